@@ -32,6 +32,7 @@ class ChangeStream:
         start_at_operation_time: Any | None = None,
         session: ClientSession | None = None,
         start_after: dict[str, Any] | None = None,
+        delta_updates: bool = False,
     ):
         """
         Initialize a change stream for a specific collection.
@@ -47,6 +48,10 @@ class ChangeStream:
             start_at_operation_time (Any, optional): Operation time to start the change stream from.
             session (Any, optional): The session to use for the change stream.
             start_after (dict[str, Any], optional): A document ID to start the change stream from.
+            delta_updates (bool, optional): If True, update events record only the
+                changed top-level fields (as ``updateDescription``) instead of a
+                full copy of the updated document. With ``full_document="updateLookup"``
+                the current document is then fetched lazily when the event is read.
         """
         self._collection = collection
         self._pipeline = pipeline or []
@@ -58,6 +63,7 @@ class ChangeStream:
         self._start_at_operation_time = start_at_operation_time
         self._session = session
         self._start_after = start_after
+        self._delta_updates = delta_updates
 
         # For SQLite-based implementation, we'll use a simple polling approach
         # In a more advanced implementation, we could use SQLite's update hooks
@@ -119,10 +125,23 @@ class ChangeStream:
                 document_id INTEGER,
                 document_data TEXT,
                 document_id_value TEXT,  -- Store the actual _id value separately
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                update_description TEXT  -- Changed fields for delta update events
             )
             """)
 
+        # Older databases created the table before update_description existed
+        if (
+            self._collection.db.execute(
+                "SELECT name FROM pragma_table_info('_neosqlite_changestream') "
+                "WHERE name = 'update_description'"
+            ).fetchone()
+            is None
+        ):
+            self._collection.db.execute(
+                "ALTER TABLE _neosqlite_changestream ADD COLUMN update_description TEXT"
+            )
+
         # Create triggers for INSERT, UPDATE, DELETE operations
         # Insert trigger
         self._collection.db.execute(f"""
@@ -139,11 +158,7 @@ class ChangeStream:
         self._collection.db.execute(f"""
             CREATE TRIGGER IF NOT EXISTS _neosqlite_{self._sanitized_name}_update_trigger
             AFTER UPDATE ON {self._sanitized_name}
-            BEGIN
-                INSERT INTO _neosqlite_changestream
-                (collection_name, operation, document_id, document_data, document_id_value)
-                VALUES ('{self._sanitized_name}', 'update', NEW.id, NEW.data, NEW._id);
-            END
+            {self._update_trigger_body()}
             """)
 
         # Delete trigger
@@ -160,6 +175,66 @@ class ChangeStream:
         # Commit the changes
         self._collection.db.commit()
 
+    def _update_trigger_body(self) -> str:
+        """
+        Build the body of the UPDATE trigger for the change tracking table.
+
+        By default the trigger copies the full new document into
+        ``document_data``. When ``delta_updates`` is enabled, the trigger
+        instead diffs the top-level fields of ``OLD.data`` and ``NEW.data``
+        with ``json_each`` and stores only an ``updateDescription`` document
+        (``updatedFields`` and ``removedFields``), so a small change to a large
+        document does not write a second copy of it. Updates that leave the
+        stored data unchanged are not recorded in delta mode.
+
+        Returns:
+            str: The ``[WHEN ...] BEGIN ... END`` part of the trigger definition.
+        """
+        if not self._delta_updates:
+            return f"""BEGIN
+                INSERT INTO _neosqlite_changestream
+                (collection_name, operation, document_id, document_data, document_id_value)
+                VALUES ('{self._sanitized_name}', 'update', NEW.id, NEW.data, NEW._id);
+            END"""
+
+        # json_each reports booleans/null as SQL values and containers as
+        # JSON text, so re-wrap them with json() to keep their JSON type
+        new_value = """CASE n.type
+                        WHEN 'true' THEN json('true')
+                        WHEN 'false' THEN json('false')
+                        WHEN 'null' THEN json('null')
+                        WHEN 'object' THEN json(n.value)
+                        WHEN 'array' THEN json(n.value)
+                        ELSE n.value
+                    END"""
+        return f"""WHEN OLD.data IS NOT NEW.data
+            BEGIN
+                INSERT INTO _neosqlite_changestream
+                (collection_name, operation, document_id, document_data,
+                 document_id_value, update_description)
+                VALUES (
+                    '{self._sanitized_name}', 'update', NEW.id, NULL, NEW._id,
+                    json_object(
+                        'updatedFields', json((
+                            SELECT json_group_object(n.key, {new_value})
+                            FROM json_each(NEW.data) AS n
+                            LEFT JOIN json_each(OLD.data) AS o ON o.key = n.key
+                            WHERE o.key IS NULL
+                               OR o.type IS NOT n.type
+                               OR o.value IS NOT n.value
+                        )),
+                        'removedFields', json((
+                            SELECT json_group_array(o.key)
+                            FROM json_each(OLD.data) AS o
+                            WHERE NOT EXISTS (
+                                SELECT 1 FROM json_each(NEW.data) AS n
+                                WHERE n.key = o.key
+                            )
+                        ))
+                    )
+                );
+            END"""
+
     def _cleanup_triggers(self):
         """
         Clean up the triggers when the change stream is closed.
@@ -247,7 +322,8 @@ class ChangeStream:
             try:
                 cursor = self._collection.db.execute(
                     """
-                    SELECT id, operation, document_id, document_data, document_id_value, timestamp
+                    SELECT id, operation, document_id, document_data, document_id_value,
+                           timestamp, update_description
                     FROM _neosqlite_changestream
                     WHERE collection_name = ? AND id > ?
                     ORDER BY id
@@ -268,6 +344,7 @@ class ChangeStream:
                         document_data,
                         document_id_value,
                         timestamp,
+                        update_description,
                     ) = row
 
                     # Delete the processed row atomically within the transaction
@@ -358,8 +435,27 @@ class ChangeStream:
                         "documentKey": {"_id": actual_id},
                     }
 
+                    # Delta update events carry the changed fields instead of
+                    # a copy of the document
+                    if update_description is not None:
+                        from neosqlite.collection.json_helpers import (
+                            neosqlite_json_loads,
+                        )
+
+                        change_doc["updateDescription"] = neosqlite_json_loads(
+                            update_description
+                        )
+
                     # Add full document if requested
                     skip_change = False
+                    if (
+                        self._full_document == "updateLookup"
+                        and operation == "update"
+                        and document_data is None
+                    ):
+                        change_doc["fullDocument"] = self._lookup_document(
+                            document_id
+                        )
                     if self._full_document == "updateLookup" and document_data:
                         full_doc_str: str | None = None
                         try:
@@ -452,6 +548,32 @@ class ChangeStream:
                 # No changes were found, sleep before retry
                 time.sleep(0.1)
 
+    def _lookup_document(self, document_id: int) -> dict[str, Any] | None:
+        """
+        Fetch the current version of a document for an update event.
+
+        Used for ``full_document="updateLookup"`` when the event did not store
+        a copy of the document (delta update events).
+
+        Args:
+            document_id (int): The auto-increment id of the changed row.
+
+        Returns:
+            dict[str, Any] | None: The current document, or None if it has
+                                   been deleted since the event was recorded.
+        """
+        from neosqlite.collection.jsonb_support import json_data_column
+
+        jsonb = self._collection.query_engine.jsonb.jsonb_supported
+        row = self._collection.db.execute(
+            f"SELECT id, {json_data_column(jsonb)}, _id "
+            f"FROM {self._sanitized_name} WHERE id = ?",
+            (document_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return self._collection._load_with_stored_id(row[0], row[1], row[2])
+
     def __enter__(self) -> ChangeStream:
         """
         Return the change stream itself.
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import warnings
+from contextlib import AbstractContextManager, nullcontext
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from neosqlite.collection.json_helpers import neosqlite_json_loads
@@ -21,13 +22,23 @@ from ..results import (
 from ..sql_utils import quote_table_name
 from .aggregation_cursor import AggregationCursor
 from .cursor import Cursor
-from .index_manager import IndexManager
+from .index_manager import (
+    DEFAULT_EXPIRE_BATCH_SIZE,
+    IndexManager,
+    delete_ttl_policies,
+    rename_ttl_policies,
+)
 from .query_engine import QueryEngine
 from .raw_batch_cursor import RawBatchCursor
 from .schema_utils import (
     create_unique_index_on_id,
     get_table_info,
 )
+from .statistics import (
+    CollectionStatistics,
+    delete_statistics,
+    rename_statistics,
+)
 from .type_utils import validate_session
 
 if TYPE_CHECKING:
@@ -67,6 +78,7 @@ class Collection:
         self.name = name
         self._database = database
         self.indexes = IndexManager(self)
+        self.statistics = CollectionStatistics(self)
         self.query_engine = QueryEngine(self)
         self._options = kwargs
 
@@ -78,6 +90,18 @@ class Collection:
         if hasattr(self, "query_engine"):
             self.query_engine.cleanup()
 
+    def _observe(
+        self,
+        operation: str,
+        filter: dict[str, Any] | None,
+        sort: dict[str, int] | None = None,
+    ) -> AbstractContextManager[None]:
+        """Time an operation for the connection's index advisor, if any."""
+        advisor = getattr(self._database, "index_advisor", None)
+        if advisor is None:
+            return nullcontext()
+        return advisor.observe(self.name, operation, filter, sort)
+
     # --- Collection helper methods ---
     def _load(
         self, id: int, data: str | bytes, stored_id: Any = None
@@ -430,8 +454,14 @@ class Collection:
             f"ALTER TABLE {quote_table_name(self.name)} RENAME TO {quote_table_name(new_name)}"
         )
 
+        rename_ttl_policies(self.db, self.name, new_name)
+        rename_statistics(self.db, self.name, new_name)
+
         # Update the collection name
         self.name = new_name
+        # Multikey and promoted field conditions qualify columns with it
+        translator = self.query_engine.sql_translator
+        translator.table_name = translator.clause_builder.table_name = new_name
 
     def options(self) -> dict[str, Any]:
         """
@@ -515,13 +545,14 @@ class Collection:
         This is a delegating method. For implementation details, see the
         core logic in :meth:`~neosqlite.collection.query_engine.QueryEngine.update_one`.
         """
-        return self.query_engine.update_one(
-            filter,
-            update,
-            upsert=upsert,
-            array_filters=array_filters,
-            session=session,
-        )
+        with self._observe("update", filter):
+            return self.query_engine.update_one(
+                filter,
+                update,
+                upsert=upsert,
+                array_filters=array_filters,
+                session=session,
+            )
 
     def update_many(
         self,
@@ -535,13 +566,14 @@ class Collection:
         This is a delegating method. For implementation details, see the
         core logic in :meth:`~neosqlite.collection.query_engine.QueryEngine.update_many`.
         """
-        return self.query_engine.update_many(
-            filter,
-            update,
-            upsert=upsert,
-            array_filters=array_filters,
-            session=session,
-        )
+        with self._observe("update", filter):
+            return self.query_engine.update_many(
+                filter,
+                update,
+                upsert=upsert,
+                array_filters=array_filters,
+                session=session,
+            )
 
     def replace_one(
         self,
@@ -579,7 +611,8 @@ class Collection:
         if self._is_gridfs_collection():
             return self._delete_one_as_gridfs(filter)
 
-        return self.query_engine.delete_one(filter, session=session)
+        with self._observe("delete", filter):
+            return self.query_engine.delete_one(filter, session=session)
 
     def _get_gridfs_bucket(self):
         """Return a GridFSBucket for this collection's bucket.
@@ -644,7 +677,8 @@ class Collection:
         if self._is_gridfs_collection():
             return self._delete_many_as_gridfs(filter)
 
-        return self.query_engine.delete_many(filter, session=session)
+        with self._observe("delete", filter):
+            return self.query_engine.delete_many(filter, session=session)
 
     def _delete_many_as_gridfs(self, filter: dict[str, Any]):
         """Delete multiple documents from a GridFS system collection."""
@@ -808,7 +842,8 @@ class Collection:
         This is a delegating method. For implementation details, see the
         core logic in :meth:`~neosqlite.collection.query_engine.QueryEngine.count_documents`.
         """
-        return self.query_engine.count_documents(filter, session=session)
+        with self._observe("count", filter):
+            return self.query_engine.count_documents(filter, session=session)
 
     def estimated_document_count(
         self,
@@ -1021,25 +1056,45 @@ class Collection:
         fts: bool = False,
         tokenizer: str | None = None,
         datetime_field: bool = False,
+        partial_filter_expression: dict[str, Any] | None = None,
+        multikey: bool = False,
+        expire_after_seconds: int | None = None,
+        fts_content: str | None = None,
+        weights: dict[str, float] | None = None,
     ):
         """
         This is a delegating method. For implementation details, see the
         core logic in :meth:`~neosqlite.collection.index_manager.IndexManager.create_index`.
         """
         self.indexes.create_index(
-            key, reindex, sparse, unique, fts, tokenizer, datetime_field
+            key,
+            reindex,
+            sparse,
+            unique,
+            fts,
+            tokenizer,
+            datetime_field,
+            partial_filter_expression,
+            multikey,
+            expire_after_seconds,
+            fts_content,
+            weights,
         )
 
     def create_search_index(
         self,
-        key: str,
+        key: str | list[str],
         tokenizer: str | None = None,
+        fts_content: str | None = None,
+        weights: dict[str, float] | None = None,
     ):
         """
         This is a delegating method. For implementation details, see the
         core logic in :meth:`~neosqlite.collection.index_manager.IndexManager.create_search_index`.
         """
-        return self.indexes.create_search_index(key, tokenizer)
+        return self.indexes.create_search_index(
+            key, tokenizer, fts_content, weights
+        )
 
     def create_indexes(
         self,
@@ -1135,6 +1190,38 @@ class Collection:
         """
         return self.indexes.index_information()
 
+    def expire(
+        self,
+        batch_size: int = DEFAULT_EXPIRE_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+        """
+        This is a delegating method. For implementation details, see the
+        core logic in :meth:`~neosqlite.collection.index_manager.IndexManager.expire`.
+        """
+        return self.indexes.expire(batch_size, max_batches)
+
+    def promote_field(self, field: str, affinity: str | None = None) -> str:
+        """
+        This is a delegating method. For implementation details, see the
+        core logic in :meth:`~neosqlite.collection.index_manager.IndexManager.promote_field`.
+        """
+        return self.indexes.promote_field(field, affinity)
+
+    def demote_field(self, field: str) -> None:
+        """
+        This is a delegating method. For implementation details, see the
+        core logic in :meth:`~neosqlite.collection.index_manager.IndexManager.demote_field`.
+        """
+        self.indexes.demote_field(field)
+
+    def analyze(self, fields: list[str] | None = None) -> list[str]:
+        """
+        This is a delegating method. For implementation details, see the
+        core logic in :meth:`~neosqlite.collection.statistics.CollectionStatistics.analyze`.
+        """
+        return self.statistics.analyze(fields)
+
     # --- Other methods ---
     @property
     def client(self) -> Connection:
@@ -1315,6 +1402,9 @@ class Collection:
         This method removes the collection (table) from the database. After calling
         this method, the collection will no longer exist in the database.
         """
+        self.indexes.drop_multikey_tables()
+        delete_ttl_policies(self.db, self.name)
+        delete_statistics(self.db, self.name)
         self.db.execute(f"DROP TABLE IF EXISTS {quote_table_name(self.name)}")
 
     def watch(
@@ -1328,6 +1418,7 @@ class Collection:
         start_at_operation_time: Any | None = None,
         session: ClientSession | None = None,
         start_after: dict[str, Any] | None = None,
+        delta_updates: bool = False,
     ) -> ChangeStream:
         """
         Monitor changes on this collection using SQLite's change tracking features.
@@ -1347,6 +1438,8 @@ class Collection:
             start_at_operation_time (Any): Operation time to start monitoring from.
             session (ClientSession): Client session for the operation.
             start_after (dict[str, Any]): Logical starting point for the change stream.
+            delta_updates (bool): Record only the changed top-level fields of updated
+                                  documents (``updateDescription``) instead of full copies.
 
         Returns:
             ChangeStream: A change stream object that can be iterated over to receive change events.
@@ -1363,4 +1456,5 @@ class Collection:
             start_at_operation_time=start_at_operation_time,
             session=session,
             start_after=start_after,
+            delta_updates=delta_updates,
         )
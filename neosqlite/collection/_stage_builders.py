@@ -19,6 +19,15 @@ from .expr_evaluator import (
 from .json_path_utils import parse_json_path
 from .pipeline_context import PipelineContext
 from .query_helper.utils import _get_json_function
+from .sql_translator_unified import (
+    build_membership_clause,
+    build_multikey_clause,
+    is_multikey_condition,
+)
+
+# Stages whose output rows are the input rows, so the generated columns of
+# promoted fields can be passed through them
+ROW_FILTER_STAGES = frozenset({"$match", "$sort", "$skip", "$limit"})
 
 
 class StageBuildersMixin:
@@ -728,15 +737,31 @@ class StageBuildersMixin:
                 where_clauses.append(expr_sql)
                 all_params.extend(expr_params)
             else:
+                # Rows of the first stage still carry the collection's ids
+                if (
+                    context.stage_index == 0
+                    and field != "_id"
+                    and is_multikey_condition(value)
+                    and not (isinstance(value, dict) and "$elemMatch" in value)
+                ):
+                    json_path = parse_json_path(field)
+                    table = self.collection.indexes.multikey_index_tables().get(
+                        json_path
+                    )
+                    multikey = (
+                        build_multikey_clause("id", table, json_path, value)
+                        if table
+                        else None
+                    )
+                    if multikey is not None:
+                        where_clauses.append(multikey[0])
+                        all_params.extend(multikey[1])
+                        continue
+
                 if field == "_id":
                     field_sql = "_id"
                 else:
-                    json_extract_func = (
-                        f"{self.jsonb.json_function_prefix}_extract"
-                    )
-                    field_sql = (
-                        f"{json_extract_func}(data, '{parse_json_path(field)}')"
-                    )
+                    field_sql = self._field_column_sql(field, context, value)
 
                 if isinstance(value, dict):
                     for op, arg in value.items():
@@ -753,18 +778,36 @@ class StageBuildersMixin:
                             case "$lte":
                                 where_clauses.append(f"{field_sql} <= ?")
                                 all_params.append(arg)
-                            case "$eq":
-                                where_clauses.append(f"{field_sql} = ?")
-                                all_params.append(arg)
-                            case "$ne":
-                                where_clauses.append(f"{field_sql} != ?")
-                                all_params.append(arg)
+                            case "$eq" | "$ne":
+                                membership = self._membership_sql(
+                                    field,
+                                    field_sql,
+                                    [arg],
+                                    context,
+                                    op == "$ne",
+                                )
+                                if membership is not None:
+                                    where_clauses.append(membership[0])
+                                    all_params.extend(membership[1])
+                                else:
+                                    sql_op = "=" if op == "$eq" else "!="
+                                    where_clauses.append(
+                                        f"{field_sql} {sql_op} ?"
+                                    )
+                                    all_params.append(arg)
+                            case (
+                                "$in" | "$nin"
+                            ) if membership := self._membership_sql(
+                                field, field_sql, arg, context, op == "$nin"
+                            ):
+                                where_clauses.append(membership[0])
+                                all_params.extend(membership[1])
                             case "$in":
                                 if isinstance(arg, (list, tuple)):
                                     json_path = parse_json_path(field)
                                     placeholders = ", ".join("?" for _ in arg)
                                     where_clauses.append(
-                                        f"EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE json_each.value IN ({placeholders}))"
+                                        f"EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE value IN ({placeholders}))"
                                     )
                                     all_params.extend(arg)
                                 else:
@@ -774,7 +817,7 @@ class StageBuildersMixin:
                                     json_path = parse_json_path(field)
                                     placeholders = ", ".join("?" for _ in arg)
                                     where_clauses.append(
-                                        f"NOT EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE json_each.value IN ({placeholders}))"
+                                        f"NOT EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE value IN ({placeholders}))"
                                     )
                                     all_params.extend(arg)
                                 else:
@@ -786,7 +829,7 @@ class StageBuildersMixin:
                                     json_path = parse_json_path(field)
                                     for v in arg:
                                         where_clauses.append(
-                                            f"EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE json_each.value = ?)"
+                                            f"EXISTS (SELECT 1 FROM {self.jsonb.json_each_function}(data, '{json_path}') WHERE value = ?)"
                                         )
                                         all_params.append(v)
                                 else:
@@ -794,20 +837,71 @@ class StageBuildersMixin:
                             case _:
                                 return None, []
                 else:
-                    where_clauses.append(f"{field_sql} = ?")
-                    all_params.append(value)
+                    membership = self._membership_sql(
+                        field, field_sql, [value], context
+                    )
+                    if membership is not None:
+                        where_clauses.append(membership[0])
+                        all_params.extend(membership[1])
+                    else:
+                        where_clauses.append(f"{field_sql} = ?")
+                        all_params.append(value)
 
         where_clause = (
             f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
         )
-        select_parts = ["id", "_id", "data"]
-        if context.has_root:
-            select_parts.append("root_data")
+        select_parts = self._row_filter_select_parts(context)
         return (
             f"SELECT {', '.join(select_parts)} FROM {prev_stage} {where_clause}",
             all_params,
         )
 
+    def _membership_sql(self, field, field_sql, values, context, negate=False):
+        """
+        Equality, $in or their negation matching array elements, as find()
+        does, or None for the plain comparison.
+
+        Each value is bound once, as cached pipeline templates rebind one
+        parameter per condition. Only the first stage's rows are the
+        collection's documents, whose indexes tell which fields hold no
+        arrays.
+        """
+        if field == "_id" or not isinstance(values, (list, tuple)):
+            return None
+        json_path = parse_json_path(field)
+        return build_membership_clause(
+            field_sql,
+            json_path,
+            list(values),
+            json_each_function=self.jsonb.json_each_function,
+            may_hold_arrays=context.stage_index != 0
+            or self.collection.indexes.may_hold_arrays(json_path),
+            negate=negate,
+            bind_once=True,
+        )
+
+    def _field_column_sql(self, field, context, condition=None):
+        """
+        A field's promoted column if the rows carry it and it can answer
+        the $match condition (None for a sort), else its JSON.
+        """
+        json_path = parse_json_path(field)
+        if json_path in context.promoted_columns:
+            column = self.collection.indexes.promoted_column(
+                json_path, condition
+            )
+            if column is not None:
+                return column
+        return f"{self.jsonb.json_function_prefix}_extract(data, '{json_path}')"
+
+    def _row_filter_select_parts(self, context):
+        """Columns of a $match, $sort, $skip or $limit stage's rows."""
+        select_parts = ["id", "_id", "data"]
+        if context.has_root:
+            select_parts.append("root_data")
+        select_parts.extend(context.promoted_columns.values())
+        return select_parts
+
     def _build_sort_sql(self, spec, prev_stage, context):
         order_parts = []
         for field, direction in spec.items():
@@ -815,32 +909,23 @@ class StageBuildersMixin:
             if field == "_id":
                 field_sql = "_id"
             else:
-                json_extract_func = f"{self.jsonb.json_function_prefix}_extract"
-                field_sql = (
-                    f"{json_extract_func}(data, '{parse_json_path(field)}')"
-                )
+                field_sql = self._field_column_sql(field, context)
             order_parts.append(f"{field_sql} {order_dir}")
-        select_parts = ["id", "_id", "data"]
-        if context.has_root:
-            select_parts.append("root_data")
+        select_parts = self._row_filter_select_parts(context)
         return (
             f"SELECT {', '.join(select_parts)} FROM {prev_stage} ORDER BY {', '.join(order_parts)}",
             [],
         )
 
     def _build_skip_sql(self, spec, prev_stage, context):
-        select_parts = ["id", "_id", "data"]
-        if context.has_root:
-            select_parts.append("root_data")
+        select_parts = self._row_filter_select_parts(context)
         return (
             f"SELECT {', '.join(select_parts)} FROM {prev_stage} LIMIT -1 OFFSET ?",
             [int(spec)],
         )
 
     def _build_limit_sql(self, spec, prev_stage, context):
-        select_parts = ["id", "_id", "data"]
-        if context.has_root:
-            select_parts.append("root_data")
+        select_parts = self._row_filter_select_parts(context)
         return (
             f"SELECT {', '.join(select_parts)} FROM {prev_stage} LIMIT ?",
             [int(spec)],
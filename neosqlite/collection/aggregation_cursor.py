@@ -277,6 +277,13 @@ class AggregationCursor:
         """
         Execute the aggregation pipeline and store the results.
         """
+        with self.collection._observe(
+            "aggregate", *_leading_filter_and_sort(self.pipeline)
+        ):
+            self._run_pipeline()
+        self._executed = True
+
+    def _run_pipeline(self) -> None:
         # Estimate the result size to determine if we need memory-constrained processing
         estimated_size = self._estimate_result_size()
 
@@ -302,8 +309,6 @@ class AggregationCursor:
                 session=self._session,
             )
 
-        self._executed = True
-
     def _estimate_result_size(self) -> int:
         """
         Estimate the size of the aggregation result in bytes.
@@ -485,3 +490,18 @@ class AggregationCursor:
         ):
             return self._results.stats
         return None
+
+
+def _leading_filter_and_sort(
+    pipeline: list[dict[str, Any]],
+) -> tuple[dict[str, Any] | None, dict[str, int] | None]:
+    """The $match and $sort a pipeline starts with, which can use indexes."""
+    filter = sort = None
+    stages = iter(pipeline)
+    stage = next(stages, None)
+    if isinstance(stage, dict) and "$match" in stage:
+        filter = stage["$match"]
+        stage = next(stages, None)
+    if isinstance(stage, dict) and "$sort" in stage:
+        sort = stage["$sort"]
+    return filter, sort
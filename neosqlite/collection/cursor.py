@@ -5,9 +5,11 @@ import time
 from collections.abc import Callable, Iterable, Iterator
 from copy import deepcopy
 from functools import partial
+from itertools import islice, repeat
 from typing import TYPE_CHECKING, Any
 
 from ..sql_utils import quote_table_name
+from .json_helpers import neosqlite_json_dumps, neosqlite_json_loads
 from .json_path_utils import parse_json_path
 from .jsonb_support import json_data_column
 from .type_utils import validate_session
@@ -20,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 ASCENDING = 1
 DESCENDING = -1
+TEXT_SCORE = {"$meta": "textScore"}
 
 
 class Cursor:
@@ -141,7 +144,16 @@ class Cursor:
             Iterator[dict[str, Any]]: An iterator yielding documents that match the filter,
                                       projection, sorting, and pagination criteria.
         """
-        return self._execute_query()
+        advisor = getattr(self._collection._database, "index_advisor", None)
+        if advisor is None:
+            return self._execute_query()
+        return advisor.timed(
+            self._execute_query(),
+            self._collection.name,
+            "find",
+            self._filter,
+            self._sort,
+        )
 
     def limit(self, limit: int) -> Cursor:
         """
@@ -571,11 +583,18 @@ class Cursor:
             self._limit, self._skip
         )
 
-        if where_result is not None:
+        params: list[Any]
+        scored = (
+            self._text_score_query(where_result[0], where_result[1])
+            if where_result is not None
+            else None
+        )
+        if scored is not None:
+            sql, params = scored
+        elif where_result is not None:
             where_clause, params, tables = where_result
-            jsonb = self._collection.query_engine.jsonb.jsonb_supported
             sql = (
-                f"SELECT id, _id, {json_data_column(jsonb)} as data "
+                f"{self._select_clause(self._covered_fields())} "
                 f"FROM {quote_table_name(self._collection.name)} {where_clause}{sort_clause}{pagination_clause}"
             )
         else:
@@ -585,7 +604,7 @@ class Cursor:
                 f"SELECT id, _id, {json_data_column(jsonb)} as data "
                 f"FROM {quote_table_name(self._collection.name)}{sort_clause}{pagination_clause}"
             )
-            params = ()
+            params = []
 
         # Get the query plan from SQLite
 
@@ -652,9 +671,12 @@ class Cursor:
         # track if SQL handled sorting and pagination
         self._sql_handled_sort = False
         self._sql_handled_pagination = False
+        self._text_scored = False
 
-        # Get the documents based on filter
-        docs = self._get_filtered_documents()
+        # Get the documents based on filter; building the query reads the
+        # collection's schema once
+        with self._collection.indexes.pinned_schema():
+            docs = self._get_filtered_documents()
 
         # Apply sorting if not handled by SQL
         if not self._sql_handled_sort:
@@ -664,8 +686,9 @@ class Cursor:
         if not self._sql_handled_pagination:
             docs = self._apply_pagination(docs)
 
-        # Apply projection
-        docs = self._apply_projection(docs)
+        # Apply projection (ranked documents come back already projected)
+        if not self._text_scored:
+            docs = self._apply_projection(docs)
 
         # Mark cursor as having been iterated (for address property)
         self._iterated = True
@@ -705,8 +728,13 @@ class Cursor:
         if "$expr" in self._filter:
             return self._handle_expr_query()
 
+        # $jsonSchema is checked in Python on the rows the rest selects
         where_result = self._query_helpers._build_simple_where_clause(
-            self._filter
+            {
+                key: value
+                for key, value in self._filter.items()
+                if key != "$jsonSchema"
+            }
         )
 
         docs: Iterable[dict[str, Any]]
@@ -726,13 +754,18 @@ class Cursor:
                 where_clause = minmax_clause
                 params = minmax_params  # type: ignore[assignment]
 
+            # Ranking $text matches reads the textScore from FTS5
+            scored = self._text_score_query(where_clause, params)
+            if scored is not None:
+                return self._get_scored_documents(*scored)
+
             # Build sorting and pagination clauses for SQL
             sort_clause = self._query_helpers._build_sort_clause(
                 self._sort, self._collation
             )
             # If we have a where predicate (Python filter), we CANNOT do SQL pagination
             # because we need to see all documents that matched the SQL filter first.
-            if self._where_predicate:
+            if self._python_filter() is not None:
                 pagination_clause = ""
             else:
                 pagination_clause = (
@@ -741,10 +774,10 @@ class Cursor:
                     )
                 )
 
-            # Use the collection's JSONB support flag to determine how to select data
-            jsonb = self._collection.query_engine.jsonb.jsonb_supported
+            # A covered query reads only the index, not the documents
+            covered = self._covered_fields()
             cmd = (
-                f"SELECT id, _id, {json_data_column(jsonb)} as data "
+                f"{self._select_clause(covered)} "
                 f"FROM {quote_table_name(self._collection.name)} {where_clause}{sort_clause}{pagination_clause}"
             )
 
@@ -770,26 +803,277 @@ class Cursor:
                     rows = db_cursor.fetchmany(self._batch_size)
                     if not rows:
                         break
-                    for doc in self._load_documents(rows):
-                        yield doc
+                    if covered:
+                        yield from self._load_covered_documents(rows, covered)
+                    else:
+                        yield from self._load_documents(rows)
 
             docs = doc_generator()
         else:
             # Fall back to Python-based filtering
             docs = self._handle_python_fallback()
 
+        return self._filter_documents(docs)
+
+    def _filter_documents(
+        self, docs: Iterable[dict[str, Any]]
+    ) -> Iterable[dict[str, Any]]:
+        """Apply the Python-side filters: where() and $jsonSchema."""
+        matches = self._python_filter()
+        return docs if matches is None else filter(matches, docs)
+
+    def _python_filter(self) -> Callable[[dict[str, Any]], bool] | None:
+        """
+        The Python-side filters, where() and $jsonSchema, as one predicate.
+
+        Returns:
+            Callable[[dict[str, Any]], bool] | None: The predicate, or None
+                if the filter has no Python-side part
+        """
+        checks: list[Callable[[dict[str, Any]], bool]] = []
         # Apply where predicate if specified (Tier-3 Python filtering)
         if self._where_predicate:
-            docs = filter(self._where_predicate, docs)  # type: ignore[arg-type]
+            checks.append(self._where_predicate)
 
         # Apply $jsonSchema filter if present
         if "$jsonSchema" in self._filter:
             from .query_helper.schema_validator import matches_json_schema
 
-            schema = self._filter["$jsonSchema"]
-            docs = (doc for doc in docs if matches_json_schema(doc, schema))
+            checks.append(
+                partial(matches_json_schema, schema=self._filter["$jsonSchema"])
+            )
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda doc: all(check(doc) for check in checks)
+
+    def _text_score_query(
+        self, where_clause: str, params: list[Any] | tuple[Any, ...]
+    ) -> tuple[str, list[Any]] | None:
+        """
+        The query of a $text search that projects or sorts by textScore.
+
+        The FTS5 ranking is joined to the collection, and sort keys of
+        ``{"$meta": "textScore"}`` order by its score. When the filter is
+        only $text and the sort only the score, the limit is pushed into
+        the ranking as ``ORDER BY rank LIMIT k``, FTS5's top-k search, so
+        only the best k matches are read from the collection.
+
+        Args:
+            where_clause: The WHERE clause of the filter
+            params: The parameters of the WHERE clause
+
+        Returns:
+            tuple[str, list[Any]] | None: The query and its parameters, or
+                None if the query does not need the score or the
+                collection has no text index
+        """
+        if "$text" not in self._filter:
+            return None
+        sort = self._sort or {}
+        projection = self._projection or {}
+        if TEXT_SCORE not in sort.values() and TEXT_SCORE not in (
+            projection.values()
+        ):
+            return None
+        only_text = len(self._filter) == 1 and not (self._min or self._max)
+        limit = self._limit
+        matches = self._python_filter()
+        top_k = (
+            only_text
+            and list(sort.values()) == [TEXT_SCORE]
+            and limit
+            and matches is None
+        )
+        ranking = self._query_helpers._build_text_ranking(
+            self._filter["$text"],
+            limit + self._skip if limit and top_k else None,
+        )
+        if ranking is None:
+            return None
+        ranking_sql, ranking_params = ranking
+
+        order = [
+            (
+                "s.text_score DESC"
+                if direction == TEXT_SCORE
+                else self._query_helpers._build_sort_clause(
+                    {key: direction}, self._collation
+                ).removeprefix(" ORDER BY ")
+            )
+            for key, direction in sort.items()
+        ]
+        sort_clause = f" ORDER BY {', '.join(order)}" if order else ""
+        pagination_clause = (
+            ""
+            if matches is not None
+            else self._query_helpers._build_pagination_clause(
+                self._limit, self._skip
+            )
+        )
+        collection = quote_table_name(self._collection.name)
+        select = f"{self._select_clause(None)}, s.text_score"
+        if only_text:
+            # The ranking is the whole filter
+            sql = (
+                f"{select} FROM ({ranking_sql}) s "
+                f"JOIN {collection} ON {collection}.id = s.text_id"
+                f"{sort_clause}{pagination_clause}"
+            )
+            return sql, list(ranking_params)
+        sql = (
+            f"{select} FROM {collection} "
+            f"JOIN ({ranking_sql}) s ON s.text_id = {collection}.id "
+            f"{where_clause}{sort_clause}{pagination_clause}"
+        )
+        return sql, [*ranking_params, *params]
+
+    def _get_scored_documents(
+        self, sql: str, params: list[Any]
+    ) -> Iterable[dict[str, Any]]:
+        """
+        Run a textScore query and return its projected documents.
+
+        Each score travels beside its document rather than inside it, so
+        where() and $jsonSchema see the stored document unchanged.
+
+        Args:
+            sql: The query built by _text_score_query
+            params: Its parameters
 
-        return docs
+        Returns:
+            list[dict[str, Any]]: The ranked, filtered, paginated and
+                projected documents
+        """
+        self._sql_handled_sort = True
+        self._sql_handled_pagination = True
+        self._text_scored = True
+        if self._comment:
+            safe_comment = (
+                self._comment.replace("/*", "")
+                .replace("*/", "")
+                .replace("--", "")
+            )
+            sql = f"/* {safe_comment} */ {sql}"
+        db_cursor = self._collection.db.execute(sql, params)
+
+        def scored_generator() -> Iterator[tuple[dict[str, Any], float]]:
+            while True:
+                rows = db_cursor.fetchmany(self._batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    (doc,) = self._load_documents([row[:3]])
+                    yield doc, row[3]
+
+        scored: Iterable[tuple[dict[str, Any], float]] = scored_generator()
+        matches = self._python_filter()
+        if matches is not None:
+            scored = (pair for pair in scored if matches(pair[0]))
+            # SQL could not paginate rows these filters may still reject
+            stop = None if self._limit is None else self._skip + self._limit
+            scored = islice(scored, self._skip, stop)
+        pairs = list(scored)
+        return self._apply_projection(
+            [doc for doc, _ in pairs], [score for _, score in pairs]
+        )
+
+    def _covered_fields(self) -> list[str] | None:
+        """
+        The projected fields, if one index holds everything the query reads.
+
+        That takes an inclusion projection of top-level fields that excludes
+        _id, and a filter on fields only, where the projected, filtered and sorted fields are
+        all keys of the same index. Without JSONB an index stores objects
+        and arrays as JSON text, indistinguishable from strings, so no query
+        is covered.
+
+        Returns:
+            list[str] | None: The projected fields, or None if the query
+                is not covered
+        """
+        projection = self._projection
+        if (
+            not projection
+            or not self._collection.query_engine.jsonb.jsonb_supported
+            or projection.get("_id", 1) not in (0, False)
+            or self._where_predicate
+            or self._min
+            or self._max
+        ):
+            return None
+        fields = [field for field in projection if field != "_id"]
+        if not fields or any(
+            projection[field] not in (1, True) or not field.isidentifier()
+            for field in fields
+        ):
+            return None
+        read = {*fields, *self._filter, *(self._sort or ())}
+        if any(
+            field.startswith("$")
+            or field == "_id"
+            or "[" in field
+            or any(part.isdigit() for part in field.split("."))
+            for field in read
+        ):
+            return None
+        paths = {parse_json_path(field) for field in read}
+        for index_paths in self._collection.indexes.index_field_paths():
+            if paths <= index_paths:
+                return fields
+        return None
+
+    def _select_clause(self, covered: list[str] | None) -> str:
+        """
+        The SELECT list of the query: the document, or the covered fields.
+
+        Covered fields are selected as the very expressions their index
+        stores, so SQLite reads them from the index.
+        """
+        if not covered:
+            jsonb = self._collection.query_engine.jsonb.jsonb_supported
+            return f"SELECT id, _id, {json_data_column(jsonb)} as data"
+        prefix = self._collection.query_engine.jsonb.json_function_prefix
+        values = ", ".join(
+            f"{prefix}_extract(data, '{parse_json_path(field)}')"
+            for field in covered
+        )
+        return f"SELECT id, {values}"
+
+    def _load_covered_documents(
+        self, rows, fields: list[str]
+    ) -> Iterable[dict[str, Any]]:
+        """
+        Build the projected documents of a covered query from index values.
+
+        Values an index does not store unambiguously send their row back to
+        the table for the whole document: NULL (missing or null field), 0
+        and 1 (possibly booleans) and JSONB (objects and arrays).
+
+        Args:
+            rows: Rows of the document's id followed by the covered values
+            fields: The covered fields, in the order they were selected
+        """
+        jsonb = self._collection.query_engine.jsonb.jsonb_supported
+        load_document = (
+            f"SELECT id, _id, {json_data_column(jsonb)} as data "
+            f"FROM {quote_table_name(self._collection.name)} WHERE id = ?"
+        )
+        for id_val, *values in rows:
+            if any(
+                value is None or isinstance(value, bytes) or value in (0, 1)
+                for value in values
+            ):
+                yield from self._load_documents(
+                    self._collection.db.execute(load_document, (id_val,))
+                )
+                continue
+            # Decodes dates the way documents loaded from JSON are
+            yield neosqlite_json_loads(
+                neosqlite_json_dumps(dict(zip(fields, values)))
+            )
 
     def _handle_python_fallback(self) -> Iterable[dict[str, Any]]:
         """Handle complex queries by filtering all documents in Python."""
@@ -1214,6 +1498,9 @@ class Cursor:
                 case_insensitive = True
 
         for key in sort_keys:
+            if self._sort[key] == TEXT_SCORE:
+                # Without a text index every score is 0
+                continue
             get_val = partial(self._collection._get_val, key=key)
             reverse = self._sort[key] == DESCENDING
 
@@ -1261,22 +1548,44 @@ class Cursor:
         return skipped_docs
 
     def _apply_projection(
-        self, docs: Iterable[dict[str, Any]]
+        self,
+        docs: Iterable[dict[str, Any]],
+        text_scores: Iterable[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Apply projection to the documents.
 
         Args:
             docs (Iterable[dict[str, Any]]): The iterable of documents to apply projection to.
+            text_scores (Iterable[float] | None): The textScore of each
+                document, in order; every score is 0 without it
 
         Returns:
             list[dict[str, Any]]: A list of dictionaries representing the documents
                                   after applying the projection.
         """
-        project = partial(
-            self._query_helpers._apply_projection, self._projection
-        )
-        return list(map(project, docs))
+        projection = self._projection or {}
+        # As in MongoDB, textScore fields are added to the projected
+        # document; they make neither an inclusion nor an exclusion
+        scores = [
+            key for key, value in projection.items() if value == TEXT_SCORE
+        ]
+        if scores:
+            projection = {
+                key: value
+                for key, value in projection.items()
+                if key not in scores
+            }
+        project = partial(self._query_helpers._apply_projection, projection)
+        if text_scores is None:
+            text_scores = repeat(0.0)
+        projected = []
+        for doc, score in zip(docs, text_scores):
+            projected_doc = project(doc)
+            for key in scores:
+                projected_doc[key] = score
+            projected.append(projected_doc)
+        return projected
 
     def close(self) -> None:
         """
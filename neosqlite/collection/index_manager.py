@@ -1,8 +1,13 @@
 import logging
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Any, Literal, overload
 
 from .._sqlite import sqlite3
-from ..sql_utils import quote_identifier, quote_table_name
+from ..sql_utils import inline_parameters, quote_identifier, quote_table_name
+from .json_helpers import neosqlite_json_dumps, neosqlite_json_loads
 from .json_path_utils import parse_json_path
 from .jsonb_support import (
     JSONBContext,
@@ -15,6 +20,152 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Comment before a sparse or partial index's WHERE clause holding the
+# index's options as JSON, which index_information() reports
+_INDEX_OPTIONS = re.compile(r" /\* (\{.*?\}) \*/(?= WHERE )")
+
+# Existence test a sparse index puts in its WHERE clause, one per key
+_SPARSE_TERM = re.compile(r"json_type\(data, '([^']*)'\) IS NOT NULL")
+
+# Statement in a multikey index's triggers naming its side table and path
+_MULTIKEY_INSERT = re.compile(
+    r"INSERT OR IGNORE INTO (\w+)\(value, id\)\s+SELECT value, new\.id\s+"
+    r"FROM json_each\(new\.data, '([^']*)'\)"
+)
+
+# Generated column of a promoted field in the collection's CREATE TABLE
+_PROMOTED_COLUMN = re.compile(
+    r"(\w+)(?: (\w+))? GENERATED ALWAYS AS \("
+    r"(?:CASE WHEN json_type\(data, '[^']*'\) IN \([^)]*\) THEN )?"
+    r"(?:json|jsonb)_extract\(data, '([^']*)'\)(?: END)?\) VIRTUAL"
+)
+
+# Hidden partial index recording which documents hold an array at a path
+_ARRAY_TRACKER = re.compile(
+    r"\(json_type\(data, '([^']*)'\)\) WHERE json_type\(data, '[^']*'\) "
+    r"= 'array'$"
+)
+
+# Index key that is a field of the document
+_INDEX_KEY_FIELD = re.compile(r"(json|jsonb)_extract\(data, '([^']*)'\)")
+
+# Type affinities a promoted field's column may declare
+PROMOTED_AFFINITIES = frozenset({"INTEGER", "REAL", "NUMERIC", "TEXT", "BLOB"})
+
+# JSON types a promoted column with an affinity holds; BLOB converts nothing
+_NUMERIC_JSON_TYPES = ("integer", "real", "true", "false")
+_AFFINITY_JSON_TYPES = {
+    "INTEGER": _NUMERIC_JSON_TYPES,
+    "REAL": _NUMERIC_JSON_TYPES,
+    "NUMERIC": _NUMERIC_JSON_TYPES,
+    "TEXT": ("text",),
+}
+
+# Operators no value of another type satisfies, which a column holding only
+# the operand's type answers as the document's value would; numbers sort
+# before text and blobs, so upper bounds on numbers exclude them too
+_TYPED_COLUMN_OPERATORS = frozenset({"$eq", "$ne", "$in", "$nin"})
+_NUMERIC_COLUMN_OPERATORS = _TYPED_COLUMN_OPERATORS | {"$lt", "$lte"}
+
+# Table recording the expireAfterSeconds policy of TTL indexes
+TTL_TABLE = "_neosqlite_ttl"
+
+# Most documents one expiry DELETE removes, so it holds the write lock briefly
+DEFAULT_EXPIRE_BATCH_SIZE = 1000
+
+# How an FTS5 table keeps the indexed text: a copy of its own (None), read
+# through a view of the collection ("external") or not at all ("contentless")
+FTS_CONTENT_OPTIONS = (None, "external", "contentless")
+
+# Array elements (or a lone scalar) stored in a multikey side table
+_MULTIKEY_ELEMENTS = (
+    "typeof(key) != 'text' AND type IN ('integer', 'real', 'text')"
+)
+
+
+def drop_multikey_side_tables(db, collection_name: str) -> None:
+    """
+    Drop the multikey side tables of a collection.
+
+    Must run before the collection's table is dropped: the triggers naming
+    the side tables go with it, while the side tables would outlive it and
+    hand stale ids to a new collection of the same name.
+    """
+    rows = db.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+        "AND tbl_name = ? AND sql IS NOT NULL",
+        (collection_name,),
+    ).fetchall()
+    tables = {
+        table for (sql,) in rows for table, _ in _MULTIKEY_INSERT.findall(sql)
+    }
+    for table in sorted(tables):
+        db.execute(f"DROP TABLE IF EXISTS {quote_identifier(table)}")
+
+
+def _index_keys(sql: str) -> list[str]:
+    """Split the key list of a CREATE INDEX statement into its keys."""
+    sql = _INDEX_OPTIONS.sub("", sql)
+    definition = sql.partition(" ON ")[2].partition(" WHERE ")[0]
+    keys_sql = definition[definition.find("(") + 1 : definition.rfind(")")]
+    keys, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(keys_sql):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            keys.append(keys_sql[start:i].strip())
+            start = i + 1
+    keys.append(keys_sql[start:].strip())
+    return keys
+
+
+def _ttl_table_exists(db) -> bool:
+    return (
+        db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (TTL_TABLE,),
+        ).fetchone()
+        is not None
+    )
+
+
+def delete_ttl_policies(db, collection_name: str) -> None:
+    """Forget the TTL policies of a dropped collection."""
+    if _ttl_table_exists(db):
+        db.execute(
+            f"DELETE FROM {TTL_TABLE} WHERE collection_name = ?",
+            (collection_name,),
+        )
+
+
+def rename_ttl_policies(db, old_name: str, new_name: str) -> None:
+    """Move the TTL policies of a renamed collection to its new name."""
+    if _ttl_table_exists(db):
+        db.execute(
+            f"UPDATE {TTL_TABLE} SET collection_name = ? "
+            "WHERE collection_name = ?",
+            (new_name, old_name),
+        )
+
+
+def ttl_collection_names(db) -> list[str]:
+    """Names of the collections that have at least one TTL index."""
+    if not _ttl_table_exists(db):
+        return []
+    return [
+        row[0]
+        for row in db.execute(
+            f"SELECT DISTINCT collection_name FROM {TTL_TABLE} "
+            "ORDER BY collection_name"
+        )
+    ]
+
 
 class IndexManager:
     """
@@ -36,6 +187,23 @@ class IndexManager:
         self.collection = collection
         # Initialize JSONB capabilities
         self.jsonb = JSONBContext.from_db(collection.db)
+        # Sparse and multikey index paths and promoted field columns,
+        # cached per schema version
+        self._sparse_paths: frozenset[str] = frozenset()
+        self._multikey_tables: dict[str, str] = {}
+        self._promoted_columns: dict[str, str] = {}
+        self._promoted_affinities: dict[str, str] = {}
+        self._index_field_paths: list[frozenset[str]] = []
+        self._array_paths: frozenset[str] = frozenset()
+        self._schema_version: int | None = None
+        # Set while one query is built, so the schema is read once for it
+        self._schema_pinned = False
+        # may_hold_arrays() answers, valid while nothing was written
+        self._array_probes: dict[str, bool] = {}
+        self._array_probes_stamp: tuple[int, ...] | None = None
+        self._data_stamp: tuple[int, ...] = ()
+        # Set while a partial filter is compiled into an index's WHERE clause
+        self._compiling_index_filter = False
 
     def create_index(
         self,
@@ -46,6 +214,11 @@ class IndexManager:
         fts: bool = False,
         tokenizer: str | None = None,
         datetime_field: bool = False,
+        partial_filter_expression: dict[str, Any] | None = None,
+        multikey: bool = False,
+        expire_after_seconds: int | None = None,
+        fts_content: str | None = None,
+        weights: dict[str, float] | None = None,
     ):
         """
         Create an index on the specified key(s) for this collection.
@@ -54,6 +227,22 @@ class IndexManager:
         function to create indexes on the JSON-stored data. For compound indexes,
         multiple json_extract calls are used for each key in the list.
 
+        Sparse and partial indexes become SQLite partial indexes: only rows
+        matching the index's WHERE clause are stored in it.
+
+        A multikey index also keeps a ``<collection>__mk_<field>`` side table
+        with one ``(value, id)`` row per scalar array element, maintained by
+        triggers, so array membership queries can use an index.
+
+        A TTL index (``expire_after_seconds``) is a datetime index whose
+        policy is recorded in the ``_neosqlite_ttl`` table; :meth:`expire`
+        deletes the documents it has expired.
+
+        A text index on several fields (``fts=True`` with a list of fields,
+        or ``[("title", "text"), ("body", "text")]``) is one multi-column
+        FTS5 table. Its ``weights`` scale each field's contribution to the
+        BM25 relevance reported as ``{"$meta": "textScore"}``.
+
         Args:
             key: A string or list of strings representing the field(s) to index.
             reindex: Boolean indicating whether to reindex (not used in this implementation).
@@ -62,7 +251,41 @@ class IndexManager:
             fts: Boolean indicating whether to create an FTS index for text search.
             tokenizer: Optional tokenizer to use for FTS index (e.g., 'icu', 'icu_th').
             datetime_field: Boolean indicating whether this is a datetime field that requires special indexing.
+            partial_filter_expression: Query selecting the documents to index.
+                It is compiled with the same translator as find(), so
+                queries that repeat its conditions can use the index.
+            multikey: Boolean indicating whether to also index each element
+                of an array field, for $in, $all, $elemMatch and equality
+                on array members.
+            expire_after_seconds: Seconds after the datetime in the field at
+                which a document expires, making this a TTL index.
+            fts_content: How a text index keeps the indexed text: None for
+                its own copy, "external" to read it through a view of the
+                collection, or "contentless" to keep only the postings.
+            weights: Relevance weight of each field of a text index;
+                fields not listed weigh 1.
+
+        Raises:
+            ValueError: If the partial filter cannot be compiled to SQL, or a
+                multikey index is compound, unique, partial or a text index,
+                or a TTL index is not on a single field, or a text index
+                has non-text keys, an unknown fts_content or an invalid
+                weight.
         """
+        if expire_after_seconds is not None:
+            if fts or multikey or partial_filter_expression:
+                raise ValueError(
+                    "TTL indexes cannot be text, multikey or partial indexes"
+                )
+            self._create_ttl_index(key, expire_after_seconds, unique)
+            return
+        if multikey and (
+            unique or fts or datetime_field or partial_filter_expression
+        ):
+            raise ValueError(
+                "Multikey indexes cannot be unique, partial, text or "
+                "datetime indexes"
+            )
         # For datetime fields, use special indexing.
         if datetime_field:
             if isinstance(key, str):
@@ -77,41 +300,55 @@ class IndexManager:
             # Handle MongoDB tuple format: [("field", "type")]
             field, index_type = key[0]
             if index_type == "text":
-                self._create_fts_index(field, tokenizer)
+                if multikey:
+                    raise ValueError("Multikey indexes cannot be text indexes")
+                self._create_fts_index(field, tokenizer, fts_content, weights)
             else:
                 # Create index name (replace dots with underscores for valid identifiers)
                 index_name = field.replace(".", "_")
 
-                # Determine which function to use based on JSONB support
-                func_prefix = self.jsonb.json_function_prefix
+                where = self._index_where_clause(
+                    [field], sparse, partial_filter_expression
+                )
 
                 # Create the index using appropriate JSON/JSONB function
                 self.collection.db.execute(
                     (
                         f"CREATE {'UNIQUE ' if unique else ''}INDEX "
                         f"IF NOT EXISTS {quote_identifier(f'idx_{self.collection.name}_{index_name}')} "
-                        f"ON {quote_table_name(self.collection.name)}({func_prefix}_extract(data, '{parse_json_path(field)}'))"
+                        f"ON {quote_table_name(self.collection.name)}({self._index_key_sql(field)})"
+                        f"{where}"
                     )
                 )
+                self._track_arrays([field], partial_filter_expression)
+                self._sync_typed_indexes()
+                if multikey:
+                    self._create_multikey_table(field)
         elif isinstance(key, str):
             if fts:
                 # Create FTS index with optional tokenizer
-                self._create_fts_index(key, tokenizer)
+                self._create_fts_index(key, tokenizer, fts_content, weights)
             else:
                 # Create index name (replace dots with underscores for valid identifiers)
                 index_name = key.replace(".", "_")
 
-                # Determine which function to use based on JSONB support
-                func_prefix = self.jsonb.json_function_prefix
+                where = self._index_where_clause(
+                    [key], sparse, partial_filter_expression
+                )
 
                 # Create the index using appropriate JSON/JSONB function
                 self.collection.db.execute(
                     (
                         f"CREATE {'UNIQUE ' if unique else ''}INDEX "
                         f"IF NOT EXISTS {quote_identifier(f'idx_{self.collection.name}_{index_name}')} "
-                        f"ON {quote_table_name(self.collection.name)}({func_prefix}_extract(data, '{parse_json_path(key)}'))"
+                        f"ON {quote_table_name(self.collection.name)}({self._index_key_sql(key)})"
+                        f"{where}"
                     )
                 )
+                self._track_arrays([key], partial_filter_expression)
+                self._sync_typed_indexes()
+                if multikey:
+                    self._create_multikey_table(key)
         else:
             # Compound indexes: must use PyMongo tuple format
             # [("field1", 1), ("field2", -1)]
@@ -120,10 +357,11 @@ class IndexManager:
                 fields = [k[0] for k in key]
             elif (
                 isinstance(key, list)
-                and len(key) == 1
-                and isinstance(key[0], str)
+                and (len(key) == 1 or fts)
+                and all(isinstance(k, str) for k in key)
             ):
-                # Single-element list like ["field"] - treat as single-field index
+                # Single-element list like ["field"] - treat as single-field
+                # index; a list of fields is allowed for a text index
                 fields = key  # type: ignore[assignment]
             else:
                 raise ValueError(
@@ -131,168 +369,1022 @@ class IndexManager:
                     f'[("field1", 1), ("field2", -1)]. Got: {key}'
                 )
 
+            text_keys = [
+                k for k in key if isinstance(k, tuple) and k[1] == "text"
+            ]
+            if text_keys and len(text_keys) < len(key):
+                raise ValueError(
+                    "Text indexes cannot be combined with other keys"
+                )
+            if fts or text_keys:
+                if multikey:
+                    raise ValueError("Multikey indexes cannot be text indexes")
+                self._create_fts_index(fields, tokenizer, fts_content, weights)
+                return
+            if multikey and len(fields) > 1:
+                raise ValueError("Compound multikey indexes are not supported")
             index_name = "_".join(fields).replace(".", "_")
 
-            # Determine which function to use based on JSONB support
-            func_prefix = self.jsonb.json_function_prefix
-
             # Create the compound index using multiple JSON/JSONB extract calls
-            index_columns = ", ".join(
-                f"{func_prefix}_extract(data, '{parse_json_path(f)}')"
-                for f in fields
+            index_columns = ", ".join(self._index_key_sql(f) for f in fields)
+            where = self._index_where_clause(
+                fields, sparse, partial_filter_expression
             )
             self.collection.db.execute(
                 (
                     f"CREATE {'UNIQUE ' if unique else ''}INDEX "
                     f"IF NOT EXISTS {quote_identifier(f'idx_{self.collection.name}_{index_name}')} "
                     f"ON {quote_table_name(self.collection.name)}({index_columns})"
+                    f"{where}"
+                )
+            )
+            self._track_arrays(fields, partial_filter_expression)
+            self._sync_typed_indexes()
+            if multikey:
+                self._create_multikey_table(fields[0])
+
+    def _index_where_clause(
+        self,
+        fields: list[str],
+        sparse: bool,
+        partial_filter_expression: dict[str, Any] | None,
+    ) -> str:
+        """
+        Build the WHERE clause of a sparse or partial index.
+
+        A sparse index keeps documents that have at least one of its keys
+        (including keys set to null, as in MongoDB). A partial filter is
+        compiled by the find() translator with its parameters inlined, since
+        an index's WHERE clause cannot take bound parameters. The options
+        themselves are kept in a comment before the clause, so
+        :meth:`index_information` reports them as given.
+
+        Returns:
+            str: " /* options */ WHERE ..." or an empty string for a full
+            index.
+
+        Raises:
+            ValueError: If the partial filter cannot be compiled to SQL.
+        """
+        terms = []
+        if sparse:
+            exists = [
+                f"json_type(data, '{parse_json_path(f)}') IS NOT NULL"
+                for f in fields
+            ]
+            terms.append(
+                exists[0] if len(exists) == 1 else f"({' OR '.join(exists)})"
+            )
+        if partial_filter_expression:
+            if any(k.startswith("$") for k in partial_filter_expression):
+                raise ValueError(
+                    "partialFilterExpression only supports field conditions: "
+                    f"{partial_filter_expression}"
+                )
+            helpers = self.collection.query_engine.helpers
+            # An index's WHERE clause cannot hold the subquery matching
+            # array elements; queries only use the index while the filter's
+            # fields hold no arrays and compile to the same scalar terms
+            self._compiling_index_filter = True
+            try:
+                result = helpers._build_simple_where_clause(
+                    partial_filter_expression
                 )
+            finally:
+                self._compiling_index_filter = False
+            if not result or not result[0]:
+                raise ValueError(
+                    "Unsupported partialFilterExpression: "
+                    f"{partial_filter_expression}"
+                )
+            where_clause, params, _ = result
+            terms.append(
+                inline_parameters(where_clause.removeprefix("WHERE "), params)
+            )
+        if not terms:
+            return ""
+        options: dict[str, Any] = {}
+        if sparse:
+            options["sparse"] = True
+        if partial_filter_expression:
+            options["partialFilterExpression"] = partial_filter_expression
+        # "\/" is JSON for "/", so no string value can end the comment
+        comment = neosqlite_json_dumps(options).replace("*/", "*\\/")
+        return f" /* {comment} */ WHERE {' AND '.join(terms)}"
+
+    def _track_arrays(
+        self,
+        fields: list[str],
+        partial_filter_expression: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Keep a hidden partial index of the documents holding an array at
+        each field of an index.
+
+        It lets :meth:`may_hold_arrays` answer from an index probe, so
+        equality on fields that hold no arrays keeps the plain comparison
+        the field's index (and a partial index's WHERE clause) can match.
+        Otherwise it serves the array side of the membership test, next
+        to the field's index serving the scalar side.
+        """
+        for field in [*fields, *(partial_filter_expression or {})]:
+            tracker = quote_identifier(
+                f"{self.collection.name}__arrays_{field.replace('.', '_')}"
+            )
+            array_type = f"json_type(data, '{parse_json_path(field)}')"
+            self.collection.db.execute(
+                f"CREATE INDEX IF NOT EXISTS {tracker} "
+                f"ON {quote_table_name(self.collection.name)}({array_type}) "
+                f"WHERE {array_type} = 'array'"
+            )
+
+    def may_hold_arrays(self, json_path: str) -> bool:
+        """
+        Whether documents of this collection may hold an array at a path.
+
+        Paths of indexed fields are answered exactly from their hidden
+        array index; any other path may hold arrays.
+        """
+        if self._compiling_index_filter:
+            return False
+        self._refresh_schema_cache()
+        if json_path not in self._array_paths:
+            return True
+        # Writes through this connection bump total_changes, and commits
+        # through others bump data_version
+        if self._array_probes_stamp != self._data_stamp:
+            self._array_probes = {}
+            self._array_probes_stamp = self._data_stamp
+        holds_arrays = self._array_probes.get(json_path)
+        if holds_arrays is None:
+            holds_arrays = (
+                self.collection.db.execute(
+                    f"SELECT 1 FROM {quote_table_name(self.collection.name)} "
+                    f"WHERE json_type(data, '{json_path}') = 'array' LIMIT 1"
+                ).fetchone()
+                is not None
+            )
+            self._array_probes[json_path] = holds_arrays
+        return holds_arrays
+
+    def paths_without_arrays(self) -> frozenset[str]:
+        """Paths of indexed fields at which no document holds an array."""
+        self._refresh_schema_cache()
+        return frozenset(
+            path for path in self._array_paths if not self.may_hold_arrays(path)
+        )
+
+    def _drop_unused_array_trackers(self) -> None:
+        """Drop the hidden array indexes of fields no index refers to."""
+        db = self.collection.db
+        rows = db.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = ? AND sql IS NOT NULL",
+            (self.collection.name,),
+        ).fetchall()
+        trackers = {
+            name: match.group(1)
+            for name, sql in rows
+            if (match := _ARRAY_TRACKER.search(sql))
+        }
+        used = " ".join(sql for name, sql in rows if name not in trackers)
+        for path, column in self.promoted_columns().items():
+            if re.search(rf"\b{column}\b", used):
+                used += f" '{path}'"
+        for name, path in trackers.items():
+            if f"'{path}'" not in used:
+                db.execute(f"DROP INDEX IF EXISTS {quote_identifier(name)}")
+
+    def sparse_index_paths(self) -> frozenset[str]:
+        """
+        JSON paths that sparse indexes on this collection require to exist.
+
+        The query builder adds a matching ``json_type(...) IS NOT NULL``
+        term when a filter already implies the field exists, which lets
+        SQLite prove the sparse index covers every matching row.
+        """
+        self._refresh_schema_cache()
+        return self._sparse_paths
+
+    def multikey_index_tables(self) -> dict[str, str]:
+        """
+        Side tables of this collection's multikey indexes, by JSON path.
+
+        The query builder rewrites array membership predicates on these
+        paths into lookups on the side table's (value, id) primary key.
+        """
+        self._refresh_schema_cache()
+        return self._multikey_tables
+
+    def promoted_columns(self) -> dict[str, str]:
+        """
+        Generated columns of this collection's promoted fields, by JSON path.
+
+        The query builders reference these columns instead of extracting
+        the field from each document.
+        """
+        self._refresh_schema_cache()
+        return self._promoted_columns
+
+    def promoted_column(
+        self, json_path: str, condition: Any = None
+    ) -> str | None:
+        """
+        The generated column a query may read a promoted field from.
+
+        A column with an affinity holds only the values of its type, so it
+        answers a condition only if every operand has that type and no
+        value of another type could match. Other conditions, and sorts,
+        read the field from the document, through the index kept on the
+        JSON expression.
+
+        Args:
+            json_path: The field's JSON path.
+            condition: The field's value or operator dict in the query, or
+                None for a sort.
+
+        Returns:
+            The column's name, or None to extract the field instead
+        """
+        column = self.promoted_columns().get(json_path)
+        affinity = self._promoted_affinities.get(json_path)
+        if column is None or affinity is None:
+            return column
+        if isinstance(condition, dict):
+            operators = _NUMERIC_COLUMN_OPERATORS
+            if affinity == "TEXT":
+                operators = _TYPED_COLUMN_OPERATORS
+            if not condition or not operators.issuperset(condition):
+                return None
+            operands = []
+            for op, value in condition.items():
+                if op not in ("$in", "$nin"):
+                    operands.append(value)
+                elif isinstance(value, (list, tuple)):
+                    operands.extend(value)
+                else:
+                    return None
+        else:
+            operands = [condition]
+        if affinity == "TEXT":
+            typed = all(isinstance(operand, str) for operand in operands)
+        else:
+            typed = all(
+                isinstance(operand, (int, float))
+                and not isinstance(operand, bool)
+                for operand in operands
             )
+        return column if typed and operands else None
 
-    def _create_fts_index(self, field: str, tokenizer: str | None = None):
+    @contextmanager
+    def pinned_schema(self) -> Iterator[None]:
         """
-        Creates an FTS5 index on the specified field for text search.
+        Read the schema once for everything looked up while building one
+        query.
 
-        For FTS indexes, we create both JSON and JSONB versions to ensure
-        compatibility with both types of queries.
+        Inside the block the sparse, multikey, promoted and array lookups
+        share a single version check instead of one round trip each.
+        Blocks may nest; only the outermost one reads the schema.
+        """
+        if self._schema_pinned:
+            yield
+            return
+        self._refresh_schema_cache()
+        self._schema_pinned = True
+        try:
+            yield
+        finally:
+            self._schema_pinned = False
 
-        For nested array fields (e.g., "comments.text"), we use json_tree() to
-        properly index all array elements, not just the first one.
+    def _refresh_schema_cache(self) -> None:
+        """
+        Re-read sparse and multikey index definitions and promoted fields if
+        the schema changed.
+
+        The cache is keyed by ``PRAGMA schema_version``, so indexes created
+        or dropped through other connections are picked up. The same round
+        trip reads ``PRAGMA data_version``, which keys the cached answers of
+        :meth:`may_hold_arrays`.
+        """
+        if self._schema_pinned:
+            return
+        db = self.collection.db
+        version, data_version = db.execute(
+            "SELECT schema_version, data_version "
+            "FROM pragma_schema_version(), pragma_data_version()"
+        ).fetchone()
+        self._data_stamp = (version, data_version, db.total_changes)
+        if version == self._schema_version:
+            return
+        rows = db.execute(
+            "SELECT type, sql FROM sqlite_master WHERE tbl_name = ? "
+            "AND type IN ('table', 'index', 'trigger') AND sql IS NOT NULL",
+            (self.collection.name,),
+        ).fetchall()
+        self._sparse_paths = frozenset(
+            path
+            for type_, sql in rows
+            if type_ == "index"
+            for path in _SPARSE_TERM.findall(sql.partition(" WHERE ")[2])
+        )
+        self._multikey_tables = {
+            path: table
+            for type_, sql in rows
+            if type_ == "trigger"
+            for table, path in _MULTIKEY_INSERT.findall(sql)
+        }
+        promoted = [
+            match
+            for type_, sql in rows
+            if type_ == "table"
+            for match in _PROMOTED_COLUMN.findall(sql)
+        ]
+        self._promoted_columns = {path: column for column, _, path in promoted}
+        self._promoted_affinities = {
+            path: affinity
+            for _, affinity, path in promoted
+            if affinity in _AFFINITY_JSON_TYPES
+        }
+        self._array_paths = frozenset(
+            path
+            for type_, sql in rows
+            if type_ == "index"
+            for path in _ARRAY_TRACKER.findall(sql)
+        )
+        prefix = self.jsonb.json_function_prefix
+        self._index_field_paths = []
+        for type_, sql in rows:
+            if type_ != "index":
+                continue
+            paths = set()
+            for key in _index_keys(sql):
+                field = _INDEX_KEY_FIELD.fullmatch(key)
+                if field is not None and field.group(1) == prefix:
+                    paths.add(field.group(2))
+            if paths:
+                self._index_field_paths.append(frozenset(paths))
+        self._schema_version = version
+
+    def index_field_paths(self) -> list[frozenset[str]]:
+        """
+        JSON paths of the fields stored by each index on this collection.
+
+        Only keys that are a field as the query builders extract it count,
+        so a query reading nothing but the fields of one index can be
+        answered from that index alone. Promoted fields do not: SQLite
+        reads virtual generated columns from the table, even when indexed.
+        """
+        self._refresh_schema_cache()
+        return self._index_field_paths
+
+    def _extract_sql(self, field: str) -> str:
+        """The expression extracting a field from the document."""
+        return (
+            f"{self.jsonb.json_function_prefix}_extract"
+            f"(data, '{parse_json_path(field)}')"
+        )
+
+    def _index_key_sql(self, field: str) -> str:
+        """
+        An index key for a field: its generated column if promoted without
+        an affinity.
+        """
+        json_path = parse_json_path(field)
+        column = self.promoted_columns().get(json_path)
+        if column is None or json_path in self._promoted_affinities:
+            return self._extract_sql(field)
+        return column
+
+    def _typed_columns(self) -> dict[str, str]:
+        """
+        Expressions of the fields promoted with an affinity, by column.
+        """
+        prefix = self.jsonb.json_function_prefix
+        return {
+            column: f"{prefix}_extract(data, '{path}')"
+            for path, column in self.promoted_columns().items()
+            if path in self._promoted_affinities
+        }
+
+    def _sync_typed_indexes(self) -> None:
+        """
+        Keep a hidden twin, keyed on the column, of each index on a field
+        promoted with an affinity.
+
+        Such a column answers only some conditions, so the index itself
+        stays on the JSON expression for ranges and sorts, and its
+        ``<collection>__typed_<index>`` twin serves the conditions read
+        from the column. Twins whose index was dropped or changed are
+        dropped or rebuilt.
+        """
+        typed = self._typed_columns()
+        db = self.collection.db
+        rows = db.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = ? AND sql IS NOT NULL",
+            (self.collection.name,),
+        ).fetchall()
+        twins = {
+            name: sql
+            for name, sql in rows
+            if any(re.search(rf"\b{column}\b", sql) for column in typed)
+        }
+        wanted = {}
+        for name, sql in rows:
+            if name in twins:
+                continue
+            _, on, definition = sql.partition(" ON ")
+            keyed = definition
+            for column, extract in typed.items():
+                # The datetime index wraps the expression, which stays
+                keyed = re.sub(
+                    rf"(?<!datetime\(){re.escape(extract)}", column, keyed
+                )
+            if keyed != definition:
+                suffix = name.removeprefix(f"idx_{self.collection.name}_")
+                twin = f"{self.collection.name}__typed_{suffix}"
+                wanted[twin] = (
+                    f"CREATE INDEX {quote_identifier(twin)}{on}{keyed}"
+                )
+        for name, sql in twins.items():
+            if wanted.get(name) != sql:
+                db.execute(f"DROP INDEX {quote_identifier(name)}")
+        for name, sql in wanted.items():
+            if twins.get(name) != sql:
+                db.execute(sql)
+
+    def promote_field(self, field: str, affinity: str | None = None) -> str:
+        """
+        Give a field a generated column in the collection's table.
+
+        The column is ``GENERATED ALWAYS AS (jsonb_extract(data, path))
+        VIRTUAL``, so writes are unchanged, and indexes on it store the
+        extracted value. find() filters and sorts and the first stages of
+        SQL-tier aggregations reference the column instead of the JSON
+        expression. Indexes on the field, existing ones included, are built
+        on the column; with an affinity they stay on the expression, and a
+        hidden twin of each is built on the column.
+
+        SQLite cannot add STORED columns to an existing table, so promoted
+        columns are always VIRTUAL.
 
         Args:
-            field (str): The field to create the FTS index on.
-            tokenizer (str, optional): Optional tokenizer to use for the FTS index.
+            field: The field to promote, in dot notation.
+            affinity: Optional type affinity of the column (INTEGER, REAL,
+                NUMERIC, TEXT or BLOB). The column then holds only values of
+                that type (numbers for the numeric affinities), and queries
+                read it only for equality, ``$in``, their negations and, for
+                numbers, upper bounds with operands of that type. Other
+                queries and sorts read the field from the document, using
+                the index on the expression.
+
+        Returns:
+            str: The name of the generated column.
+
+        Raises:
+            ValueError: If the field is _id, the affinity is unknown, or
+                another promoted field already has the column's name.
+        """
+        if field == "_id" or not field or field.startswith("$"):
+            raise ValueError(f"Cannot promote field {field!r}")
+        if affinity is not None:
+            affinity = affinity.upper()
+            if affinity not in PROMOTED_AFFINITIES:
+                raise ValueError(f"Unknown column affinity: {affinity!r}")
+
+        json_path = parse_json_path(field)
+        promoted = self.promoted_columns()
+        if json_path in promoted:
+            return promoted[json_path]
+        column = quote_identifier("f_" + re.sub(r"\W", "_", field))
+        if column in promoted.values():
+            raise ValueError(
+                f"Column {column} already holds another promoted field"
+            )
+
+        extract = self._extract_sql(field)
+        generated = extract
+        if affinity in _AFFINITY_JSON_TYPES:
+            # Values of other types stay out rather than being converted
+            json_types = ", ".join(
+                f"'{json_type}'" for json_type in _AFFINITY_JSON_TYPES[affinity]
+            )
+            generated = (
+                f"CASE WHEN json_type(data, '{json_path}') IN ({json_types}) "
+                f"THEN {extract} END"
+            )
+        db = self.collection.db
+        db.execute("SAVEPOINT promote_field")
+        try:
+            db.execute(
+                f"ALTER TABLE {quote_table_name(self.collection.name)} "
+                f"ADD COLUMN {column}{f' {affinity}' if affinity else ''} "
+                f"GENERATED ALWAYS AS ({generated}) VIRTUAL"
+            )
+            if affinity in _AFFINITY_JSON_TYPES:
+                self._sync_typed_indexes()
+            else:
+                # The datetime index wraps the expression, which stays as it is
+                self._rewrite_indexes(
+                    re.compile(rf"(?<!datetime\(){re.escape(extract)}"),
+                    column,
+                )
+        except BaseException:
+            db.execute("ROLLBACK TO SAVEPOINT promote_field")
+            raise
+        finally:
+            db.execute("RELEASE SAVEPOINT promote_field")
+        return column
+
+    def demote_field(self, field: str) -> None:
+        """
+        Drop the generated column of a promoted field.
+
+        Indexes on the column are rebuilt on the JSON expression; the
+        hidden twins of a column with an affinity are dropped.
+
+        Args:
+            field: The promoted field, in dot notation.
+        """
+        json_path = parse_json_path(field)
+        column = self.promoted_columns().get(json_path)
+        if column is None:
+            return
+        db = self.collection.db
+        db.execute("SAVEPOINT demote_field")
+        try:
+            if json_path in self._promoted_affinities:
+                # Only the hidden twins are built on the column
+                for name, sql in db.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                    "AND tbl_name = ? AND sql IS NOT NULL",
+                    (self.collection.name,),
+                ).fetchall():
+                    if re.search(rf"\b{column}\b", sql):
+                        db.execute(f"DROP INDEX {quote_identifier(name)}")
+            else:
+                self._rewrite_indexes(
+                    re.compile(rf'(?:"?\w+"?\.)?\b{column}\b'),
+                    self._extract_sql(field),
+                )
+            db.execute(
+                f"ALTER TABLE {quote_table_name(self.collection.name)} "
+                f"DROP COLUMN {column}"
+            )
+        except BaseException:
+            db.execute("ROLLBACK TO SAVEPOINT demote_field")
+            raise
+        finally:
+            db.execute("RELEASE SAVEPOINT demote_field")
+
+    def _rewrite_indexes(self, pattern: re.Pattern[str], replacement: str):
+        """
+        Rebuild the collection's indexes whose definition matches a pattern.
+
+        Args:
+            pattern: What to replace in the key list and WHERE clause.
+            replacement: The SQL replacing each match.
+        """
+        db = self.collection.db
+        indexes = db.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = ? AND sql IS NOT NULL",
+            (self.collection.name,),
+        ).fetchall()
+        for name, sql in indexes:
+            head, on, definition = sql.partition(" ON ")
+            new_definition = pattern.sub(replacement, definition)
+            if new_definition != definition:
+                db.execute(f"DROP INDEX {quote_identifier(name)}")
+                db.execute(head + on + new_definition)
+
+    def _create_multikey_table(self, field: str):
+        """
+        Creates the side table and triggers of a multikey index.
+
+        The table holds one ``(value, id)`` row per distinct scalar element
+        of the array at ``field`` (or the field's value if it is a scalar),
+        so membership tests become primary key lookups instead of a
+        json_each() scan of every document. Object and boolean elements are
+        not indexed; queries on them keep using json_each().
+
+        Args:
+            field (str): The array field to index.
         """
-        # Create index name (replace dots with underscores for valid identifiers)
         index_name = field.replace(".", "_")
-        fts_table_name = quote_identifier(
-            f"{self.collection.name}_{index_name}_fts"
+        collection = quote_table_name(self.collection.name)
+        table = quote_identifier(f"{self.collection.name}__mk_{index_name}")
+        json_path = parse_json_path(field)
+
+        self.collection.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                value NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (value, id)
+            ) WITHOUT ROWID
+            """)
+        self.collection.db.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_id ON {table}(id)"
         )
+        self.collection.db.execute(f"""
+            INSERT OR IGNORE INTO {table}(value, id)
+            SELECT value, c.id
+            FROM {collection} c, json_each(c.data, '{json_path}')
+            WHERE {_MULTIKEY_ELEMENTS}
+            """)
 
-        # Create FTS table with optional tokenizer
-        # Note: We don't use the 'content' option because we manage the FTS data manually
-        # to properly support array fields with json_tree()
-        tokenizer_clause = f"TOKENIZE={tokenizer}" if tokenizer else ""
+        insert_elements = f"""
+                    INSERT OR IGNORE INTO {table}(value, id)
+                    SELECT value, new.id
+                    FROM json_each(new.data, '{json_path}')
+                    WHERE {_MULTIKEY_ELEMENTS};"""
         self.collection.db.execute(f"""
-            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table_name}
-            USING FTS5({index_name}, {tokenizer_clause})
+            CREATE TRIGGER IF NOT EXISTS {table}_insert
+            AFTER INSERT ON {collection}
+            BEGIN{insert_elements}
+            END
+            """)
+        # Updates that leave the array alone skip the side table entirely
+        self.collection.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_update
+            AFTER UPDATE OF data ON {collection}
+            WHEN json_extract(old.data, '{json_path}')
+                IS NOT json_extract(new.data, '{json_path}')
+            BEGIN
+                DELETE FROM {table} WHERE id = old.id;{insert_elements}
+            END
+            """)
+        self.collection.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_delete
+            AFTER DELETE ON {collection}
+            BEGIN
+                DELETE FROM {table} WHERE id = old.id;
+            END
             """)
 
-        # For nested fields with arrays, use json_tree() to index all matching values
-        # Convert field path to json_tree fullkey pattern (e.g., "comments.text" -> "$.comments[*].text")
-        field_parts = field.split(".")
-        if len(field_parts) == 1:
-            # Simple field - use direct json_extract
-            json_path = parse_json_path(field)
-            self.collection.db.execute(f"""
-                INSERT INTO {fts_table_name}(rowid, {index_name})
-                SELECT id, lower(json_extract(data, '{json_path}'))
-                FROM {quote_table_name(self.collection.name)}
-                WHERE json_extract(data, '{json_path}') IS NOT NULL
-                """)
-        else:
-            # Nested field - use json_tree/jsonb_tree to find all matching values including array elements
-            # Concatenate all text values with spaces for FTS indexing
-            jsonb_each_supported = supports_jsonb_each(self.collection.db)
-            json_tree_func = _get_json_tree_function(
-                self.jsonb.jsonb_supported, jsonb_each_supported
+    def _create_ttl_index(
+        self,
+        key: str | list[str] | list[tuple[str, int]],
+        expire_after_seconds: int,
+        unique: bool,
+    ):
+        """
+        Creates a TTL index: a datetime index plus its expiry policy.
+
+        Args:
+            key: The datetime field, as a string or a one-element key list.
+            expire_after_seconds: Seconds a document lives past the field.
+            unique: Whether the datetime index should be unique.
+
+        Raises:
+            ValueError: If the key is not a single field or the expiry is
+                not a non-negative integer.
+        """
+        match key:
+            case str():
+                field = key
+            case [str() as field] | [(str() as field, _)]:
+                pass
+            case _:
+                raise ValueError(
+                    f"TTL indexes must be on a single field: {key}"
+                )
+        if (
+            not isinstance(expire_after_seconds, int)
+            or isinstance(expire_after_seconds, bool)
+            or expire_after_seconds < 0
+        ):
+            raise ValueError(
+                "expireAfterSeconds must be a non-negative integer: "
+                f"{expire_after_seconds!r}"
             )
-            last_key = field_parts[-1]
+        self._create_datetime_index(field, unique=unique)
+        self.collection.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {TTL_TABLE} (
+                collection_name TEXT NOT NULL,
+                field TEXT NOT NULL,
+                expire_after_seconds INTEGER NOT NULL,
+                PRIMARY KEY (collection_name, field)
+            )
+            """)
+        self.collection.db.execute(
+            f"INSERT OR REPLACE INTO {TTL_TABLE} VALUES (?, ?, ?)",
+            (self.collection.name, field, expire_after_seconds),
+        )
+
+    def ttl_policies(self) -> dict[str, int]:
+        """
+        TTL indexes on this collection.
+
+        Returns:
+            dict[str, int]: expireAfterSeconds by field name.
+        """
+        if not _ttl_table_exists(self.collection.db):
+            return {}
+        return dict(
             self.collection.db.execute(
-                f"""
-                INSERT INTO {fts_table_name}(rowid, {index_name})
-                SELECT
-                    r.id,
-                    group_concat(lower(t.value), ' ')
-                FROM {quote_table_name(self.collection.name)} r
-                JOIN {json_tree_func}(r.data) t
-                WHERE t.key = ? AND t.type = 'text'
-                GROUP BY r.id
-                """,
-                [last_key],
-            )
-
-        # Create triggers to keep FTS table in sync with main table
-        # For array fields, we need to delete all entries for the rowid and re-insert all values
-        field_parts = field.split(".")
-
-        # Insert trigger - delete any existing entries and insert all matching values
-        if len(field_parts) == 1:
-            # Simple field
+                f"SELECT field, expire_after_seconds FROM {TTL_TABLE} "
+                "WHERE collection_name = ? ORDER BY field",
+                (self.collection.name,),
+            ).fetchall()
+        )
+
+    def expire(
+        self,
+        batch_size: int = DEFAULT_EXPIRE_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+        """
+        Delete the documents this collection's TTL indexes have expired.
+
+        Each batch is one DELETE of at most ``batch_size`` documents located
+        through the TTL field's datetime index, so other writers only wait
+        for one small batch at a time. As in MongoDB, documents whose field
+        is missing or not a date never expire. Once anything has been
+        deleted, ``PRAGMA incremental_vacuum`` returns the freed pages to
+        the file system (on databases using incremental auto-vacuum).
+
+        Args:
+            batch_size: Most documents deleted per statement.
+            max_batches: Most statements to run per TTL index, or None to
+                keep going until nothing expired is left.
+
+        Returns:
+            int: The number of documents deleted.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        policies = self.ttl_policies()
+        if not policies:
+            return 0
+
+        db = self.collection.db
+        table = quote_table_name(self.collection.name)
+        func_prefix = self.jsonb.json_function_prefix
+        now = datetime.now(timezone.utc)
+        deleted = 0
+        for field, expire_after_seconds in policies.items():
             json_path = parse_json_path(field)
-            self.collection.db.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_insert
-                AFTER INSERT ON {quote_table_name(self.collection.name)}
-                BEGIN
-                    DELETE FROM {fts_table_name} WHERE rowid = new.id;
-                    INSERT INTO {fts_table_name}(rowid, {index_name})
-                    VALUES (new.id, lower(json_extract(new.data, '{json_path}')));
-                END
-                """)
-        else:
-            # Nested field - use json_tree/jsonb_tree with GROUP BY
-            jsonb_each_supported = supports_jsonb_each(self.collection.db)
-            json_tree_func = _get_json_tree_function(
-                self.jsonb.jsonb_supported, jsonb_each_supported
+            # Same expression as the datetime index, so SQLite range-scans it
+            cutoff = (now - timedelta(seconds=expire_after_seconds)).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            delete_batch = (
+                f"DELETE FROM {table} WHERE id IN ("
+                f"SELECT id FROM {table} "
+                f"WHERE datetime({func_prefix}_extract(data, '{json_path}')) <= ? "
+                f"AND json_type(data, '{json_path}') = 'text' "
+                "LIMIT ?)"
+            )
+            batches = 0
+            while max_batches is None or batches < max_batches:
+                count = db.execute(delete_batch, (cutoff, batch_size)).rowcount
+                deleted += count
+                batches += 1
+                if count < batch_size:
+                    break
+
+        if deleted:
+            db.execute("PRAGMA incremental_vacuum")
+            logger.debug(
+                f"Expired {deleted} documents from '{self.collection.name}'"
+            )
+        return deleted
+
+    def _drop_multikey_table(self, index_name: str):
+        """
+        Drops the side table and triggers of a multikey index, if any.
+
+        Args:
+            index_name (str): The index name, with dots replaced by
+                underscores.
+        """
+        table = f"{quote_table_name(self.collection.name)}__mk_{index_name}"
+        for suffix in ("insert", "update", "delete"):
+            self.collection.db.execute(
+                f"DROP TRIGGER IF EXISTS {table}_{suffix}"
+            )
+        self.collection.db.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def drop_multikey_tables(self):
+        """
+        Drops the side tables of every multikey index on this collection.
+        """
+        drop_multikey_side_tables(self.collection.db, self.collection.name)
+
+    def _create_fts_index(
+        self,
+        fields: str | list[str],
+        tokenizer: str | None = None,
+        content: str | None = None,
+        weights: dict[str, float] | None = None,
+    ):
+        """
+        Creates an FTS5 index on the specified field(s) for text search.
+
+        Several fields share one multi-column FTS5 table, so a $text query
+        searches them with a single MATCH.
+
+        By default the FTS5 table stores its own lowercased copy of the
+        text. With ``content="external"`` it is an external-content table
+        reading the text through a ``<table>_source`` view of the collection
+        (top-level fields only: FTS5 cannot read a view calling json_tree),
+        and with ``content="contentless"`` the text is not kept at all;
+        either way only the full-text postings are stored, and the triggers
+        pass the old text to FTS5's 'delete' command.
+
+        The weights become the table's persistent ``rank`` configuration,
+        ``bm25(w1, w2, ...)`` in column order, so ``ORDER BY rank`` ranks by
+        the weighted relevance and can use FTS5's top-k search.
+
+        The update trigger only fires when an indexed field changed, so
+        updates to other fields leave the postings alone.
+
+        For nested array fields (e.g., "comments.text"), json_tree() over the
+        first path segment indexes all array elements, not just the first one.
+
+        Args:
+            fields (str | list[str]): The field(s) to create the FTS index on.
+            tokenizer (str, optional): Optional tokenizer to use for the FTS index.
+            content (str, optional): None, "external" or "contentless".
+            weights (dict[str, float], optional): BM25 weight of each field;
+                fields not listed weigh 1.
+
+        Raises:
+            ValueError: If the content option is not recognised, an
+                external-content index has a nested field, or a weight is
+                not a positive number or names a field not in the index.
+        """
+        if content not in FTS_CONTENT_OPTIONS:
+            raise ValueError(
+                f"FTS content must be one of {FTS_CONTENT_OPTIONS}, "
+                f"got {content!r}"
             )
+        if isinstance(fields, str):
+            fields = [fields]
+        if content == "external" and any("." in field for field in fields):
+            raise ValueError(
+                "External-content text indexes cannot have nested fields; "
+                'use fts_content="contentless"'
+            )
+        weights = weights or {}
+        unknown = set(weights) - set(fields)
+        if unknown:
+            raise ValueError(
+                "Text index weights name fields not in the index: "
+                f"{sorted(unknown)}"
+            )
+        for field, weight in weights.items():
+            if (
+                isinstance(weight, bool)
+                or not isinstance(weight, (int, float))
+                or not weight > 0
+            ):
+                raise ValueError(
+                    f"Text index weight of {field!r} must be a positive "
+                    f"number, got {weight!r}"
+                )
+        # Create index name (replace dots with underscores for valid identifiers)
+        columns = [field.replace(".", "_") for field in fields]
+        index_name = "_".join(columns)
+        fts_table = f"{self.collection.name}_{index_name}_fts"
+        fts_table_name = quote_identifier(fts_table)
+        collection_name = quote_table_name(self.collection.name)
+        trigger_prefix = f"{collection_name}_{index_name}_fts"
+        column_list = ", ".join(columns)
+
+        options = [*columns]
+        if tokenizer:
+            options.append(f"TOKENIZE={tokenizer}")
+        if content == "external":
+            content_view = quote_identifier(f"{fts_table}_source")
             self.collection.db.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_insert
-                AFTER INSERT ON {quote_table_name(self.collection.name)}
-                BEGIN
-                    DELETE FROM {fts_table_name} WHERE rowid = new.id;
-                    INSERT INTO {fts_table_name}(rowid, {index_name})
-                    SELECT
-                        new.id,
-                        group_concat(lower(t.value), ' ')
-                    FROM {json_tree_func}(new.data) t
-                    WHERE t.key = '{last_key}' AND t.type = 'text'
-                    GROUP BY new.id;
-                END
+                CREATE VIEW IF NOT EXISTS {content_view} AS
+                SELECT r.id AS id, {self._fts_values_sql(fields, "r", columns)}
+                FROM {collection_name} r
                 """)
+            options.append(f"content='{fts_table}_source'")
+            options.append("content_rowid='id'")
+        elif content == "contentless":
+            options.append("content=''")
+        self.collection.db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table_name}
+            USING FTS5({", ".join(options)})
+            """)
 
-        # Update trigger - delete old entries and insert new ones
-        if len(field_parts) == 1:
-            # Simple field
-            json_path = parse_json_path(field)
+        if weights:
+            # The rank configuration persists in the FTS5 table
+            rank = ", ".join(
+                str(float(weights.get(field, 1))) for field in fields
+            )
+            self.collection.db.execute(
+                f"INSERT INTO {fts_table_name}({fts_table_name}, rank) "
+                "VALUES ('rank', ?)",
+                (f"bm25({rank})",),
+            )
+
+        new_values = self._fts_values_sql(fields, "new")
+        old_values = self._fts_values_sql(fields, "old")
+        if content == "external":
+            self.collection.db.execute(
+                f"INSERT INTO {fts_table_name}({fts_table_name}) "
+                "VALUES ('rebuild')"
+            )
+        else:
             self.collection.db.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_update
-                AFTER UPDATE ON {quote_table_name(self.collection.name)}
-                BEGIN
-                    DELETE FROM {fts_table_name} WHERE rowid = old.id;
-                    INSERT INTO {fts_table_name}(rowid, {index_name})
-                    VALUES (new.id, lower(json_extract(new.data, '{json_path}')));
-                END
+                INSERT INTO {fts_table_name}(rowid, {column_list})
+                SELECT r.id, {self._fts_values_sql(fields, "r")}
+                FROM {collection_name} r
                 """)
+
+        # Statements removing a row's entry: external-content and
+        # contentless tables need the text that was indexed
+        if content is None:
+            delete_new = f"DELETE FROM {fts_table_name} WHERE rowid = new.id;"
+            delete_old = f"DELETE FROM {fts_table_name} WHERE rowid = old.id;"
         else:
-            # Nested field - use json_tree/jsonb_tree with GROUP BY
-            jsonb_each_supported = supports_jsonb_each(self.collection.db)
-            json_tree_func = _get_json_tree_function(
-                self.jsonb.jsonb_supported, jsonb_each_supported
+            delete_new = ""
+            delete_old = (
+                f"INSERT INTO {fts_table_name}"
+                f"({fts_table_name}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values});"
             )
-            self.collection.db.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_update
-                AFTER UPDATE ON {quote_table_name(self.collection.name)}
-                BEGIN
-                    DELETE FROM {fts_table_name} WHERE rowid = old.id;
-                    INSERT INTO {fts_table_name}(rowid, {index_name})
-                    SELECT
-                        new.id,
-                        group_concat(lower(t.value), ' ')
-                    FROM {json_tree_func}(new.data) t
-                    WHERE t.key = '{last_key}' AND t.type = 'text'
-                    GROUP BY new.id;
-                END
-                """)
+        insert_new = (
+            f"INSERT INTO {fts_table_name}(rowid, {column_list}) "
+            f"VALUES (new.id, {new_values});"
+        )
 
-        # Delete trigger - remove all entries for the deleted row
         self.collection.db.execute(f"""
-            CREATE TRIGGER IF NOT EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_delete
-            AFTER DELETE ON {quote_table_name(self.collection.name)}
+            CREATE TRIGGER IF NOT EXISTS {trigger_prefix}_insert
+            AFTER INSERT ON {collection_name}
+            BEGIN
+                {delete_new}
+                {insert_new}
+            END
+            """)
+        self.collection.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {trigger_prefix}_update
+            AFTER UPDATE OF data ON {collection_name}
+            WHEN {self._fts_changed_sql(fields)}
+            BEGIN
+                {delete_old}
+                {insert_new}
+            END
+            """)
+        self.collection.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {trigger_prefix}_delete
+            AFTER DELETE ON {collection_name}
             BEGIN
-                DELETE FROM {fts_table_name} WHERE rowid = old.id;
+                {delete_old}
             END
             """)
 
+    def _fts_values_sql(
+        self, fields: list[str], row: str, aliases: list[str] | None = None
+    ) -> str:
+        """
+        SQL for the lowercased text an FTS index stores for each field of
+        the row ``row`` (``new``, ``old`` or a table alias).
+        """
+        json_tree_func = _get_json_tree_function(
+            self.jsonb.jsonb_supported,
+            supports_jsonb_each(self.collection.db),
+        )
+        values = []
+        for field in fields:
+            field_parts = field.split(".")
+            if len(field_parts) == 1:
+                value = f"lower(json_extract({row}.data, '{parse_json_path(field)}'))"
+            else:
+                # Every text value under the field's key within the first
+                # segment, so arrays of subdocuments are all indexed
+                value = (
+                    f"(SELECT group_concat(lower(t.value), ' ') "
+                    f"FROM {json_tree_func}({row}.data, "
+                    f"'{parse_json_path(field_parts[0])}') t "
+                    f"WHERE t.key = '{field_parts[-1]}' AND t.type = 'text')"
+                )
+            values.append(value)
+        if aliases is not None:
+            values = [
+                f"{value} AS {alias}" for value, alias in zip(values, aliases)
+            ]
+        return ", ".join(values)
+
+    def _fts_changed_sql(self, fields: list[str]) -> str:
+        """
+        WHEN condition of an FTS update trigger: some indexed field (for
+        nested fields, its first path segment) differs between old and new.
+        """
+        paths = dict.fromkeys(
+            parse_json_path(field.split(".")[0]) for field in fields
+        )
+        return " OR ".join(
+            f"json_extract(old.data, '{path}') IS NOT "
+            f"json_extract(new.data, '{path}')"
+            for path in paths
+        )
+
     def create_indexes(
         self,
         indexes: list["IndexModel"],
@@ -320,6 +1412,13 @@ class IndexManager:
             sparse: bool = bool(doc.get("sparse", False))
             fts: bool = bool(doc.get("fts", False))
             tokenizer: str | None = doc.get("tokenizer")
+            partial_filter_expression: dict[str, Any] | None = doc.get(
+                "partialFilterExpression"
+            )
+            multikey: bool = bool(doc.get("multikey", False))
+            expire_after_seconds: int | None = doc.get("expireAfterSeconds")
+            fts_content: str | None = doc.get("fts_content")
+            weights: dict[str, float] | None = doc.get("weights")
 
             # Convert key dict to the format expected by create_index
             match key:
@@ -330,8 +1429,13 @@ class IndexManager:
                             field,
                             unique=unique,
                             sparse=sparse,
-                            fts=fts,
+                            fts=fts or key[field] == "text",
                             tokenizer=tokenizer,
+                            partial_filter_expression=partial_filter_expression,
+                            multikey=multikey,
+                            expire_after_seconds=expire_after_seconds,
+                            fts_content=fts_content,
+                            weights=weights,
                         )
                         index_name = field.replace(".", "_")
                     else:
@@ -342,6 +1446,11 @@ class IndexManager:
                             sparse=sparse,
                             fts=fts,
                             tokenizer=tokenizer,
+                            partial_filter_expression=partial_filter_expression,
+                            multikey=multikey,
+                            expire_after_seconds=expire_after_seconds,
+                            fts_content=fts_content,
+                            weights=weights,
                         )
                         index_name = "_".join(key.keys()).replace(".", "_")
                 case str():
@@ -351,6 +1460,11 @@ class IndexManager:
                         sparse=sparse,
                         fts=fts,
                         tokenizer=tokenizer,
+                        partial_filter_expression=partial_filter_expression,
+                        multikey=multikey,
+                        expire_after_seconds=expire_after_seconds,
+                        fts_content=fts_content,
+                        weights=weights,
                     )
                     index_name = key.replace(".", "_")
                 case [str()]:
@@ -360,6 +1474,11 @@ class IndexManager:
                         sparse=sparse,
                         fts=fts,
                         tokenizer=tokenizer,
+                        partial_filter_expression=partial_filter_expression,
+                        multikey=multikey,
+                        expire_after_seconds=expire_after_seconds,
+                        fts_content=fts_content,
+                        weights=weights,
                     )
                     index_name = key[0].replace(".", "_")
                 case list() if isinstance(key[0], tuple):
@@ -369,11 +1488,19 @@ class IndexManager:
                         sparse=sparse,
                         fts=fts,
                         tokenizer=tokenizer,
+                        partial_filter_expression=partial_filter_expression,
+                        multikey=multikey,
+                        expire_after_seconds=expire_after_seconds,
+                        fts_content=fts_content,
+                        weights=weights,
                     )
                     index_name = "_".join(k[0] for k in key).replace(".", "_")
                 case _:
                     raise ValueError(f"Invalid key specification: {key}")
 
+            if expire_after_seconds is not None:
+                # TTL indexes are datetime indexes
+                index_name += "_utc"
             created_indexes.append(
                 f"idx_{quote_table_name(self.collection.name)}_{index_name}"
             )
@@ -480,12 +1607,24 @@ class IndexManager:
             self.collection.db.execute(
                 f"DROP INDEX IF EXISTS idx_{quote_table_name(self.collection.name)}_{index_name}"
             )
+            self._drop_multikey_table(index_name)
+            if index in self.ttl_policies():
+                self.collection.db.execute(
+                    f"DROP INDEX IF EXISTS idx_{quote_table_name(self.collection.name)}_{index_name}_utc"
+                )
+                self.collection.db.execute(
+                    f"DELETE FROM {TTL_TABLE} "
+                    "WHERE collection_name = ? AND field = ?",
+                    (self.collection.name, index),
+                )
         else:
             # For compound indexes
             index_name = "_".join(index).replace(".", "_")
             self.collection.db.execute(
                 f"DROP INDEX IF EXISTS idx_{quote_table_name(self.collection.name)}_{index_name}"
             )
+        self._sync_typed_indexes()
+        self._drop_unused_array_trackers()
 
     def drop_indexes(self):
         """
@@ -498,6 +1637,10 @@ class IndexManager:
         for index in indexes:
             # Extract the actual index name from the full name
             self.collection.db.execute(f"DROP INDEX IF EXISTS {index}")
+        self.drop_multikey_tables()
+        self._sync_typed_indexes()
+        self._drop_unused_array_trackers()
+        delete_ttl_policies(self.collection.db, self.collection.name)
 
     def index_information(self) -> dict[str, Any]:
         """
@@ -514,6 +1657,7 @@ class IndexManager:
         info: dict[str, Any] = {}
 
         try:
+            typed = self._typed_columns()
             # Get all indexes for this collection
             indexes = self.collection.db.execute(
                 "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=?",
@@ -528,6 +1672,15 @@ class IndexManager:
                     == f"idx_{quote_table_name(self.collection.name)}_id"
                 ):
                     continue
+                # Hidden array indexes and typed twins only serve the query
+                # builders
+                if idx_sql and (
+                    _ARRAY_TRACKER.search(idx_sql)
+                    or any(
+                        re.search(rf"\b{column}\b", idx_sql) for column in typed
+                    )
+                ):
+                    continue
 
                 # Parse the index information
                 index_info: dict[str, Any] = {
@@ -540,14 +1693,26 @@ class IndexManager:
                 else:
                     index_info["unique"] = False
 
+                # Sparse and partialFilterExpression, as given
+                options = _INDEX_OPTIONS.search(idx_sql or "")
+                if options:
+                    index_info.update(neosqlite_json_loads(options.group(1)))
+
                 # Try to extract key information from the SQL
                 if idx_sql:
+                    idx_sql = _INDEX_OPTIONS.sub("", idx_sql)
+                    for path, column in self.promoted_columns().items():
+                        idx_sql = re.sub(
+                            rf"\b{column}\b",
+                            f"json_extract(data, '{path}')",
+                            idx_sql,
+                        )
                     # Extract key information from json_extract or jsonb_extract expressions
-                    import re
-
-                    # Look for both json_extract and jsonb_extract
+                    # Look for both json_extract and jsonb_extract, in the
+                    # key list only (not a partial index's WHERE clause)
                     json_extract_matches = re.findall(
-                        r"(?:json|jsonb)_extract\(data, '(\$..*?)'\)", idx_sql
+                        r"(?:json|jsonb)_extract\(data, '(\$..*?)'\)",
+                        idx_sql.partition(" WHERE ")[0],
                     )
                     if json_extract_matches:
                         # Convert SQLite JSON paths back to dot notation
@@ -565,6 +1730,14 @@ class IndexManager:
 
                 info[idx_name] = index_info
 
+            for field, expire_after_seconds in self.ttl_policies().items():
+                ttl_index = (
+                    f"idx_{quote_table_name(self.collection.name)}_"
+                    f"{field.replace('.', '_')}_utc"
+                )
+                if ttl_index in info:
+                    info[ttl_index]["expireAfterSeconds"] = expire_after_seconds
+
         except sqlite3.Error as e:
             logger.debug(
                 f"Failed to get index information for collection '{self.collection.name}': {e}"
@@ -575,8 +1748,10 @@ class IndexManager:
 
     def create_search_index(
         self,
-        key: str,
+        key: str | list[str],
         tokenizer: str | None = None,
+        fts_content: str | None = None,
+        weights: dict[str, float] | None = None,
     ):
         """
         Create a search index on the specified key for text search functionality.
@@ -585,13 +1760,21 @@ class IndexManager:
         It is equivalent to calling create_index(key, fts=True, tokenizer=tokenizer).
 
         Args:
-            key: A string representing the field to index for text search.
+            key: The field, or list of fields, to index for text search.
             tokenizer: Optional tokenizer to use for the FTS index (e.g., 'icu').
+            fts_content: None, "external" or "contentless"; see create_index.
+            weights: Relevance weight of each field; see create_index.
 
         Returns:
             The result of the index creation operation.
         """
-        return self.create_index(key, fts=True, tokenizer=tokenizer)
+        return self.create_index(
+            key,
+            fts=True,
+            tokenizer=tokenizer,
+            fts_content=fts_content,
+            weights=weights,
+        )
 
     def create_search_indexes(
         self,
@@ -695,7 +1878,8 @@ class IndexManager:
         This is a convenience method for dropping FTS5 search indexes.
 
         Args:
-            index (str): The name of the search index to drop (field name).
+            index (str): The name of the search index to drop (field name,
+                or the fields joined by underscores for a multi-field index).
         """
         # For FTS indexes, we need to drop the FTS virtual table and its triggers
         # FTS tables have a specific naming pattern: {collection}_{field}_fts
@@ -717,6 +1901,10 @@ class IndexManager:
         self.collection.db.execute(
             f"DROP TRIGGER IF EXISTS {quote_table_name(self.collection.name)}_{index_name}_fts_delete"
         )
+        # And the content view of an external-content FTS table
+        self.collection.db.execute(
+            f"DROP VIEW IF EXISTS {quote_identifier(f'{self.collection.name}_{index_name}_fts_source')}"
+        )
 
     def _create_datetime_index(self, key: str, unique: bool = False):
         """Create a timezone normalized datetime index.
@@ -18,6 +18,9 @@ class PipelineContext:
         self.stage_index: int = 0
         self.has_root: bool = False
         self.has_computed: bool = False
+        # Generated columns of promoted fields the rows still carry, by JSON
+        # path; only stages that pass the collection's rows through keep them
+        self.promoted_columns: dict[str, str] = {}
 
     def add_computed_field(self, field: str, sql_expr: str) -> None:
         """Track a computed field."""
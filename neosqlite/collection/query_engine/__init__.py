@@ -60,6 +60,10 @@ class QueryEngine(CRUDOperationsMixin, FindOperationsMixin, QueryMethodsMixin):
             "id",
             self.jsonb.jsonb_supported,
             self.jsonb.json_each_function,
+            multikey_tables=collection.indexes.multikey_index_tables,
+            promoted_column=collection.indexes.promoted_column,
+            may_hold_arrays=collection.indexes.may_hold_arrays,
+            pinned_schema=collection.indexes.pinned_schema,
         )
         # Get translation cache size from connection (default: 100, 0 to disable)
         # collection._database is the NeoSQLite Connection, collection.db is sqlite3
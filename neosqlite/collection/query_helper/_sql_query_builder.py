@@ -13,6 +13,12 @@ from typing import TYPE_CHECKING, Any
 from ...sql_utils import quote_table_name
 from ..json_helpers import neosqlite_json_dumps_for_sql
 from ..json_path_utils import parse_json_path
+from ..sql_translator_unified import (
+    _is_multikey_scalar_list,
+    build_membership_clause,
+    build_multikey_clause,
+    is_multikey_condition,
+)
 from ..type_correction import normalize_id_query_for_db
 
 if TYPE_CHECKING:
@@ -22,6 +28,29 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# Operators whose match requires the field to hold a non-null value
+_NON_NULL_OPERATORS = frozenset({"$eq", "$gt", "$gte", "$lt", "$lte"})
+
+
+def _implies_exists(value: Any) -> bool:
+    """Check whether a field condition only matches documents with the field."""
+    if not isinstance(value, dict):
+        return value is not None
+    for op, op_val in value.items():
+        if op in _NON_NULL_OPERATORS and op_val is not None:
+            return True
+        if op == "$exists" and op_val is True:
+            return True
+        if (
+            op == "$in"
+            and isinstance(op_val, (list, tuple))
+            and op_val
+            and None not in op_val
+        ):
+            return True
+    return False
+
+
 class SqlQueryBuilderMixin:
     """Mixin providing SQL WHERE clause building methods.
 
@@ -44,18 +73,29 @@ class SqlQueryBuilderMixin:
         """
         return "$text" in query
 
+    def _text_index_tables(self) -> list[str]:
+        """The FTS5 tables of this collection's text indexes."""
+        cursor = self.collection.db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
+            (f"{quote_table_name(self.collection.name)}_%_fts",),
+        )
+        return [name for (name,) in cursor.fetchall()]
+
     def _build_text_search_query(
         self, query: dict[str, Any]
     ) -> tuple[str, list[Any], list[str]] | None:
         """
         Builds a SQL query for text search using FTS5.
 
+        Conditions next to $text are translated as usual and ANDed with the
+        text match.
+
         Args:
             query: A dictionary representing the text search query with $text operator.
 
         Returns:
             tuple[str, list[Any], list[str]] | None: A tuple containing the SQL WHERE clause,
-                                                      a list of parameters, and an empty list of
+                                                      a list of parameters, and a list of
                                                       tables to clean up, or None.
         """
         if "$text" not in query:
@@ -70,11 +110,7 @@ class SqlQueryBuilderMixin:
             return None
 
         # Find FTS tables for this collection
-        cursor = self.collection.db.execute(
-            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?",
-            (f"{quote_table_name(self.collection.name)}_%_fts",),
-        )
-        fts_tables = cursor.fetchall()
+        fts_tables = self._text_index_tables()
 
         if not fts_tables:
             return None
@@ -83,26 +119,84 @@ class SqlQueryBuilderMixin:
         subqueries = []
         params = []
 
-        for (fts_table_name,) in fts_tables:
-            # Extract field name from FTS table name (collection_field_fts -> field)
-            index_name = fts_table_name[
-                len(f"{quote_table_name(self.collection.name)}_") : -4
-            ]  # Remove collection_ prefix and _fts suffix
-
-            # Add subquery for this FTS table
+        for fts_table_name in fts_tables:
+            # Matching the table searches every field of a multi-field index
             subqueries.append(
-                f"SELECT rowid FROM {fts_table_name} WHERE {index_name} MATCH ?"
+                f"SELECT rowid FROM {fts_table_name} WHERE {fts_table_name} MATCH ?"
             )
             params.append(search_term.lower())
 
         # Combine all subqueries with UNION to get documents matching in ANY FTS index
         union_query = " UNION ".join(subqueries)
 
+        rest = {key: value for key, value in query.items() if key != "$text"}
+        tables: list[str] = []
+        condition = ""
+        if rest:
+            rest_result = self._build_simple_where_clause(rest)
+            if rest_result is None:
+                return None
+            rest_where, rest_params, tables = rest_result
+            condition = f" AND ({rest_where.strip().removeprefix('WHERE ')})"
+            params.extend(rest_params)
+
         # Build the FTS query
         where_clause = f"""
-        WHERE id IN ({union_query})
+        WHERE id IN ({union_query}){condition}
         """
-        return where_clause, params, []
+        return where_clause, params, tables
+
+    def _build_text_ranking(
+        self, text_query: Any, limit: int | None = None
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Builds a subquery scoring the documents a $text query matches.
+
+        The subquery yields ``text_id`` (the document row) and
+        ``text_score``: the negated FTS5 ``rank``, which is bm25() with the
+        weights of the text index, so higher scores are better matches as
+        in MongoDB's textScore. A document matching several text indexes
+        scores the sum of its scores.
+
+        Args:
+            text_query: The value of the $text operator.
+            limit: Keep only this many best matches. With one text index
+                this is FTS5's ``ORDER BY rank LIMIT`` top-k search.
+
+        Returns:
+            tuple[str, list[Any]] | None: The subquery and its parameters,
+                or None if the collection has no text index.
+        """
+        if not isinstance(text_query, dict) or not isinstance(
+            text_query.get("$search"), str
+        ):
+            return None
+        fts_tables = self._text_index_tables()
+        if not fts_tables:
+            return None
+        search_term = text_query["$search"].lower()
+        limit_clause = f" LIMIT {limit}" if limit is not None else ""
+        if len(fts_tables) == 1:
+            fts_table_name = fts_tables[0]
+            order_clause = " ORDER BY rank" if limit is not None else ""
+            return (
+                f"SELECT rowid AS text_id, -rank AS text_score "
+                f"FROM {fts_table_name} WHERE {fts_table_name} MATCH ?"
+                f"{order_clause}{limit_clause}",
+                [search_term],
+            )
+        union_query = " UNION ALL ".join(
+            f"SELECT rowid AS text_id, -rank AS text_score "
+            f"FROM {fts_table_name} WHERE {fts_table_name} MATCH ?"
+            for fts_table_name in fts_tables
+        )
+        order_clause = " ORDER BY text_score DESC" if limit is not None else ""
+        return (
+            f"SELECT text_id, SUM(text_score) AS text_score "
+            f"FROM ({union_query}) GROUP BY text_id"
+            f"{order_clause}{limit_clause}",
+            [search_term] * len(fts_tables),
+        )
 
     def _id_column_ref(self) -> str:
         """Return the quoted SQL column reference that stores the logical _id.
@@ -221,9 +315,16 @@ class SqlQueryBuilderMixin:
             else:
                 return f"{id_col} = ?", [value]
         else:
+            multikey_result = self._build_multikey_clause(field, value)
+            if multikey_result is not None:
+                return multikey_result
+
             # Handle regular fields with json_extract/jsonb_extract
             # Use the correct function based on JSONB support
             json_path = f"'{parse_json_path(field)}'"
+            extract_expr = (
+                f"{self.jsonb.json_function_prefix}_extract(data, {json_path})"
+            )
 
             if isinstance(value, dict):
                 # Handle operators like $eq, $gt, etc.
@@ -234,14 +335,95 @@ class SqlQueryBuilderMixin:
                 )
                 if clause is None:
                     return None
-                return f"{clause}", params
             else:
                 # Simple equality
                 if isinstance(value, re.Pattern):
                     return None  # Fall back to Python for regex objects
 
-                extract_expr = f"{self.jsonb.json_function_prefix}_extract(data, {json_path})"
-                return f"{extract_expr} = ?", [value]
+                clause, params = self._build_membership_clause(
+                    json_path, [value]
+                ) or (f"{extract_expr} = ?", [value])
+
+            column = self._promoted_column_ref(field, value)
+            if column is not None:
+                clause = clause.replace(extract_expr, column)
+            return clause, params
+
+    def _promoted_column_ref(
+        self, field: str, condition: Any = None
+    ) -> str | None:
+        """
+        The generated column of a promoted field, qualified with the table.
+
+        Args:
+            field: The field name
+            condition: The field's value or operator dict in the query, or
+                None for a sort
+
+        Returns:
+            The column reference, or None if the field is not promoted or
+            its column cannot answer the condition
+        """
+        column = self.collection.indexes.promoted_column(
+            parse_json_path(field), condition
+        )
+        if column is None:
+            return None
+        return f"{quote_table_name(self.collection.name)}.{column}"
+
+    def _build_membership_clause(
+        self, json_path: str, values: list[Any], negate: bool = False
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Build equality, $in or their negation with array membership.
+
+        Args:
+            json_path: The field's quoted JSON path
+            values: The value of an equality, or the values of $in
+            negate: Build the $ne / $nin condition instead
+
+        Returns:
+            Tuple of (SQL clause, parameters), or None if a value is not a
+            string or number
+        """
+        if not _is_multikey_scalar_list(values):
+            return None
+        path = json_path.strip("'")
+        return build_membership_clause(
+            f"{self.jsonb.json_function_prefix}_extract(data, {json_path})",
+            path,
+            values,
+            json_each_function=self.jsonb.json_each_function,
+            may_hold_arrays=self.collection.indexes.may_hold_arrays(path),
+            negate=negate,
+        )
+
+    def _build_multikey_clause(
+        self, field: str, value: Any
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Build a WHERE clause answered by a multikey index's side table.
+
+        Args:
+            field: Field name
+            value: Field value or operator dict
+
+        Returns:
+            Tuple of (SQL clause, parameters), or None if the field has no
+            multikey index or the condition needs the regular translation
+        """
+        if not is_multikey_condition(value):
+            return None
+        json_path = parse_json_path(field)
+        table = self.collection.indexes.multikey_index_tables().get(json_path)
+        if table is None:
+            return None
+        return build_multikey_clause(
+            f"{quote_table_name(self.collection.name)}.id",
+            table,
+            json_path,
+            value,
+        )
 
     def _build_simple_where_clause(
         self,
@@ -266,6 +448,15 @@ class SqlQueryBuilderMixin:
                                                       a list of parameters, and a list of
                                                       temporary tables to clean up, or None.
         """
+        # The index lookups of every field share one schema check
+        with self.collection.indexes.pinned_schema():
+            return self._build_pinned_where_clause(query)
+
+    def _build_pinned_where_clause(
+        self,
+        query: dict[str, Any],
+    ) -> tuple[str, list[Any], list[str]] | None:
+        """Build the WHERE clause of :meth:`_build_simple_where_clause`."""
         # Apply type correction to handle cases where users query 'id' with ObjectId
         # or other common type mismatches
         query = normalize_id_query_for_db(query)
@@ -308,6 +499,7 @@ class SqlQueryBuilderMixin:
 
         clauses: list[str] = []
         params: list[Any] = []
+        sparse_paths: frozenset[str] | None = None
 
         for field, value in query.items():
             # Handle logical operators by falling back to Python processing
@@ -362,6 +554,18 @@ class SqlQueryBuilderMixin:
                 if field_clause:  # Only add non-empty clauses
                     clauses.append(field_clause)
                     params.extend(field_params)
+                    if sparse_paths is None:
+                        sparse_paths = (
+                            self.collection.indexes.sparse_index_paths()
+                        )
+                    if sparse_paths and _implies_exists(value):
+                        path = parse_json_path(field)
+                        if path in sparse_paths:
+                            # Lets SQLite prove a sparse index covers the
+                            # matching rows
+                            clauses.append(
+                                f"json_type(data, '{path}') IS NOT NULL"
+                            )
 
         if clauses:
             return "WHERE " + " AND ".join(clauses), params, []
@@ -396,11 +600,17 @@ class SqlQueryBuilderMixin:
                 collate_clause = " COLLATE NOCASE"
 
         for field, direction in sort.items():
+            if isinstance(direction, dict):
+                # {"$meta": "textScore"} orders by the text ranking, which
+                # the cursor joins in; without one every score is 0
+                continue
             if field == "_id":
                 order_field = f"{quote_table_name(self.collection.name)}._id"
             else:
                 json_path = f"'{parse_json_path(field)}'"
-                order_field = f"{self.jsonb.json_function_prefix}_extract(data, {json_path})"
+                order_field = self._promoted_column_ref(field) or (
+                    f"{self.jsonb.json_function_prefix}_extract(data, {json_path})"
+                )
 
             order_dir = "ASC" if direction == 1 else "DESC"
             clauses.append(f"{order_field}{collate_clause} {order_dir}")
@@ -480,7 +690,15 @@ class SqlQueryBuilderMixin:
                     # Array values need Python for correct semantics
                     if isinstance(op_val, (list, tuple)):
                         return None, []
-                    if is_datetime_indexed:
+                    membership = None
+                    if json_path != "value" and not is_datetime_indexed:
+                        membership = self._build_membership_clause(
+                            json_path, [op_val]
+                        )
+                    if membership is not None:
+                        clauses.append(membership[0])
+                        params.extend(membership[1])
+                    elif is_datetime_indexed:
                         clauses.append(
                             f"{self.jsonb.json_function_prefix}_extract(data, {json_path}) = datetime(?)"
                         )
@@ -548,7 +766,15 @@ class SqlQueryBuilderMixin:
                     # Array values need Python for correct semantics
                     if isinstance(op_val, (list, tuple)):
                         return None, []
-                    if is_datetime_indexed:
+                    membership = None
+                    if json_path != "value" and not is_datetime_indexed:
+                        membership = self._build_membership_clause(
+                            json_path, [op_val], negate=True
+                        )
+                    if membership is not None:
+                        clauses.append(membership[0])
+                        params.extend(membership[1])
+                    elif is_datetime_indexed:
                         clauses.append(
                             f"{self.jsonb.json_function_prefix}_extract(data, {json_path}) != datetime(?)"
                         )
@@ -560,7 +786,17 @@ class SqlQueryBuilderMixin:
                         params.append(op_val)
                 case "$in":
                     json_each_func = self.jsonb.json_each_function
-                    if isinstance(op_val, (list, tuple)):
+                    membership = None
+                    if json_path != "value" and isinstance(
+                        op_val, (list, tuple)
+                    ):
+                        membership = self._build_membership_clause(
+                            json_path, list(op_val)
+                        )
+                    if membership is not None:
+                        clauses.append(membership[0])
+                        params.extend(membership[1])
+                    elif isinstance(op_val, (list, tuple)):
                         placeholders = ", ".join("?" for _ in op_val)
                         if json_path == "value":
                             clauses.append(f"value IN ({placeholders})")
@@ -573,7 +809,17 @@ class SqlQueryBuilderMixin:
                         return None, []
                 case "$nin":
                     json_each_func = self.jsonb.json_each_function
-                    if isinstance(op_val, (list, tuple)):
+                    membership = None
+                    if json_path != "value" and isinstance(
+                        op_val, (list, tuple)
+                    ):
+                        membership = self._build_membership_clause(
+                            json_path, list(op_val), negate=True
+                        )
+                    if membership is not None:
+                        clauses.append(membership[0])
+                        params.extend(membership[1])
+                    elif isinstance(op_val, (list, tuple)):
                         placeholders = ", ".join("?" for _ in op_val)
                         if json_path == "value":
                             clauses.append(f"value NOT IN ({placeholders})")
@@ -42,8 +42,6 @@ class CRUDOperationsMixin:
             ValueError: If the document contains invalid JSON
             sqlite3.Error: If database operations fail
         """
-        from copy import deepcopy
-
         from ...exceptions import MalformedDocument
         from ..json_helpers import neosqlite_json_dumps
         from .utils import _convert_bytes_to_binary
@@ -53,15 +51,14 @@ class CRUDOperationsMixin:
                 f"document must be a dictionary, not a {type(document)}"
             )
 
-        doc_to_insert = deepcopy(document)
+        # Converting bytes to Binary rebuilds every dict and list, so the
+        # result is already a copy the caller's document is safe from
+        doc_to_insert = _convert_bytes_to_binary(document)
         original_has_id = "_id" in doc_to_insert
         doc_to_insert.pop(
             "_id", None
         )  # Remove _id from doc_to_insert to avoid duplication
 
-        # Convert any bytes objects to Binary objects for proper JSON serialization
-        doc_to_insert = _convert_bytes_to_binary(doc_to_insert)
-
         # Serialize to JSON string
         json_str = neosqlite_json_dumps(doc_to_insert)
 
@@ -11,7 +11,7 @@ from typing import TYPE_CHECKING, Any
 
 from ... import query_operators
 from ...exceptions import MalformedQueryException
-from ...sql_utils import quote_table_name
+from ...sql_utils import quote_identifier, quote_table_name
 from ..expr_evaluator import ExprEvaluator
 from ..text_search import unified_text_search
 from ._sql_query_builder import SqlQueryBuilderMixin
@@ -141,14 +141,15 @@ class QueryBuilderMixin(SqlQueryBuilderMixin):
 
                             # Check each FTS-indexed field for matches
                             if fts_tables:
-                                for fts_table in fts_tables:
-                                    fts_table_name = fts_table[0]
-                                    index_name = fts_table_name[
-                                        len(
-                                            f"{quote_table_name(self.collection.name)}_"
-                                        ) : -4
-                                    ]
-                                    field_name = index_name.replace("_", ".")
+                                # Each column of an FTS table is one field
+                                field_names = [
+                                    column[1].replace("_", ".")
+                                    for (fts_table_name,) in fts_tables
+                                    for column in self.collection.db.execute(
+                                        f"PRAGMA table_info({quote_identifier(fts_table_name)})"
+                                    )
+                                ]
+                                for field_name in field_names:
                                     try:
                                         field_value = self.collection._get_val(
                                             document, field_name
@@ -248,7 +249,11 @@ class QueryBuilderMixin(SqlQueryBuilderMixin):
                                 str(doc_value)
                             ):
                                 matches.append(False)
-                        elif value != doc_value:
+                        elif value != doc_value and not (
+                            # An array matches a value equal to an element
+                            isinstance(doc_value, list)
+                            and value in doc_value
+                        ):
                             matches.append(False)
         return all(matches)
 
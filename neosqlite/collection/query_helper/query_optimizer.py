@@ -8,10 +8,18 @@ index analysis, and pipeline optimization.
 from typing import TYPE_CHECKING, Any
 
 from ...sql_utils import quote_table_name
+from ..statistics import (
+    DEFAULT_GROUP_SELECTIVITY,
+    DEFAULT_MATCH_SELECTIVITY,
+    DEFAULT_UNWIND_FACTOR,
+)
 
 if TYPE_CHECKING:
     from .. import Collection
 
+# Stages after which documents still have the stored documents' fields
+_DOCUMENT_STAGES = frozenset({"$match", "$sort", "$skip", "$limit", "$unwind"})
+
 
 class QueryOptimizerMixin:
     """
@@ -57,11 +65,42 @@ class QueryOptimizerMixin:
 
         return indexed_fields
 
+    def _match_selectivity(self, query: dict[str, Any]) -> float:
+        """Estimated fraction of the documents a $match keeps."""
+        selectivity = self.collection.statistics.selectivity(query)
+        return DEFAULT_MATCH_SELECTIVITY if selectivity is None else selectivity
+
+    def _unwind_factor(self, spec: Any) -> float | None:
+        """Estimated documents an $unwind outputs per input document."""
+        path = spec.get("path") if isinstance(spec, dict) else spec
+        if not isinstance(path, str) or not path.startswith("$"):
+            return None
+        return self.collection.statistics.unwind_factor(path[1:])
+
+    def _group_selectivity(self, spec: dict[str, Any]) -> float | None:
+        """Estimated ratio of groups to input documents of a $group."""
+        key = spec.get("_id")
+        statistics = self.collection.statistics
+        count = statistics.document_count()
+        if not count:
+            return None
+        if key is None:
+            return 1 / count
+        if not isinstance(key, str) or not key.startswith("$"):
+            return None
+        distinct = statistics.distinct_count(key[1:])
+        if distinct is None:
+            return None
+        # Documents without the field form one more group
+        return min((distinct + 1) / count, 1.0)
+
     def _estimate_result_size(self, pipeline: list[dict[str, Any]]) -> int:
         """
         Estimate the size of the aggregation result in bytes.
 
-        This method analyzes the pipeline to estimate the size of the result set.
+        This method analyzes the pipeline to estimate the size of the result set,
+        from the collection's statistics while the stages still see its
+        documents' fields.
 
         Args:
             pipeline: The aggregation pipeline to analyze
@@ -70,19 +109,25 @@ class QueryOptimizerMixin:
             Estimated size in bytes
         """
         # Get the base collection size
-        base_count = self.collection.estimated_document_count()
+        statistics = self.collection.statistics
+        base_count = statistics.document_count()
 
         # Apply pipeline stages to estimate result size
         estimated_count = base_count
-        estimated_avg_doc_size = 1024  # Default estimate of 1KB per document
+        estimated_avg_doc_size = int(statistics.average_document_size())
+        on_documents = True
 
         for stage in pipeline:
             stage_name = next(iter(stage.keys()))
             match stage_name:
                 case "$match":
                     # Matches typically reduce the result set
-                    # For now, we'll use a rough estimate
-                    estimated_count = max(1, int(estimated_count * 0.5))
+                    selectivity = (
+                        self._match_selectivity(stage["$match"])
+                        if on_documents
+                        else DEFAULT_MATCH_SELECTIVITY
+                    )
+                    estimated_count = max(1, int(estimated_count * selectivity))
                 case "$limit":
                     limit_count = stage["$limit"]
                     estimated_count = min(estimated_count, limit_count)
@@ -90,18 +135,31 @@ class QueryOptimizerMixin:
                     skip_count = stage["$skip"]
                     estimated_count = max(0, estimated_count - skip_count)
                 case "$unwind":
-                    # Unwind operations can multiply the result set
-                    # This is a very rough estimate
-                    estimated_count = (
-                        estimated_count * 3
-                    )  # Assume 3 elements per array on average
+                    # Unwind operations multiply the result set by the
+                    # average array length
+                    factor = (
+                        self._unwind_factor(stage["$unwind"])
+                        if on_documents
+                        else None
+                    )
+                    if factor is None:
+                        factor = DEFAULT_UNWIND_FACTOR
+                    estimated_count = int(estimated_count * factor)
                 case "$group":
-                    # Group operations typically reduce the result set
-                    # This is a very rough estimate
-                    estimated_count = max(1, int(estimated_count * 0.1))
+                    # Group operations reduce the result set to one
+                    # document per distinct key
+                    group = (
+                        self._group_selectivity(stage["$group"])
+                        if on_documents
+                        else None
+                    )
+                    if group is None:
+                        group = DEFAULT_GROUP_SELECTIVITY
+                    estimated_count = max(1, int(estimated_count * group))
                 case _:
                     # For other operations, we'll assume they don't significantly change the size
                     pass
+            on_documents = on_documents and stage_name in _DOCUMENT_STAGES
 
         # Apply some limits to prevent extreme estimates
         estimated_count = min(
@@ -115,7 +173,9 @@ class QueryOptimizerMixin:
         """
         Estimate the cost of executing a query based on index availability.
 
-        Lower cost values indicate more efficient queries.
+        Lower cost values indicate more efficient queries. An indexed field
+        costs the fraction of documents its condition matches, where the
+        collection's statistics can tell.
 
         Args:
             query (dict[str, Any]): A dictionary representing the query criteria.
@@ -143,8 +203,15 @@ class QueryOptimizerMixin:
                 # _id field is always indexed (it's a column)
                 cost *= 0.1  # Very low cost for _id queries
             elif field in indexed_fields:
-                # Field is indexed, reduce cost
-                cost *= 0.3  # Lower cost when using an index
+                # Field is indexed, so only the matching entries are read
+                selectivity = self.collection.statistics.clause_selectivity(
+                    field, value
+                )
+                if selectivity is None:
+                    cost *= 0.3  # Lower cost when using an index
+                else:
+                    count = self.collection.statistics.document_count()
+                    cost *= max(selectivity, 1 / max(count, 1))
             else:
                 # Field is not indexed, increase cost
                 cost *= 1.0  # No change for non-indexed fields
@@ -169,6 +236,8 @@ class QueryOptimizerMixin:
             1.0  # Represents how much data flows through each stage
         )
 
+        on_documents = True
+
         for i, stage in enumerate(pipeline):
             stage_name = next(iter(stage.keys()))
             stage_cost = 0.0
@@ -184,8 +253,11 @@ class QueryOptimizerMixin:
                     stage_cost *= cumulative_multiplier
 
                     # Update data flow multiplier based on selectivity
-                    # Assume matches reduce data by 50% on average
-                    cumulative_multiplier *= 0.5
+                    cumulative_multiplier *= (
+                        self._match_selectivity(query)
+                        if on_documents
+                        else DEFAULT_MATCH_SELECTIVITY
+                    )
 
                 case "$sort":
                     # Sort operations have moderate cost, weighted by data volume
@@ -206,17 +278,30 @@ class QueryOptimizerMixin:
                     # Group operations have high cost (require processing all data)
                     stage_cost = 5.0 * cumulative_multiplier
 
-                    # Groups typically reduce data significantly
+                    # Groups reduce data to one document per distinct key
+                    group = (
+                        self._group_selectivity(stage["$group"])
+                        if on_documents
+                        else None
+                    )
                     cumulative_multiplier *= (
                         0.2  # Assume groups reduce data by 80%
+                        if group is None
+                        else group
                     )
 
                 case "$unwind":
                     # Unwind operations multiply the data size, increasing cost and data flow
                     stage_cost = 2.0 * cumulative_multiplier
 
-                    # Unwinds increase data volume (assume 5x increase on average)
-                    cumulative_multiplier *= 5.0
+                    # Unwinds increase data volume by the average array
+                    # length (assume 5x where unknown)
+                    factor = (
+                        self._unwind_factor(stage["$unwind"])
+                        if on_documents
+                        else None
+                    )
+                    cumulative_multiplier *= 5.0 if factor is None else factor
 
                 case "$lookup":
                     # Lookup operations have high cost (joins)
@@ -233,6 +318,7 @@ class QueryOptimizerMixin:
                     # cumulative_multiplier stays the same
 
             total_cost += stage_cost
+            on_documents = on_documents and stage_name in _DOCUMENT_STAGES
 
         return total_cost
 
@@ -285,8 +371,11 @@ class QueryOptimizerMixin:
         )
 
         if match_stages and has_expensive_ops:
-            # Move matches to the front to filter early
-            match_stage_items = [stage for _, stage in match_stages]
+            # Move matches to the front to filter early, most selective first
+            match_stage_items = sorted(
+                (stage for _, stage in match_stages),
+                key=lambda stage: self._match_selectivity(stage["$match"]),
+            )
             other_stage_items = [stage for _, stage in other_stages]
             return match_stage_items + other_stage_items
 
@@ -322,7 +411,8 @@ class QueryOptimizerMixin:
         Reorder pipeline stages to optimize performance based on index availability.
 
         Moves $match stages with indexed fields to the beginning of the pipeline
-        to take advantage of index-based filtering.
+        to take advantage of index-based filtering, the one estimated to keep
+        the fewest documents first.
 
         Args:
             pipeline (list[dict[str, Any]]): The original pipeline stages.
@@ -379,4 +469,7 @@ class QueryOptimizerMixin:
                 other_stages.append(stage)
 
         # Return reordered pipeline: indexed matches first, then other stages
+        indexed_matches.sort(
+            key=lambda stage: self._match_selectivity(stage["$match"])
+        )
         return indexed_matches + other_stages
@@ -14,10 +14,11 @@ from typing import Any, cast
 
 from .._sqlite import sqlite3
 from ..sql_utils import quote_table_name
-from ._stage_builders import StageBuildersMixin
+from ._stage_builders import ROW_FILTER_STAGES, StageBuildersMixin
 from .expr_evaluator import (
     ExprEvaluator,
 )
+from .json_path_utils import parse_json_path
 from .jsonb_support import JSONBContext
 from .pipeline_context import PipelineContext
 from .query_helper.translation_cache import TranslationCache
@@ -165,11 +166,43 @@ class SQLTierAggregator(StageBuildersMixin):
         self, pipeline: list[dict[str, Any]]
     ) -> tuple[str | None, list[Any]]:
         """Build optimized SQL query for entire pipeline using CTEs."""
+        # The index lookups of every stage share one schema check
+        with self.collection.indexes.pinned_schema():
+            return self._build_pinned_pipeline_sql(pipeline)
+
+    def _build_pinned_pipeline_sql(
+        self, pipeline: list[dict[str, Any]]
+    ) -> tuple[str | None, list[Any]]:
+        """Build the query of :meth:`build_pipeline_sql`."""
         if not pipeline or not self.can_optimize_pipeline(pipeline):
             return None, []
 
         # Try to get from cache
         cache_key = self._translation_cache.make_key(pipeline)
+        multikey_tables = self.collection.indexes.multikey_index_tables()
+        if multikey_tables:
+            # $match may be answered from multikey side tables
+            cache_key += f"|multikey:{sorted(multikey_tables)}"
+        promoted_columns = self.collection.indexes.promoted_columns()
+        if promoted_columns:
+            # Leading stages reference promoted fields' generated columns,
+            # those with an affinity only for operands of its type
+            served = sorted(
+                field
+                for stage in pipeline
+                if isinstance(stage.get("$match"), dict)
+                for field, condition in stage["$match"].items()
+                if self.collection.indexes.promoted_column(
+                    parse_json_path(field), condition
+                )
+            )
+            cache_key += (
+                f"|promoted:{sorted(promoted_columns.items())}:{served}"
+            )
+        scalar_paths = self.collection.indexes.paths_without_arrays()
+        if scalar_paths:
+            # Equality on fields holding no arrays skips matching elements
+            cache_key += f"|scalar:{sorted(scalar_paths)}"
         cached = self._translation_cache.get(cache_key)
 
         if cached is not None:
@@ -198,8 +231,14 @@ class SQLTierAggregator(StageBuildersMixin):
         """Build SQL template and return (template, params)."""
         cte_parts: list[str] = []
         all_params: list[Any] = []
-        prev_stage = f"(SELECT id, _id, data FROM {quote_table_name(self.collection.name)})"
         context = PipelineContext()
+        context.promoted_columns = dict(
+            self.collection.indexes.promoted_columns()
+        )
+        promoted = "".join(
+            f", {column}" for column in context.promoted_columns.values()
+        )
+        prev_stage = f"(SELECT id, _id, data{promoted} FROM {quote_table_name(self.collection.name)})"
 
         needs_root = self._pipeline_needs_root(pipeline)
         if needs_root:
@@ -225,6 +264,8 @@ class SQLTierAggregator(StageBuildersMixin):
             cte_parts.append(f"{cte_name} AS ({stage_sql})")
             all_params.extend(stage_params)
             prev_stage = cte_name
+            if stage_name not in ROW_FILTER_STAGES:
+                context.promoted_columns = {}
 
         with_keyword = (
             "WITH RECURSIVE"
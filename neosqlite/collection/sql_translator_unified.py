@@ -7,11 +7,13 @@ temporary table generation.
 """
 
 import logging
-from typing import Any
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
 from ..query_operators import _convert_to_bitmask
+from ..sql_utils import quote_table_name
 from .cursor import DESCENDING
 from .json_path_utils import parse_json_path
 from .jsonb_support import (
@@ -39,6 +41,187 @@ def _text_search_fallback() -> tuple[None, list[Any]]:
     return None, []
 
 
+# Operators a multikey side table can answer for one array element
+_MULTIKEY_ELEMENT_OPERATORS = {
+    "$eq": "=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+}
+
+
+def _is_multikey_scalar(value: Any) -> bool:
+    """Check whether a value is of a type stored in multikey side tables."""
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def _is_multikey_scalar_list(value: Any) -> bool:
+    return (
+        isinstance(value, (list, tuple))
+        and bool(value)
+        and all(_is_multikey_scalar(v) for v in value)
+    )
+
+
+def is_multikey_condition(value: Any) -> bool:
+    """
+    Cheap check for a field condition a multikey index might answer.
+
+    Lets translators skip looking up the collection's multikey indexes for
+    conditions that could never use them.
+    """
+    if isinstance(value, dict):
+        return bool(value) and all(
+            op in ("$eq", "$in", "$all", "$elemMatch") for op in value
+        )
+    return _is_multikey_scalar(value)
+
+
+def build_membership_clause(
+    extract: str,
+    json_path: str,
+    values: list[Any],
+    data_column: str = "data",
+    json_each_function: str = "json_each",
+    may_hold_arrays: bool = True,
+    negate: bool = False,
+    bind_once: bool = False,
+) -> tuple[str, list[Any]] | None:
+    """
+    Translate equality with scalar values into MongoDB array membership.
+
+    A document matches if the field equals one of the values or is an array
+    with an element equal to one of them, the elements a multikey index's
+    side table stores, so results are the same with or without the index.
+    The negation ($ne, $nin) also matches documents without the field.
+
+    Args:
+        extract: SQL expression extracting the field (or its promoted column)
+        json_path: The field's JSON path
+        values: The value of an equality, or the values of $in
+        data_column: The column holding the documents
+        json_each_function: The json_each function to use
+        may_hold_arrays: False if the field is known to hold no arrays,
+            leaving the plain comparison an index can answer
+        negate: Build the $ne / $nin condition instead
+        bind_once: Bind each value once, looking the field up with
+            json_each() only; the field's index is then not used
+
+    Returns:
+        Tuple of (SQL clause, parameters), or None if a value is not a
+        string or number
+    """
+    if not values or not all(_is_multikey_scalar(v) for v in values):
+        return None
+    placeholders = ", ".join("?" for _ in values)
+    clause = (
+        f"{extract} = ?"
+        if len(values) == 1
+        else f"{extract} IN ({placeholders})"
+    )
+    params = list(values)
+    if may_hold_arrays and bind_once:
+        # json_each() yields a scalar field itself, with a NULL key
+        clause = (
+            f"EXISTS (SELECT 1 FROM {json_each_function}({data_column}, "
+            f"'{json_path}') WHERE typeof(key) != 'text' "
+            f"AND type IN ('integer', 'real', 'text') "
+            f"AND value IN ({placeholders}))"
+        )
+    elif may_hold_arrays:
+        clause = (
+            f"({clause} OR (json_type({data_column}, '{json_path}') = 'array' "
+            f"AND EXISTS (SELECT 1 FROM {json_each_function}({data_column}, "
+            f"'{json_path}') WHERE type IN ('integer', 'real', 'text') "
+            f"AND value IN ({placeholders}))))"
+        )
+        params.extend(values)
+    if negate:
+        # A missing field compares as NULL, and does not equal the value
+        clause = f"NOT COALESCE({clause}, 0)"
+    return clause, params
+
+
+def build_multikey_clause(
+    id_ref: str, table: str, json_path: str, value: Any
+) -> tuple[str, list[Any]] | None:
+    """
+    Translate a field condition into lookups on a multikey side table.
+
+    Equality, $in and $all on scalar values, and $elemMatch with comparison
+    operators on scalar elements, become ``id IN (SELECT id FROM <table> ...)``
+    probes of the side table's (value, id) primary key instead of a
+    json_each() scan of every document. Equality also matches arrays that
+    contain the value, as in MongoDB.
+
+    Args:
+        id_ref: SQL reference to the collection's integer id column
+        table: The multikey side table of the field
+        json_path: The field's JSON path
+        value: Field value or operator dict
+
+    Returns:
+        Tuple of (SQL clause, parameters), or None if the condition needs
+        the regular translation
+    """
+
+    def lookup(condition: str) -> str:
+        return f"{id_ref} IN (SELECT id FROM {table} WHERE {condition})"
+
+    if not isinstance(value, dict):
+        if not _is_multikey_scalar(value):
+            return None
+        return lookup("value = ?"), [value]
+
+    clauses: list[str] = []
+    params: list[Any] = []
+    for op, op_val in value.items():
+        match op:
+            case "$eq" if _is_multikey_scalar(op_val):
+                clauses.append(lookup("value = ?"))
+                params.append(op_val)
+            case "$in" if _is_multikey_scalar_list(op_val):
+                placeholders = ", ".join("?" for _ in op_val)
+                clauses.append(lookup(f"value IN ({placeholders})"))
+                params.extend(op_val)
+            case "$all" if _is_multikey_scalar_list(op_val):
+                for v in op_val:
+                    clauses.append(lookup("value = ?"))
+                    params.append(v)
+            case "$elemMatch" if isinstance(op_val, dict) and op_val:
+                element_clauses: list[str] = []
+                for element_op, operand in op_val.items():
+                    if element_op == "$in" and _is_multikey_scalar_list(
+                        operand
+                    ):
+                        placeholders = ", ".join("?" for _ in operand)
+                        element_clauses.append(f"value IN ({placeholders})")
+                        params.extend(operand)
+                        continue
+                    if element_op not in _MULTIKEY_ELEMENT_OPERATORS or (
+                        not _is_multikey_scalar(operand)
+                    ):
+                        return None
+                    sql_op = _MULTIKEY_ELEMENT_OPERATORS[element_op]
+                    element_clauses.append(f"value {sql_op} ?")
+                    params.append(operand)
+                    if element_op != "$eq":
+                        # Range bounds only compare within one type
+                        element_clauses.append(
+                            "typeof(value) = 'text'"
+                            if isinstance(operand, str)
+                            else "typeof(value) IN ('integer', 'real')"
+                        )
+                clauses.append(
+                    f"json_type(data, '{json_path}') = 'array' AND "
+                    f"{lookup(' AND '.join(element_clauses))}"
+                )
+            case _:
+                return None
+    return " AND ".join(clauses), params
+
+
 class SQLFieldAccessor:
     """
     Handles field access patterns for different contexts.
@@ -422,6 +605,10 @@ class SQLClauseBuilder:
         field_accessor: SQLFieldAccessor | None = None,
         operator_translator: SQLOperatorTranslator | None = None,
         json_each_function: str | None = None,
+        table_name: str | None = None,
+        multikey_tables: Callable[[], dict[str, str]] | None = None,
+        promoted_column: Callable[[str, Any], str | None] | None = None,
+        may_hold_arrays: Callable[[str], bool] | None = None,
     ):
         """
         Initialize the SQLClauseBuilder with optional field accessor and operator translator.
@@ -434,8 +621,24 @@ class SQLClauseBuilder:
             json_each_function: The json_each function to use ('jsonb_each' or 'json_each').
                                If provided and operator_translator is None, a new SQLOperatorTranslator
                                will be created with this function.
+            table_name: The collection table queried in the "direct" context.
+            multikey_tables: Returns the collection's multikey side tables by
+                             JSON path; conditions on those fields are
+                             answered from the side tables.
+            promoted_column: Returns the generated column of a promoted
+                             field by JSON path, if it can answer the
+                             field's condition; the condition then uses
+                             the column.
+            may_hold_arrays: Tells whether a JSON path of the collection
+                             may hold arrays. Given it, equality, $ne, $in
+                             and $nin match array elements as in MongoDB,
+                             skipping the lookup for fields holding none.
         """
         self.field_accessor = field_accessor or SQLFieldAccessor()
+        self.table_name = table_name
+        self.multikey_tables = multikey_tables
+        self.promoted_column = promoted_column
+        self.may_hold_arrays = may_hold_arrays
         if operator_translator is not None:
             self.operator_translator = operator_translator
         elif json_each_function is not None:
@@ -592,15 +795,30 @@ class SQLClauseBuilder:
                 else:
                     return _empty_result()  # Invalid format for $not
             else:
+                multikey = self._build_multikey_condition(field, value, context)
+                if multikey is not None:
+                    clauses.append(multikey[0])
+                    params.extend(multikey[1])
+                    continue
+
                 # Regular field condition
                 # Get field access expression
-                field_access = self.field_accessor.get_field_access(
+                field_access = self._promoted_column(
+                    field, context, value
+                ) or self.field_accessor.get_field_access(
                     field, context, query_param
                 )
 
                 if isinstance(value, dict):
                     # Handle query operators like $eq, $gt, $lt, etc.
                     for operator, op_val in value.items():
+                        membership = self._build_membership_condition(
+                            field, field_access, operator, op_val, context
+                        )
+                        if membership is not None:
+                            clauses.append(membership[0])
+                            params.extend(membership[1])
+                            continue
                         sql, clause_params = (
                             self.operator_translator.translate_operator(
                                 field_access, operator, op_val
@@ -624,8 +842,15 @@ class SQLClauseBuilder:
                     params.extend(clause_params)
                 else:
                     # Simple equality check
-                    clauses.append(f"{field_access} = ?")
-                    params.append(value)
+                    membership = self._build_membership_condition(
+                        field, field_access, "$eq", value, context
+                    )
+                    if membership is not None:
+                        clauses.append(membership[0])
+                        params.extend(membership[1])
+                    else:
+                        clauses.append(f"{field_access} = ?")
+                        params.append(value)
 
         if not clauses:
             return _empty_result()
@@ -638,6 +863,106 @@ class SQLClauseBuilder:
 
         return where_clause, params
 
+    def _promoted_column(
+        self, field: str, context: str, condition: Any
+    ) -> str | None:
+        """
+        The generated column of a promoted field, in the direct context.
+
+        Returns:
+            The column qualified with the table name, or None if the field
+            is not promoted or its column cannot answer the condition
+        """
+        if (
+            context != "direct"
+            or self.promoted_column is None
+            or self.table_name is None
+            or field == "_id"
+        ):
+            return None
+        column = self.promoted_column(parse_json_path(field), condition)
+        if column is None:
+            return None
+        return f"{quote_table_name(self.table_name)}.{column}"
+
+    def _build_membership_condition(
+        self,
+        field: str,
+        field_access: str,
+        operator: str,
+        value: Any,
+        context: str,
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Build equality, $ne, $in or $nin with MongoDB array membership.
+
+        Datetime strings keep the regular translation, which compares them
+        the way datetime indexes store them, as do builders created without
+        ``may_hold_arrays``.
+
+        Returns:
+            Tuple of (SQL expression, parameters) or None for the regular
+            translation
+        """
+        if (
+            self.may_hold_arrays is None
+            or field == "_id"
+            or operator not in ("$eq", "$ne", "$in", "$nin")
+        ):
+            return None
+        values = value if operator in ("$in", "$nin") else [value]
+        if not _is_multikey_scalar_list(values) or any(
+            isinstance(v, str)
+            and self.operator_translator._is_datetime_value(v)
+            for v in values
+        ):
+            return None
+        json_path = parse_json_path(field)
+        # Temporary tables hold reshaped documents the collection's
+        # indexes know nothing about
+        may_hold_arrays = context != "direct" or self.may_hold_arrays(json_path)
+        return build_membership_clause(
+            field_access,
+            json_path,
+            list(values),
+            self.field_accessor.data_column,
+            self.operator_translator._json_each_function,
+            may_hold_arrays,
+            negate=operator in ("$ne", "$nin"),
+        )
+
+    def _build_multikey_condition(
+        self, field: str, value: Any, context: str
+    ) -> tuple[str, list[Any]] | None:
+        """
+        Build a condition answered by a multikey index, if the field has one.
+
+        Only applies to queries on the collection table itself; temporary
+        tables have their own ids.
+
+        Returns:
+            Tuple of (SQL expression, parameters) or None for the regular
+            translation
+        """
+        if (
+            context != "direct"
+            or self.multikey_tables is None
+            or self.table_name is None
+            or field == "_id"
+            or not is_multikey_condition(value)
+        ):
+            return None
+        json_path = parse_json_path(field)
+        table = self.multikey_tables().get(json_path)
+        if table is None:
+            return None
+        return build_multikey_clause(
+            f"{quote_table_name(self.table_name)}.{self.field_accessor.id_column}",
+            table,
+            json_path,
+            value,
+        )
+
     def build_order_by_clause(
         self, sort_spec: dict[str, Any], context: str = "direct"
     ) -> str:
@@ -712,6 +1037,10 @@ class SQLTranslator:
         id_column: str = "id",
         jsonb_supported: bool = False,
         json_each_function: str | None = None,
+        multikey_tables: Callable[[], dict[str, str]] | None = None,
+        promoted_column: Callable[[str, Any], str | None] | None = None,
+        may_hold_arrays: Callable[[str], bool] | None = None,
+        pinned_schema: Callable[[], AbstractContextManager[Any]] | None = None,
     ):
         """
         Initialize the SQLTranslator with table and column names.
@@ -723,8 +1052,20 @@ class SQLTranslator:
             jsonb_supported: Whether JSONB functions are supported (default: False)
             json_each_function: The json_each function to use ('jsonb_each' or 'json_each').
                               If None, defaults to 'json_each'.
+            multikey_tables: Returns the collection's multikey side tables by
+                             JSON path (default: None, no multikey indexes)
+            promoted_column: Returns the generated column answering a
+                             condition on a promoted field by JSON path
+                             (default: None, no promoted fields)
+            may_hold_arrays: Tells whether a JSON path of the collection
+                             may hold arrays (default: None, equality
+                             compares scalars only)
+            pinned_schema: Returns a context in which the lookups above
+                           read the collection's schema only once
+                           (default: None, each lookup reads it)
         """
         self.table_name = table_name or "collection"
+        self._pinned_schema = pinned_schema or nullcontext
         self.data_column = data_column
         self.id_column = id_column
         self.jsonb_supported = jsonb_supported
@@ -738,7 +1079,12 @@ class SQLTranslator:
             self.field_accessor, self._json_each_function
         )
         self.clause_builder = SQLClauseBuilder(
-            self.field_accessor, self.operator_translator
+            self.field_accessor,
+            self.operator_translator,
+            table_name=self.table_name,
+            multikey_tables=multikey_tables,
+            promoted_column=promoted_column,
+            may_hold_arrays=may_hold_arrays,
         )
 
     def translate_match(
@@ -775,9 +1121,10 @@ class SQLTranslator:
             )  # Special handling required, return None to fallback
 
         # Pass the query to the clause builder so it can be used for field access decisions
-        return self.clause_builder.build_where_clause(
-            match_spec, context, query_param=match_spec
-        )
+        with self._pinned_schema():
+            return self.clause_builder.build_where_clause(
+                match_spec, context, query_param=match_spec
+            )
 
     def _contains_text_operator(self, query: dict[str, Any]) -> bool:
         """
@@ -0,0 +1,564 @@
+"""
+Sampled statistics on the fields of a collection.
+
+The query optimizer's cost model reads them to estimate how many documents a
+filter keeps, how far ``$unwind`` multiplies them and how large they are,
+instead of assuming the same selectivity for every field.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from ..sql_utils import quote_table_name
+from .index_manager import _INDEX_KEY_FIELD, _index_keys
+from .json_path_utils import parse_json_path
+
+if TYPE_CHECKING:
+    from . import Collection
+
+logger = logging.getLogger(__name__)
+
+# Table keeping the statistics of every collection, one row per JSON path
+STATS_TABLE = "_neosqlite_stats"
+
+# Path of the row describing whole documents (their sizes)
+DOCUMENT_PATH = "$"
+
+# Documents read to compute the statistics of a path
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Equi-depth buckets in a path's histogram
+HISTOGRAM_BUCKETS = 32
+
+# Most frequent values kept per path, so skewed values are estimated alone
+MOST_COMMON_VALUES = 8
+
+# Share of the documents that must change before statistics are stale
+STALE_FRACTION = 0.2
+
+# Estimates used where no statistics are available
+DEFAULT_MATCH_SELECTIVITY = 0.5
+DEFAULT_UNWIND_FACTOR = 3.0
+DEFAULT_GROUP_SELECTIVITY = 0.1
+DEFAULT_DOCUMENT_SIZE = 1024
+
+# Operators whose selectivity is estimated from a path's statistics
+_RANGE_OPERATORS = frozenset({"$gt", "$gte", "$lt", "$lte"})
+
+
+def _stats_table_exists(db) -> bool:
+    return (
+        db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (STATS_TABLE,),
+        ).fetchone()
+        is not None
+    )
+
+
+def delete_statistics(db, collection_name: str) -> None:
+    """Forget the statistics of a dropped collection."""
+    if _stats_table_exists(db):
+        db.execute(
+            f"DELETE FROM {STATS_TABLE} WHERE collection_name = ?",
+            (collection_name,),
+        )
+
+
+def rename_statistics(db, old_name: str, new_name: str) -> None:
+    """Move the statistics of a renamed collection to its new name."""
+    if _stats_table_exists(db):
+        db.execute(
+            f"UPDATE {STATS_TABLE} SET collection_name = ? "
+            "WHERE collection_name = ?",
+            (new_name, old_name),
+        )
+
+
+def _sort_key(value: int | float | str) -> tuple[bool, int | float | str]:
+    """Order values the way SQLite compares them: numbers before text."""
+    return isinstance(value, str), value
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Equality that, unlike Python's, tells booleans from 0 and 1."""
+    return (type(a) is bool) == (type(b) is bool) and a == b
+
+
+def _scalar(value: Any) -> bool:
+    return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+
+def _quantiles(values: list, count: int) -> list:
+    """``count + 1`` evenly spaced values of a sorted list, ends included."""
+    if not values:
+        return []
+    last = len(values) - 1
+    return [values[round(i * last / count)] for i in range(count + 1)]
+
+
+class CollectionStatistics:
+    """
+    Statistics on the documents of a collection, sampled per JSON path.
+
+    For every path the optimizer asks about, a random sample of documents
+    gives the fraction that lack the field, the most common values, an
+    equi-depth histogram of its scalar values, a distinct count and the
+    lengths of arrays; the ``$`` path records document sizes. Paths are sampled the
+    first time they are needed and again once :data:`STALE_FRACTION` of the
+    documents changed. :meth:`analyze` also runs SQLite's ``ANALYZE``, whose
+    ``sqlite_stat1`` rows give exact distinct counts of indexed fields, and
+    saves the statistics in the ``_neosqlite_stats`` table for the next
+    connection to start from.
+    """
+
+    def __init__(self, collection: Collection):
+        """
+        Args:
+            collection: The collection the statistics describe
+        """
+        self.collection = collection
+        self.sample_size = DEFAULT_SAMPLE_SIZE
+        self._paths: dict[str, dict[str, Any]] = {}
+        self._loaded_from: str | None = None
+        # Row count and highest id, taken again once enough rows changed
+        self._snapshot: tuple[int, int] | None = None
+        self._snapshot_changes = 0
+        self._index_distinct: dict[str, float] | None = None
+
+    # --- Freshness ---
+    def _current(self) -> tuple[int, int]:
+        """The collection's document count and highest id."""
+        db = self.collection.db
+        changes = db.total_changes
+        if self._snapshot is not None and (
+            changes - self._snapshot_changes
+            <= STALE_FRACTION * self._snapshot[0]
+        ):
+            return self._snapshot
+        row = db.execute(
+            "SELECT count(*), coalesce(max(id), 0) FROM "
+            f"{quote_table_name(self.collection.name)}"
+        ).fetchone()
+        self._snapshot = (row[0], row[1])
+        self._snapshot_changes = changes
+        self._index_distinct = None
+        return self._snapshot
+
+    def _is_stale(self, stats: dict[str, Any]) -> bool:
+        count, max_id = self._current()
+        sampled_count = stats["document_count"]
+        allowed = STALE_FRACTION * max(sampled_count, 1)
+        return (
+            abs(count - sampled_count) > allowed
+            or max_id - stats["max_id"] > allowed
+        )
+
+    def _load(self) -> None:
+        """Read the statistics saved for this collection, once per name."""
+        name = self.collection.name
+        if self._loaded_from == name:
+            return
+        self._paths = {}
+        self._snapshot = None
+        self._index_distinct = None
+        self._loaded_from = name
+        db = self.collection.db
+        if not _stats_table_exists(db):
+            return
+        for path, stats in db.execute(
+            f"SELECT path, stats FROM {STATS_TABLE} WHERE collection_name = ?",
+            (name,),
+        ):
+            self._paths[path] = json.loads(stats)
+
+    def path_statistics(self, path: str) -> dict[str, Any] | None:
+        """
+        The statistics of a JSON path, sampling it if missing or stale.
+
+        Args:
+            path: A JSON path such as ``$.a.b``, or ``$`` for documents
+
+        Returns:
+            dict[str, Any] | None: The statistics, or None if the collection
+                has no documents to sample or the path is ``_id``
+        """
+        if not path.startswith(DOCUMENT_PATH):
+            return None
+        self._load()
+        stats = self._paths.get(path)
+        if stats is None or self._is_stale(stats):
+            stats = self._sample(path)
+            self._paths[path] = stats
+        return stats if stats["sampled"] else None
+
+    def _sample(self, path: str) -> dict[str, Any]:
+        """Compute the statistics of a path from a random sample of rows."""
+        count, max_id = self._current()
+        table = quote_table_name(self.collection.name)
+        params: list[Any] = []
+        where = ""
+        if count > self.sample_size:
+            # Probing random ids reads only the sampled rows' pages
+            first = self.collection.db.execute(
+                f"SELECT min(id) FROM {table}"
+            ).fetchone()[0]
+            span = max_id - first + 1
+            probes = min(
+                span,
+                10 * self.sample_size,
+                math.ceil(self.sample_size * span / count),
+            )
+            ids = random.sample(range(first, max_id + 1), probes)
+            where = "WHERE id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(ids))
+        stats: dict[str, Any] = {"document_count": count, "max_id": max_id}
+        if path == DOCUMENT_PATH:
+            sizes = sorted(
+                row[0]
+                for row in self.collection.db.execute(
+                    f"SELECT length(data) FROM {table} {where}", params
+                )
+            )
+            stats["sampled"] = len(sizes)
+            if sizes:
+                stats["average_size"] = sum(sizes) / len(sizes)
+                stats["size_quantiles"] = _quantiles(sizes, 4)
+            return stats
+        rows = self.collection.db.execute(
+            f"SELECT json_type(data, ?), json_extract(data, ?), "
+            f"CASE json_type(data, ?) WHEN 'array' "
+            f"THEN json_array_length(data, ?) END FROM {table} {where}",
+            [path, path, path, path, *params],
+        ).fetchall()
+        stats["sampled"] = len(rows)
+        if not rows:
+            return stats
+        values: list[Any] = []
+        lengths: list[int] = []
+        missing = nulls = 0
+        for type_, value, length in rows:
+            if type_ is None:
+                missing += 1
+            elif type_ == "null":
+                nulls += 1
+            elif type_ == "array":
+                lengths.append(length)
+            elif type_ in ("true", "false"):
+                values.append(type_ == "true")
+            elif type_ != "object":
+                values.append(value)
+        sampled = len(rows)
+        stats["missing_fraction"] = missing / sampled
+        stats["null_fraction"] = (missing + nulls) / sampled
+        stats["array_fraction"] = len(lengths) / sampled
+        stats["value_fraction"] = len(values) / sampled
+        if lengths:
+            lengths.sort()
+            stats["average_array_length"] = sum(lengths) / len(lengths)
+            stats["array_length_quantiles"] = _quantiles(lengths, 4)
+
+        # Counter keys would merge True with 1, so bools are tagged
+        frequencies = Counter((type(v) is bool, v) for v in values)
+        most_common = [
+            [value, seen / sampled]
+            for (_, value), seen in frequencies.most_common(MOST_COMMON_VALUES)
+            if seen > 1
+        ]
+        stats["most_common"] = most_common
+        stats["distinct"] = self._estimate_distinct(
+            frequencies, len(values), count * len(values) / sampled
+        )
+        scalars = sorted((v for v in values if _scalar(v)), key=_sort_key)
+        stats["scalar_fraction"] = len(scalars) / sampled
+        stats["histogram"] = _quantiles(scalars, HISTOGRAM_BUCKETS)
+        return stats
+
+    @staticmethod
+    def _estimate_distinct(
+        frequencies: Counter, sampled: int, population: float
+    ) -> float:
+        """Scale a sample's distinct count up to the whole collection."""
+        distinct = len(frequencies)
+        if not sampled or sampled >= population:
+            return float(distinct)
+        # Haas and Stokes' Duj1 estimator, as PostgreSQL uses
+        once = sum(1 for seen in frequencies.values() if seen == 1)
+        estimate = (
+            sampled * distinct / (sampled - once + once * sampled / population)
+        )
+        return min(max(estimate, float(distinct)), population)
+
+    def _index_distinct_counts(self) -> dict[str, float]:
+        """Distinct counts of indexes' leading fields from sqlite_stat1."""
+        if self._index_distinct is not None:
+            return self._index_distinct
+        counts: dict[str, float] = {}
+        db = self.collection.db
+        if db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone():
+            prefix = self.collection.indexes.jsonb.json_function_prefix
+            rows = db.execute(
+                "SELECT s.stat, m.sql FROM sqlite_stat1 s "
+                "JOIN sqlite_master m ON m.type = 'index' AND m.name = s.idx "
+                "WHERE s.tbl = ? AND m.sql IS NOT NULL AND m.sql NOT LIKE "
+                "'% WHERE %'",
+                (self.collection.name,),
+            ).fetchall()
+            for stat, sql in rows:
+                field = _INDEX_KEY_FIELD.fullmatch(_index_keys(sql)[0])
+                numbers = stat.split()
+                if field is None or field.group(1) != prefix:
+                    continue
+                if len(numbers) < 2 or not numbers[1].isdigit():
+                    continue
+                # "rows rows-per-first-key ...", per distinct key value
+                counts[field.group(2)] = int(numbers[0]) / max(
+                    int(numbers[1]), 1
+                )
+        self._index_distinct = counts
+        return counts
+
+    # --- Estimates ---
+    def document_count(self) -> int:
+        """The number of documents, as of the last change of any size."""
+        return self._current()[0]
+
+    def average_document_size(self) -> float:
+        """Average stored document size in bytes."""
+        stats = self.path_statistics(DOCUMENT_PATH)
+        if stats is None:
+            return DEFAULT_DOCUMENT_SIZE
+        return stats["average_size"]
+
+    def distinct_count(self, field: str) -> float | None:
+        """Estimated number of distinct values of a field, if known."""
+        if field == "_id":
+            return float(self.document_count())
+        path = parse_json_path(field)
+        stats = self.path_statistics(path)
+        if stats is None:
+            return None
+        exact = self._index_distinct_counts().get(path)
+        return exact if exact is not None else stats["distinct"]
+
+    def unwind_factor(self, field: str) -> float | None:
+        """Estimated documents ``$unwind`` outputs per input document."""
+        stats = self.path_statistics(parse_json_path(field))
+        if stats is None:
+            return None
+        # Scalars pass through once; missing, null and [] are dropped
+        return (
+            stats["array_fraction"] * stats.get("average_array_length", 0.0)
+            + 1.0
+            - stats["null_fraction"]
+            - stats["array_fraction"]
+        )
+
+    def selectivity(self, query: dict[str, Any]) -> float | None:
+        """
+        Estimate the fraction of documents a filter matches.
+
+        Conditions no statistics can answer (operators such as ``$regex``,
+        or values of other types) each count as :data:`DEFAULT_MATCH_SELECTIVITY`
+        once per filter, as the cost model assumed before.
+
+        Returns:
+            float | None: The fraction, or None if no condition of the
+                filter could be estimated
+        """
+        known: list[float] = []
+        unknown = False
+        for field, condition in query.items():
+            estimate = self.clause_selectivity(field, condition)
+            if estimate is None:
+                unknown = True
+            else:
+                known.append(estimate)
+        if not known:
+            return None
+        selectivity = math.prod(known)
+        if unknown:
+            selectivity *= DEFAULT_MATCH_SELECTIVITY
+        return selectivity
+
+    def clause_selectivity(self, field: str, condition: Any) -> float | None:
+        """
+        Estimate the fraction of documents one condition of a filter matches.
+
+        Args:
+            field: The filter key: a field, or ``$and``, ``$or`` or ``$nor``
+            condition: Its value in the filter
+
+        Returns:
+            float | None: The fraction, or None if it cannot be estimated
+        """
+        if field in ("$and", "$or", "$nor"):
+            if not isinstance(condition, list):
+                return None
+            parts: list[float] = []
+            for sub in condition:
+                part = self.selectivity(sub) if isinstance(sub, dict) else None
+                if part is None:
+                    return None
+                parts.append(part)
+            if field == "$and":
+                return math.prod(parts)
+            missed = math.prod(1 - p for p in parts)
+            return missed if field == "$nor" else 1 - missed
+        if field.startswith("$") or field == "_id":
+            return None
+        if isinstance(condition, dict) and any(
+            key.startswith("$") for key in condition
+        ):
+            return self._operator_selectivity(field, condition)
+        return self._equality_selectivity(field, condition)
+
+    def _equality_selectivity(self, field: str, value: Any) -> float | None:
+        if value is not None and not isinstance(value, (int, float, str)):
+            return None
+        path = parse_json_path(field)
+        stats = self.path_statistics(path)
+        if stats is None:
+            return None
+        if value is None:
+            return stats["null_fraction"]
+        for common, fraction in stats["most_common"]:
+            if _same_value(common, value):
+                return fraction
+        others = max(
+            (self.distinct_count(field) or 1.0) - len(stats["most_common"]),
+            1.0,
+        )
+        rest = stats["value_fraction"] - sum(
+            fraction for _, fraction in stats["most_common"]
+        )
+        # A value the sample missed may still be there, just rare
+        return max(rest / others, 1 / max(self.document_count(), 1))
+
+    def _operator_selectivity(
+        self, field: str, condition: dict[str, Any]
+    ) -> float | None:
+        known: list[float] = []
+        lower: tuple[Any, bool] | None = None
+        upper: tuple[Any, bool] | None = None
+        for op, value in condition.items():
+            estimate: float | None = None
+            if op == "$eq":
+                estimate = self._equality_selectivity(field, value)
+            elif op == "$ne":
+                estimate = self._equality_selectivity(field, value)
+                estimate = None if estimate is None else 1 - estimate
+            elif op in ("$in", "$nin") and isinstance(value, list):
+                parts = [self._equality_selectivity(field, v) for v in value]
+                if None not in parts:
+                    estimate = min(sum(parts), 1.0)  # type: ignore[arg-type]
+                    if op == "$nin":
+                        estimate = 1 - estimate
+            elif op == "$exists":
+                stats = self.path_statistics(parse_json_path(field))
+                if stats is not None:
+                    estimate = stats["missing_fraction"]
+                    if value:
+                        estimate = 1 - estimate
+            elif op in _RANGE_OPERATORS and _scalar(value):
+                if op in ("$gt", "$gte"):
+                    if lower is None or _sort_key(value) > _sort_key(lower[0]):
+                        lower = (value, op == "$gte")
+                elif upper is None or _sort_key(value) < _sort_key(upper[0]):
+                    upper = (value, op == "$lte")
+                continue
+            if estimate is None:
+                return None
+            known.append(estimate)
+        if lower is not None or upper is not None:
+            estimate = self._range_selectivity(field, lower, upper)
+            if estimate is None:
+                return None
+            known.append(estimate)
+        return math.prod(known)
+
+    def _range_selectivity(
+        self,
+        field: str,
+        lower: tuple[Any, bool] | None,
+        upper: tuple[Any, bool] | None,
+    ) -> float | None:
+        stats = self.path_statistics(parse_json_path(field))
+        if stats is None:
+            return None
+        bounds = [_sort_key(v) for v in stats["histogram"]]
+        if not bounds:
+            return 0.0
+
+        def below(value: Any, inclusive: bool) -> float:
+            key = _sort_key(value)
+            position = (
+                bisect_right(bounds, key)
+                if inclusive
+                else bisect_left(bounds, key)
+            )
+            return position / len(bounds)
+
+        start = 0.0 if lower is None else below(lower[0], not lower[1])
+        end = 1.0 if upper is None else below(upper[0], upper[1])
+        return max(end - start, 0.0) * stats["scalar_fraction"]
+
+    # --- Maintenance ---
+    def analyze(self, fields: list[str] | None = None) -> list[str]:
+        """
+        Refresh and save the statistics, and run SQLite's ANALYZE.
+
+        Without fields, the paths sampled before, the indexed fields and the
+        document sizes are refreshed if stale or never sampled; named fields
+        are always sampled again.
+
+        Args:
+            fields: Fields to sample, or None for every stale one
+
+        Returns:
+            list[str]: The JSON paths that were sampled
+        """
+        self._load()
+        db = self.collection.db
+        db.execute(f"ANALYZE {quote_table_name(self.collection.name)}")
+        self._snapshot = None
+        self._index_distinct = None
+        if fields is not None:
+            paths = [parse_json_path(field) for field in fields]
+            refresh = set(paths)
+        else:
+            indexed = set().union(*self.collection.indexes.index_field_paths())
+            paths = sorted({DOCUMENT_PATH, *self._paths, *indexed})
+            refresh = {
+                path
+                for path in paths
+                if path not in self._paths or self._is_stale(self._paths[path])
+            }
+        for path in sorted(refresh):
+            self._paths[path] = self._sample(path)
+        db.execute(
+            f"CREATE TABLE IF NOT EXISTS {STATS_TABLE} ("
+            "collection_name TEXT NOT NULL, path TEXT NOT NULL, "
+            "stats TEXT NOT NULL, PRIMARY KEY (collection_name, path))"
+        )
+        db.executemany(
+            f"INSERT OR REPLACE INTO {STATS_TABLE} "
+            "(collection_name, path, stats) VALUES (?, ?, ?)",
+            [
+                (self.collection.name, path, json.dumps(self._paths[path]))
+                for path in paths
+            ],
+        )
+        logger.debug(
+            f"Analyzed {self.collection.name}: sampled {sorted(refresh)}"
+        )
+        return sorted(refresh)
@@ -64,6 +64,8 @@ class TemporaryTableAggregationProcessor(OperatorsMixin):
             "id",
             self.jsonb.jsonb_supported,
             self.jsonb.json_each_function,
+            # Temporary tables have no indexes telling which fields hold none
+            may_hold_arrays=lambda json_path: True,
         )
         # Track if pipeline has $sort stage (for $first/$last limitation)
         self._has_sort_stage = False
@@ -715,6 +715,11 @@ class OperatorsAdvancedMixin(OperatorsBaseMixin):
                 r_sql = r_sql.replace(
                     "jsonb_extract(data", "jsonb_extract(t.data"
                 )
+                # Column references qualified with the collection's name
+                # (_id, multikey lookups) must use the join alias
+                r_sql = r_sql.replace(
+                    f"{quote_table_name(target_coll.name)}.", "t."
+                )
                 restrict_where = f"AND ({r_sql})"
                 restrict_params = (
                     r_params * 2
@@ -235,7 +235,8 @@ class OperatorsLookupMixin(OperatorsBaseMixin):
         """
         Estimate the size of a collection in bytes.
 
-        Uses SQLite's table statistics to estimate size.
+        Uses the collection's sampled statistics, so the estimate does not
+        read every document.
 
         Args:
             collection_name: Name of the collection to estimate
@@ -244,14 +245,13 @@ class OperatorsLookupMixin(OperatorsBaseMixin):
             Estimated size in bytes
         """
         try:
-            result = self.db.execute(
-                f"SELECT COUNT(*), AVG(LENGTH(data)) FROM {quote_table_name(collection_name)}"
-            ).fetchone()
-            if result and result[0]:
-                count, avg_size = result
-                avg_size = avg_size or 0
+            statistics = self.collection.database.get_collection(
+                collection_name
+            ).statistics
+            count = statistics.document_count()
+            if count:
                 row_size = (
-                    int(avg_size) + 50
+                    int(statistics.average_document_size()) + 50
                 )  # Add overhead for id, _id columns
                 return count * row_size
         except Exception as e:
@@ -10,10 +10,17 @@ from ._sqlite import sqlite3
 from .client_session import ClientSession
 from .collection import Collection
 from .collection.aggregation_cursor import AggregationCursor
+from .collection.index_manager import (
+    delete_ttl_policies,
+    drop_multikey_side_tables,
+)
+from .collection.statistics import delete_statistics
 from .exceptions import CollectionInvalid
+from .index_advisor import IndexAdvisor
 from .migration import migrate_autovacuum, needs_migration, should_migrate
 from .options import AutoVacuumMode, JournalMode, WriteConcern
 from .sql_utils import quote_table_name
+from .ttl_monitor import TTLMonitor
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +52,13 @@ class Connection:
                         Can be 0/NONE, 1/FULL, 2/INCREMENTAL, or "NONE"/"FULL"/"INCREMENTAL".
                         If database has different auto_vacuum setting, migration may be triggered.
                       - translation_cache: SQL translation cache size (default: 100, 0 to disable)
+                      - ttl_monitor_interval: Seconds between background passes deleting
+                        documents expired by TTL indexes (default: None, no background
+                        thread; call Collection.expire() instead). Needs a database file.
+                      - index_advisor: Record the shapes and latencies of queries run
+                        through this connection and suggest indexes for slow ones
+                        (default: False). True, or the slow threshold in milliseconds.
+                        See IndexAdvisor.
         """
         self._collections: dict[str, Collection] = {}
         self._tokenizers: list[tuple[str, str]] = kwargs.pop("tokenizers", [])
@@ -67,6 +81,16 @@ class Connection:
         self._translation_cache_size: int | None = kwargs.pop(
             "translation_cache", self.DEFAULT_TRANSLATION_CACHE_SIZE
         )
+        ttl_monitor_interval: float | None = kwargs.pop(
+            "ttl_monitor_interval", None
+        )
+        self._ttl_monitor: TTLMonitor | None = None
+        index_advisor: bool | float | None = kwargs.pop("index_advisor", None)
+        self.index_advisor: IndexAdvisor | None = None
+        if index_advisor is True:
+            self.index_advisor = IndexAdvisor(self)
+        elif index_advisor is not None and index_advisor is not False:
+            self.index_advisor = IndexAdvisor(self, slow_ms=index_advisor)
 
         self.name: str = kwargs.pop("name", None)
         self._db_path = args[0] if args else ":memory:"
@@ -77,7 +101,11 @@ class Connection:
 
         self._closed = False
         if not self._is_clone:
+            if ttl_monitor_interval is not None:
+                self._ttl_monitor = TTLMonitor(self, ttl_monitor_interval)
             self.connect(*args, **kwargs)
+            if self._ttl_monitor is not None:
+                self._ttl_monitor.start()
 
     @property
     def db_path(self) -> str:
@@ -257,6 +285,11 @@ class Connection:
         if getattr(self, "_is_clone", False) or getattr(self, "_closed", False):
             return
 
+        monitor = getattr(self, "_ttl_monitor", None)
+        if monitor is not None:
+            monitor.stop()
+            self._ttl_monitor = None
+
         # Clean up collections before closing the database
         self.cleanup()
 
@@ -289,6 +322,11 @@ class Connection:
         if getattr(self, "_is_clone", False) or getattr(self, "_closed", False):
             return
 
+        monitor = getattr(self, "_ttl_monitor", None)
+        if monitor is not None:
+            monitor.stop()
+            self._ttl_monitor = None
+
         if self.db is not None:
             try:
                 if self.db.in_transaction:
@@ -453,6 +491,9 @@ class Connection:
                         does not exist, the operation is silently ignored due to
                         the use of `IF EXISTS` in the SQL command.
         """
+        drop_multikey_side_tables(self.db, name)
+        delete_ttl_policies(self.db, name)
+        delete_statistics(self.db, name)
         self.db.execute(f"DROP TABLE IF EXISTS {quote_table_name(name)}")
 
     def create_collection(self, name: str, **kwargs) -> Collection:
@@ -737,6 +778,7 @@ class Connection:
         clone.debug = self.debug
         clone._collections = self._collections.copy()
         clone.journal_mode = self.journal_mode
+        clone.index_advisor = self.index_advisor
 
         # Store the new options
         clone._codec_options = codec_options
@@ -1051,8 +1093,17 @@ def _command_busy_timeout(
 
 
 def _command_analyze(
-    self: Connection, _command: dict, **__: Any
+    self: Connection, command: dict, **kwargs: Any
 ) -> dict[str, Any]:
+    collection_name = kwargs.get("collection")
+    if not collection_name and isinstance(command, dict):
+        collection_name = command.get("analyze")
+    if isinstance(collection_name, str):
+        # Also samples the statistics of the collection's fields
+        sampled = self.get_collection(collection_name).analyze(
+            kwargs.get("fields")
+        )
+        return {"ok": 1, "message": "ANALYZE completed", "sampled": sampled}
     self.db.execute("ANALYZE")
     return {"ok": 1, "message": "ANALYZE completed"}
 
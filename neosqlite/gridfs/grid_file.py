@@ -3,6 +3,9 @@ from __future__ import annotations
 import datetime
 import hashlib
 import logging
+import os
+import tempfile
+from collections.abc import Iterator
 from typing import Any
 
 from .._sqlite import sqlite3
@@ -11,17 +14,32 @@ from ..collection.schema_utils import column_exists
 # Import ObjectId for GridIn and GridOut
 from ..objectid import ObjectId
 from ..sql_utils import quote_table_name
-from .errors import NoFile
+from .errors import CorruptGridFile, NoFile
 from .utils import (
+    BLOB_SPOOL_MAX_MEMORY,
+    STORAGE_BLOB,
+    STORAGE_CHUNKS,
+    STORAGE_DEDUP,
+    choose_compression,
+    compress_chunk,
+    decompress_chunk,
     deserialize_aliases,
     deserialize_metadata,
     force_sync_if_needed,
+    insert_dedup_chunks,
+    max_blob_length,
+    read_blob_range,
+    read_into_buffer,
     serialize_aliases,
     serialize_metadata,
+    write_blob,
 )
 
 logger = logging.getLogger(__name__)
 
+# Number of consecutive chunks GridOut fetches per query during sequential reads
+DEFAULT_READ_AHEAD_CHUNKS = 4
+
 
 class GridIn:
     """
@@ -42,6 +60,8 @@ class GridIn:
         write_concern: dict[str, Any] | None = None,
         content_type: str | None = None,
         aliases: list[str] | None = None,
+        storage: str = STORAGE_CHUNKS,
+        compression: str | None = None,
     ):
         """
         Initialize a new GridIn instance.
@@ -57,6 +77,11 @@ class GridIn:
             write_concern: Write concern settings (simulated for compatibility)
             content_type: Optional MIME type of the file
             aliases: Optional list of alternative names for the file
+            storage: "chunks" to write chunk rows as data arrives, "dedup" to
+                write them to the content-addressed chunk store, or "blob"
+                to spool the data and store it as a single BLOB row on close
+            compression: Optional per-chunk compression ("zlib" or "lzma");
+                skipped for BLOB storage and already-compressed content types
         """
         self._db = db
         self._bucket_name = bucket_name
@@ -70,9 +95,25 @@ class GridIn:
         self._write_concern = write_concern or {}
         self._content_type = content_type
         self._aliases = aliases
+        self._storage = storage
+        self._blobs_collection = f"{bucket_name}_blobs"
+        self._chunk_store_collection = f"{bucket_name}_chunk_store"
+        self._chunk_refs_collection = f"{bucket_name}_chunk_refs"
+        self._compression = (
+            None
+            if storage == STORAGE_BLOB
+            else choose_compression(compression, filename, content_type)
+        )
 
         # Stream state
         self._buffer = bytearray()
+        # BLOB storage needs the final size up front, so data is spooled
+        # (in memory, spilling to a temporary file) until close()
+        self._spool = (
+            tempfile.SpooledTemporaryFile(max_size=BLOB_SPOOL_MAX_MEMORY)
+            if storage == STORAGE_BLOB
+            else None
+        )
         self._chunk_number = 0
         self._position = 0
         self._closed = False
@@ -147,12 +188,17 @@ class GridIn:
         if not isinstance(data, (bytes, bytearray)):
             raise TypeError("data must be bytes or bytearray")
 
-        # Add data to buffer
-        self._buffer.extend(data)
         self._position += len(data)
         if self._md5_hasher:
             self._md5_hasher.update(data)
 
+        if self._spool is not None:
+            self._spool.write(data)
+            return len(data)
+
+        # Add data to buffer
+        self._buffer.extend(data)
+
         # Flush chunks if buffer is full
         while len(self._buffer) >= self._chunk_size_bytes:
             self._flush_chunk()
@@ -178,16 +224,34 @@ class GridIn:
                 self._create_file_document()
 
             # Insert the chunk
+            self._insert_chunk(self._get_file_id(), chunk_data)
+
+    def _insert_chunk(self, file_int_id: int, data: bytes | memoryview) -> None:
+        """
+        Store the next chunk of the file.
+
+        Args:
+            file_int_id: The integer ID of the file document
+            data: The chunk data
+        """
+        data = compress_chunk(data, self._compression)
+        if self._storage == STORAGE_DEDUP:
+            insert_dedup_chunks(
+                self._db,
+                self._chunk_store_collection,
+                self._chunk_refs_collection,
+                [(file_int_id, self._chunk_number, data)],
+            )
+        else:
             self._db.execute(
                 f"""
                 INSERT INTO {self._chunks_collection}
                 (files_id, n, data)
                 VALUES (?, ?, ?)
             """,
-                (self._get_file_id(), self._chunk_number, chunk_data),
+                (file_int_id, self._chunk_number, data),
             )
-
-            self._chunk_number += 1
+        self._chunk_number += 1
 
     def _create_file_document(self) -> None:
         """
@@ -319,6 +383,10 @@ class GridIn:
         if self._closed:
             return
 
+        if self._spool is not None:
+            self._close_blob(self._spool)
+            return
+
         # Flush any remaining data in the buffer
         if self._buffer or self._chunk_number == 0:
             # If no chunks have been written yet, we still need to create the file
@@ -330,19 +398,7 @@ class GridIn:
 
             # Write the final chunk (which may be smaller than chunk_size_bytes)
             if self._buffer:
-                self._db.execute(
-                    f"""
-                    INSERT INTO {self._chunks_collection}
-                    (files_id, n, data)
-                    VALUES (?, ?, ?)
-                """,
-                    (
-                        file_int_id,
-                        self._chunk_number,
-                        bytes(self._buffer),
-                    ),
-                )
-                self._chunk_number += 1
+                self._insert_chunk(file_int_id, bytes(self._buffer))
 
         # Update the file document with final metadata.
         # This must happen even when the last chunk filled the buffer exactly
@@ -356,10 +412,16 @@ class GridIn:
             self._db.execute(
                 f"""
                 UPDATE {self._files_collection}
-                SET length = ?, md5 = ?
+                SET length = ?, md5 = ?, storage = ?, compression = ?
                 WHERE id = ?
             """,
-                (self._position, md5_hash, file_int_id),
+                (
+                    self._position,
+                    md5_hash,
+                    STORAGE_DEDUP if self._storage == STORAGE_DEDUP else None,
+                    self._compression,
+                    file_int_id,
+                ),
             )
 
         # Force sync if write concern requires it
@@ -367,6 +429,57 @@ class GridIn:
 
         self._closed = True
 
+    def _close_blob(self, spool: Any) -> None:
+        """
+        Store the spooled data as a single BLOB row and finalise the file.
+
+        The file document, the BLOB and the final length/md5 are written in
+        one savepoint. Files too large for a single SQLite value are written
+        as regular chunks instead.
+        """
+        self._db.execute("SAVEPOINT gridfs_upload")
+        try:
+            self._create_file_document()
+            file_int_id = self._get_file_id()
+            spool.seek(0)
+            storage = None
+            if self._position <= max_blob_length(self._db):
+                write_blob(
+                    self._db,
+                    self._blobs_collection,
+                    file_int_id,
+                    spool,
+                    self._position,
+                    self._chunk_size_bytes,
+                )
+                storage = STORAGE_BLOB
+            else:
+                buffer = memoryview(bytearray(self._chunk_size_bytes))
+                while count := read_into_buffer(spool, buffer):
+                    self._insert_chunk(file_int_id, buffer[:count])
+
+            md5_hash = (
+                self._md5_hasher.hexdigest() if self._md5_hasher else None
+            )
+            self._db.execute(
+                f"""
+                UPDATE {self._files_collection}
+                SET length = ?, md5 = ?, storage = ?
+                WHERE id = ?
+            """,
+                (self._position, md5_hash, storage, file_int_id),
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK TO SAVEPOINT gridfs_upload")
+            self._db.execute("RELEASE SAVEPOINT gridfs_upload")
+            raise
+        finally:
+            spool.close()
+        self._db.execute("RELEASE SAVEPOINT gridfs_upload")
+
+        self._force_sync_if_needed()
+        self._closed = True
+
     def __enter__(self) -> GridIn:
         """Context manager entry."""
         return self
@@ -388,6 +501,7 @@ class GridOut:
         db: sqlite3.Connection,
         bucket_name: str,
         file_id: ObjectId | int,
+        read_ahead: int = DEFAULT_READ_AHEAD_CHUNKS,
     ):
         """
         Initialize a new GridOut instance.
@@ -396,7 +510,11 @@ class GridOut:
             db: SQLite database connection
             bucket_name: The bucket name for the GridFS files
             file_id: The ID of the file to read (ObjectId or integer)
+            read_ahead: Maximum number of consecutive chunks to prefetch with
+                        a single query while reading sequentially
         """
+        if read_ahead < 1:
+            raise ValueError("read_ahead must be a positive integer")
         self._db = db
         self._bucket_name = bucket_name
         # Convert file_id to integer for internal use
@@ -421,6 +539,8 @@ class GridOut:
         # Check if new columns exist to maintain backward compatibility
         has_content_type = False
         has_aliases = False
+        has_storage = False
+        has_compression = False
         try:
             has_content_type = column_exists(
                 self._db, self._files_collection, "content_type"
@@ -428,6 +548,12 @@ class GridOut:
             has_aliases = column_exists(
                 self._db, self._files_collection, "aliases"
             )
+            has_storage = column_exists(
+                self._db, self._files_collection, "storage"
+            )
+            has_compression = column_exists(
+                self._db, self._files_collection, "compression"
+            )
         except (AttributeError, TypeError) as e:
             # Handle mocked databases in tests - assume old schema
             logger.debug(f"{e=}")
@@ -447,6 +573,10 @@ class GridOut:
             select_columns.append("content_type")
         if has_aliases:
             select_columns.append("json(aliases)")
+        if has_storage:
+            select_columns.append("storage")
+        if has_compression:
+            select_columns.append("compression")
 
         query = f"""
             SELECT {", ".join(select_columns)}
@@ -483,6 +613,15 @@ class GridOut:
         if has_content_type:
             row_idx += 1
         aliases_str = row[row_idx] if has_aliases else None
+        if has_aliases:
+            row_idx += 1
+        self._storage = row[row_idx] if has_storage else None
+        if has_storage:
+            row_idx += 1
+        self._compression = row[row_idx] if has_compression else None
+        self._blobs_collection = f"{bucket_name}_blobs"
+        self._chunk_store_collection = f"{bucket_name}_chunk_store"
+        self._chunk_refs_collection = f"{bucket_name}_chunk_refs"
 
         # Set the actual _id field to the appropriate type based on the stored value
         if self._stored_oid is not None:
@@ -530,8 +669,15 @@ class GridOut:
         self._metadata = deserialize_metadata(metadata_str)
         self._aliases = deserialize_aliases(aliases_str)
         self._position = 0
-        self._current_chunk_data = b""
-        self._current_chunk_index = -1
+        self._read_ahead = read_ahead
+        # Prefetched chunks keyed by chunk number (at most read_ahead entries)
+        self._chunk_cache: dict[int, bytes | memoryview] = {}
+        # Cached chunks still holding compressed data; each chunk is only
+        # decompressed when a read actually reaches it
+        self._compressed_chunks: set[int] = set()
+        # Reads following on from the previous read use the full read-ahead
+        # window; the first read and reads after a seek fetch only what they need
+        self._sequential = False
         self._closed = False
 
     @property
@@ -585,70 +731,258 @@ class GridOut:
         if self._closed:
             raise ValueError("I/O operation on closed file")
 
-        if size == -1:
+        if size is None or size < 0:
             # Read all remaining data
             size = self._length - self._position
 
+        size = min(size, self._length - self._position)
         if size <= 0:
             return b""
 
-        # Calculate which chunks we need
-        result = bytearray()
-        bytes_read = 0
+        # Collect zero-copy slices of the chunks and join them once
+        pieces: list[bytes | memoryview] = []
+        for chunk, start, stop in self._iter_chunk_slices(size):
+            if isinstance(chunk, bytes) and start == 0 and stop == len(chunk):
+                pieces.append(chunk)
+            else:
+                pieces.append(memoryview(chunk)[start:stop])
+        if len(pieces) == 1 and isinstance(pieces[0], bytes):
+            return pieces[0]
+        return b"".join(pieces)
 
-        while bytes_read < size and self._position < self._length:
-            # Load the current chunk if needed
-            self._load_chunk()
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """
+        Read data from the GridOut stream directly into a writable buffer.
 
-            # Calculate how much we can read from the current chunk
-            chunk_offset = self._position % self._chunk_size
-            bytes_available_in_chunk = (
-                len(self._current_chunk_data) - chunk_offset
-            )
-            bytes_to_read = min(size - bytes_read, bytes_available_in_chunk)
+        Chunk data is copied straight into the caller's buffer without
+        building intermediate bytes objects.
 
-            # Read from the current chunk
-            result.extend(
-                self._current_chunk_data[
-                    chunk_offset : chunk_offset + bytes_to_read
-                ]
-            )
+        Args:
+            buffer: A writable bytes-like object (e.g. bytearray or memoryview)
+
+        Returns:
+            The number of bytes read (0 at end of file)
+        """
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
 
-            # Update position
-            self._position += bytes_to_read
-            bytes_read += bytes_to_read
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), self._length - self._position)
+        if size <= 0:
+            return 0
+
+        offset = 0
+        for chunk, start, stop in self._iter_chunk_slices(size):
+            count = stop - start
+            target[offset : offset + count] = memoryview(chunk)[start:stop]
+            offset += count
+        return offset
+
+    def _iter_chunk_slices(
+        self, size: int
+    ) -> Iterator[tuple[bytes | memoryview, int, int]]:
+        """
+        Yield ``(chunk_data, start, stop)`` slices covering the next size bytes.
 
-            # Move to next chunk if we've exhausted the current one
-            if self._position % self._chunk_size == 0:
-                self._current_chunk_index += 1
-                self._current_chunk_data = b""
+        Advances the stream position as slices are produced. The caller must
+        ensure size does not extend beyond the end of the file.
 
-        return bytes(result)
+        Args:
+            size: The number of bytes to read from the current position
 
-    def _load_chunk(self) -> None:
-        """Load the chunk containing the current position."""
-        chunk_index = self._position // self._chunk_size
+        Yields:
+            Tuples of chunk data and the byte range to take from it
+        """
+        last_index = (self._position + size - 1) // self._chunk_size
+        remaining = size
+        while remaining > 0:
+            chunk_index = self._position // self._chunk_size
+            chunk = self._get_chunk(chunk_index, last_index)
+
+            start = self._position - chunk_index * self._chunk_size
+            stop = min(len(chunk), start + remaining)
+            if stop <= start:
+                raise CorruptGridFile(
+                    f"Chunk {chunk_index} for file id {self._int_file_id} "
+                    f"is truncated"
+                )
+            yield chunk, start, stop
 
-        # If we already have the right chunk, we're done
-        if chunk_index == self._current_chunk_index:
-            return
+            self._position += stop - start
+            remaining -= stop - start
+        self._sequential = True
 
-        # Load the required chunk using the integer file ID
-        row = self._db.execute(
-            f"""
-            SELECT data FROM {self._chunks_collection}
-            WHERE files_id = ? AND n = ?
-        """,
-            (self._int_file_id, chunk_index),
-        ).fetchone()
+    def _get_chunk(
+        self, chunk_index: int, last_needed: int
+    ) -> bytes | memoryview:
+        """
+        Return the data of a chunk, prefetching a window of chunks on a miss.
 
-        if row is None:
+        A miss loads consecutive chunks with a single ``n BETWEEN ? AND ?``
+        query. Random-access reads (the first read, or a read after a seek)
+        only fetch the chunks the current request needs; sequential reads
+        fetch up to ``read_ahead`` chunks ahead. Compressed chunks are
+        decompressed individually on first access.
+
+        Args:
+            chunk_index: The chunk number to return
+            last_needed: The last chunk number the current request touches
+
+        Returns:
+            The chunk data
+
+        Raises:
+            NoFile: If the chunk does not exist
+            CorruptGridFile: If the chunk cannot be decompressed
+        """
+        if (chunk := self._chunk_cache.get(chunk_index)) is None:
+            chunk = self._fetch_chunk_window(chunk_index, last_needed)
+
+        if chunk_index in self._compressed_chunks:
+            chunk = decompress_chunk(chunk, self._compression)
+            self._chunk_cache[chunk_index] = chunk
+            self._compressed_chunks.discard(chunk_index)
+        return chunk
+
+    def _fetch_chunk_window(
+        self, chunk_index: int, last_needed: int
+    ) -> bytes | memoryview:
+        """
+        Load the window of chunks starting at chunk_index into the cache.
+
+        Args:
+            chunk_index: The chunk number that missed the cache
+            last_needed: The last chunk number the current request touches
+
+        Returns:
+            The stored data of chunk_index
+
+        Raises:
+            NoFile: If the chunk does not exist
+        """
+
+        last_chunk = max(0, (self._length - 1) // self._chunk_size)
+        window_end = chunk_index + self._read_ahead - 1
+        if not self._sequential:
+            window_end = min(window_end, last_needed)
+        window_end = max(chunk_index, min(window_end, last_chunk))
+
+        if self._storage == STORAGE_BLOB:
+            self._chunk_cache = self._fetch_blob_window(chunk_index, window_end)
+        elif self._storage == STORAGE_DEDUP:
+            cursor = self._db.execute(
+                f"""
+                SELECT r.n, s.data
+                FROM {quote_table_name(self._chunk_refs_collection)} AS r
+                JOIN {quote_table_name(self._chunk_store_collection)} AS s
+                ON s.hash = r.chunk_hash
+                WHERE r.files_id = ? AND r.n BETWEEN ? AND ?
+            """,
+                (self._int_file_id, chunk_index, window_end),
+            )
+            self._chunk_cache = {n: data for n, data in cursor.fetchall()}
+        else:
+            cursor = self._db.execute(
+                f"""
+                SELECT n, data FROM {self._chunks_collection}
+                WHERE files_id = ? AND n BETWEEN ? AND ?
+            """,
+                (self._int_file_id, chunk_index, window_end),
+            )
+            self._chunk_cache = {n: data for n, data in cursor.fetchall()}
+
+        if self._compression is not None:
+            self._compressed_chunks = set(self._chunk_cache)
+        if (chunk := self._chunk_cache.get(chunk_index)) is None:
             raise NoFile(
                 f"Chunk {chunk_index} for file id {self._int_file_id} not found"
             )
+        return chunk
+
+    def _fetch_blob_window(
+        self, first: int, last: int
+    ) -> dict[int, bytes | memoryview]:
+        """
+        Read a range of a BLOB-stored file as chunkSize-sized windows.
+
+        The whole range is read with one incremental BLOB read and split
+        into zero-copy memoryview slices, so BLOB-stored files share the
+        chunk-based read, seek and read-ahead logic.
+
+        Args:
+            first: The first chunk-sized window to read
+            last: The last chunk-sized window to read
+
+        Returns:
+            A mapping of window number to its data
+        """
+        offset = first * self._chunk_size
+        size = min((last + 1) * self._chunk_size, self._length) - offset
+        data = memoryview(
+            read_blob_range(
+                self._db,
+                self._blobs_collection,
+                self._int_file_id,
+                offset,
+                size,
+            )
+        )
+        return {
+            first + i: data[start : start + self._chunk_size]
+            for i, start in enumerate(range(0, len(data), self._chunk_size))
+        }
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET) -> int:
+        """
+        Move the stream position.
+
+        Seeking is free: no chunks are read until the next read, which then
+        loads only the chunk(s) containing the requested range.
+
+        Args:
+            pos: The offset to move to, interpreted according to whence
+            whence: ``os.SEEK_SET`` (start of file), ``os.SEEK_CUR`` (current
+                    position) or ``os.SEEK_END`` (end of file)
+
+        Returns:
+            The new absolute position
+
+        Raises:
+            ValueError: If the stream is closed, whence is invalid or the
+                        resulting position would be negative
+        """
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
+
+        match whence:
+            case os.SEEK_SET:
+                new_position = pos
+            case os.SEEK_CUR:
+                new_position = self._position + pos
+            case os.SEEK_END:
+                new_position = self._length + pos
+            case _:
+                raise ValueError(f"Invalid whence ({whence})")
+
+        if new_position < 0:
+            raise ValueError(f"Negative seek position {new_position}")
+
+        if new_position != self._position:
+            self._sequential = False
+        self._position = new_position
+        return self._position
+
+    def tell(self) -> int:
+        """Return the current stream position."""
+        return self._position
+
+    def seekable(self) -> bool:
+        """GridOut streams support random access."""
+        return True
 
-        self._current_chunk_data = row[0]
-        self._current_chunk_index = chunk_index
+    def readable(self) -> bool:
+        """GridOut streams are readable."""
+        return True
 
     @property
     def filename(self) -> str:
@@ -693,6 +1027,8 @@ class GridOut:
     def close(self) -> None:
         """Close the GridOut stream."""
         self._closed = True
+        self._chunk_cache = {}
+        self._compressed_chunks = set()
 
     def __enter__(self) -> GridOut:
         """Context manager entry."""
@@ -2,6 +2,8 @@ import datetime
 import hashlib
 import io
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 from .._sqlite import sqlite3
@@ -25,11 +27,29 @@ from ..sql_utils import quote_table_name
 from .errors import FileExists, NoFile
 from .grid_file import GridIn, GridOut, GridOutCursor
 from .utils import (
+    COMPRESSION_LZMA,
+    COMPRESSION_ZLIB,
+    STORAGE_BLOB,
+    STORAGE_CHUNKS,
+    STORAGE_DEDUP,
+    blob_io_supported,
+    choose_compression,
+    compress_chunk,
     deserialize_metadata,
     force_sync_if_needed,
+    insert_dedup_chunks,
+    max_blob_length,
+    read_into_buffer,
+    release_dedup_chunks,
     serialize_metadata,
+    source_length,
+    spool_source,
+    write_blob,
 )
 
+# Upper bound on the chunk data buffered per executemany() batch when uploading
+UPLOAD_BATCH_BYTES = 4 * 1024 * 1024
+
 
 class GridFSBucket:
     """
@@ -47,6 +67,8 @@ class GridFSBucket:
         write_concern: dict[str, Any] | None = None,
         read_preference: Any | None = None,
         disable_md5: bool = False,
+        storage: str = STORAGE_CHUNKS,
+        compression: str | None = None,
     ):
         """
         Initialize a new GridFSBucket instance.
@@ -58,12 +80,45 @@ class GridFSBucket:
             write_concern: Write concern settings (simulated for compatibility)
             read_preference: Read preference settings (not applicable to SQLite)
             disable_md5: Disable MD5 checksum calculation for performance
+            storage: How new files are stored: "chunks" (default) splits files
+                into rows of the chunks table, "blob" stores each file as a
+                single BLOB row streamed with incremental BLOB I/O (requires
+                ``sqlite3.Connection.blobopen``, Python 3.11+) and "dedup"
+                stores each distinct chunk payload once in a reference-counted,
+                SHA-256 addressed chunk store. The mode is recorded per file,
+                so buckets may mix them.
+            compression: Optional per-chunk compression of new files, "zlib"
+                or "lzma". Files whose content type (or filename) indicates
+                already-compressed data are stored as-is, as are BLOB-stored
+                files. The method is recorded per file.
         """
+        if storage not in (STORAGE_CHUNKS, STORAGE_BLOB, STORAGE_DEDUP):
+            raise ValueError(
+                f"storage must be '{STORAGE_CHUNKS}', '{STORAGE_BLOB}' "
+                f"or '{STORAGE_DEDUP}'"
+            )
+        if storage == STORAGE_BLOB and not blob_io_supported(db):
+            logger.warning(
+                "GridFS BLOB storage requires sqlite3 incremental BLOB I/O "
+                "(Python 3.11+); falling back to chunked storage"
+            )
+            storage = STORAGE_CHUNKS
+        if compression not in (None, COMPRESSION_ZLIB, COMPRESSION_LZMA):
+            raise ValueError(
+                f"compression must be None, '{COMPRESSION_ZLIB}' or "
+                f"'{COMPRESSION_LZMA}'"
+            )
+
         self._db = db
         self._bucket_name = bucket_name
         self._chunk_size_bytes = chunk_size_bytes
+        self._storage = storage
+        self._compression = compression
         self._files_collection = f"{bucket_name}_files"
         self._chunks_collection = f"{bucket_name}_chunks"
+        self._blobs_collection = f"{bucket_name}_blobs"
+        self._chunk_store_collection = f"{bucket_name}_chunk_store"
+        self._chunk_refs_collection = f"{bucket_name}_chunk_refs"
 
         # Process write concern settings
         self._write_concern = write_concern or {}
@@ -214,6 +269,32 @@ class GridFSBucket:
             ON {chunks_coll} (files_id)
         """)
 
+        if self._storage == STORAGE_BLOB:
+            self._db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {quote_table_name(self._blobs_collection)} (
+                    files_id INTEGER PRIMARY KEY,
+                    data BLOB,
+                    FOREIGN KEY (files_id) REFERENCES {files_coll} (id)
+                )
+            """)
+
+        if self._storage == STORAGE_DEDUP:
+            self._db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {quote_table_name(self._chunk_store_collection)} (
+                    hash BLOB PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    refcount INTEGER NOT NULL
+                )
+            """)
+            self._db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {quote_table_name(self._chunk_refs_collection)} (
+                    files_id INTEGER NOT NULL,
+                    n INTEGER NOT NULL,
+                    chunk_hash BLOB NOT NULL,
+                    PRIMARY KEY (files_id, n)
+                ) WITHOUT ROWID
+            """)
+
         # Migrate existing tables to add new columns
         self._migrate_table_schema()
 
@@ -228,7 +309,7 @@ class GridFSBucket:
             pass
 
     def _migrate_table_schema(self):
-        """Migrate existing tables to add new columns for content_type and aliases."""
+        """Migrate existing tables to add new columns for content_type, aliases, storage and compression."""
         files_coll = quote_table_name(self._files_collection)
         try:
             if not column_exists(
@@ -244,10 +325,59 @@ class GridFSBucket:
                 self._db.execute(
                     f"ALTER TABLE {files_coll} ADD COLUMN aliases {column_type}"
                 )
+
+            if not column_exists(self._db, self._files_collection, "storage"):
+                self._db.execute(
+                    f"ALTER TABLE {files_coll} ADD COLUMN storage TEXT"
+                )
+
+            if not column_exists(
+                self._db, self._files_collection, "compression"
+            ):
+                self._db.execute(
+                    f"ALTER TABLE {files_coll} ADD COLUMN compression TEXT"
+                )
         except Exception as e:
             logger.debug(f"{e=}")
             pass
 
+    def _table_exists(self, table_name: str) -> bool:
+        """Check whether one of the bucket's optional storage tables exists."""
+        return (
+            self._db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+                (table_name,),
+            ).fetchone()
+            is not None
+        )
+
+    def _release_file_data(self, file_ids: list[int] | None) -> None:
+        """
+        Delete the data stored for files in every storage mode.
+
+        Args:
+            file_ids: Integer IDs of the files, or None for all files
+        """
+        where, params = "", []
+        if file_ids is not None:
+            where = f" WHERE files_id IN ({','.join('?' * len(file_ids))})"
+            params = file_ids
+        self._db.execute(
+            f"DELETE FROM {self._chunks_collection}{where}", params
+        )
+        if self._table_exists(self._blobs_collection):
+            self._db.execute(
+                f"DELETE FROM {quote_table_name(self._blobs_collection)}{where}",
+                params,
+            )
+        if self._table_exists(self._chunk_refs_collection):
+            release_dedup_chunks(
+                self._db,
+                self._chunk_store_collection,
+                self._chunk_refs_collection,
+                file_ids,
+            )
+
     def _serialize_metadata(
         self, metadata: dict[str, Any] | None
     ) -> str | None:
@@ -308,18 +438,8 @@ class GridFSBucket:
         if session:
             validate_session(session, self._db)
 
-        # Get the data from the source
-        if isinstance(source, bytes):
-            data = source
-        elif hasattr(source, "read"):
-            data = source.read()
-        else:
-            raise TypeError("source must be bytes or a file-like object")
-
-        # Calculate MD5 hash of the data (unless disabled)
-        md5_hash = None
-        if not self._disable_md5:
-            md5_hash = hashlib.md5(data).hexdigest()
+        self._validate_source(source)
+        chunk_size = chunk_size_bytes or self._chunk_size_bytes
 
         # Generate ObjectId for the file
         file_oid = ObjectId()
@@ -327,54 +447,277 @@ class GridFSBucket:
         # Insert file metadata first
         upload_date = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-        cursor = self._db.execute(
-            f"""
-            INSERT INTO {self._files_collection}
-            (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
-            VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                str(file_oid),  # Store ObjectId as hex string
-                filename,
-                len(data),
-                self._chunk_size_bytes,
-                upload_date,
-                md5_hash,
-                serialize_metadata(metadata),
-            ),
-        )
+        with self._upload_transaction():
+            cursor = self._db.execute(
+                f"""
+                INSERT INTO {self._files_collection}
+                (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
+                VALUES (NULL, ?, ?, NULL, ?, ?, NULL, ?)
+            """,
+                (
+                    str(file_oid),  # Store ObjectId as hex string
+                    filename,
+                    chunk_size,
+                    upload_date,
+                    serialize_metadata(metadata),
+                ),
+            )
 
-        file_id = cursor.lastrowid
-        if file_id is None:
-            raise RuntimeError("Failed to get file ID")
+            file_id = cursor.lastrowid
+            if file_id is None:
+                raise RuntimeError("Failed to get file ID")
 
-        # Split data into chunks and insert them
-        self._insert_chunks(file_id, data)
+            # Stream the data in, then record the final length/md5
+            self._store_file_data(
+                file_id,
+                source,
+                chunk_size,
+                self._compression_for(filename, metadata),
+            )
 
         # Force sync if write concern requires it
         self._force_sync_if_needed()
 
         return file_oid
 
-    def _insert_chunks(self, file_id: int, data: bytes):
+    @staticmethod
+    def _validate_source(source: Any) -> None:
         """
-        Split data into chunks and insert them into the chunks collection.
+        Check that an upload source is bytes-like or a readable file object.
 
         Args:
-            file_id: The ID of the file document
-            data: The data to be chunked
+            source: The source passed to one of the upload methods
+
+        Raises:
+            TypeError: If the source cannot be read from
         """
-        # Split data into chunks
-        for i in range(0, len(data), self._chunk_size_bytes):
-            chunk_data = data[i : i + self._chunk_size_bytes]
+        if not isinstance(source, (bytes, bytearray, memoryview)) and not (
+            hasattr(source, "readinto") or hasattr(source, "read")
+        ):
+            raise TypeError("source must be bytes or a file-like object")
 
-            self._db.execute(
+    def _compression_for(
+        self, filename: str, metadata: dict[str, Any] | None
+    ) -> str | None:
+        """
+        Choose the compression method for a new file.
+
+        Args:
+            filename: The name of the file
+            metadata: Optional metadata, whose ``contentType`` is used if set
+
+        Returns:
+            The compression method, or None to store the chunks as-is
+        """
+        content_type = (metadata or {}).get("contentType")
+        return choose_compression(
+            self._compression,
+            filename,
+            content_type if isinstance(content_type, str) else None,
+        )
+
+    @contextmanager
+    def _upload_transaction(self) -> Iterator[None]:
+        """
+        Run an upload inside a single savepoint.
+
+        The file document and all of its chunks are committed together (or
+        rolled back together on error). A savepoint is used so that uploads
+        nest correctly inside an enclosing transaction or session.
+        """
+        self._db.execute("SAVEPOINT gridfs_upload")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK TO SAVEPOINT gridfs_upload")
+            self._db.execute("RELEASE SAVEPOINT gridfs_upload")
+            raise
+        self._db.execute("RELEASE SAVEPOINT gridfs_upload")
+
+    def _store_file_data(
+        self,
+        file_id: int,
+        source: bytes | bytearray | memoryview | io.IOBase,
+        chunk_size: int,
+        compression: str | None = None,
+    ) -> None:
+        """
+        Store a file's data using the bucket's storage mode and finalise it.
+
+        In BLOB mode the data is written as one BLOB row when its size can be
+        determined up front (bytes or seekable sources; other sources are
+        spooled to a temporary file first) and fits in a single SQLite value.
+        Otherwise it is split into chunks. Once the data is stored, the file
+        document's ``length``, ``md5``, ``storage`` and ``compression`` are
+        filled in.
+
+        Args:
+            file_id: The integer ID of the file document
+            source: The data to store (bytes-like or file-like object)
+            chunk_size: The chunk size in bytes
+            compression: Per-chunk compression method for chunked data
+        """
+        md5_hasher = None if self._disable_md5 else hashlib.md5()
+        storage = None
+
+        if self._storage == STORAGE_BLOB:
+            # BLOB-stored data is never compressed, so BLOB reads can address
+            # arbitrary byte ranges directly
+            compression = None
+            spool = None
+            if (length := source_length(source)) is None:
+                spool, length = spool_source(source, chunk_size)
+                source = spool
+            try:
+                if length <= max_blob_length(self._db):
+                    length = write_blob(
+                        self._db,
+                        self._blobs_collection,
+                        file_id,
+                        source,
+                        length,
+                        chunk_size,
+                        md5_hasher,
+                    )
+                    storage = STORAGE_BLOB
+                else:
+                    logger.info(
+                        f"File of {length} bytes exceeds the SQLite value size "
+                        f"limit; storing it in chunks instead of a single BLOB"
+                    )
+                    length = self._insert_chunks(
+                        file_id, source, chunk_size, md5_hasher
+                    )
+            finally:
+                if spool is not None:
+                    spool.close()
+        else:
+            length = self._insert_chunks(
+                file_id, source, chunk_size, md5_hasher, compression
+            )
+            if self._storage == STORAGE_DEDUP:
+                storage = STORAGE_DEDUP
+
+        self._db.execute(
+            f"""
+            UPDATE {self._files_collection}
+            SET length = ?, md5 = ?, storage = ?, compression = ?
+            WHERE id = ?
+        """,
+            (
+                length,
+                md5_hasher.hexdigest() if md5_hasher else None,
+                storage,
+                compression,
+                file_id,
+            ),
+        )
+
+    def _insert_chunks(
+        self,
+        file_id: int,
+        source: bytes | bytearray | memoryview | io.IOBase,
+        chunk_size: int,
+        md5_hasher: Any = None,
+        compression: str | None = None,
+    ) -> int:
+        """
+        Stream data from source into the chunks collection.
+
+        The source is read one chunk at a time into a reusable buffer (using
+        ``readinto`` when the source supports it), the MD5 digest is updated
+        incrementally and chunks are written in batches with ``executemany``,
+        so memory use is bounded by the batch buffer rather than the file
+        size. In dedup mode the batches go to the content-addressed chunk
+        store instead of the chunks table. With compression, each chunk is
+        compressed individually so chunks stay independently readable.
+
+        Args:
+            file_id: The integer ID of the file document
+            source: The data to be chunked (bytes-like or file-like object)
+            chunk_size: The chunk size in bytes
+            md5_hasher: Optional hashlib object updated with the data
+            compression: Optional per-chunk compression method
+
+        Returns:
+            The number of bytes stored
+        """
+        length = 0
+        n = 0
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # Already in memory: bind zero-copy slices of the caller's buffer
+            view = memoryview(source).cast("B")
+            batch = []
+            for offset in range(0, len(view), chunk_size):
+                chunk = view[offset : offset + chunk_size]
+                if md5_hasher:
+                    md5_hasher.update(chunk)
+                batch.append((file_id, n, chunk))
+                n += 1
+                if len(batch) * chunk_size >= UPLOAD_BATCH_BYTES:
+                    self._write_chunk_batch(batch, compression)
+                    batch.clear()
+            if batch:
+                self._write_chunk_batch(batch, compression)
+            length = len(view)
+        else:
+            batch_chunks = max(1, UPLOAD_BATCH_BYTES // chunk_size)
+            buffer = memoryview(bytearray(batch_chunks * chunk_size))
+            eof = False
+            while not eof:
+                batch = []
+                for i in range(batch_chunks):
+                    slot = buffer[i * chunk_size : (i + 1) * chunk_size]
+                    filled = read_into_buffer(source, slot)
+                    if filled:
+                        chunk = slot[:filled]
+                        if md5_hasher:
+                            md5_hasher.update(chunk)
+                        batch.append((file_id, n, chunk))
+                        n += 1
+                        length += filled
+                    if filled < chunk_size:
+                        eof = True
+                        break
+                if batch:
+                    # sqlite3 copies bound BLOBs, so the buffer can be reused
+                    self._write_chunk_batch(batch, compression)
+
+        return length
+
+    def _write_chunk_batch(
+        self,
+        batch: list[tuple[int, int, Any]],
+        compression: str | None = None,
+    ) -> None:
+        """
+        Write a batch of ``(files_id, n, data)`` chunks.
+
+        Args:
+            batch: The chunks to write
+            compression: Optional per-chunk compression method
+        """
+        if compression is not None:
+            batch = [
+                (files_id, n, compress_chunk(data, compression))
+                for files_id, n, data in batch
+            ]
+        if self._storage == STORAGE_DEDUP:
+            insert_dedup_chunks(
+                self._db,
+                self._chunk_store_collection,
+                self._chunk_refs_collection,
+                batch,
+            )
+        else:
+            self._db.executemany(
                 f"""
                 INSERT INTO {self._chunks_collection}
                 (files_id, n, data)
                 VALUES (?, ?, ?)
             """,
-                (file_id, i // self._chunk_size_bytes, chunk_data),
+                batch,
             )
 
     def download_to_stream(
@@ -395,7 +738,8 @@ class GridFSBucket:
         # Get file metadata using integer ID
         row = self._db.execute(
             f"""
-            SELECT length, chunkSize FROM {self._files_collection}
+            SELECT length, chunkSize, storage, compression
+            FROM {self._files_collection}
             WHERE id = ?
         """,
             (file_int_id,),
@@ -404,6 +748,14 @@ class GridFSBucket:
         if row is None:
             raise NoFile(f"File with id {file_id} not found")
 
+        if row[2] is not None or row[3] is not None:
+            # BLOB, dedup and compressed files are decoded by GridOut
+            grid_out = GridOut(self._db, self._bucket_name, file_int_id)
+            buffer = memoryview(bytearray(row[1] or self._chunk_size_bytes))
+            while count := grid_out.readinto(buffer):
+                destination.write(buffer[:count])
+            return
+
         # Get all chunks in order
         cursor = self._db.execute(
             f"""
@@ -564,13 +916,7 @@ class GridFSBucket:
             raise NoFile(f"File with id {file_id} not found")
 
         # Delete chunks first
-        self._db.execute(
-            f"""
-            DELETE FROM {self._chunks_collection}
-            WHERE files_id = ?
-        """,
-            (file_int_id,),
-        )
+        self._release_file_data([file_int_id])
 
         # Delete file document
         cursor = self._db.execute(
@@ -633,6 +979,8 @@ class GridFSBucket:
             metadata,
             disable_md5=self._disable_md5,
             write_concern=self._write_concern,
+            storage=self._storage,
+            compression=self._compression,
         )
 
     def upload_from_stream_with_id(
@@ -679,77 +1027,63 @@ class GridFSBucket:
         if row is not None:
             raise FileExists(f"File with id {file_id} already exists")
 
-        # Get the data from the source
-        if isinstance(source, bytes):
-            data = source
-        elif hasattr(source, "read"):
-            data = source.read()
-        else:
-            raise TypeError("source must be bytes or a file-like object")
-
-        # Calculate MD5 hash of the data (unless disabled)
-        md5_hash = None
-        if not self._disable_md5:
-            md5_hash = hashlib.md5(data).hexdigest()
+        self._validate_source(source)
+        chunk_size = chunk_size_bytes or self._chunk_size_bytes
 
         # Insert file metadata
         upload_date = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-        # When providing a custom ID, we need to handle it properly
-        if isinstance(file_id, ObjectId):
-            # Store the ObjectId in the _id column, let SQLite auto-generate the integer id
-            self._db.execute(
-                f"""
-                INSERT INTO {self._files_collection}
-                (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
-                VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    str(file_id),
-                    filename,
-                    len(data),
-                    chunk_size_bytes or self._chunk_size_bytes,
-                    upload_date,
-                    md5_hash,
-                    serialize_metadata(metadata),
-                ),
-            )
-        else:
-            # When using integer ID as custom ID, store it in both places but in appropriate formats
-            # The integer in the 'id' column as the primary key, and string representation in '_id' column
-            self._db.execute(
-                f"""
-                INSERT INTO {self._files_collection}
-                (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    file_id,  # Use integer ID for the auto-increment column (for compatibility)
-                    str(
-                        file_id
-                    ),  # Store as string in _id column for general searchability
-                    filename,
-                    len(data),
-                    chunk_size_bytes or self._chunk_size_bytes,
-                    upload_date,
-                    md5_hash,
-                    serialize_metadata(metadata),
-                ),
-            )
-
-        # Get the integer ID that was used/created
-        if isinstance(file_id, ObjectId):
-            # If it was an ObjectId, get the auto-generated integer ID
-            file_int_id = self._db.execute(
-                f"SELECT id FROM {self._files_collection} WHERE _id = ?",
-                (str(file_id),),
-            ).fetchone()[0]
-        else:
-            # If it was an integer ID, that's the integer ID
-            file_int_id = file_id
+        with self._upload_transaction():
+            # When providing a custom ID, we need to handle it properly
+            if isinstance(file_id, ObjectId):
+                # Store the ObjectId in the _id column, let SQLite auto-generate the integer id
+                cursor = self._db.execute(
+                    f"""
+                    INSERT INTO {self._files_collection}
+                    (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
+                    VALUES (NULL, ?, ?, NULL, ?, ?, NULL, ?)
+                """,
+                    (
+                        str(file_id),
+                        filename,
+                        chunk_size,
+                        upload_date,
+                        serialize_metadata(metadata),
+                    ),
+                )
+            else:
+                # When using integer ID as custom ID, store it in both places but in appropriate formats
+                # The integer in the 'id' column as the primary key, and string representation in '_id' column
+                cursor = self._db.execute(
+                    f"""
+                    INSERT INTO {self._files_collection}
+                    (id, _id, filename, length, chunkSize, uploadDate, md5, metadata)
+                    VALUES (?, ?, ?, NULL, ?, ?, NULL, ?)
+                """,
+                    (
+                        file_id,  # Use integer ID for the auto-increment column (for compatibility)
+                        str(
+                            file_id
+                        ),  # Store as string in _id column for general searchability
+                        filename,
+                        chunk_size,
+                        upload_date,
+                        serialize_metadata(metadata),
+                    ),
+                )
 
-        # Split data into chunks and insert them
-        self._insert_chunks(file_int_id, data)
+            # The integer ID that was used/created
+            file_int_id = cursor.lastrowid
+            if file_int_id is None:
+                raise RuntimeError("Failed to get file ID")
+
+            # Stream the data in, then record the final length/md5
+            self._store_file_data(
+                file_int_id,
+                source,
+                chunk_size,
+                self._compression_for(filename, metadata),
+            )
 
         # Force sync if write concern requires it
         self._force_sync_if_needed()
@@ -805,6 +1139,8 @@ class GridFSBucket:
             write_concern=self._write_concern,
             content_type=content_type,
             aliases=aliases,
+            storage=self._storage,
+            compression=self._compression,
         )
 
     def delete_by_name(self, filename: str) -> None:
@@ -817,7 +1153,7 @@ class GridFSBucket:
         # Get all file IDs with this filename
         cursor = self._db.execute(
             f"""
-            SELECT _id FROM {self._files_collection}
+            SELECT id FROM {self._files_collection}
             WHERE filename = ?
         """,
             (filename,),
@@ -829,14 +1165,7 @@ class GridFSBucket:
             raise NoFile(f"File with name {filename} not found")
 
         # Delete all chunks for these files
-        placeholders = ",".join("?" * len(file_ids))
-        self._db.execute(
-            f"""
-            DELETE FROM {self._chunks_collection}
-            WHERE files_id IN ({placeholders})
-        """,
-            file_ids,
-        )
+        self._release_file_data(file_ids)
 
         # Delete all file documents
         self._db.execute(
@@ -898,7 +1227,7 @@ class GridFSBucket:
         all files and their associated chunks.
         """
         # Delete all chunks first (foreign key constraint)
-        self._db.execute(f"DELETE FROM {self._chunks_collection}")
+        self._release_file_data(None)
 
         # Delete all files
         self._db.execute(f"DELETE FROM {self._files_collection}")
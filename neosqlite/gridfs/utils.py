@@ -8,12 +8,64 @@ to avoid code duplication and ensure consistent behavior.
 from __future__ import annotations
 
 import ast
+import hashlib
+import io
 import json
 import logging
+import lzma
+import mimetypes
+import tempfile
+import zlib
 from typing import Any
 
+from .._sqlite import sqlite3
+from ..sql_utils import quote_table_name
+from .errors import CorruptGridFile, NoFile
+
 logger = logging.getLogger(__name__)
 
+# Values of the files table ``storage`` column (NULL means chunked storage)
+STORAGE_CHUNKS = "chunks"
+STORAGE_BLOB = "blob"
+STORAGE_DEDUP = "dedup"
+
+# Values of the files table ``compression`` column (NULL means uncompressed)
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_LZMA = "lzma"
+
+# Content types whose data is already compressed, so recompressing it would
+# only cost CPU time
+COMPRESSED_CONTENT_TYPES = frozenset(
+    {
+        "application/gzip",
+        "application/x-gzip",
+        "application/zip",
+        "application/x-7z-compressed",
+        "application/x-bzip2",
+        "application/x-rar-compressed",
+        "application/vnd.rar",
+        "application/x-xz",
+        "application/zstd",
+        "application/x-zstd",
+        "application/pdf",
+        "application/epub+zip",
+        "application/java-archive",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        "font/woff",
+        "font/woff2",
+    }
+)
+# Media types that are compressed unless listed as exceptions below
+COMPRESSED_CONTENT_PREFIXES = ("image/", "audio/", "video/")
+UNCOMPRESSED_MEDIA_TYPES = frozenset(
+    {"image/bmp", "image/svg+xml", "image/tiff", "audio/wav", "audio/x-wav"}
+)
+
+# Data kept in memory before an upload of unknown size spills to a temp file
+BLOB_SPOOL_MAX_MEMORY = 4 * 1024 * 1024
+
 
 def serialize_metadata(metadata: dict[str, Any] | None) -> str | None:
     """
@@ -147,10 +199,420 @@ def force_sync_if_needed(
         db_connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
 
 
+def read_into_buffer(source: Any, buffer: memoryview) -> int:
+    """
+    Fill buffer from a file-like source, stopping early only at end of file.
+
+    Uses ``readinto`` when available so no intermediate bytes objects are
+    created, and falls back to ``read`` otherwise. Short reads (e.g. from
+    pipes or sockets) are retried so every chunk except the last is full.
+
+    Args:
+        source: A readable file-like object
+        buffer: The writable buffer to fill
+
+    Returns:
+        The number of bytes written into buffer
+    """
+    filled = 0
+    size = len(buffer)
+    readinto = getattr(source, "readinto", None)
+    while filled < size:
+        if readinto is not None:
+            count = readinto(buffer[filled:])
+        else:
+            data = source.read(size - filled)
+            count = len(data) if data else 0
+            if count:
+                buffer[filled : filled + count] = data
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def blob_io_supported(db_connection: Any) -> bool:
+    """
+    Check whether the connection supports incremental BLOB I/O.
+
+    ``sqlite3.Connection.blobopen`` is available from Python 3.11 in the
+    standard library module (pysqlite3 builds may not provide it).
+
+    Args:
+        db_connection: SQLite database connection
+
+    Returns:
+        True if ``blobopen`` can be used on this connection
+    """
+    return hasattr(db_connection, "blobopen")
+
+
+def max_blob_length(db_connection: Any) -> int:
+    """
+    Return the largest BLOB the connection can store in a single row.
+
+    Args:
+        db_connection: SQLite database connection
+
+    Returns:
+        The SQLITE_LIMIT_LENGTH value (SQLite's compiled default if unknown)
+    """
+    try:
+        # The constant (and getlimit) only exist from Python 3.11; its C
+        # value is 0
+        limit = getattr(sqlite3, "SQLITE_LIMIT_LENGTH", 0)
+        return db_connection.getlimit(limit)
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.debug(f"Could not read SQLITE_LIMIT_LENGTH: {e}")
+        return 1_000_000_000
+
+
+def source_length(source: Any) -> int | None:
+    """
+    Determine how many bytes remain in an upload source without reading it.
+
+    Args:
+        source: Bytes-like object or file-like object
+
+    Returns:
+        The remaining length, or None if the source is not seekable
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    try:
+        if source.seekable():
+            position = source.tell()
+            end = source.seek(0, io.SEEK_END)
+            source.seek(position)
+            return end - position
+    except (AttributeError, OSError, ValueError) as e:
+        logger.debug(f"Upload source is not seekable: {e}")
+    return None
+
+
+def spool_source(source: Any, buffer_size: int) -> tuple[Any, int]:
+    """
+    Copy a non-seekable source into a spooled temporary file.
+
+    Small sources stay in memory; larger ones spill to disk, so the total
+    size can be determined without holding the whole file in RAM.
+
+    Args:
+        source: A readable file-like object
+        buffer_size: Size of the copy buffer in bytes
+
+    Returns:
+        A tuple of the rewound spooled file and its length
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=BLOB_SPOOL_MAX_MEMORY)
+    buffer = memoryview(bytearray(buffer_size))
+    while count := read_into_buffer(source, buffer):
+        spool.write(buffer[:count])
+    length = spool.tell()
+    spool.seek(0)
+    return spool, length
+
+
+def write_blob(
+    db_connection: Any,
+    blobs_table: str,
+    files_id: int,
+    source: Any,
+    length: int,
+    buffer_size: int,
+    md5_hasher: Any = None,
+) -> int:
+    """
+    Store file data as a single BLOB row using incremental BLOB I/O.
+
+    A ``zeroblob(length)`` row is inserted first and the data is then
+    streamed into it through ``Connection.blobopen`` with a reusable buffer,
+    so neither the file nor the BLOB is ever materialised in Python.
+
+    Args:
+        db_connection: SQLite database connection supporting ``blobopen``
+        blobs_table: Unquoted name of the bucket's blobs table
+        files_id: Integer ID of the file document (the row's rowid)
+        source: Bytes-like object or readable file-like object
+        length: Number of bytes to store
+        buffer_size: Size of the copy buffer in bytes
+        md5_hasher: Optional hashlib object updated with the data written
+
+    Returns:
+        The number of bytes actually written
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    db_connection.execute(
+        f"INSERT INTO {quote_table_name(blobs_table)} (files_id, data) "
+        f"VALUES (?, zeroblob(?))",
+        (files_id, length),
+    )
+
+    written = 0
+    if length:
+        buffer = memoryview(bytearray(min(buffer_size, length)))
+        with db_connection.blobopen(blobs_table, "data", files_id) as blob:
+            while written < length:
+                count = read_into_buffer(
+                    source, buffer[: min(len(buffer), length - written)]
+                )
+                if not count:
+                    break
+                blob.write(buffer[:count])
+                if md5_hasher:
+                    md5_hasher.update(buffer[:count])
+                written += count
+
+    if written < length:
+        # The source ended early: trim the unused tail of the zeroblob
+        db_connection.execute(
+            f"UPDATE {quote_table_name(blobs_table)} "
+            f"SET data = substr(data, 1, ?) WHERE files_id = ?",
+            (written, files_id),
+        )
+    return written
+
+
+def read_blob_range(
+    db_connection: Any,
+    blobs_table: str,
+    files_id: int,
+    offset: int,
+    size: int,
+) -> bytes:
+    """
+    Read part of a file stored as a single BLOB row.
+
+    Uses incremental BLOB I/O when available and falls back to ``substr()``
+    otherwise, so BLOB-stored files stay readable on every Python version.
+
+    Args:
+        db_connection: SQLite database connection
+        blobs_table: Unquoted name of the bucket's blobs table
+        files_id: Integer ID of the file document
+        offset: Byte offset to start reading from
+        size: Maximum number of bytes to read
+
+    Returns:
+        The bytes read (shorter than size at the end of the BLOB)
+    """
+    if blob_io_supported(db_connection):
+        with db_connection.blobopen(
+            blobs_table, "data", files_id, readonly=True
+        ) as blob:
+            blob.seek(offset)
+            return blob.read(size)
+
+    row = db_connection.execute(
+        f"SELECT substr(data, ?, ?) FROM {quote_table_name(blobs_table)} "
+        f"WHERE files_id = ?",
+        (offset + 1, size, files_id),
+    ).fetchone()
+    if row is None:
+        raise NoFile(f"BLOB for file id {files_id} not found")
+    return row[0] or b""
+
+
+def insert_dedup_chunks(
+    db_connection: Any,
+    store_table: str,
+    refs_table: str,
+    chunks: list[tuple[int, int, Any]],
+) -> None:
+    """
+    Store chunks content-addressed, writing each unique payload only once.
+
+    Each chunk is identified by the SHA-256 digest of its data. New payloads
+    are inserted into the chunk store with a reference count of 1; payloads
+    already present only have their reference count incremented. The file
+    keeps a ``(files_id, n, chunk_hash)`` mapping per chunk.
+
+    Args:
+        db_connection: SQLite database connection
+        store_table: Unquoted name of the bucket's chunk store table
+        refs_table: Unquoted name of the bucket's chunk mapping table
+        chunks: ``(files_id, n, data)`` tuples to store
+    """
+    if not chunks:
+        return
+    rows = [
+        (files_id, n, hashlib.sha256(data).digest(), data)
+        for files_id, n, data in chunks
+    ]
+    db_connection.executemany(
+        f"""
+        INSERT INTO {quote_table_name(store_table)} (hash, data, refcount)
+        VALUES (?, ?, 1)
+        ON CONFLICT(hash) DO UPDATE SET refcount = refcount + 1
+    """,
+        [(digest, data) for _, _, digest, data in rows],
+    )
+    db_connection.executemany(
+        f"""
+        INSERT INTO {quote_table_name(refs_table)} (files_id, n, chunk_hash)
+        VALUES (?, ?, ?)
+    """,
+        [(files_id, n, digest) for files_id, n, digest, _ in rows],
+    )
+
+
+def release_dedup_chunks(
+    db_connection: Any,
+    store_table: str,
+    refs_table: str,
+    file_ids: list[int] | None = None,
+) -> None:
+    """
+    Drop the chunk mappings of files and release the payloads they reference.
+
+    Reference counts are decremented once per mapping and payloads that are
+    no longer referenced by any file are deleted from the chunk store.
+
+    Args:
+        db_connection: SQLite database connection
+        store_table: Unquoted name of the bucket's chunk store table
+        refs_table: Unquoted name of the bucket's chunk mapping table
+        file_ids: Integer IDs of the files being deleted, or None for all
+    """
+    store = quote_table_name(store_table)
+    refs = quote_table_name(refs_table)
+    if file_ids is None:
+        db_connection.execute(f"DELETE FROM {refs}")
+        db_connection.execute(f"DELETE FROM {store}")
+        return
+    if not file_ids:
+        return
+
+    placeholders = ",".join("?" * len(file_ids))
+    released = db_connection.execute(
+        f"""
+        SELECT chunk_hash, COUNT(*) FROM {refs}
+        WHERE files_id IN ({placeholders})
+        GROUP BY chunk_hash
+    """,
+        file_ids,
+    ).fetchall()
+    db_connection.execute(
+        f"DELETE FROM {refs} WHERE files_id IN ({placeholders})", file_ids
+    )
+    db_connection.executemany(
+        f"UPDATE {store} SET refcount = refcount - ? WHERE hash = ?",
+        [(count, digest) for digest, count in released],
+    )
+    db_connection.executemany(
+        f"DELETE FROM {store} WHERE hash = ? AND refcount <= 0",
+        [(digest,) for digest, _ in released],
+    )
+
+
+def choose_compression(
+    compression: str | None, filename: str | None, content_type: str | None
+) -> str | None:
+    """
+    Decide whether a file's chunks should be compressed.
+
+    Files whose content type (given, or guessed from the filename) is an
+    already-compressed format such as images, video, archives or PDFs are
+    stored as-is.
+
+    Args:
+        compression: The bucket's compression method, or None
+        filename: The name of the file
+        content_type: The MIME type of the file, if known
+
+    Returns:
+        The compression method to use for the file, or None
+    """
+    if compression is None:
+        return None
+    if content_type is None and filename:
+        content_type, encoding = mimetypes.guess_type(filename)
+        if encoding is not None:
+            # e.g. "logs.tar.gz" is already gzip/bzip2/xz encoded
+            return None
+    if content_type is None:
+        return compression
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    if content_type in COMPRESSED_CONTENT_TYPES or (
+        content_type.startswith(COMPRESSED_CONTENT_PREFIXES)
+        and content_type not in UNCOMPRESSED_MEDIA_TYPES
+    ):
+        return None
+    return compression
+
+
+def compress_chunk(data: Any, compression: str | None) -> Any:
+    """
+    Compress chunk data with the given method.
+
+    Args:
+        data: The chunk data (bytes-like)
+        compression: "zlib", "lzma" or None
+
+    Returns:
+        The compressed data, or data unchanged if compression is None
+    """
+    match compression:
+        case None:
+            return data
+        case "zlib":
+            return zlib.compress(data)
+        case "lzma":
+            return lzma.compress(data)
+        case _:
+            raise ValueError(f"Unsupported GridFS compression: {compression}")
+
+
+def decompress_chunk(data: Any, compression: str | None) -> Any:
+    """
+    Decompress chunk data stored with the given method.
+
+    Args:
+        data: The stored chunk data
+        compression: "zlib", "lzma" or None
+
+    Returns:
+        The original chunk data
+
+    Raises:
+        CorruptGridFile: If the data cannot be decompressed
+    """
+    try:
+        match compression:
+            case None:
+                return data
+            case "zlib":
+                return zlib.decompress(data)
+            case "lzma":
+                return lzma.decompress(data)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise CorruptGridFile(f"Cannot decompress chunk: {e}") from e
+    raise CorruptGridFile(f"Unsupported GridFS compression: {compression}")
+
+
 __all__ = [
     "serialize_metadata",
     "deserialize_metadata",
     "serialize_aliases",
     "deserialize_aliases",
     "force_sync_if_needed",
+    "read_into_buffer",
+    "blob_io_supported",
+    "max_blob_length",
+    "source_length",
+    "spool_source",
+    "write_blob",
+    "read_blob_range",
+    "insert_dedup_chunks",
+    "release_dedup_chunks",
+    "choose_compression",
+    "compress_chunk",
+    "decompress_chunk",
+    "STORAGE_CHUNKS",
+    "STORAGE_BLOB",
+    "STORAGE_DEDUP",
+    "COMPRESSION_ZLIB",
+    "COMPRESSION_LZMA",
 ]
@@ -0,0 +1,527 @@
+"""Workload-driven index suggestions from recorded query shapes."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .collection.json_path_utils import parse_json_path
+from .collection.statistics import DEFAULT_MATCH_SELECTIVITY
+from .index_model import IndexModel
+
+if TYPE_CHECKING:
+    from .collection import Collection
+    from .connection import Connection
+
+# Average latency above which a query shape is worth explaining
+DEFAULT_SLOW_MS = 10.0
+
+# Most distinct shapes remembered; later new shapes are only counted
+DEFAULT_MAX_SHAPES = 1000
+
+# Executions with the same equality value before it suggests a partial index
+MIN_CONSTANT_EXECUTIONS = 2
+
+EQUALITY = "eq"
+RANGE = "range"
+
+_EQUALITY_OPERATORS = frozenset({"$eq", "$in", "$all"})
+_RANGE_OPERATORS = frozenset({"$gt", "$gte", "$lt", "$lte"})
+
+# Marks an equality value that changed between executions
+_VARIES = object()
+
+
+def normalize_filter(filter: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Reduce a filter to its shape: the class of condition on each field.
+
+    Values are dropped, so ``{"a": 1, "b": {"$gt": 2}}`` and
+    ``{"a": 7, "b": {"$gt": 0}}`` share the shape
+    ``{"a": "eq", "b": "range"}``. Operators that cannot seek an index
+    (``$ne``, ``$regex``, ...) keep their name; ``$or`` and ``$nor`` keep
+    the shapes of their branches.
+    """
+    shape: dict[str, Any] = {}
+    for key, condition in (filter or {}).items():
+        if key == "$and" and isinstance(condition, list):
+            for clause in condition:
+                if isinstance(clause, dict):
+                    for field_name, kind in normalize_filter(clause).items():
+                        shape.setdefault(field_name, kind)
+        elif key in ("$or", "$nor") and isinstance(condition, list):
+            shape[key] = [
+                normalize_filter(clause)
+                for clause in condition
+                if isinstance(clause, dict)
+            ]
+        elif key.startswith("$"):
+            shape[key] = key
+        else:
+            shape[key] = _condition_kind(condition)
+    return shape
+
+
+def _condition_kind(condition: Any) -> str:
+    if not isinstance(condition, dict) or not any(
+        str(op).startswith("$") for op in condition
+    ):
+        return EQUALITY
+    operators = set(condition)
+    if operators <= _EQUALITY_OPERATORS:
+        return EQUALITY
+    if operators <= _RANGE_OPERATORS:
+        return RANGE
+    return ",".join(sorted(operators))
+
+
+def _equality_value(condition: Any) -> Any:
+    """The single value an equality condition matches, else _VARIES."""
+    if not isinstance(condition, dict):
+        return condition
+    if set(condition) == {"$eq"}:
+        return condition["$eq"]
+    if any(str(op).startswith("$") for op in condition):
+        return _VARIES
+    return condition
+
+
+@dataclass
+class QueryShape:
+    """Executions of one normalised filter and sort on one collection."""
+
+    collection: str
+    operation: str
+    filter: dict[str, Any]
+    sort: list[tuple[str, int]]
+    example: dict[str, Any]
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    # Equality values that have been the same in every execution
+    constants: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def document(self) -> dict[str, Any]:
+        """The shape's figures as reported by :meth:`IndexAdvisor.shapes`."""
+        return {
+            "collection": self.collection,
+            "operation": self.operation,
+            "filter": self.filter,
+            "sort": self.sort,
+            "count": self.count,
+            "totalMillis": round(self.total_ms, 3),
+            "averageMillis": round(self.average_ms, 3),
+            "maxMillis": round(self.max_ms, 3),
+        }
+
+
+class IndexAdvisor:
+    """
+    Records the query shapes run through a connection and suggests indexes.
+
+    Enable it with ``Connection(..., index_advisor=True)``. Finds (timed
+    while their cursor is consumed), aggregations, counts, updates and
+    deletes are recorded by the shape of their filter and sort, with
+    execution counts and latencies. :meth:`suggest` explains the slow
+    shapes and proposes single, compound, partial or multikey indexes for
+    those that scan the collection or sort in a temporary B-tree;
+    :meth:`create_suggested_indexes` builds them, e.g. during a
+    maintenance window.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        slow_ms: float = DEFAULT_SLOW_MS,
+        max_shapes: int = DEFAULT_MAX_SHAPES,
+    ) -> None:
+        """
+        Args:
+            connection: The connection whose queries are recorded.
+            slow_ms: Average milliseconds from which a shape is explained.
+            max_shapes: Most distinct shapes remembered.
+        """
+        self._connection = connection
+        self.slow_ms = slow_ms
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self._shapes: dict[tuple[str, str, str], QueryShape] = {}
+        self.dropped = 0
+
+    def record(
+        self,
+        collection: str,
+        operation: str,
+        filter: dict[str, Any] | None,
+        sort: dict[str, int] | None,
+        elapsed_ms: float,
+    ) -> None:
+        """Add one execution of a query to its shape's figures."""
+        filter = filter or {}
+        shape = normalize_filter(filter)
+        sort_keys = [
+            (key, direction) for key, direction in (sort or {}).items()
+        ]
+        key = (
+            collection,
+            operation,
+            json.dumps([shape, sort_keys], sort_keys=True, default=str),
+        )
+        with self._lock:
+            recorded = self._shapes.get(key)
+            if recorded is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.dropped += 1
+                    return
+                recorded = QueryShape(
+                    collection, operation, shape, sort_keys, filter
+                )
+                recorded.constants = {
+                    name: value
+                    for name, kind in shape.items()
+                    if kind == EQUALITY
+                    and name in filter
+                    and (value := _equality_value(filter[name])) is not _VARIES
+                }
+                self._shapes[key] = recorded
+            else:
+                for name, value in list(recorded.constants.items()):
+                    if (
+                        name not in filter
+                        or _equality_value(filter[name]) != value
+                    ):
+                        del recorded.constants[name]
+            recorded.count += 1
+            recorded.total_ms += elapsed_ms
+            recorded.max_ms = max(recorded.max_ms, elapsed_ms)
+
+    @contextmanager
+    def observe(
+        self,
+        collection: str,
+        operation: str,
+        filter: dict[str, Any] | None,
+        sort: dict[str, int] | None = None,
+    ) -> Iterator[None]:
+        """Time the enclosed block as one execution of a query."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(
+                collection,
+                operation,
+                filter,
+                sort,
+                (time.perf_counter() - started) * 1000,
+            )
+
+    def timed(
+        self,
+        documents: Iterator[dict[str, Any]],
+        collection: str,
+        operation: str,
+        filter: dict[str, Any] | None,
+        sort: dict[str, int] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield from a cursor's documents, timing only the work of producing
+        them: time the caller spends between documents is not counted.
+        """
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    document = next(documents)
+                except StopIteration:
+                    elapsed += time.perf_counter() - started
+                    return
+                elapsed += time.perf_counter() - started
+                yield document
+        finally:
+            self.record(collection, operation, filter, sort, elapsed * 1000)
+
+    def shapes(self, collection: str | None = None) -> list[dict[str, Any]]:
+        """
+        The recorded shapes, most total time first.
+
+        Args:
+            collection: Only report this collection's shapes.
+        """
+        with self._lock:
+            shapes = [
+                shape
+                for shape in self._shapes.values()
+                if collection is None or shape.collection == collection
+            ]
+        shapes.sort(key=lambda shape: shape.total_ms, reverse=True)
+        return [shape.document() for shape in shapes]
+
+    def reset(self) -> None:
+        """Forget every recorded shape."""
+        with self._lock:
+            self._shapes.clear()
+            self.dropped = 0
+
+    def suggest(
+        self,
+        collection: str | None = None,
+        slow_ms: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Suggest indexes for the slow shapes that scan or sort.
+
+        Each slow shape's example query is explained; shapes whose plan
+        uses an index for both filter and sort are left alone. Candidate
+        keys follow the equality, sort, range rule: equality fields first,
+        then the sort keys, then one range field. An equality value that
+        was the same in every execution becomes a partial index's filter
+        instead of a key, and an equality on a field holding arrays gets
+        a multikey index. Suggestions for the same index are merged.
+
+        The estimated benefit is the shape's total time multiplied by the
+        fraction of documents the index lets the query skip, from the
+        collection's sampled statistics. It is a rough guide for ranking
+        suggestions, not a prediction.
+
+        Args:
+            collection: Only advise on this collection.
+            slow_ms: Average milliseconds from which a shape is considered,
+                instead of :attr:`slow_ms`.
+
+        Returns:
+            list[dict[str, Any]]: Suggestions, largest benefit first, each
+                with the collection, the index keys as ``(field, direction)``
+                pairs, its kind (single, compound, partial or multikey), the
+                ``IndexModel`` options, the estimated benefit in
+                milliseconds, the shapes it serves and their query plans.
+        """
+        threshold = self.slow_ms if slow_ms is None else slow_ms
+        with self._lock:
+            shapes = [
+                shape
+                for shape in self._shapes.values()
+                if shape.average_ms >= threshold
+                and (collection is None or shape.collection == collection)
+            ]
+        suggestions: dict[tuple[Any, ...], dict[str, Any]] = {}
+        for shape in shapes:
+            suggestion = self._suggest_for(shape)
+            if suggestion is None:
+                continue
+            # Indexes are named after their fields, so suggestions on the
+            # same fields are one index; a full index serves partial ones
+            key = (
+                suggestion["collection"],
+                tuple(name for name, _ in suggestion["keys"]),
+                suggestion["kind"] == "multikey",
+            )
+            if key in suggestions:
+                merged = suggestions[key]
+                if merged["options"] != suggestion["options"]:
+                    merged["options"].pop("partialFilterExpression", None)
+                    merged["keys"] = [(name, 1) for name, _ in merged["keys"]]
+                    merged["kind"] = (
+                        "single" if len(merged["keys"]) == 1 else "compound"
+                    )
+                merged["estimatedBenefitMillis"] += suggestion[
+                    "estimatedBenefitMillis"
+                ]
+                merged["shapes"].extend(suggestion["shapes"])
+                merged["plans"].extend(suggestion["plans"])
+            else:
+                suggestions[key] = suggestion
+        result = list(suggestions.values())
+        for suggestion in result:
+            suggestion["estimatedBenefitMillis"] = round(
+                suggestion["estimatedBenefitMillis"], 3
+            )
+        result.sort(key=lambda s: s["estimatedBenefitMillis"], reverse=True)
+        return result
+
+    def _suggest_for(self, shape: QueryShape) -> dict[str, Any] | None:
+        if shape.collection not in self._connection.list_collection_names():
+            return None
+        collection = self._connection.get_collection(shape.collection)
+        fields = {
+            name: kind
+            for name, kind in shape.filter.items()
+            if not name.startswith("$")
+        }
+        if fields.get("_id") == EQUALITY:
+            # Served by the _id index
+            return None
+        plan = self._plan(collection, shape)
+        if plan is None:
+            return None
+        scans = any(_is_table_scan(detail) for detail in plan)
+        sorts = any("USE TEMP B-TREE" in detail for detail in plan)
+        if not scans and not sorts:
+            return None
+
+        statistics = collection.statistics
+        arrays = {
+            name
+            for name in (*fields, *(key for key, _ in shape.sort))
+            if name != "_id"
+            and (stats := statistics.path_statistics(parse_json_path(name)))
+            and stats["array_fraction"] > 0
+        }
+        equalities = [
+            name
+            for name, kind in fields.items()
+            if kind == EQUALITY and name != "_id" and name not in arrays
+        ]
+        constants = {
+            name: value
+            for name, value in shape.constants.items()
+            if name in equalities and shape.count >= MIN_CONSTANT_EXECUTIONS
+        }
+        keys: list[tuple[str, int]] = [
+            (name, 1) for name in equalities if name not in constants
+        ]
+        for name, direction in shape.sort:
+            if name not in arrays and name not in dict(keys):
+                keys.append((name, direction))
+        ranges = [
+            name
+            for name, kind in fields.items()
+            if kind == RANGE and name != "_id" and name not in arrays
+        ]
+        if ranges and ranges[0] not in dict(keys):
+            keys.append((ranges[0], 1))
+
+        options: dict[str, Any] = {}
+        if keys and constants:
+            kind = "partial"
+            options["partialFilterExpression"] = constants
+        elif constants:
+            keys = [(name, 1) for name in constants]
+            constants = {}
+            kind = "single" if len(keys) == 1 else "compound"
+        elif keys:
+            kind = "single" if len(keys) == 1 else "compound"
+        else:
+            multikey = [
+                name
+                for name, kind in fields.items()
+                if name in arrays and (kind == EQUALITY or kind == RANGE)
+            ]
+            if not multikey:
+                return None
+            keys = [(multikey[0], 1)]
+            kind = "multikey"
+            options["multikey"] = True
+        if _is_served(collection, keys, kind):
+            return None
+
+        served = {name for name, _ in keys} | set(constants)
+        selectivity = statistics.selectivity(
+            {
+                name: condition
+                for name, condition in shape.example.items()
+                if name in served
+            }
+        )
+        if selectivity is None:
+            selectivity = DEFAULT_MATCH_SELECTIVITY
+        if not any(name in fields for name in served):
+            # The index only saves the sort
+            selectivity = DEFAULT_MATCH_SELECTIVITY
+        return {
+            "collection": shape.collection,
+            "keys": keys,
+            "kind": kind,
+            "options": options,
+            "estimatedBenefitMillis": shape.total_ms * (1 - selectivity),
+            "shapes": [shape.document()],
+            "plans": [plan],
+        }
+
+    def _plan(
+        self, collection: Collection, shape: QueryShape
+    ) -> list[str] | None:
+        """The query plan details of a shape's example, or None if its
+        filter cannot run as SQL (an index would not help it)."""
+        if shape.example:
+            where = collection.query_engine.helpers._build_simple_where_clause(
+                shape.example
+            )
+            if where is None:
+                return None
+        cursor = collection.find(shape.example)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        explained = cursor.explain()
+        if "error" in explained:
+            return None
+        return [
+            stage["detail"]
+            for stage in explained["queryPlanner"]["winningPlan"]
+        ]
+
+    def create_suggested_indexes(
+        self,
+        suggestions: list[dict[str, Any]] | None = None,
+        min_benefit_ms: float = 0.0,
+    ) -> dict[str, list[str]]:
+        """
+        Create suggested indexes with :meth:`IndexManager.create_indexes`.
+
+        Index builds lock the collection while they scan it, so run this
+        when the database is quiet.
+
+        Args:
+            suggestions: Suggestions from :meth:`suggest` (default: all
+                current suggestions).
+            min_benefit_ms: Skip suggestions with a smaller estimated
+                benefit.
+
+        Returns:
+            dict[str, list[str]]: The names of the created indexes, by
+                collection.
+        """
+        if suggestions is None:
+            suggestions = self.suggest()
+        models: dict[str, list[IndexModel]] = {}
+        for suggestion in suggestions:
+            if suggestion["estimatedBenefitMillis"] < min_benefit_ms:
+                continue
+            models.setdefault(suggestion["collection"], []).append(
+                IndexModel(list(suggestion["keys"]), **suggestion["options"])
+            )
+        return {
+            name: self._connection.get_collection(name).create_indexes(indexes)
+            for name, indexes in models.items()
+        }
+
+
+def _is_table_scan(detail: str) -> bool:
+    return detail.startswith("SCAN ") and " INDEX " not in detail
+
+
+def _is_served(
+    collection: Collection, keys: list[tuple[str, int]], kind: str
+) -> bool:
+    """Whether an existing index already starts with the suggested keys."""
+    if kind == "multikey":
+        return (
+            parse_json_path(keys[0][0])
+            in collection.indexes.multikey_index_tables()
+        )
+    fields = [name for name, _ in keys]
+    for info in collection.index_information().values():
+        existing = list(info.get("key", {}))
+        if existing[: len(fields)] == fields:
+            return True
+    return False
@@ -1,4 +1,6 @@
+import math
 import re
+from typing import Any, Sequence
 
 
 def quote_identifier(identifier: str) -> str:
@@ -34,3 +36,66 @@ def quote_table_name(name: str) -> str:
     Safely quote a table name. In NeoSQLite, table names are the same as collection names.
     """
     return quote_identifier(name)
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Render a scalar as a SQL literal.
+
+    Used where SQLite does not accept bound parameters, such as the WHERE
+    clause of a partial index.
+
+    Args:
+        value: None, a bool, a finite int or float, or a str.
+
+    Returns:
+        str: The SQL literal.
+
+    Raises:
+        ValueError: If the value has no safe literal form.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float) and math.isfinite(value):
+        return repr(value)
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise ValueError(
+        f"Cannot use a {type(value).__name__} value as a SQL literal"
+    )
+
+
+def inline_parameters(sql: str, params: Sequence[Any]) -> str:
+    """
+    Replace the ``?`` placeholders in a SQL fragment with literal values.
+
+    Placeholders inside single-quoted strings (such as JSON paths) are left
+    alone.
+
+    Raises:
+        ValueError: If the placeholder and parameter counts differ, or a
+            parameter has no safe literal form.
+    """
+    values = iter(params)
+    parts: list[str] = []
+    in_string = False
+    for char in sql:
+        if char == "'":
+            in_string = not in_string
+        if char == "?" and not in_string:
+            try:
+                parts.append(sql_literal(next(values)))
+            except StopIteration:
+                raise ValueError("More placeholders than parameters") from None
+        else:
+            parts.append(char)
+    if next(values, _NO_VALUE) is not _NO_VALUE:
+        raise ValueError("More parameters than placeholders")
+    return "".join(parts)
+
+
+_NO_VALUE = object()
@@ -0,0 +1,108 @@
+"""Background deletion of documents expired by TTL indexes."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from ._sqlite import sqlite3
+from .collection.index_manager import (
+    DEFAULT_EXPIRE_BATCH_SIZE,
+    ttl_collection_names,
+)
+
+if TYPE_CHECKING:
+    from .connection import Connection
+
+logger = logging.getLogger(__name__)
+
+# MongoDB's TTL monitor also wakes up once a minute
+DEFAULT_TTL_MONITOR_INTERVAL = 60.0
+
+
+class TTLMonitor:
+    """
+    Periodically deletes expired documents from every TTL-indexed collection.
+
+    The monitor's thread uses its own connection to the database file, so
+    its small delete batches never join a transaction open on the
+    application's connection; SQLite's locking interleaves them with other
+    writers.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        interval: float = DEFAULT_TTL_MONITOR_INTERVAL,
+        batch_size: int = DEFAULT_EXPIRE_BATCH_SIZE,
+    ) -> None:
+        """
+        Args:
+            connection: The connection whose database file is watched.
+            interval: Seconds between passes.
+            batch_size: Most documents deleted per statement.
+
+        Raises:
+            ValueError: If the database is in memory or the interval is not
+                positive.
+        """
+        if connection.db_path == ":memory:":
+            raise ValueError("The TTL monitor needs a database file")
+        if interval <= 0:
+            raise ValueError("TTL monitor interval must be positive")
+        self._db_path = connection.db_path
+        self._journal_mode = connection.journal_mode
+        self._auto_vacuum = connection.auto_vacuum
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the monitor thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="neosqlite-ttl-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the monitor thread, waiting for a pass in progress."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        from .connection import Connection
+
+        connection = Connection(
+            self._db_path,
+            journal_mode=self._journal_mode,
+            auto_vacuum=self._auto_vacuum,
+        )
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    self.run_once(connection)
+                except sqlite3.Error as e:
+                    # Most likely the database was busy; retry next pass
+                    logger.warning(f"TTL monitor pass failed: {e}")
+        finally:
+            connection.close()
+
+    def run_once(self, connection: Connection) -> int:
+        """
+        Expire documents in every collection with a TTL index.
+
+        Returns:
+            int: The number of documents deleted.
+        """
+        deleted = 0
+        for name in ttl_collection_names(connection.db):
+            if self._stop.is_set():
+                break
+            deleted += connection.get_collection(name).expire(self.batch_size)
+        return deleted
@@ -4,6 +4,7 @@ from nx_27017.handler import NeoSQLiteHandler
 from nx_27017.nx_27017 import main
 from nx_27017.server import run_server
 from nx_27017.wire_protocol import (
+    OP_COMPRESSED,
     OP_MSG,
     OP_QUERY,
     ResponseBuilder,
@@ -12,6 +13,7 @@ from nx_27017.wire_protocol import (
 
 __all__ = [
     "NeoSQLiteHandler",
+    "OP_COMPRESSED",
     "OP_MSG",
     "OP_QUERY",
     "ResponseBuilder",
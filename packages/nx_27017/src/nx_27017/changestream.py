@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
 import time
 import uuid
 from datetime import datetime, timezone
@@ -14,6 +16,45 @@ logger = logging.getLogger("nx_27017")
 # Counter for generating unique cursor IDs
 _cursor_id_counter = count(1000)
 
+# Worker processes started with --workers get disjoint cursor ID ranges: the
+# worker index lives in the bits above CURSOR_ID_WORKER_SHIFT
+CURSOR_ID_WORKER_SHIFT = 48
+_worker_index = 0
+_in_worker_pool = False
+
+
+def next_cursor_id() -> int:
+    """Allocate a cursor ID unique across worker processes."""
+    return next(_cursor_id_counter)
+
+
+def seed_cursor_ids(worker_index: int) -> None:
+    """Give the current worker process its own range of cursor IDs."""
+    global _cursor_id_counter, _worker_index, _in_worker_pool
+    _worker_index = worker_index
+    _in_worker_pool = True
+    _cursor_id_counter = count((worker_index << CURSOR_ID_WORKER_SHIFT) + 1000)
+
+
+def cursor_worker(cursor_id: int) -> int:
+    """Get the index of the worker process that opened a cursor."""
+    return cursor_id >> CURSOR_ID_WORKER_SHIFT
+
+
+def current_worker() -> int:
+    """Get the index of the current worker process."""
+    return _worker_index
+
+
+def in_worker_pool() -> bool:
+    """
+    Whether this process is one of several workers sharing the port.
+
+    A client's next request may then reach a sibling worker, which sees
+    neither this process's cursors nor its change streams.
+    """
+    return _in_worker_pool
+
 
 class ChangeStreamCursor:
     """A cursor-like object for change streams."""
@@ -31,7 +72,7 @@ class ChangeStreamCursor:
         self.resume_after = resume_after
         self.start_at_operation_time = start_at_operation_time
         self.full_document = full_document or "default"
-        self._id = next(_cursor_id_counter)  # Integer cursor ID
+        self._id = next_cursor_id()  # Integer cursor ID
         self._stream_id = str(
             uuid.uuid4()
         )  # String stream ID for internal tracking
@@ -39,6 +80,17 @@ class ChangeStreamCursor:
         self._start_time = time.time()
         self._changes: list[dict] = []
         self._position = 0
+        # Token of the last event handed to the client
+        self._resume_token: dict = {"_data": self._stream_id}
+
+        # Changes arrive on the writer thread while getMore waits elsewhere:
+        # threaded clients block on the condition, asyncio clients await an
+        # event woken through their own loop
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._async_waiters: list[
+            tuple[asyncio.AbstractEventLoop, asyncio.Event]
+        ] = []
 
         # Extract filter from $match stage if present
         self._filter = self._extract_filter()
@@ -51,8 +103,10 @@ class ChangeStreamCursor:
         return {}
 
     def close(self) -> None:
-        """Close the change stream."""
-        self._closed = True
+        """Close the change stream, waking any waiting getMore."""
+        with self._lock:
+            self._closed = True
+            self._wake()
 
     def is_closed(self) -> bool:
         """Check if the change stream is closed."""
@@ -64,10 +118,84 @@ class ChangeStreamCursor:
         return []
 
     def get_resume_token(self) -> dict:
-        """Get the resume token for this change stream."""
-        if self._changes:
-            return self._changes[-1]["_id"]
-        return {"_data": f"{self._stream_id}"}
+        """Get the token of the last event returned to the client."""
+        return self._resume_token
+
+    def has_changes(self) -> bool:
+        """Check whether events are buffered for the next getMore."""
+        return bool(self._changes)
+
+    def take_changes(self, batch_size: int | None = None) -> list[dict]:
+        """
+        Remove and return buffered events, oldest first.
+
+        Advances the resume token past the returned events, so the
+        getMore reply's ``postBatchResumeToken`` resumes after them.
+        """
+        with self._lock:
+            if batch_size and batch_size > 0:
+                batch = self._changes[:batch_size]
+                del self._changes[:batch_size]
+            else:
+                batch, self._changes = self._changes, []
+            if batch:
+                self._resume_token = batch[-1]["_id"]
+            return batch
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until an event is buffered, the stream closes or timeout.
+
+        Returns:
+            True if events are buffered
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._changes or self._closed, timeout
+            )
+            return bool(self._changes)
+
+    async def wait_async(self, timeout: float) -> bool:
+        """
+        Like wait(), but awaits on the running event loop.
+
+        No thread is held while waiting; the writer thread wakes the loop
+        with call_soon_threadsafe when an event arrives.
+
+        Returns:
+            True if events are buffered
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._changes or self._closed:
+                return bool(self._changes)
+            self._async_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+        return bool(self._changes)
+
+    def _add_change(self, change_doc: dict) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._changes.append(change_doc)
+            self._wake()
+
+    def _wake(self) -> None:
+        """Wake every waiting getMore; the caller holds self._lock."""
+        self._changed.notify_all()
+        for loop, event in self._async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop has shut down
+                pass
 
     def _on_change(
         self,
@@ -84,7 +212,7 @@ class ChangeStreamCursor:
                 full_doc=document if self.full_document != "off" else None,
                 update_description=update_description,
             )
-            self._changes.append(change_doc)
+            self._add_change(change_doc)
 
     def _create_change_document(
         self,
@@ -148,8 +276,22 @@ class ChangeStreamManager:
             stream = self._streams[stream_id]
             stream.close()
             del self._streams[stream_id]
+            listeners = self._listeners.get(stream.collection_name, [])
+            if stream._on_change in listeners:
+                listeners.remove(stream._on_change)
+            if not listeners:
+                self._listeners.pop(stream.collection_name, None)
             logger.debug(f"Closed change stream {stream_id}")
 
+    def has_subscribers(self, collection_name: str) -> bool:
+        """
+        Check whether any change stream is watching a collection.
+
+        Writers use this to skip gathering pre- and post-images for
+        change notifications that nobody would receive.
+        """
+        return bool(self._listeners.get(collection_name))
+
     def get_stream(self, stream_id: int) -> ChangeStreamCursor | None:
         """Get a change stream by ID."""
         return self._streams.get(stream_id)
@@ -191,7 +333,7 @@ class ChangeStreamManager:
                 full_doc=document if stream.full_document != "off" else None,
                 update_description=update_description,
             )
-            stream._changes.append(change_doc)
+            stream._add_change(change_doc)
 
 
 def is_change_stream_pipeline(pipeline: list[dict]) -> bool:
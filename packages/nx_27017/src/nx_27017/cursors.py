@@ -0,0 +1,179 @@
+"""Server-side cursors for find and aggregate results in NX-27017."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Iterable
+
+from bson import encode
+from bson.raw_bson import RawBSONDocument
+
+from nx_27017.changestream import next_cursor_id
+from nx_27017.utils import convert_neo_to_bson_objectids
+from nx_27017.wire_protocol import MAX_BSON_DOCUMENT_SIZE
+
+logger = logging.getLogger("nx_27017")
+
+# MongoDB returns at most 101 documents in the first batch unless the client
+# asks for a batchSize
+DEFAULT_FIRST_BATCH_SIZE = 101
+
+# Idle cursors are closed after 10 minutes (MongoDB's cursorTimeoutMillis)
+DEFAULT_CURSOR_TIMEOUT_SECONDS = 600
+
+# Room left in a reply for the cursor envelope around the batch documents
+BATCH_ENVELOPE_RESERVE = 16 * 1024
+MAX_BATCH_BYTES = MAX_BSON_DOCUMENT_SIZE - BATCH_ENVELOPE_RESERVE
+
+
+class ServerCursor:
+    """A live result set whose documents are returned in batches."""
+
+    def __init__(
+        self,
+        namespace: str,
+        documents: Iterable[dict[str, Any]],
+        no_cursor_timeout: bool = False,
+    ):
+        self.namespace = namespace
+        self.no_cursor_timeout = no_cursor_timeout
+        self._id = next_cursor_id()
+        self._documents = iter(documents)
+        # A document that did not fit in the previous batch
+        self._pending: RawBSONDocument | None = None
+        self._exhausted = False
+        self.last_used = time.monotonic()
+
+    @property
+    def id(self) -> int:
+        """The cursor ID sent to clients."""
+        return self._id
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every document has been returned."""
+        return self._exhausted and self._pending is None
+
+    def next_batch(
+        self, batch_size: int | None = None
+    ) -> list[RawBSONDocument]:
+        """
+        Return the next batch of documents.
+
+        A batch holds at most ``batch_size`` documents (no count limit when
+        None) and stops before its encoded size would exceed the 16 MB reply
+        limit. A batch always holds at least one document, so a single
+        maximum-size document still makes progress.
+
+        Args:
+            batch_size: Maximum number of documents in the batch
+
+        Documents are encoded to BSON once, here, and returned as
+        RawBSONDocument so building the reply copies their bytes instead of
+        converting and encoding them again.
+
+        Returns:
+            The documents of the batch
+        """
+        batch: list[RawBSONDocument] = []
+        batch_bytes = 0
+        while batch_size is None or len(batch) < batch_size:
+            if self._pending is not None:
+                doc, self._pending = self._pending, None
+            else:
+                try:
+                    doc = next(self._documents)
+                except StopIteration:
+                    self._exhausted = True
+                    break
+            if not isinstance(doc, RawBSONDocument):
+                doc = RawBSONDocument(
+                    encode(convert_neo_to_bson_objectids(doc))
+                )
+            doc_bytes = len(doc.raw)
+            if batch and batch_bytes + doc_bytes > MAX_BATCH_BYTES:
+                self._pending = doc
+                break
+            batch.append(doc)
+            batch_bytes += doc_bytes
+        self.last_used = time.monotonic()
+        return batch
+
+    def close(self) -> None:
+        """Release the underlying result set."""
+        close = getattr(self._documents, "close", None)
+        if callable(close):
+            close()
+        self._pending = None
+        self._exhausted = True
+
+
+class CursorManager:
+    """Registry of open server-side cursors."""
+
+    def __init__(
+        self, timeout_seconds: float = DEFAULT_CURSOR_TIMEOUT_SECONDS
+    ) -> None:
+        self._cursors: dict[int, ServerCursor] = {}
+        self._lock = threading.Lock()
+        self.timeout_seconds = timeout_seconds
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def register(self, cursor: ServerCursor) -> None:
+        """Keep a cursor open for later getMore commands."""
+        self.reap_idle()
+        with self._lock:
+            self._cursors[cursor.id] = cursor
+        logger.debug(f"Opened cursor {cursor.id} on {cursor.namespace}")
+
+    def get(self, cursor_id: int) -> ServerCursor | None:
+        """Get an open cursor by ID."""
+        self.reap_idle()
+        with self._lock:
+            return self._cursors.get(cursor_id)
+
+    def kill(self, cursor_id: int) -> bool:
+        """
+        Close and forget a cursor.
+
+        Returns:
+            True if the cursor was open
+        """
+        with self._lock:
+            cursor = self._cursors.pop(cursor_id, None)
+        if cursor is None:
+            return False
+        cursor.close()
+        logger.debug(f"Closed cursor {cursor_id}")
+        return True
+
+    def reap_idle(self) -> int:
+        """
+        Close cursors that have not been used within the idle timeout.
+
+        Returns:
+            The number of cursors closed
+        """
+        deadline = time.monotonic() - self.timeout_seconds
+        with self._lock:
+            expired = [
+                cursor_id
+                for cursor_id, cursor in self._cursors.items()
+                if not cursor.no_cursor_timeout and cursor.last_used < deadline
+            ]
+        for cursor_id in expired:
+            self.kill(cursor_id)
+        if expired:
+            logger.debug(f"Closed {len(expired)} idle cursor(s)")
+        return len(expired)
+
+    def close_all(self) -> None:
+        """Close every open cursor."""
+        with self._lock:
+            cursor_ids = list(self._cursors)
+        for cursor_id in cursor_ids:
+            self.kill(cursor_id)
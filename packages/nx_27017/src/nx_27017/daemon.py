@@ -10,8 +10,10 @@ import sys
 import time
 from typing import Any
 
+from nx_27017.executor import DEFAULT_MAX_QUEUE_DEPTH
 from nx_27017.handler import NeoSQLiteHandler
-from nx_27017.server import run_server_threaded
+from nx_27017.pool import DEFAULT_GROUP_COMMIT_MAX_OPS
+from nx_27017.server import run_server_threaded, run_workers
 from nx_27017.wire_protocol import SHUTDOWN_POLL_INTERVAL, SHUTDOWN_RETRY_COUNT
 
 try:
@@ -158,6 +160,10 @@ def run_as_daemon(args: argparse.Namespace):
     if args.db_path != "memory" and not os.path.isabs(args.db_path):
         args.db_path = os.path.abspath(args.db_path)
 
+    data_dir = getattr(args, "data_dir", None)
+    if isinstance(data_dir, str):
+        args.data_dir = os.path.abspath(data_dir)
+
     if args.fts5_tokenizers:
         args.fts5_tokenizers = [
             (name, os.path.abspath(path)) for name, path in args.fts5_tokenizers
@@ -225,13 +231,67 @@ def run_server_sync(args: argparse.Namespace):
         args.threaded,
     )
 
-    handler = NeoSQLiteHandler(
-        db_path, tokenizers=tokenizers, journal_mode=args.journal_mode
-    )
+    read_pool_size = getattr(args, "read_pool_size", None)
+    data_dir = getattr(args, "data_dir", None)
+    if not isinstance(data_dir, str):
+        data_dir = None
+    group_commit_ms = getattr(args, "group_commit_ms", None)
+    if not isinstance(group_commit_ms, (int, float)):
+        group_commit_ms = None
+    group_commit_max_ops = getattr(args, "group_commit_max_ops", None)
+    if not isinstance(group_commit_max_ops, int):
+        group_commit_max_ops = DEFAULT_GROUP_COMMIT_MAX_OPS
+    fast_workers = getattr(args, "fast_workers", None)
+    heavy_workers = getattr(args, "heavy_workers", None)
+    max_queue_depth = getattr(args, "max_queue_depth", None)
+    if not isinstance(max_queue_depth, int):
+        max_queue_depth = DEFAULT_MAX_QUEUE_DEPTH
+
+    def make_handler() -> NeoSQLiteHandler:
+        return NeoSQLiteHandler(
+            db_path,
+            tokenizers=tokenizers,
+            journal_mode=args.journal_mode,
+            read_pool_size=(
+                read_pool_size if isinstance(read_pool_size, int) else None
+            ),
+            data_dir=data_dir,
+            group_commit_ms=group_commit_ms,
+            group_commit_max_ops=group_commit_max_ops,
+            fast_workers=(
+                fast_workers if isinstance(fast_workers, int) else None
+            ),
+            heavy_workers=(
+                heavy_workers if isinstance(heavy_workers, int) else None
+            ),
+            max_queue_depth=max_queue_depth,
+        )
 
-    try:
-        run_server_threaded(
-            args.host, args.port, handler, use_threading=args.threaded
+    workers = getattr(args, "workers", 1)
+    if not isinstance(workers, int):
+        workers = 1
+    if workers > 1 and db_path == ":memory:" and data_dir is None:
+        logger.warning(
+            "Ignoring --workers for an in-memory database; "
+            "each worker would get its own empty database"
         )
+        workers = 1
+
+    try:
+        if workers > 1:
+            run_workers(
+                args.host,
+                args.port,
+                make_handler,
+                workers,
+                use_threading=args.threaded,
+            )
+        else:
+            run_server_threaded(
+                args.host,
+                args.port,
+                make_handler(),
+                use_threading=args.threaded,
+            )
     except KeyboardInterrupt:
         logger.info("Shutting down...")
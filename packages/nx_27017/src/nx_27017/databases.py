@@ -0,0 +1,183 @@
+"""One SQLite file per logical database for NX-27017."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Callable
+
+from neosqlite import Connection
+from nx_27017.pool import (
+    DEFAULT_GROUP_COMMIT_MAX_OPS,
+    ReaderPool,
+    WriterQueue,
+)
+
+logger = logging.getLogger("nx_27017")
+
+DATABASE_FILE_SUFFIX = ".db"
+
+# MongoDB's limit on database name length
+MAX_DATABASE_NAME_LENGTH = 63
+
+# Characters MongoDB does not allow in database names
+INVALID_DATABASE_NAME_CHARS = frozenset('/\\. "$*<>:|?\x00')
+
+
+def validate_database_name(name: str) -> None:
+    """
+    Check that a database name is valid and safe to use as a file name.
+
+    Raises:
+        ValueError: If the name is empty, too long or contains a character
+            MongoDB forbids in database names
+    """
+    if not isinstance(name, str) or not name:
+        raise ValueError("Database name cannot be empty")
+    if len(name) > MAX_DATABASE_NAME_LENGTH:
+        raise ValueError(f"Database name is too long: {name!r}")
+    if INVALID_DATABASE_NAME_CHARS.intersection(name):
+        raise ValueError(f"Invalid database name: {name!r}")
+
+
+class DatabaseFile:
+    """
+    A logical database stored in its own SQLite file.
+
+    Each file has its own writer thread and reader pool, so writes to
+    different databases do not wait on each other's WAL write lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        connect: Callable[[str], Connection],
+        read_pool_size: int,
+        group_commit_window: float | None = None,
+        group_commit_max_ops: int = DEFAULT_GROUP_COMMIT_MAX_OPS,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.conn = connect(path)
+        self.writer = WriterQueue(
+            name=f"nx-27017-writer-{name}",
+            connection=self.conn,
+            group_commit_window=group_commit_window,
+            group_commit_max_ops=group_commit_max_ops,
+        )
+        self.readers: ReaderPool | None = None
+        if read_pool_size > 0:
+            self.readers = ReaderPool(lambda: connect(path), read_pool_size)
+
+    def close(self) -> None:
+        """Finish queued writes and close every connection to the file."""
+        self.writer.close()
+        if self.readers is not None:
+            self.readers.close()
+        self.conn.close()
+
+
+class DatabaseRegistry:
+    """Maps MongoDB database names to SQLite files under a data directory."""
+
+    def __init__(
+        self,
+        data_dir: str,
+        connect: Callable[[str], Connection],
+        read_pool_size: int,
+        group_commit_window: float | None = None,
+        group_commit_max_ops: int = DEFAULT_GROUP_COMMIT_MAX_OPS,
+    ) -> None:
+        self.data_dir = os.path.abspath(data_dir)
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._connect = connect
+        self._read_pool_size = read_pool_size
+        self._group_commit_window = group_commit_window
+        self._group_commit_max_ops = group_commit_max_ops
+        self._open: dict[str, DatabaseFile] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, name: str) -> str:
+        """Get the SQLite file path for a database name."""
+        validate_database_name(name)
+        return os.path.join(self.data_dir, name + DATABASE_FILE_SUFFIX)
+
+    def get(self, name: str) -> DatabaseFile:
+        """
+        Get a database, opening (and creating) its file on first use.
+
+        Raises:
+            ValueError: If the name is not a valid database name
+        """
+        with self._lock:
+            database = self._open.get(name)
+            if database is None:
+                path = self.path_for(name)
+                database = DatabaseFile(
+                    name,
+                    path,
+                    self._connect,
+                    self._read_pool_size,
+                    self._group_commit_window,
+                    self._group_commit_max_ops,
+                )
+                self._open[name] = database
+                logger.debug(f"Opened database {name} at {path}")
+            return database
+
+    def names(self) -> list[str]:
+        """Names of all databases, whether open or only on disk."""
+        names = set(self._open)
+        for entry in os.listdir(self.data_dir):
+            name, suffix = os.path.splitext(entry)
+            if suffix == DATABASE_FILE_SUFFIX:
+                names.add(name)
+        return sorted(names)
+
+    def size_on_disk(self, name: str) -> int:
+        """Size of a database's file plus its WAL, in bytes."""
+        path = self.path_for(name)
+        size = 0
+        for file_path in (path, path + "-wal"):
+            try:
+                size += os.path.getsize(file_path)
+            except OSError:
+                pass
+        return size
+
+    def drop(self, name: str) -> bool:
+        """
+        Close a database and delete its files.
+
+        Returns:
+            True if the database existed
+        """
+        path = self.path_for(name)
+        with self._lock:
+            database = self._open.pop(name, None)
+        # Close outside the lock: queued writes may still look databases up
+        if database is not None:
+            database.close()
+        with self._lock:
+            existed = database is not None or os.path.exists(path)
+            if name in self._open:
+                # Reopened while closing; leave the new handle's file alone
+                return existed
+            for file_path in (path, path + "-wal", path + "-shm"):
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+        if existed:
+            logger.info(f"Dropped database {name}")
+        return existed
+
+    def close(self) -> None:
+        """Close every open database."""
+        with self._lock:
+            databases = list(self._open.values())
+            self._open.clear()
+        for database in databases:
+            database.close()
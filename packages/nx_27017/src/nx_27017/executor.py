@@ -0,0 +1,294 @@
+"""Bounded command executor with fast and heavy lanes for NX-27017."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from nx_27017.changestream import is_change_stream_pipeline
+from nx_27017.gridfs_adapter import _is_gridfs_collection
+
+logger = logging.getLogger("nx_27017")
+
+FAST_LANE = "fast"
+HEAVY_LANE = "heavy"
+
+# Commands that may scan or rewrite whole collections
+HEAVY_COMMANDS = frozenset(
+    {
+        "aggregate",
+        "mapReduce",
+        "mapreduce",
+        "createIndexes",
+        "createindexes",
+        "reIndex",
+        "compact",
+        "validate",
+        "dbStats",
+        "dbstats",
+        "collStats",
+        "collstats",
+    }
+)
+
+# Most messages that may wait for a worker in one lane
+DEFAULT_MAX_QUEUE_DEPTH = 1000
+
+# MongoDB error codes for rejected commands
+MAX_TIME_MS_EXPIRED = 50
+TEMPORARILY_UNAVAILABLE = 365
+
+
+def default_fast_workers() -> int:
+    """Same sizing as asyncio's default executor."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def default_heavy_workers() -> int:
+    """Half the CPUs, so heavy work cannot take over the machine."""
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+def command_lane(command_doc: dict[str, Any] | None) -> str:
+    """Pick the lane for a command: heavy for scans and GridFS, else fast."""
+    if not command_doc:
+        return FAST_LANE
+    name = next(iter(command_doc))
+    target = command_doc.get(name)
+    if isinstance(target, str) and _is_gridfs_collection(target):
+        return HEAVY_LANE
+    if name not in HEAVY_COMMANDS:
+        return FAST_LANE
+    if name == "aggregate" and is_change_stream_pipeline(
+        command_doc.get("pipeline", [])
+    ):
+        # Opening a change stream only registers a listener
+        return FAST_LANE
+    return HEAVY_LANE
+
+
+class CommandRejected(Exception):
+    """A message was turned away instead of run; ``reply`` explains why."""
+
+    def __init__(self, reply: dict[str, Any]) -> None:
+        super().__init__(reply["errmsg"])
+        self.reply = reply
+
+
+class Lane:
+    """
+    A fixed pool of worker threads with a bounded wait queue.
+
+    Messages beyond ``max_queue_depth`` waiting for a worker are rejected
+    straight away, as are messages whose maxTimeMS would run out before a
+    worker is likely to pick them up. A message whose deadline passes while
+    it waits is dropped rather than run.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue_depth: int) -> None:
+        if workers < 1:
+            raise ValueError(f"{name} lane needs at least one worker")
+        if max_queue_depth < 0:
+            raise ValueError("Maximum queue depth cannot be negative")
+        self.name = name
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self._pool = ThreadPoolExecutor(
+            workers, thread_name_prefix=f"nx-27017-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._total_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def estimated_wait(self) -> float:
+        """Seconds a new message would likely wait for a worker."""
+        with self._lock:
+            if self._active + self._queued < self.workers:
+                return 0.0
+            if not self._completed:
+                return 0.0
+            average_run = self._total_run / self._completed
+            return (self._queued + 1) / self.workers * average_run
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        deadline: float | None = None,
+    ) -> Any:
+        """
+        Run fn(*args) on one of the lane's workers.
+
+        Args:
+            deadline: time.monotonic() by which fn must start (maxTimeMS)
+
+        Raises:
+            CommandRejected: If the queue is full or the deadline cannot
+                be met
+        """
+        if deadline is not None and (
+            time.monotonic() + self.estimated_wait() > deadline
+        ):
+            with self._lock:
+                self._timed_out += 1
+            raise CommandRejected(_max_time_expired(self.name))
+        with self._lock:
+            if self._queued >= self.max_queue_depth:
+                self._rejected += 1
+                raise CommandRejected(
+                    {
+                        "ok": 0,
+                        "errmsg": (
+                            f"Server busy: {self._queued} operations already "
+                            f"queued in the {self.name} lane"
+                        ),
+                        "code": TEMPORARILY_UNAVAILABLE,
+                        "codeName": "TemporarilyUnavailable",
+                    }
+                )
+            self._queued += 1
+            self._total_queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, self._call, fn, args, time.monotonic(), deadline
+        )
+
+    def _call(
+        self,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        enqueued: float,
+        deadline: float | None,
+    ) -> Any:
+        started = time.monotonic()
+        wait = started - enqueued
+        expired = deadline is not None and started > deadline
+        with self._lock:
+            self._queued -= 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            if expired:
+                self._timed_out += 1
+            else:
+                self._active += 1
+        if expired:
+            raise CommandRejected(_max_time_expired(self.name))
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                self._total_run += elapsed
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and wait-time figures for serverStatus."""
+        with self._lock:
+            started = self._total_queued - self._queued
+            return {
+                "workers": self.workers,
+                "active": self._active,
+                "queueLength": self._queued,
+                "maxQueueDepth": self.max_queue_depth,
+                "totalQueued": self._total_queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timedOut": self._timed_out,
+                "totalWaitMicros": int(self._total_wait * 1_000_000),
+                "averageWaitMicros": (
+                    int(self._total_wait / started * 1_000_000)
+                    if started
+                    else 0
+                ),
+                "maxWaitMicros": int(self._max_wait * 1_000_000),
+                "totalTimeProcessingMicros": int(self._total_run * 1_000_000),
+            }
+
+    def shutdown(self) -> None:
+        """Stop taking work; running messages finish in the background."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _max_time_expired(lane: str) -> dict[str, Any]:
+    return {
+        "ok": 0,
+        "errmsg": f"operation exceeded time limit waiting in the {lane} lane",
+        "code": MAX_TIME_MS_EXPIRED,
+        "codeName": "MaxTimeMSExpired",
+    }
+
+
+class CommandExecutor:
+    """
+    Runs wire messages for the asyncio server on two bounded lanes.
+
+    Point reads and writes go to the fast lane; aggregations, index builds,
+    stats and GridFS traffic go to the heavy lane, so a burst of report
+    pipelines queues behind itself instead of in front of point reads.
+    """
+
+    def __init__(
+        self,
+        fast_workers: int | None = None,
+        heavy_workers: int | None = None,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+    ) -> None:
+        self.lanes = {
+            FAST_LANE: Lane(
+                FAST_LANE,
+                fast_workers or default_fast_workers(),
+                max_queue_depth,
+            ),
+            HEAVY_LANE: Lane(
+                HEAVY_LANE,
+                heavy_workers or default_heavy_workers(),
+                max_queue_depth,
+            ),
+        }
+
+    async def run(self, fn: Callable[..., Any], msg: dict[str, Any]) -> Any:
+        """
+        Run fn(msg) in the lane the message's command belongs to.
+
+        Raises:
+            CommandRejected: If the lane turned the message away
+        """
+        command_doc = next(
+            (
+                doc
+                for kind, doc in msg.get("sections", [])
+                if kind == "body" and isinstance(doc, dict)
+            ),
+            msg.get("query"),
+        )
+        deadline = None
+        if isinstance(command_doc, dict):
+            max_time_ms = command_doc.get("maxTimeMS")
+            if isinstance(max_time_ms, (int, float)) and max_time_ms > 0:
+                deadline = time.monotonic() + max_time_ms / 1000
+        lane = self.lanes[
+            command_lane(command_doc if isinstance(command_doc, dict) else None)
+        ]
+        return await lane.run(fn, msg, deadline=deadline)
+
+    def stats(self) -> dict[str, Any]:
+        """Per-lane figures, reported under serverStatus queues.execution."""
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+    def shutdown(self) -> None:
+        """Stop every lane."""
+        for lane in self.lanes.values():
+            lane.shutdown()
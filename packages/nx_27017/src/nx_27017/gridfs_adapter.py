@@ -15,6 +15,7 @@ import logging
 from typing import Any
 
 from neosqlite.gridfs import GridFSBucket
+from neosqlite.gridfs.utils import STORAGE_CHUNKS
 from neosqlite.objectid import ObjectId
 
 logger = logging.getLogger(__name__)
@@ -194,6 +195,17 @@ class GridFSAdapter:
                     self._get_bucket()._chunk_size_bytes = (
                         DEFAULT_CHUNK_SIZE_BYTES
                     )
+                    self._get_bucket()._blobs_collection = (
+                        f"{self._bucket_name}_blobs"
+                    )
+                    self._get_bucket()._chunk_store_collection = (
+                        f"{self._bucket_name}_chunk_store"
+                    )
+                    self._get_bucket()._chunk_refs_collection = (
+                        f"{self._bucket_name}_chunk_refs"
+                    )
+                    self._get_bucket()._storage = STORAGE_CHUNKS
+                    self._get_bucket()._compression = None
                     logger.debug("GridFSBucket initialized (skipped creation)")
                     return
 
@@ -12,16 +12,33 @@ from bson import ObjectId as BsonObjectId
 
 from neosqlite import Connection
 from nx_27017.changestream import (
+    ChangeStreamCursor,
     ChangeStreamManager,
+    current_worker,
+    cursor_worker,
     extract_change_stream_options,
+    in_worker_pool,
     is_change_stream_pipeline,
 )
+from nx_27017.cursors import (
+    DEFAULT_FIRST_BATCH_SIZE,
+    CursorManager,
+    ServerCursor,
+)
+from nx_27017.databases import DatabaseRegistry
+from nx_27017.executor import DEFAULT_MAX_QUEUE_DEPTH, CommandExecutor
 from nx_27017.gridfs_adapter import (
     _get_gridfs_bucket_name,
     _is_gridfs_collection,
     create_gridfs_adapter,
 )
+from nx_27017.pool import (
+    DEFAULT_GROUP_COMMIT_MAX_OPS,
+    ReaderPool,
+    WriterQueue,
+)
 from nx_27017.wire_protocol import (
+    DEFAULT_AWAIT_DATA_TIMEOUT_MS,
     DEFAULT_MAX_CONNECTIONS,
     DEFAULT_SESSION_TIMEOUT_MINUTES,
     MAX_BSON_DOCUMENT_SIZE,
@@ -30,11 +47,22 @@ from nx_27017.wire_protocol import (
     MAX_WRITE_BATCH_SIZE,
     MIN_WIRE_VERSION,
     _extract_session_id,
+    negotiate_compressors,
 )
 
 logger = logging.getLogger("nx_27017")
 
 
+def _invalid_namespace(error: Exception) -> dict[str, Any]:
+    """Build the error reply for an unusable database name."""
+    return {
+        "ok": 0,
+        "errmsg": str(error),
+        "code": 73,
+        "codeName": "InvalidNamespace",
+    }
+
+
 class NeoSQLiteHandler:
     """Handle MongoDB commands and translate them to SQLite operations."""
 
@@ -69,25 +97,96 @@ class NeoSQLiteHandler:
             "listcollections",
             "renameCollection",
             "renamecollection",
+            "getMore",
+            "killCursors",
+        }
+    )
+
+    # Commands that never write and may run on a pooled read connection
+    READ_COMMANDS = frozenset(
+        {
+            "ping",
+            "ismaster",
+            "isMaster",
+            "hello",
+            "Hello",
+            "buildinfo",
+            "buildInfo",
+            "whatsmyuri",
+            "serverStatus",
+            "listDatabases",
+            "listdatabases",
+            "dbStats",
+            "dbstats",
+            "collStats",
+            "collstats",
+            "find",
+            "count",
+            "distinct",
+            "aggregate",
+            "explain",
+            "getMore",
+            "killCursors",
+            "listCollections",
+            "listcollections",
+            "listIndexes",
+            "listindexes",
+            "listSearchIndexes",
+            "listsearchindexes",
         }
     )
 
+    # Writes that may share a group commit with other clients' writes
+    GROUP_COMMIT_COMMANDS = frozenset(
+        {"insert", "update", "delete", "findAndModify", "findandmodify"}
+    )
+
     def __init__(
         self,
         db_path: str = ":memory:",
         tokenizers: list | None = None,
         journal_mode: str = "WAL",
+        read_pool_size: int | None = None,
+        data_dir: str | None = None,
+        group_commit_ms: float | None = None,
+        group_commit_max_ops: int = DEFAULT_GROUP_COMMIT_MAX_OPS,
+        fast_workers: int | None = None,
+        heavy_workers: int | None = None,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
     ):
         self.db_path = db_path
         self.tokenizers = tokenizers
         self.journal_mode = journal_mode
+        self.data_dir = data_dir
         self.start_time = time.time()
         self._active_connections = 0
         self._connections_lock = threading.Lock()
-        self._sessions: dict[str, Any] = {}
+        # Keyed by (lsid, database): a session's transaction is bound to the
+        # connection of the database it was started on
+        self._sessions: dict[tuple[str, str], Any] = {}
         self._sessions_lock = threading.Lock()
 
-        if db_path == ":memory:":
+        if read_pool_size is None:
+            read_pool_size = min(32, (os.cpu_count() or 1) + 4)
+        group_commit_window = (
+            None if group_commit_ms is None else group_commit_ms / 1000
+        )
+
+        # With a data directory every database name gets its own SQLite
+        # file, writer thread and reader pool; "admin" backs self.conn
+        self._registry: DatabaseRegistry | None = None
+        if data_dir is not None:
+            self._registry = DatabaseRegistry(
+                data_dir,
+                self._open_reader,
+                read_pool_size,
+                group_commit_window=group_commit_window,
+                group_commit_max_ops=group_commit_max_ops,
+            )
+            admin = self._registry.get("admin")
+            self.db_path = admin.path
+            self.conn = admin.conn
+        elif db_path == ":memory:":
             self.conn = Connection(
                 "file::memory:?cache=shared",
                 check_same_thread=False,
@@ -104,12 +203,196 @@ class NeoSQLiteHandler:
             )
         self.databases: dict[str, Connection] = {"admin": self.conn}
         self._change_stream_manager = ChangeStreamManager()
+        self._cursor_manager = CursorManager()
+        # Worker lanes the asyncio server runs messages on
+        self.executor = CommandExecutor(
+            fast_workers, heavy_workers, max_queue_depth
+        )
+
+        # Writes (and anything inside a transaction) run one at a time on the
+        # writer thread using self.conn; reads borrow a pooled connection.
+        # In-memory databases cannot share data across connections safely,
+        # so they read through self.conn as well.
+        self._local = threading.local()
+        self._readers: ReaderPool | None = None
+        if self._registry is not None:
+            self._writer = admin.writer
+            self._readers = admin.readers
+        else:
+            self._writer = WriterQueue(
+                connection=self.conn,
+                group_commit_window=group_commit_window,
+                group_commit_max_ops=group_commit_max_ops,
+            )
+            if db_path != ":memory:" and read_pool_size > 0:
+                self._readers = ReaderPool(self._open_reader, read_pool_size)
+
+    def _open_reader(self, path: str | None = None) -> Connection:
+        """Open a connection to a database file (the handler's by default)."""
+        return Connection(
+            path or self.db_path,
+            check_same_thread=False,
+            tokenizers=self.tokenizers,
+            journal_mode=self.journal_mode,
+        )
+
+    def close(self) -> None:
+        """Stop the writer thread and close all connections."""
+        self.executor.shutdown()
+        self._cursor_manager.close_all()
+        if self._registry is not None:
+            self._registry.close()
+            return
+        self._writer.close()
+        if self._readers is not None:
+            self._readers.close()
+        self.conn.close()
 
     def get_database(self, db_name: str) -> Connection:
+        reader = getattr(self._local, "reader", None)
+        if reader is not None and (
+            self._registry is None or self._local.reader_db == db_name
+        ):
+            return reader
+        if self._registry is not None:
+            return self._registry.get(db_name).conn
         if db_name not in self.databases:
             self.databases[db_name] = self.conn
         return self.databases[db_name]
 
+    def _route(self, db_name: str) -> tuple[WriterQueue, ReaderPool | None]:
+        """
+        Get the writer queue and reader pool serving a database.
+
+        Raises:
+            ValueError: If the name is not a valid database name
+        """
+        if self._registry is None:
+            return self._writer, self._readers
+        database = self._registry.get(db_name)
+        return database.writer, database.readers
+
+    def _drop_database(self, msg: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """
+        Delete a database's file (one-file-per-database mode).
+
+        Runs on the database's writer thread, so writes queued before the
+        drop finish first and none run against the file while it is removed.
+        """
+        assert self._registry is not None
+        db_name = self._command_db_name(msg)
+        if db_name == "admin":
+            return msg["request_id"], {
+                "ok": 0,
+                "errmsg": "Dropping the admin database is not allowed",
+                "code": 20,
+                "codeName": "IllegalOperation",
+            }
+        with self._sessions_lock:
+            for key in [key for key in self._sessions if key[1] == db_name]:
+                self._sessions.pop(key).end_session()
+        self._registry.drop(db_name)
+        return msg["request_id"], {"ok": 1, "dropped": db_name}
+
+    @staticmethod
+    def _compression_reply(command_doc: dict[str, Any]) -> dict[str, Any]:
+        """Advertise the compressors agreed with the client in hello."""
+        compressors = negotiate_compressors(command_doc.get("compression"))
+        return {"compression": compressors} if compressors else {}
+
+    def _is_read_command(self, command_doc: dict[str, Any]) -> bool:
+        """Check whether a command can run outside the writer thread."""
+        name = next(iter(command_doc), None)
+        if name not in self.READ_COMMANDS:
+            return False
+        # Transactions are pinned to the writer connection that owns them
+        if "txnNumber" in command_doc or "startTransaction" in command_doc:
+            return False
+        target = command_doc.get(name)
+        if isinstance(target, str) and self._is_gridfs_collection(target):
+            # The GridFS adapter may create its tables on first use
+            return False
+        if name == "aggregate":
+            return not any(
+                isinstance(stage, dict)
+                and ("$out" in stage or "$merge" in stage)
+                for stage in command_doc.get("pipeline", [])
+            )
+        return True
+
+    def _is_batchable_write(self, command_doc: dict[str, Any]) -> bool:
+        """Check whether a write may share a group commit."""
+        if next(iter(command_doc), None) not in self.GROUP_COMMIT_COMMANDS:
+            return False
+        # Session transactions begin and commit on the writer connection
+        return not (
+            "startTransaction" in command_doc or "autocommit" in command_doc
+        )
+
+    def _idle_change_stream(
+        self, msg: dict[str, Any]
+    ) -> tuple[ChangeStreamCursor, float] | None:
+        """
+        Find the change stream an awaitData getMore should wait on.
+
+        Returns:
+            The stream and the seconds to wait (maxTimeMS, or a default),
+            or None if the message is not a getMore on an idle stream
+        """
+        command_doc = next(
+            (doc for kind, doc in msg["sections"] if kind == "body"), None
+        )
+        if not command_doc or "getMore" not in command_doc:
+            return None
+        try:
+            cursor_id = int(command_doc["getMore"])
+        except (TypeError, ValueError):
+            return None
+        stream = self._change_stream_manager.get_stream(cursor_id)
+        if stream is None or stream.has_changes():
+            return None
+        max_time_ms = command_doc.get("maxTimeMS")
+        if not isinstance(max_time_ms, (int, float)) or max_time_ms <= 0:
+            max_time_ms = DEFAULT_AWAIT_DATA_TIMEOUT_MS
+        return stream, max_time_ms / 1000
+
+    def await_change_stream_data(self, msg: dict[str, Any]) -> None:
+        """
+        Hold a getMore on an idle change stream until an event arrives.
+
+        Change stream cursors are tailable awaitData cursors, so instead of
+        answering an empty batch straight away (which has clients spin on
+        getMore) the server waits up to maxTimeMS. The threaded server calls
+        this before handle_command; other messages return at once.
+        """
+        if idle := self._idle_change_stream(msg):
+            stream, timeout = idle
+            stream.wait(timeout)
+
+    async def await_change_stream_data_async(self, msg: dict[str, Any]) -> None:
+        """Like await_change_stream_data(), without holding a thread."""
+        if idle := self._idle_change_stream(msg):
+            stream, timeout = idle
+            await stream.wait_async(timeout)
+
+    def _run_read(
+        self,
+        fn: Any,
+        msg: dict[str, Any],
+        db_name: str,
+        readers: ReaderPool | None,
+    ) -> Any:
+        """Run a read handler on a pooled connection in the calling thread."""
+        if readers is None:
+            return fn(msg)
+        with readers.connection() as reader:
+            self._local.reader = reader
+            self._local.reader_db = db_name
+            try:
+                return fn(msg)
+            finally:
+                self._local.reader = None
+
     def _convert_objectids(self, doc: dict) -> dict:
         """Convert PyMongo ObjectIds to NeoSQLite ObjectIds recursively."""
         from nx_27017.utils import convert_bson_to_neo_objectids
@@ -265,6 +548,31 @@ class NeoSQLiteHandler:
         return chunk_id
 
     def handle_insert(self, msg: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        db_name = self._command_db_name(msg)
+        try:
+            writer, _ = self._route(db_name)
+        except ValueError as e:
+            return msg["request_id"], _invalid_namespace(e)
+        command_doc = next(
+            (doc for kind, doc in msg["sections"] if kind == "body"), {}
+        )
+        return writer.submit(
+            self._execute_insert,
+            msg,
+            batchable=self._is_batchable_write(command_doc),
+        )
+
+    @staticmethod
+    def _command_db_name(msg: dict[str, Any]) -> str:
+        """Get the database a wire message targets."""
+        for kind, doc in msg["sections"]:
+            if kind == "body" and isinstance(doc, dict):
+                return doc.get("$db", "test")
+        return "test"
+
+    def _execute_insert(
+        self, msg: dict[str, Any]
+    ) -> tuple[int, dict[str, Any]]:
         request_id = msg["request_id"]
         sections = msg["sections"]
 
@@ -359,17 +667,20 @@ class NeoSQLiteHandler:
             lsid = command_doc.get("lsid")
             session_id = _extract_session_id(lsid) if lsid else None
             if session_id:
+                key = (session_id, db_name)
                 with self._sessions_lock:
-                    if session_id not in self._sessions:
-                        session = self.conn.start_session()
+                    if key not in self._sessions:
+                        session = db.start_session()
                         session._in_transaction = False
-                        self._sessions[session_id] = session
-                    session_to_use = self._sessions[session_id]
+                        self._sessions[key] = session
+                    session_to_use = self._sessions[key]
                     if not session_to_use._in_transaction:
                         session_to_use.start_transaction()
 
         if docs_to_insert:
             result = coll.insert_many(docs_to_insert, session=session_to_use)
+            if not self._change_stream_manager.has_subscribers(coll_name):
+                docs_to_insert = []
             for doc in docs_to_insert:
                 doc_key = {"_id": doc.get("_id")}
                 self._change_stream_manager.notify_change(
@@ -386,7 +697,29 @@ class NeoSQLiteHandler:
 
         return request_id, {"ok": 1, "n": 0}
 
-    def handle_command(  # noqa: E501
+    def handle_command(self, msg: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """Route a command to a read connection or the writer queue."""
+        command_doc = next(
+            (doc for kind, doc in msg["sections"] if kind == "body"), None
+        )
+        db_name = self._command_db_name(msg)
+        try:
+            writer, readers = self._route(db_name)
+        except ValueError as e:
+            return msg["request_id"], _invalid_namespace(e)
+        if self._registry is not None and command_doc:
+            if "dropDatabase" in command_doc:
+                return writer.submit(self._drop_database, msg)
+        if command_doc and self._is_read_command(command_doc):
+            return self._run_read(self._execute_command, msg, db_name, readers)
+        return writer.submit(
+            self._execute_command,
+            msg,
+            batchable=bool(command_doc)
+            and self._is_batchable_write(command_doc),
+        )
+
+    def _execute_command(  # noqa: E501
         self, msg: dict[str, Any]
     ) -> tuple[int, dict[str, Any]]:
         """Handle command by passing directly to NeoSQLite."""
@@ -425,13 +758,13 @@ class NeoSQLiteHandler:
                     "connectionId": 1,
                     "minWireVersion": MIN_WIRE_VERSION,
                     "maxWireVersion": MAX_WIRE_VERSION,
-                }
+                } | self._compression_reply(command_doc)
 
         if "startSession" in command_doc:
             session_id = f"session_{uuid.uuid4().hex}"
-            session = self.conn.start_session()
+            session = db.start_session()
             with self._sessions_lock:
-                self._sessions[session_id] = session
+                self._sessions[(session_id, db_name)] = session
             return request_id, {
                 "ok": 1,
                 "session": {"id": {"$oid": session_id}},
@@ -442,7 +775,9 @@ class NeoSQLiteHandler:
             tx_session_id = _extract_session_id(lsid) if lsid else None
             if tx_session_id:
                 with self._sessions_lock:
-                    commit_session: Any = self._sessions.get(tx_session_id)
+                    commit_session: Any = self._sessions.get(
+                        (tx_session_id, db_name)
+                    )
                 if commit_session and commit_session.in_transaction:
                     commit_session.commit_transaction()
                     return request_id, {"ok": 1}
@@ -453,7 +788,9 @@ class NeoSQLiteHandler:
             tx_session_id = _extract_session_id(lsid) if lsid else None
             if tx_session_id:
                 with self._sessions_lock:
-                    abort_session: Any = self._sessions.get(tx_session_id)
+                    abort_session: Any = self._sessions.get(
+                        (tx_session_id, db_name)
+                    )
                 if abort_session and abort_session.in_transaction:
                     abort_session.abort_transaction()
                     return request_id, {"ok": 1}
@@ -465,7 +802,6 @@ class NeoSQLiteHandler:
                 session_ids = [session_ids]
             with self._sessions_lock:
                 for sid in session_ids:
-                    end_session: Any = None
                     if isinstance(sid, dict):
                         sid = _extract_session_id(sid)
                     elif isinstance(sid, bytes):
@@ -473,10 +809,12 @@ class NeoSQLiteHandler:
 
                         if isinstance(sid, Binary):
                             sid = sid.hex()
-                    if sid:
-                        end_session = self._sessions.pop(sid, None)
-                    if end_session:
-                        end_session.end_session()
+                    if not sid:
+                        continue
+                    # endSessions is sent to admin; end the session on
+                    # every database it touched
+                    for key in [key for key in self._sessions if key[0] == sid]:
+                        self._sessions.pop(key).end_session()
             return request_id, {"ok": 1}
 
         cmd_copy = dict(command_doc)
@@ -539,6 +877,9 @@ class NeoSQLiteHandler:
                 name = index_spec.get("name")
                 unique = index_spec.get("unique", False)
                 sparse = index_spec.get("sparse", False)
+                partial_filter = index_spec.get("partialFilterExpression")
+                multikey = index_spec.get("multikey", False)
+                expire_after = index_spec.get("expireAfterSeconds")
                 fts = index_spec.get("fts", False)
                 tokenizer = index_spec.get("tokenizer")
 
@@ -554,6 +895,9 @@ class NeoSQLiteHandler:
                     sparse=sparse,
                     fts=fts,
                     tokenizer=tokenizer,
+                    partial_filter_expression=partial_filter,
+                    multikey=multikey,
+                    expire_after_seconds=expire_after,
                 )
                 if name and name != idx_name:
                     logger.warning(
@@ -591,6 +935,9 @@ class NeoSQLiteHandler:
             name = cmd_copy.get("name")
             unique = cmd_copy.get("unique", False)
             sparse = cmd_copy.get("sparse", False)
+            partial_filter = cmd_copy.get("partialFilterExpression")
+            multikey = cmd_copy.get("multikey", False)
+            expire_after = cmd_copy.get("expireAfterSeconds")
 
             if self._is_gridfs_collection(coll_name):
                 bucket_name = self._get_gridfs_bucket_name(coll_name)
@@ -615,7 +962,12 @@ class NeoSQLiteHandler:
                 keys_list = key
 
             idx_name = coll.create_index(
-                keys_list, unique=unique, sparse=sparse
+                keys_list,
+                unique=unique,
+                sparse=sparse,
+                partial_filter_expression=partial_filter,
+                multikey=multikey,
+                expire_after_seconds=expire_after,
             )
             return request_id, {
                 "ok": 1,
@@ -722,6 +1074,7 @@ class NeoSQLiteHandler:
             coll_name = cmd_copy.pop("update")
             updates = cmd_copy.pop("updates", []) or payload_updates
             coll = db[coll_name]
+            watched = self._change_stream_manager.has_subscribers(coll_name)
             modified = 0
             for update in updates:
                 q = update.get("q", {})
@@ -730,58 +1083,44 @@ class NeoSQLiteHandler:
                 u = self._convert_objectids(u)
                 multi = update.get("multi", False)
                 upsert = update.get("upsert", False)
+                is_replace = not any(k.startswith("$") for k in u.keys())
 
-                # Fetch matching documents to get their _id and state before update
-                try:
-                    matched_docs = list(coll.find(q))
-                except Exception:
-                    matched_docs = []
+                # Only collect the _ids of affected documents when a change
+                # stream will receive the notifications
+                matched_ids = (
+                    self._matched_ids(coll, q, multi and not is_replace)
+                    if watched
+                    else []
+                )
 
-                is_replace = not any(k.startswith("$") for k in u.keys())
                 if is_replace:
                     upd_result = coll.replace_one(q, u, upsert=upsert)
                     modified += upd_result.modified_count
 
-                    for doc in matched_docs:
-                        doc_id = doc.get("_id")
+                    for doc_id in matched_ids:
                         self._change_stream_manager.notify_change(
                             collection_name=coll_name,
                             operation_type="replace",
                             document=u,
                             document_key={"_id": doc_id},
                         )
-                elif multi:
-                    upd_result = coll.update_many(q, u, upsert=upsert)
-                    modified += upd_result.modified_count
+                    continue
 
-                    for doc in matched_docs:
-                        doc_id = doc.get("_id")
-                        new_doc = coll.find_one({"_id": doc_id})
-                        self._change_stream_manager.notify_change(
-                            collection_name=coll_name,
-                            operation_type="update",
-                            document=new_doc or {},
-                            document_key={"_id": doc_id},
-                            update_description={
-                                "updatedFields": u.get("$set", {})
-                            },
-                        )
+                if multi:
+                    upd_result = coll.update_many(q, u, upsert=upsert)
                 else:
                     upd_result = coll.update_one(q, u, upsert=upsert)
-                    modified += upd_result.modified_count
+                modified += upd_result.modified_count
 
-                    if matched_docs:
-                        doc_id = matched_docs[0].get("_id")
-                        new_doc = coll.find_one({"_id": doc_id})
-                        self._change_stream_manager.notify_change(
-                            collection_name=coll_name,
-                            operation_type="update",
-                            document=new_doc or {},
-                            document_key={"_id": doc_id},
-                            update_description={
-                                "updatedFields": u.get("$set", {})
-                            },
-                        )
+                post_images = self._find_by_ids(coll, matched_ids)
+                for doc_id in matched_ids:
+                    self._change_stream_manager.notify_change(
+                        collection_name=coll_name,
+                        operation_type="update",
+                        document=post_images.get(doc_id) or {},
+                        document_key={"_id": doc_id},
+                        update_description={"updatedFields": u.get("$set", {})},
+                    )
             return request_id, {"ok": 1, "n": modified, "nModified": modified}
 
         if "find" in cmd_copy:
@@ -826,15 +1165,13 @@ class NeoSQLiteHandler:
                     cursor = cursor.max(list(max_val.items()))
                 elif isinstance(max_val, list):
                     cursor = cursor.max(max_val)
-            docs = list(cursor)
-            return request_id, {
-                "ok": 1,
-                "cursor": {
-                    "id": 0,
-                    "ns": f"{db.name}.{coll_name}",
-                    "firstBatch": docs,
-                },
-            }
+            return request_id, self._open_cursor(
+                cursor,
+                f"{db.name}.{coll_name}",
+                batch_size=cmd_copy.get("batchSize"),
+                single_batch=bool(cmd_copy.get("singleBatch", False)),
+                no_cursor_timeout=bool(cmd_copy.get("noCursorTimeout", False)),
+            )
 
         if "count" in cmd_copy:
             try:
@@ -872,15 +1209,12 @@ class NeoSQLiteHandler:
 
                 coll = db[coll_name]
                 cursor = coll.aggregate(pipeline)  # type: ignore[assignment]
-                docs = cursor.to_list()
-                return request_id, {
-                    "ok": 1,
-                    "cursor": {
-                        "id": 0,
-                        "ns": f"{db.name}.{coll_name}",
-                        "firstBatch": docs,
-                    },
-                }
+                cursor_options = cmd_copy.get("cursor") or {}
+                return request_id, self._open_cursor(
+                    cursor,
+                    f"{db.name}.{coll_name}",
+                    batch_size=cursor_options.get("batchSize"),
+                )
             except Exception as e:
                 logger.error(f"Error in aggregate: {e}")
                 return request_id, {"ok": 0, "errmsg": str(e)}
@@ -900,6 +1234,25 @@ class NeoSQLiteHandler:
             coll_stats_result = db.command({"collstats": coll_name})
             return request_id, coll_stats_result
 
+        if self._registry is not None and (
+            "listDatabases" in cmd_copy or "listdatabases" in cmd_copy
+        ):
+            databases_info = []
+            for name in self._registry.names():
+                size_on_disk = self._registry.size_on_disk(name)
+                databases_info.append(
+                    {
+                        "name": name,
+                        "sizeOnDisk": size_on_disk,
+                        "empty": size_on_disk == 0,
+                    }
+                )
+            return request_id, {
+                "ok": 1,
+                "databases": databases_info,
+                "totalSize": sum(d["sizeOnDisk"] for d in databases_info),
+            }
+
         if "listDatabases" in cmd_copy or "listdatabases" in cmd_copy:
             databases_info = []
             total_size = 0
@@ -1015,15 +1368,20 @@ class NeoSQLiteHandler:
                     },
                 }
 
+        if "killCursors" in cmd_copy:
+            return request_id, self._kill_cursors(cmd_copy.get("cursors", []))
+
         if "getMore" in cmd_copy:
             raw_id = cmd_copy.get("getMore")
             cursor_id = int(raw_id) if raw_id is not None else 0
             coll_name = cmd_copy.get("collection")
+            if server_cursor := self._cursor_manager.get(cursor_id):
+                return request_id, self._get_more(
+                    server_cursor, cmd_copy.get("batchSize")
+                )
             stream = self._change_stream_manager.get_stream(cursor_id)
             if stream:
-                next_batch = list(stream._changes)
-                stream._changes.clear()
-                stream._position = 0
+                next_batch = stream.take_changes(cmd_copy.get("batchSize"))
                 return request_id, {
                     "ok": 1,
                     "cursor": {
@@ -1034,13 +1392,19 @@ class NeoSQLiteHandler:
                     },
                 }
             else:
+                errmsg = f"cursor id {cursor_id} not found"
+                if isinstance(cursor_id, int) and (
+                    cursor_worker(cursor_id) != current_worker()
+                ):
+                    errmsg += (
+                        f" (opened by worker {cursor_worker(cursor_id)}, "
+                        f"this is worker {current_worker()})"
+                    )
                 return request_id, {
-                    "ok": 1,
-                    "cursor": {
-                        "id": 0,
-                        "ns": f"{db.name}.{coll_name}",
-                        "nextBatch": [],
-                    },
+                    "ok": 0,
+                    "errmsg": errmsg,
+                    "code": 43,
+                    "codeName": "CursorNotFound",
                 }
 
         logger.info(f"Calling db.command with: {cmd_copy}")
@@ -1050,6 +1414,89 @@ class NeoSQLiteHandler:
         )
         return request_id, cmd_result
 
+    def _open_cursor(
+        self,
+        documents: Any,
+        namespace: str,
+        batch_size: int | None = None,
+        single_batch: bool = False,
+        no_cursor_timeout: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Build a find/aggregate reply, keeping the rest of the results open.
+
+        The first batch holds ``batchSize`` documents (101 by default) and at
+        most 16 MB. If documents remain, the cursor is registered so the
+        client can fetch them with getMore.
+
+        In a worker pool, getMore may reach a sibling worker that does not
+        have the cursor, so the first batch ignores ``batchSize`` and takes
+        all it can hold.
+        """
+        cursor = ServerCursor(namespace, documents, no_cursor_timeout)
+        if in_worker_pool():
+            batch_size = None
+        elif batch_size is None:
+            batch_size = DEFAULT_FIRST_BATCH_SIZE
+        first_batch = cursor.next_batch(batch_size)
+        if single_batch or cursor.exhausted:
+            cursor.close()
+            cursor_id = 0
+        else:
+            self._cursor_manager.register(cursor)
+            cursor_id = cursor.id
+            if in_worker_pool():
+                logger.warning(
+                    f"Results for {namespace} exceed one reply; getMore "
+                    f"must reach worker {current_worker()} to read the rest"
+                )
+        return {
+            "ok": 1,
+            "cursor": {
+                "id": cursor_id,
+                "ns": namespace,
+                "firstBatch": first_batch,
+            },
+        }
+
+    def _get_more(
+        self, cursor: ServerCursor, batch_size: int | None
+    ) -> dict[str, Any]:
+        """Return the next batch of an open cursor, closing it when drained."""
+        next_batch = cursor.next_batch(batch_size or None)
+        cursor_id = cursor.id
+        if cursor.exhausted:
+            self._cursor_manager.kill(cursor_id)
+            cursor_id = 0
+        return {
+            "ok": 1,
+            "cursor": {
+                "id": cursor_id,
+                "ns": cursor.namespace,
+                "nextBatch": next_batch,
+            },
+        }
+
+    def _kill_cursors(self, cursor_ids: list[Any]) -> dict[str, Any]:
+        """Close query cursors and change streams named by killCursors."""
+        killed, not_found = [], []
+        for raw_id in cursor_ids:
+            cursor_id = int(raw_id)
+            if self._cursor_manager.kill(cursor_id):
+                killed.append(raw_id)
+            elif self._change_stream_manager.get_stream(cursor_id):
+                self._change_stream_manager.close_stream(cursor_id)
+                killed.append(raw_id)
+            else:
+                not_found.append(raw_id)
+        return {
+            "ok": 1,
+            "cursorsKilled": killed,
+            "cursorsNotFound": not_found,
+            "cursorsAlive": [],
+            "cursorsUnknown": [],
+        }
+
     def _handle_gridfs_find(
         self,
         request_id: int,
@@ -1277,16 +1724,21 @@ class NeoSQLiteHandler:
             q = self._convert_objectids(q)
             limit = delete.get("limit", 0)
 
-            # Fetch matching documents to get their _id before deletion
-            try:
-                matched_docs = list(coll.find(q))
-            except Exception:
-                matched_docs = []
+            # Pre-images are only needed when a change stream is listening
+            matched_docs: list[dict[str, Any]] = []
+            if self._change_stream_manager.has_subscribers(coll_name):
+                try:
+                    cursor = coll.find(q)
+                    if limit != 0:
+                        cursor = cursor.limit(1)
+                    matched_docs = list(cursor)
+                except Exception:
+                    matched_docs = []
 
             result = coll.delete_many(q) if limit == 0 else coll.delete_one(q)
             removed += result.deleted_count
 
-            for doc in (matched_docs[:1] if limit != 0 else matched_docs):
+            for doc in matched_docs:
                 doc_id = doc.get("_id")
                 self._change_stream_manager.notify_change(
                     collection_name=coll_name,
@@ -1297,6 +1749,29 @@ class NeoSQLiteHandler:
 
         return request_id, {"ok": 1, "n": removed}
 
+    @staticmethod
+    def _matched_ids(coll: Any, query: dict[str, Any], multi: bool) -> list:
+        """Get the _ids of the documents an update is about to touch."""
+        try:
+            cursor = coll.find(query, {"_id": 1})
+            if not multi:
+                cursor = cursor.limit(1)
+            return [doc.get("_id") for doc in cursor]
+        except Exception:
+            return []
+
+    @staticmethod
+    def _find_by_ids(coll: Any, ids: list) -> dict[Any, dict[str, Any]]:
+        """Fetch documents by _id with a single query."""
+        if not ids:
+            return {}
+        try:
+            return {
+                doc.get("_id"): doc for doc in coll.find({"_id": {"$in": ids}})
+            }
+        except Exception:
+            return {}
+
     def _handle_aggregate(
         self, request_id: int, command_doc: dict, db: Connection
     ) -> tuple[int, dict[str, Any]]:
@@ -1320,15 +1795,12 @@ class NeoSQLiteHandler:
 
         try:
             cursor = coll.aggregate(pipeline)
-            docs = list(cursor)
-            return request_id, {
-                "ok": 1,
-                "cursor": {
-                    "id": 0,
-                    "ns": f"{db.name}.{coll_name}",
-                    "firstBatch": docs,
-                },
-            }
+            cursor_options = command_doc.get("cursor") or {}
+            return request_id, self._open_cursor(
+                cursor,
+                f"{db.name}.{coll_name}",
+                batch_size=cursor_options.get("batchSize"),
+            )
         except Exception as e:
             logger.error(f"Error in aggregate: {e}")
             return request_id, {"ok": 0, "errmsg": str(e)}
@@ -1341,6 +1813,18 @@ class NeoSQLiteHandler:
         db: Connection,
     ) -> tuple[int, dict[str, Any]]:
         """Handle change stream aggregate command."""
+        if in_worker_pool():
+            # Events are published by the worker that accepted the write,
+            # so a stream would miss writes its siblings accept
+            return request_id, {
+                "ok": 0,
+                "errmsg": (
+                    "The $changeStream stage is not supported when the "
+                    "server runs several worker processes"
+                ),
+                "code": 40573,
+                "codeName": "Location40573",
+            }
         try:
             options = extract_change_stream_options(pipeline)
             stream = self._change_stream_manager.create_stream(
@@ -1462,6 +1946,7 @@ class NeoSQLiteHandler:
                 "virtual": virtual_mem,
             },
             "globalLock": {"totalTime": 0},
+            "queues": {"execution": self.executor.stats()},
         }
 
     def _handle_list_indexes(
@@ -24,6 +24,8 @@ from nx_27017.daemon import (  # noqa: F401 - re-export for backward compatibili
 from nx_27017.handler import (
     NeoSQLiteHandler,  # noqa: F401 - re-export for backward compatibility
 )
+from nx_27017.executor import DEFAULT_MAX_QUEUE_DEPTH
+from nx_27017.pool import DEFAULT_GROUP_COMMIT_MAX_OPS
 from nx_27017.wire_protocol import (  # noqa: F401 - re-export for backward compatibility
     LOG_FILE,
     OP_MSG,
@@ -75,6 +77,15 @@ Examples:
             "SQLite database path (default: nx-27017.db, use 'memory' for in-memory)"
         ),
     )
+    parser.add_argument(
+        "--data-dir",
+        dest="data_dir",
+        default=None,
+        help=(
+            "Store each database in its own SQLite file <name>.db under this "
+            "directory (overrides --db)"
+        ),
+    )
     parser.add_argument(
         "--host",
         default="127.0.0.1",
@@ -139,6 +150,76 @@ Examples:
             "WAL provides best concurrency; DELETE is traditional rollback."
         ),
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes sharing the port via SO_REUSEPORT "
+            "(default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--read-pool-size",
+        dest="read_pool_size",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of read-only SQLite connections "
+            "(default: min(32, CPU count + 4); 0 reads through the writer)"
+        ),
+    )
+    parser.add_argument(
+        "--group-commit-ms",
+        dest="group_commit_ms",
+        type=float,
+        default=None,
+        help=(
+            "Commit writes from different clients arriving within this many "
+            "milliseconds in one transaction (default: off)"
+        ),
+    )
+    parser.add_argument(
+        "--group-commit-max-ops",
+        dest="group_commit_max_ops",
+        type=int,
+        default=DEFAULT_GROUP_COMMIT_MAX_OPS,
+        help=(
+            "Most writes committed together by one group commit "
+            f"(default: {DEFAULT_GROUP_COMMIT_MAX_OPS})"
+        ),
+    )
+    parser.add_argument(
+        "--fast-workers",
+        dest="fast_workers",
+        type=int,
+        default=None,
+        help=(
+            "Threads running point reads and writes (asyncio server; "
+            "default: min(32, CPU count + 4))"
+        ),
+    )
+    parser.add_argument(
+        "--heavy-workers",
+        dest="heavy_workers",
+        type=int,
+        default=None,
+        help=(
+            "Threads running aggregations, index builds, stats and GridFS "
+            "(asyncio server; default: half the CPU count)"
+        ),
+    )
+    parser.add_argument(
+        "--max-queue-depth",
+        dest="max_queue_depth",
+        type=int,
+        default=DEFAULT_MAX_QUEUE_DEPTH,
+        help=(
+            "Operations allowed to wait in each worker lane before new ones "
+            f"are rejected (default: {DEFAULT_MAX_QUEUE_DEPTH})"
+        ),
+    )
 
     args = parser.parse_args()
 
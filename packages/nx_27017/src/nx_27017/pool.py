@@ -0,0 +1,281 @@
+"""Reader connection pool and single-writer queue for NX-27017."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from neosqlite import Connection
+
+logger = logging.getLogger("nx_27017")
+
+# Seconds close() waits for queued writes to finish
+WRITER_SHUTDOWN_TIMEOUT = 5.0
+
+# Most writes committed together by one group commit
+DEFAULT_GROUP_COMMIT_MAX_OPS = 64
+
+# Savepoint isolating each write inside a group commit
+GROUP_COMMIT_SAVEPOINT = "nx_group_op"
+
+_WriteItem = tuple[Callable[..., Any], tuple[Any, ...], Future, bool]
+
+
+class WriterQueue:
+    """
+    Run write operations one at a time on a dedicated thread.
+
+    SQLite allows a single writer at a time, so funnelling every write
+    through one thread (and one connection) avoids SQLITE_BUSY retries
+    between writers while readers proceed concurrently under WAL.
+
+    With a group commit window, batchable writes queued within the window
+    (up to ``group_commit_max_ops`` of them) share one transaction and one
+    WAL commit. Each write runs under its own savepoint, so a failing write
+    is rolled back alone and only its caller sees the error. Callers are
+    answered once the shared COMMIT has succeeded.
+    """
+
+    def __init__(
+        self,
+        name: str = "nx-27017-writer",
+        connection: Connection | None = None,
+        group_commit_window: float | None = None,
+        group_commit_max_ops: int = DEFAULT_GROUP_COMMIT_MAX_OPS,
+    ) -> None:
+        if group_commit_window is not None:
+            if connection is None:
+                raise ValueError("Group commit needs the writer connection")
+            if group_commit_window < 0:
+                raise ValueError("Group commit window cannot be negative")
+            if group_commit_max_ops < 1:
+                raise ValueError("Group commit max ops must be positive")
+        self._connection = connection
+        self._window = group_commit_window
+        self._max_ops = group_commit_max_ops
+        self._queue: queue.Queue[_WriteItem | None] = queue.Queue()
+        # Item that ended a group, run next
+        self._held: list[_WriteItem | None] = []
+        self._closed = False
+        # Orders the closed check in submit() against close()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=name, daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Number of writes waiting to run."""
+        return self._queue.qsize()
+
+    @property
+    def group_commit(self) -> bool:
+        """Whether batchable writes are committed in groups."""
+        return self._window is not None
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, batchable: bool = False
+    ) -> Any:
+        """
+        Run fn(*args) on the writer thread and return its result.
+
+        Calls made from the writer thread itself run inline, so write
+        handlers may call each other without deadlocking. Pass
+        ``batchable=True`` only for writes that never begin, commit or roll
+        back a transaction themselves; with group commit enabled they may
+        share a transaction with writes from other clients.
+
+        Raises:
+            RuntimeError: If the queue has been closed
+            Exception: Whatever fn raised, or the error that failed the
+                group's COMMIT
+        """
+        if threading.current_thread() is self._thread:
+            return fn(*args)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Writer queue is closed")
+            self._queue.put((fn, args, future, batchable))
+        return future.result()
+
+    def _next(self) -> _WriteItem | None:
+        if self._held:
+            return self._held.pop()
+        return self._queue.get()
+
+    def _run(self) -> None:
+        while (item := self._next()) is not None:
+            fn, args, future, batchable = item
+            if self._window is not None and batchable:
+                self._run_group(self._gather(item))
+            elif future.set_running_or_notify_cancel():
+                self._call(fn, args, future)
+        # Writes queued behind a close made from the writer thread itself
+        while self._held or not self._queue.empty():
+            if (item := self._next()) is not None:
+                item[2].set_exception(RuntimeError("Writer queue is closed"))
+
+    def _gather(self, first: _WriteItem) -> list[_WriteItem]:
+        """Collect batchable writes arriving within the window."""
+        assert self._window is not None
+        batch = [first]
+        # A lone writer is not kept waiting for company that never comes;
+        # the window only applies once other writes are already queued
+        window = self._window if self._queue.qsize() else 0.0
+        deadline = time.monotonic() + window
+        while len(batch) < self._max_ops:
+            try:
+                item = self._queue.get(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except queue.Empty:
+                break
+            if item is None or not item[3]:
+                self._held.append(item)
+                break
+            batch.append(item)
+        return batch
+
+    @staticmethod
+    def _call(fn: Callable[..., Any], args: tuple[Any, ...], future: Future):
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _run_group(self, batch: list[_WriteItem]) -> None:
+        """Run a batch of writes in one transaction and answer each caller."""
+        assert self._connection is not None
+        batch = [
+            item for item in batch if item[2].set_running_or_notify_cancel()
+        ]
+        db = self._connection.db
+        if db.in_transaction or len(batch) == 1:
+            # A session transaction owns the connection, or there is nothing
+            # to share a commit with
+            for fn, args, future, _ in batch:
+                self._call(fn, args, future)
+            return
+
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            for fn, args, future, _ in batch:
+                db.execute(f"SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    if not db.in_transaction:
+                        # SQLite rolled back the whole group (e.g. disk full)
+                        raise
+                    db.execute(f"ROLLBACK TO {GROUP_COMMIT_SAVEPOINT}")
+                    db.execute(f"RELEASE {GROUP_COMMIT_SAVEPOINT}")
+                    outcomes.append((future, None, e))
+                else:
+                    db.execute(f"RELEASE {GROUP_COMMIT_SAVEPOINT}")
+                    outcomes.append((future, result, None))
+            db.commit()
+        except BaseException as e:
+            logger.warning(f"Group commit of {len(batch)} writes failed: {e}")
+            if db.in_transaction:
+                db.rollback()
+            for _, _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        logger.debug(f"Group committed {len(batch)} writes")
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """
+        Finish queued writes and stop the writer thread.
+
+        Called from the writer thread itself, the thread stops once the
+        current write returns, and writes queued after it fail.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if threading.current_thread() is not self._thread:
+            self._thread.join(WRITER_SHUTDOWN_TIMEOUT)
+
+
+class ReaderPool:
+    """
+    A bounded pool of read connections to one SQLite database.
+
+    Connections are opened lazily up to ``size`` and handed to whichever
+    thread runs a read command, so concurrent reads use separate SQLite
+    handles instead of serialising on the writer's connection.
+    """
+
+    def __init__(self, connect: Callable[[], Connection], size: int) -> None:
+        if size < 1:
+            raise ValueError("Reader pool size must be positive")
+        self._connect = connect
+        self.size = size
+        self._idle: queue.LifoQueue[Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def opened(self) -> int:
+        """Number of connections opened so far."""
+        return self._opened
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Borrow a read connection for the duration of the block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def _acquire(self) -> Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+        logger.debug(f"Opened read connection {self._opened}/{self.size}")
+        return conn
+
+    def close(self) -> None:
+        """Close idle connections; borrowed ones close when returned."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -5,14 +5,20 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import os
+import signal
 import socket
 import struct
 import threading
+from typing import Any, Callable
 
+from nx_27017.changestream import seed_cursor_ids
+from nx_27017.executor import CommandRejected
 from nx_27017.handler import NeoSQLiteHandler
 from nx_27017.wire_protocol import (
     MAX_MESSAGE_SIZE_BYTES,
     MESSAGE_HEADER_SIZE,
+    OP_COMPRESSED,
     OP_MSG,
     OP_QUERY,
     SOCKET_BACKLOG,
@@ -77,6 +83,17 @@ async def handle_client(
             else:
                 full_message = header
 
+            compressor_id = None
+            if opcode == WireProtocol.OP_COMPRESSED:
+                try:
+                    full_message, compressor_id = OP_COMPRESSED.unwrap(
+                        full_message
+                    )
+                except (ValueError, struct.error) as e:
+                    logger.warning(f"Invalid OP_COMPRESSED message: {e}")
+                    return
+                opcode = struct.unpack("<i", full_message[12:16])[0]
+
             match opcode:
                 case WireProtocol.OP_MSG:
                     msg = OP_MSG.parse(full_message)
@@ -110,16 +127,25 @@ async def handle_client(
                                     )
                         msg.get("request_id", 0)
                         if is_insert or has_payload_docs:
-                            request_id, response_doc = await asyncio.to_thread(
-                                handler.handle_insert, msg
+                            request_id, response_doc = (
+                                await handler.executor.run(
+                                    handler.handle_insert, msg
+                                )
                             )
                         else:
-                            request_id, response_doc = await asyncio.to_thread(
-                                handler.handle_command, msg
+                            await handler.await_change_stream_data_async(msg)
+                            request_id, response_doc = (
+                                await handler.executor.run(
+                                    handler.handle_command, msg
+                                )
                             )
                         logger.debug(
                             f"OP_MSG handled: request_id={request_id}, response_doc={response_doc.get('ok') if isinstance(response_doc, dict) else 'N/A'}"
                         )
+                    except CommandRejected as e:
+                        logger.debug(f"Rejected OP_MSG: {e}")
+                        response_doc = e.reply
+                        request_id = msg.get("request_id", 0)
                     except Exception as e:
                         logger.exception("Error handling OP_MSG")
                         response_doc = {"ok": 0, "errmsg": str(e)}
@@ -130,6 +156,7 @@ async def handle_client(
                             request_id=0,
                             response_to=msg.get("request_id", 0),
                             document=response_doc,
+                            compressor_id=compressor_id,
                         )
                         writer.write(reply)
                         await writer.drain()
@@ -140,11 +167,17 @@ async def handle_client(
                     msg = OP_QUERY.parse(full_message)
                     orig_request_id = msg["request_id"]
                     try:
-                        request_id, docs = await asyncio.to_thread(
-                            handler.handle_query, msg
-                        )
+                        try:
+                            request_id, docs = await handler.executor.run(
+                                handler.handle_query, msg
+                            )
+                        except CommandRejected as e:
+                            request_id, docs = 0, [e.reply]
                         reply = ResponseBuilder.build_reply(
-                            request_id, orig_request_id, docs
+                            request_id,
+                            orig_request_id,
+                            docs,
+                            compressor_id=compressor_id,
                         )
                         writer.write(reply)
                         await writer.drain()
@@ -224,6 +257,17 @@ def handle_client_threaded(
                 else:
                     full_message = header
 
+                compressor_id = None
+                if opcode == WireProtocol.OP_COMPRESSED:
+                    try:
+                        full_message, compressor_id = OP_COMPRESSED.unwrap(
+                            full_message
+                        )
+                    except (ValueError, struct.error) as e:
+                        logger.warning(f"Invalid OP_COMPRESSED message: {e}")
+                        return
+                    opcode = struct.unpack("<i", full_message[12:16])[0]
+
                 logger.debug(
                     f"Received: len={len(full_message)}, opcode={opcode}"
                 )
@@ -246,6 +290,7 @@ def handle_client_threaded(
                     ):
                         _, response_doc = handler.handle_insert(msg)
                     else:
+                        handler.await_change_stream_data(msg)
                         _, response_doc = handler.handle_command(msg)
 
                     logger.info(
@@ -256,6 +301,7 @@ def handle_client_threaded(
                         request_id=response_request_id,
                         response_to=request_id,
                         document=response_doc,
+                        compressor_id=compressor_id,
                     )
                     logger.info(
                         f"Sending reply: len={len(reply)}, "
@@ -269,7 +315,10 @@ def handle_client_threaded(
                     _, docs = handler.handle_query(msg)
                     response_request_id = _get_next_request_id()
                     reply = ResponseBuilder.build_reply(
-                        response_request_id, orig_request_id, docs
+                        response_request_id,
+                        orig_request_id,
+                        docs,
+                        compressor_id=compressor_id,
                     )
                     client_socket.sendall(reply)
 
@@ -297,16 +346,19 @@ def run_server_threaded(
     port: int,
     handler: NeoSQLiteHandler,
     use_threading: bool = True,
+    reuse_port: bool = False,
 ):
     """Run the MongoDB wire protocol server (threaded or async)."""
     if not use_threading:
         if uvloop is not None:
             uvloop.install()
-        asyncio.run(run_server(host, port, handler))
+        asyncio.run(run_server(host, port, handler, reuse_port=reuse_port))
         return
 
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
     server_socket.bind((host, port))
     server_socket.listen(SOCKET_BACKLOG)
 
@@ -330,7 +382,12 @@ def run_server_threaded(
         server_socket.close()
 
 
-async def run_server(host: str, port: int, handler: NeoSQLiteHandler):
+async def run_server(
+    host: str,
+    port: int,
+    handler: NeoSQLiteHandler,
+    reuse_port: bool = False,
+):
     """Run the MongoDB wire protocol server."""
 
     async def handle_client_closure(
@@ -342,6 +399,7 @@ async def run_server(host: str, port: int, handler: NeoSQLiteHandler):
         handle_client_closure,
         host,
         port,
+        reuse_port=reuse_port or None,
     )
 
     addr = server.sockets[0].getsockname()
@@ -349,3 +407,95 @@ async def run_server(host: str, port: int, handler: NeoSQLiteHandler):
 
     async with server:
         await server.serve_forever()
+
+
+def _raise_system_exit(signum: int, frame: Any) -> None:
+    raise SystemExit(0)
+
+
+def _run_worker(
+    index: int,
+    host: str,
+    port: int,
+    make_handler: Callable[[], NeoSQLiteHandler],
+    use_threading: bool,
+) -> int:
+    """Serve clients in a forked worker process; returns its exit code."""
+    try:
+        # Each worker opens its own SQLite connections after the fork and
+        # hands out cursor IDs from its own range
+        seed_cursor_ids(index)
+        handler = make_handler()
+        logger.info(f"Worker {index} started (PID: {os.getpid()})")
+        run_server_threaded(
+            host, port, handler, use_threading=use_threading, reuse_port=True
+        )
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    except Exception:
+        logger.exception(f"Worker {index} failed")
+        return 1
+    return 0
+
+
+def run_workers(
+    host: str,
+    port: int,
+    make_handler: Callable[[], NeoSQLiteHandler],
+    workers: int,
+    use_threading: bool = True,
+) -> None:
+    """
+    Pre-fork worker processes that all listen on the same port.
+
+    Every worker binds host:port with SO_REUSEPORT, so the kernel spreads
+    incoming connections across them and query work is no longer limited
+    to one core by the GIL. A connection stays with the worker that
+    accepted it for its whole life, but a driver may send a getMore on
+    another pooled connection, so workers return whole results in the
+    first batch where one reply can hold them. Change streams, which only
+    see the writes of their own worker, are refused.
+
+    Args:
+        host: Address to bind
+        port: Port to bind
+        make_handler: Creates a worker's handler; called after the fork
+        workers: Number of worker processes
+        use_threading: Use the threaded server instead of asyncio
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if not hasattr(socket, "SO_REUSEPORT") or not hasattr(os, "fork"):
+        raise RuntimeError("Multiple workers need fork() and SO_REUSEPORT")
+
+    # Turn SIGTERM into SystemExit so the workers are stopped below even
+    # when the caller has not installed a handler of its own
+    if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _raise_system_exit)
+
+    children: dict[int, int] = {}
+    try:
+        for index in range(workers):
+            pid = os.fork()
+            if pid == 0:
+                os._exit(
+                    _run_worker(index, host, port, make_handler, use_threading)
+                )
+            children[pid] = index
+        logger.info(f"Started {workers} workers on {host}:{port}")
+
+        while children:
+            pid, status = os.wait()
+            index = children.pop(pid, None)
+            if index is not None:
+                logger.warning(
+                    f"Worker {index} (PID: {pid}) exited with status "
+                    f"{os.waitstatus_to_exitcode(status)}"
+                )
+    finally:
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        for pid in children:
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
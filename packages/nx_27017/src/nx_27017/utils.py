@@ -1,5 +1,5 @@
 from decimal import Decimal as PyDecimal
-from typing import Any
+from typing import Any, Callable
 
 from bson import ObjectId as BsonObjectId
 from bson.int64 import Int64
@@ -7,56 +7,80 @@ from bson.int64 import Int64
 from neosqlite.objectid import ObjectId as NeoObjectId
 
 
-def convert_neo_to_bson_objectids(doc: Any) -> Any:
-    """Convert NeoSQLite ObjectIds to BSON ObjectIds, and Decimal to float."""
+def _convert_list(items: list, convert: Callable[[Any], Any]) -> list:
+    """Convert list items, returning the original list if none changed."""
+    converted = [convert(item) for item in items]
+    if all(new is old for new, old in zip(converted, items)):
+        return items
+    return converted
 
-    def _convert_value(value: Any) -> Any:
-        if isinstance(value, NeoObjectId):
-            return BsonObjectId(value.binary)
-        elif isinstance(value, PyDecimal):
-            return float(value)
-        elif isinstance(value, list):
-            return [_convert_value(item) for item in value]
-        elif isinstance(value, dict):
-            return convert_neo_to_bson_objectids(value)
-        return value
 
+def _convert_dict(doc: dict, convert: Callable[[str, Any], Any]) -> dict:
+    """Convert dict values, copying the dict only if a value changed."""
+    result = None
+    for key, value in doc.items():
+        new = convert(key, value)
+        if new is not value:
+            if result is None:
+                result = dict(doc)
+            result[key] = new
+    return doc if result is None else result
+
+
+def _neo_to_bson_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return convert_neo_to_bson_objectids(value)
+    elif isinstance(value, list):
+        return _convert_list(value, _neo_to_bson_value)
+    elif isinstance(value, NeoObjectId):
+        return BsonObjectId(value.binary)
+    elif isinstance(value, PyDecimal):
+        return float(value)
+    return value
+
+
+def _neo_to_bson_field(key: str, value: Any) -> Any:
+    if key == "id" and value == 0 and type(value) is not Int64:
+        return Int64(0)
+    return _neo_to_bson_value(value)
+
+
+def convert_neo_to_bson_objectids(doc: Any) -> Any:
+    """
+    Convert NeoSQLite ObjectIds to BSON ObjectIds, and Decimal to float.
+
+    Containers are only copied when something inside them changes, so
+    documents without ObjectIds or Decimals are returned as-is.
+    """
     if isinstance(doc, dict):
-        result = {}
-        for key, value in doc.items():
-            if key == "id" and value == 0:
-                result[key] = Int64(0)
-            else:
-                result[key] = _convert_value(value)
-        return result
-    elif isinstance(doc, list):
-        return [_convert_value(item) for item in doc]
-    elif isinstance(doc, PyDecimal):
-        return float(doc)
-    elif isinstance(doc, NeoObjectId):
-        return BsonObjectId(doc.binary)
-    return doc
+        return _convert_dict(doc, _neo_to_bson_field)
+    return _neo_to_bson_value(doc)
 
 
-def convert_bson_to_neo_objectids(doc: Any) -> Any:
-    """Convert PyMongo/BSON ObjectIds to NeoSQLite ObjectIds recursively."""
+def _bson_to_neo_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return convert_bson_to_neo_objectids(value)
+    elif isinstance(value, list):
+        return _convert_list(value, _bson_to_neo_value)
+    elif isinstance(value, BsonObjectId):
+        return NeoObjectId(value.binary)
+    return value
+
+
+def _bson_to_neo_field(key: str, value: Any) -> Any:
+    return _bson_to_neo_value(value)
 
-    def _convert_value(value: Any) -> Any:
-        if isinstance(value, dict):
-            return convert_bson_to_neo_objectids(value)
-        elif isinstance(value, list):
-            return [_convert_value(item) for item in value]
-        elif isinstance(value, BsonObjectId):
-            return NeoObjectId(value.binary)
-        return value
 
+def convert_bson_to_neo_objectids(doc: Any) -> Any:
+    """
+    Convert PyMongo/BSON ObjectIds to NeoSQLite ObjectIds recursively.
+
+    Like convert_neo_to_bson_objectids, documents that hold no BSON
+    ObjectIds are returned without being copied.
+    """
     if not isinstance(doc, dict):
         return doc
-
-    result = {}
-    for key, value in doc.items():
-        result[key] = _convert_value(value)
-    return result
+    return _convert_dict(doc, _bson_to_neo_field)
 
 
 def convert_json_to_neo_objectids(doc: Any) -> Any:
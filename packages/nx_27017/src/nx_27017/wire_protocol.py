@@ -4,11 +4,22 @@ from __future__ import annotations
 
 import logging
 import struct
+import zlib
 from itertools import count
 from typing import Any
 
 from bson import BSON, encode
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import snappy
+except ImportError:
+    snappy = None  # type: ignore[assignment]
+
 logger = logging.getLogger("nx_27017")
 
 PID_FILE = "/tmp/nx_27017.pid"
@@ -23,9 +34,21 @@ MIN_WIRE_VERSION = 17
 MAX_WIRE_VERSION = 21
 
 DEFAULT_SESSION_TIMEOUT_MINUTES = 30
+# How long an awaitData getMore waits for change events without maxTimeMS
+DEFAULT_AWAIT_DATA_TIMEOUT_MS = 1000
 DEFAULT_MAX_CONNECTIONS = 1000
 SOCKET_BACKLOG = 128
 
+# OP_COMPRESSED compressor IDs from the MongoDB wire protocol
+COMPRESSOR_NOOP = 0
+COMPRESSOR_SNAPPY = 1
+COMPRESSOR_ZLIB = 2
+COMPRESSOR_ZSTD = 3
+
+# Header fields after the standard header: originalOpcode, uncompressedSize,
+# compressorId
+OP_COMPRESSED_HEADER_SIZE = 9
+
 SHUTDOWN_RETRY_COUNT = 10
 SHUTDOWN_POLL_INTERVAL = 0.5
 
@@ -63,6 +86,158 @@ class WireProtocol:
 
     OP_MSG = 2013
     OP_QUERY = 2004
+    OP_COMPRESSED = 2012
+
+
+def available_compressors() -> dict[str, int]:
+    """Compressors this server can use, by name, in preference order."""
+    compressors = {}
+    if zstandard is not None:
+        compressors["zstd"] = COMPRESSOR_ZSTD
+    if snappy is not None:
+        compressors["snappy"] = COMPRESSOR_SNAPPY
+    compressors["zlib"] = COMPRESSOR_ZLIB
+    return compressors
+
+
+def negotiate_compressors(requested: Any) -> list[str]:
+    """
+    Pick the compressors to advertise in a hello reply.
+
+    Returns the client's requested compressors that this server supports,
+    in the client's order of preference.
+    """
+    if not isinstance(requested, list):
+        return []
+    available = available_compressors()
+    return [name for name in requested if name in available]
+
+
+def compress(data: bytes, compressor_id: int) -> bytes:
+    """Compress a message body with the given OP_COMPRESSED compressor."""
+    if compressor_id == COMPRESSOR_NOOP:
+        return data
+    if compressor_id == COMPRESSOR_ZLIB:
+        return zlib.compress(data)
+    if compressor_id == COMPRESSOR_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    if compressor_id == COMPRESSOR_SNAPPY and snappy is not None:
+        return snappy.compress(data)
+    raise ValueError(f"Unsupported compressor: {compressor_id}")
+
+
+def _snappy_length(data: bytes) -> int:
+    """
+    Read the uncompressed length a raw snappy stream declares.
+
+    The stream starts with it as a little-endian varint of at most 5 bytes.
+
+    Raises:
+        ValueError: If the preamble is truncated or too long
+    """
+    length = 0
+    for i, byte in enumerate(data[:5]):
+        length |= (byte & 0x7F) << (7 * i)
+        if not byte & 0x80:
+            return length
+    raise ValueError("Invalid snappy length preamble")
+
+
+def decompress(data: bytes, compressor_id: int, size: int) -> bytes:
+    """
+    Decompress an OP_COMPRESSED body of a known uncompressed size.
+
+    Raises:
+        ValueError: If the compressor is unsupported, ``size`` exceeds the
+            maximum message size, or the data does not decompress to
+            ``size`` bytes
+    """
+    if size < 0 or size > MAX_MESSAGE_SIZE_BYTES:
+        raise ValueError(f"Invalid uncompressed size: {size}")
+    try:
+        if compressor_id == COMPRESSOR_NOOP:
+            result = data
+        elif compressor_id == COMPRESSOR_ZLIB:
+            # Bound the output so a bogus stream cannot exhaust memory
+            result = zlib.decompressobj().decompress(data, size + 1)
+        elif compressor_id == COMPRESSOR_ZSTD and zstandard is not None:
+            result = zstandard.ZstdDecompressor().decompress(
+                data, max_output_size=size
+            )
+        elif compressor_id == COMPRESSOR_SNAPPY and snappy is not None:
+            # snappy allocates the length the stream declares, so check it
+            # before decompressing
+            declared = _snappy_length(data)
+            if declared != size:
+                raise ValueError(
+                    f"Decompressed size {declared} does not match "
+                    f"uncompressedSize {size}"
+                )
+            result = snappy.uncompress(data)
+        else:
+            raise ValueError(f"Unsupported compressor: {compressor_id}")
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Invalid compressed data: {e}") from e
+    if len(result) != size:
+        raise ValueError(
+            f"Decompressed size {len(result)} does not match "
+            f"uncompressedSize {size}"
+        )
+    return result
+
+
+class OP_COMPRESSED:
+    """Codec for MongoDB OP_COMPRESSED wire protocol messages."""
+
+    @staticmethod
+    def unwrap(message_bytes: bytes) -> tuple[bytes, int]:
+        """
+        Rebuild the original message wrapped by an OP_COMPRESSED message.
+
+        Returns:
+            The uncompressed message (header included) and the compressor ID
+        """
+        request_id, response_to, _ = struct.unpack("<iii", message_bytes[4:16])
+        original_opcode, size, compressor_id = struct.unpack(
+            "<iiB", message_bytes[16 : 16 + OP_COMPRESSED_HEADER_SIZE]
+        )
+        if size < 0 or size > MAX_MESSAGE_SIZE_BYTES - MESSAGE_HEADER_SIZE:
+            raise ValueError(f"Invalid uncompressed size: {size}")
+        body = decompress(
+            message_bytes[16 + OP_COMPRESSED_HEADER_SIZE :],
+            compressor_id,
+            size,
+        )
+        header = struct.pack(
+            "<iiii",
+            MESSAGE_HEADER_SIZE + size,
+            request_id,
+            response_to,
+            original_opcode,
+        )
+        return header + body, compressor_id
+
+    @staticmethod
+    def wrap(message_bytes: bytes, compressor_id: int) -> bytes:
+        """Compress an encoded message into an OP_COMPRESSED message."""
+        request_id, response_to, original_opcode = struct.unpack(
+            "<iii", message_bytes[4:16]
+        )
+        body = message_bytes[MESSAGE_HEADER_SIZE:]
+        compressed = compress(body, compressor_id)
+        header = struct.pack(
+            "<iiiiiiB",
+            MESSAGE_HEADER_SIZE + OP_COMPRESSED_HEADER_SIZE + len(compressed),
+            request_id,
+            response_to,
+            WireProtocol.OP_COMPRESSED,
+            original_opcode,
+            len(body),
+            compressor_id,
+        )
+        return header + compressed
 
 
 class ResponseBuilder:
@@ -74,6 +249,7 @@ class ResponseBuilder:
         response_to: int,
         document: dict[str, Any],
         flags: int = 0,
+        compressor_id: int | None = None,
     ) -> bytes:
         doc_data = encode(_convert_objectids(document))
         sections = struct.pack("<B", 0) + doc_data
@@ -85,6 +261,8 @@ class ResponseBuilder:
             response_to,
             WireProtocol.OP_MSG,
         )
+        if compressor_id is not None:
+            return OP_COMPRESSED.wrap(header + body, compressor_id)
         return header + body
 
     @staticmethod
@@ -93,6 +271,7 @@ class ResponseBuilder:
         response_to: int,
         documents: list[dict[str, Any]],
         flags: int = 0,
+        compressor_id: int | None = None,
     ) -> bytes:
         sections = []
         for doc in documents:
@@ -107,6 +286,8 @@ class ResponseBuilder:
             response_to,
             WireProtocol.OP_MSG,
         )
+        if compressor_id is not None:
+            return OP_COMPRESSED.wrap(header + body, compressor_id)
         return header + body
 
 
@@ -115,6 +296,12 @@ class OP_MSG:
 
     @staticmethod
     def parse(message_bytes: bytes) -> dict[str, Any]:
+        compressor_id = None
+        if struct.unpack("<i", message_bytes[12:16])[0] == (
+            WireProtocol.OP_COMPRESSED
+        ):
+            message_bytes, compressor_id = OP_COMPRESSED.unwrap(message_bytes)
+
         message_length = struct.unpack("<i", message_bytes[0:4])[0]
         request_id = struct.unpack("<i", message_bytes[4:8])[0]
         response_to = struct.unpack("<i", message_bytes[8:12])[0]
@@ -210,6 +397,7 @@ class OP_MSG:
             "opcode": opcode,
             "flags": flags,
             "sections": sections,
+            "compressor_id": compressor_id,
         }
 
 
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from nx_27017.nx_27017 import NeoSQLiteHandler
 
@@ -119,3 +123,178 @@ def test_change_stream_lifecycle_and_getmore(handler):
     events3 = getmore_res3["cursor"]["nextBatch"]
     assert len(events3) == 1
     assert events3[0]["operationType"] == "delete"
+
+
+def _command(handler, body):
+    body = dict(body, **{"$db": "test"})
+    return handler.handle_command(
+        {"request_id": 1, "sections": [("body", body)]}
+    )[1]
+
+
+def _insert_users(handler, docs):
+    handler.handle_insert(
+        {
+            "request_id": 1,
+            "sections": [
+                ("body", {"insert": "users", "$db": "test"}),
+                ("payload", {"documents": docs}),
+            ],
+        }
+    )
+
+
+def test_has_subscribers_tracks_open_streams(handler):
+    manager = handler._change_stream_manager
+    assert not manager.has_subscribers("users")
+    res = _command(
+        handler, {"aggregate": "users", "pipeline": [{"$changeStream": {}}]}
+    )
+    assert manager.has_subscribers("users")
+    assert not manager.has_subscribers("other")
+    _command(
+        handler, {"killCursors": "users", "cursors": [res["cursor"]["id"]]}
+    )
+    assert not manager.has_subscribers("users")
+
+
+def test_unwatched_writes_skip_image_reads(handler, monkeypatch):
+    _insert_users(handler, [{"_id": i, "n": i} for i in range(5)])
+
+    def fail(*args):
+        raise AssertionError("image read without a change stream")
+
+    monkeypatch.setattr(NeoSQLiteHandler, "_matched_ids", fail)
+    res = _command(
+        handler,
+        {
+            "update": "users",
+            "updates": [{"q": {}, "u": {"$inc": {"n": 1}}, "multi": True}],
+        },
+    )
+    assert res["n"] == 5
+
+
+def test_watched_update_many_batches_post_images(handler):
+    _insert_users(handler, [{"_id": i, "n": i} for i in range(5)])
+    res = _command(
+        handler, {"aggregate": "users", "pipeline": [{"$changeStream": {}}]}
+    )
+    cursor_id = res["cursor"]["id"]
+    _command(
+        handler,
+        {
+            "update": "users",
+            "updates": [
+                {
+                    "q": {"n": {"$gte": 2}},
+                    "u": {"$inc": {"n": 10}},
+                    "multi": True,
+                }
+            ],
+        },
+    )
+    _command(handler, {"delete": "users", "deletes": [{"q": {}, "limit": 1}]})
+    events = _command(handler, {"getMore": cursor_id, "collection": "users"})[
+        "cursor"
+    ]["nextBatch"]
+    updates = [e for e in events if e["operationType"] == "update"]
+    assert sorted(e["fullDocument"]["n"] for e in updates) == [12, 13, 14]
+    deletes = [e for e in events if e["operationType"] == "delete"]
+    assert len(deletes) == 1
+
+
+def _watch(handler):
+    res = _command(
+        handler, {"aggregate": "users", "pipeline": [{"$changeStream": {}}]}
+    )
+    return res["cursor"]["id"]
+
+
+def _get_more_msg(cursor_id, **options):
+    body = {"getMore": cursor_id, "collection": "users", "$db": "test"}
+    return {"request_id": 1, "sections": [("body", dict(body, **options))]}
+
+
+def test_post_batch_resume_token(handler):
+    cursor_id = _watch(handler)
+    _insert_users(handler, [{"_id": i} for i in range(3)])
+
+    cursor = _command(
+        handler, {"getMore": cursor_id, "collection": "users", "batchSize": 2}
+    )["cursor"]
+    assert len(cursor["nextBatch"]) == 2
+    assert cursor["postBatchResumeToken"] == cursor["nextBatch"][-1]["_id"]
+
+    cursor = _command(handler, {"getMore": cursor_id, "collection": "users"})[
+        "cursor"
+    ]
+    last = cursor["nextBatch"][-1]["_id"]
+    assert cursor["postBatchResumeToken"] == last
+
+    # An empty batch keeps the position after the last event returned
+    cursor = _command(handler, {"getMore": cursor_id, "collection": "users"})[
+        "cursor"
+    ]
+    assert cursor["nextBatch"] == []
+    assert cursor["postBatchResumeToken"] == last
+
+
+def test_await_data_wakes_on_change(handler):
+    msg = _get_more_msg(_watch(handler), maxTimeMS=5000)
+    timer = threading.Timer(0.05, _insert_users, (handler, [{"_id": 1}]))
+    timer.start()
+    started = time.monotonic()
+    handler.await_change_stream_data(msg)
+    assert time.monotonic() - started < 2
+    timer.join()
+    events = handler.handle_command(msg)[1]["cursor"]["nextBatch"]
+    assert [e["documentKey"] for e in events] == [{"_id": 1}]
+
+
+def test_await_data_times_out(handler):
+    msg = _get_more_msg(_watch(handler), maxTimeMS=50)
+    started = time.monotonic()
+    handler.await_change_stream_data(msg)
+    assert 0.04 <= time.monotonic() - started < 1
+    assert handler.handle_command(msg)[1]["cursor"]["nextBatch"] == []
+
+
+def test_await_data_async(handler):
+    cursor_id = _watch(handler)
+    msg = _get_more_msg(cursor_id, maxTimeMS=5000)
+
+    async def wait():
+        waiting = asyncio.create_task(
+            handler.await_change_stream_data_async(msg)
+        )
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        # The change arrives from a writer thread, not the event loop
+        writer = threading.Thread(
+            target=_insert_users, args=(handler, [{"_id": 1}])
+        )
+        writer.start()
+        await asyncio.wait_for(waiting, 2)
+        writer.join()
+
+    asyncio.run(wait())
+    assert handler._change_stream_manager.get_stream(cursor_id).has_changes()
+
+
+def test_close_wakes_waiter(handler):
+    cursor_id = _watch(handler)
+    stream = handler._change_stream_manager.get_stream(cursor_id)
+    threading.Timer(0.05, stream.close).start()
+    started = time.monotonic()
+    assert not stream.wait(5)
+    assert time.monotonic() - started < 2
+
+
+def test_await_data_ignores_other_messages(handler):
+    started = time.monotonic()
+    handler.await_change_stream_data(_get_more_msg(12345, maxTimeMS=5000))
+    handler.await_change_stream_data(
+        {"request_id": 1, "sections": [("body", {"ping": 1})]}
+    )
+    assert time.monotonic() - started < 1
@@ -108,3 +108,55 @@ class TestDaemonFunctions:
             mock_fork.side_effect = OSError("Cannot fork")
             with pytest.raises(SystemExit):
                 run_as_daemon(args)
+
+    def _server_args(self, tmp_path, db_path, workers):
+        args = MagicMock()
+        args.db_path = db_path
+        args.host = "127.0.0.1"
+        args.port = 27017
+        args.journal_mode = "WAL"
+        args.fts5_tokenizers = None
+        args.threaded = True
+        args.read_pool_size = None
+        args.workers = workers
+        return args
+
+    def test_run_server_sync_workers(self, tmp_path):
+        """Test that --workers starts the pre-fork supervisor."""
+        from nx_27017.daemon import run_server_sync
+
+        args = self._server_args(tmp_path, str(tmp_path / "w.db"), 3)
+        with (
+            patch("nx_27017.daemon.run_workers") as mock_workers,
+            patch("nx_27017.daemon.run_server_threaded") as mock_single,
+        ):
+            run_server_sync(args)
+        mock_single.assert_not_called()
+        host, port, make_handler, workers = mock_workers.call_args.args
+        assert (host, port, workers) == ("127.0.0.1", 27017, 3)
+        handler = make_handler()
+        try:
+            assert handler.db_path == str(tmp_path / "w.db")
+        finally:
+            handler.close()
+
+    def test_run_server_sync_memory_ignores_workers(self, tmp_path):
+        """Test that an in-memory database always runs one process."""
+        from nx_27017.daemon import run_server_sync
+
+        args = self._server_args(tmp_path, "memory", 4)
+        with (
+            patch("nx_27017.daemon.run_workers") as mock_workers,
+            patch("nx_27017.daemon.run_server_threaded") as mock_single,
+        ):
+            run_server_sync(args)
+        mock_workers.assert_not_called()
+        mock_single.assert_called_once()
+        mock_single.call_args.args[2].close()
+
+    def test_run_workers_rejects_zero(self):
+        """Test run_workers argument validation."""
+        from nx_27017.server import run_workers
+
+        with pytest.raises(ValueError):
+            run_workers("127.0.0.1", 27017, MagicMock(), 0)
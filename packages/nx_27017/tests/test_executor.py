@@ -0,0 +1,167 @@
+"""Tests for the bounded two-lane command executor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from nx_27017.executor import (
+    FAST_LANE,
+    HEAVY_LANE,
+    CommandExecutor,
+    CommandRejected,
+    Lane,
+    command_lane,
+)
+
+
+def _msg(body):
+    return {"request_id": 1, "sections": [("body", body)]}
+
+
+class TestCommandLane:
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"find": "items", "filter": {"_id": 1}},
+            {"insert": "items"},
+            {"getMore": 1, "collection": "items"},
+            {"aggregate": "items", "pipeline": [{"$changeStream": {}}]},
+            {"ping": 1},
+        ],
+    )
+    def test_fast(self, body):
+        assert command_lane(body) == FAST_LANE
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"aggregate": "items", "pipeline": [{"$group": {"_id": "$k"}}]},
+            {"createIndexes": "items", "indexes": []},
+            {"collStats": "items"},
+            {"find": "fs.files", "filter": {}},
+            {"insert": "fs.chunks"},
+        ],
+    )
+    def test_heavy(self, body):
+        assert command_lane(body) == HEAVY_LANE
+
+    def test_empty(self):
+        assert command_lane(None) == FAST_LANE
+        assert command_lane({}) == FAST_LANE
+
+
+class TestLane:
+    def test_rejects_when_queue_full(self):
+        lane = Lane("test", workers=1, max_queue_depth=1)
+        release = threading.Event()
+
+        async def scenario():
+            busy = asyncio.ensure_future(lane.run(release.wait))
+            while not lane.stats()["active"]:
+                await asyncio.sleep(0.001)
+            queued = asyncio.ensure_future(lane.run(lambda: "queued"))
+            await asyncio.sleep(0.01)
+            with pytest.raises(CommandRejected) as rejected:
+                await lane.run(lambda: "rejected")
+            release.set()
+            return await busy, await queued, rejected.value.reply
+
+        try:
+            busy, queued, reply = asyncio.run(scenario())
+        finally:
+            lane.shutdown()
+        assert (busy, queued) == (True, "queued")
+        assert reply["code"] == 365
+        stats = lane.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["queueLength"] == 0
+        assert stats["maxWaitMicros"] > 0
+
+    def test_drops_work_past_deadline(self):
+        lane = Lane("test", workers=1, max_queue_depth=10)
+        ran = []
+
+        async def scenario():
+            busy = asyncio.ensure_future(lane.run(time.sleep, 0.1))
+            while not lane.stats()["active"]:
+                await asyncio.sleep(0.001)
+            with pytest.raises(CommandRejected) as rejected:
+                await lane.run(
+                    lambda: ran.append(1), deadline=time.monotonic() + 0.01
+                )
+            await busy
+            return rejected.value.reply
+
+        try:
+            reply = asyncio.run(scenario())
+        finally:
+            lane.shutdown()
+        assert reply["code"] == 50
+        assert ran == []
+        assert lane.stats()["timedOut"] == 1
+
+    def test_rejects_deadline_it_cannot_meet(self):
+        lane = Lane("test", workers=1, max_queue_depth=10)
+
+        async def scenario():
+            await lane.run(time.sleep, 0.05)
+            busy = asyncio.ensure_future(lane.run(time.sleep, 0.05))
+            while not lane.stats()["active"]:
+                await asyncio.sleep(0.001)
+            started = time.monotonic()
+            with pytest.raises(CommandRejected):
+                await lane.run(lambda: None, deadline=started + 0.001)
+            # Turned away at once rather than after waiting in the queue
+            assert time.monotonic() - started < 0.04
+            await busy
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            lane.shutdown()
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            Lane("test", workers=0, max_queue_depth=1)
+
+
+class TestCommandExecutor:
+    def test_heavy_work_does_not_block_point_reads(self):
+        executor = CommandExecutor(fast_workers=1, heavy_workers=1)
+        release = threading.Event()
+        report = _msg({"aggregate": "items", "pipeline": []})
+        point = _msg({"find": "items", "filter": {"_id": 1}})
+
+        async def scenario():
+            slow = asyncio.ensure_future(
+                executor.run(lambda msg: release.wait(), report)
+            )
+            fast = await asyncio.wait_for(
+                executor.run(lambda msg: "point", point), 1
+            )
+            release.set()
+            await slow
+            return fast
+
+        try:
+            assert asyncio.run(scenario()) == "point"
+        finally:
+            executor.shutdown()
+        stats = executor.stats()
+        assert stats[FAST_LANE]["completed"] == 1
+        assert stats[HEAVY_LANE]["completed"] == 1
+
+    def test_server_status_reports_queues(self, tmp_path):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        h = NeoSQLiteHandler(str(tmp_path / "t.db"), heavy_workers=3)
+        try:
+            _, reply = h.handle_command(_msg({"serverStatus": 1}))
+        finally:
+            h.close()
+        execution = reply["queues"]["execution"]
+        assert execution[HEAVY_LANE]["workers"] == 3
+        assert execution[FAST_LANE]["queueLength"] == 0
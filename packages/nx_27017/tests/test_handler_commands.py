@@ -193,7 +193,7 @@ class TestSessions:
         assert "id" in response["session"]
         assert "$oid" in response["session"]["id"]
         session_id = response["session"]["id"]["$oid"]
-        assert session_id in handler._sessions
+        assert (session_id, "admin") in handler._sessions
 
     def test_commit_transaction(self, handler):
         start_msg = {
@@ -204,7 +204,7 @@ class TestSessions:
         session_id = start_response["session"]["id"]["$oid"]
 
         with handler._sessions_lock:
-            session = handler._sessions[session_id]
+            session = handler._sessions[(session_id, "admin")]
             session.start_transaction()
 
         commit_msg = {
@@ -232,7 +232,7 @@ class TestSessions:
         session_id = start_response["session"]["id"]["$oid"]
 
         with handler._sessions_lock:
-            session = handler._sessions[session_id]
+            session = handler._sessions[(session_id, "admin")]
             session.start_transaction()
 
         abort_msg = {
@@ -258,7 +258,7 @@ class TestSessions:
         }
         _, start_response = handler.handle_command(start_msg)
         session_id = start_response["session"]["id"]["$oid"]
-        assert session_id in handler._sessions
+        assert (session_id, "admin") in handler._sessions
 
         end_msg = {
             "request_id": 22,
@@ -274,7 +274,7 @@ class TestSessions:
         }
         _, end_response = handler.handle_command(end_msg)
         assert end_response["ok"] == 1
-        assert session_id not in handler._sessions
+        assert (session_id, "admin") not in handler._sessions
 
 
 class TestUnknownCommand:
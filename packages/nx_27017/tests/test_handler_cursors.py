@@ -0,0 +1,237 @@
+"""Tests for server-side cursors (batchSize, getMore, killCursors)."""
+
+import pytest
+
+
+@pytest.fixture
+def handler(tmp_path):
+    from nx_27017.nx_27017 import NeoSQLiteHandler
+
+    db_path = str(tmp_path / "test.db")
+    h = NeoSQLiteHandler(db_path)
+    yield h
+    h.conn.close()
+
+
+def _insert(handler, count):
+    handler.handle_insert(
+        {
+            "request_id": 1,
+            "sections": [
+                ("body", {"insert": "items", "$db": "test"}),
+                ("payload_docs", [{"n": i} for i in range(count)]),
+            ],
+        }
+    )
+
+
+def _command(handler, body):
+    body = dict(body, **{"$db": "test"})
+    _, response = handler.handle_command(
+        {"request_id": 2, "sections": [("body", body)]}
+    )
+    return response
+
+
+def _get_more(handler, cursor_id, batch_size=None):
+    body = {"getMore": cursor_id, "collection": "items"}
+    if batch_size is not None:
+        body["batchSize"] = batch_size
+    return _command(handler, body)
+
+
+class TestFindCursors:
+    def test_small_result_closes_cursor(self, handler):
+        _insert(handler, 3)
+        response = _command(handler, {"find": "items", "filter": {}})
+        assert response["cursor"]["id"] == 0
+        assert len(response["cursor"]["firstBatch"]) == 3
+        assert len(handler._cursor_manager) == 0
+
+    def test_default_first_batch_size(self, handler):
+        _insert(handler, 150)
+        response = _command(handler, {"find": "items", "filter": {}})
+        cursor = response["cursor"]
+        assert len(cursor["firstBatch"]) == 101
+        assert cursor["id"] != 0
+
+        more = _get_more(handler, cursor["id"])
+        assert more["cursor"]["id"] == 0
+        assert len(more["cursor"]["nextBatch"]) == 49
+        assert len(handler._cursor_manager) == 0
+
+    def test_batch_size_and_get_more(self, handler):
+        _insert(handler, 10)
+        response = _command(
+            handler,
+            {"find": "items", "filter": {}, "sort": {"n": 1}, "batchSize": 4},
+        )
+        cursor_id = response["cursor"]["id"]
+        seen = [doc["n"] for doc in response["cursor"]["firstBatch"]]
+        assert seen == [0, 1, 2, 3]
+
+        more = _get_more(handler, cursor_id, batch_size=4)
+        assert more["cursor"]["id"] == cursor_id
+        assert more["cursor"]["ns"] == response["cursor"]["ns"]
+        seen += [doc["n"] for doc in more["cursor"]["nextBatch"]]
+        more = _get_more(handler, cursor_id, batch_size=4)
+        seen += [doc["n"] for doc in more["cursor"]["nextBatch"]]
+
+        assert seen == list(range(10))
+        assert more["cursor"]["id"] == 0
+
+    def test_batch_size_zero_returns_empty_first_batch(self, handler):
+        _insert(handler, 2)
+        response = _command(
+            handler, {"find": "items", "filter": {}, "batchSize": 0}
+        )
+        assert response["cursor"]["firstBatch"] == []
+        more = _get_more(handler, response["cursor"]["id"])
+        assert len(more["cursor"]["nextBatch"]) == 2
+
+    def test_single_batch(self, handler):
+        _insert(handler, 10)
+        response = _command(
+            handler,
+            {
+                "find": "items",
+                "filter": {},
+                "batchSize": 3,
+                "singleBatch": True,
+            },
+        )
+        assert response["cursor"]["id"] == 0
+        assert len(response["cursor"]["firstBatch"]) == 3
+        assert len(handler._cursor_manager) == 0
+
+    def test_batches_are_bounded_by_size(self, handler, monkeypatch):
+        from nx_27017 import cursors
+
+        _insert(handler, 10)
+        doc_size = len(cursors.encode({"_id": 1, "n": 1}))
+        monkeypatch.setattr(cursors, "MAX_BATCH_BYTES", doc_size * 3)
+        response = _command(handler, {"find": "items", "filter": {}})
+        assert len(response["cursor"]["firstBatch"]) < 10
+        cursor_id = response["cursor"]["id"]
+
+        total = len(response["cursor"]["firstBatch"])
+        while cursor_id:
+            more = _get_more(handler, cursor_id)
+            total += len(more["cursor"]["nextBatch"])
+            cursor_id = more["cursor"]["id"]
+        assert total == 10
+
+
+class TestAggregateCursors:
+    def test_aggregate_batch_size(self, handler):
+        _insert(handler, 5)
+        response = _command(
+            handler,
+            {
+                "aggregate": "items",
+                "pipeline": [{"$sort": {"n": -1}}],
+                "cursor": {"batchSize": 2},
+            },
+        )
+        assert [d["n"] for d in response["cursor"]["firstBatch"]] == [4, 3]
+        more = _get_more(handler, response["cursor"]["id"])
+        assert [d["n"] for d in more["cursor"]["nextBatch"]] == [2, 1, 0]
+        assert more["cursor"]["id"] == 0
+
+
+class TestCursorLifetime:
+    def test_kill_cursors(self, handler):
+        _insert(handler, 5)
+        response = _command(
+            handler, {"find": "items", "filter": {}, "batchSize": 1}
+        )
+        cursor_id = response["cursor"]["id"]
+
+        killed = _command(
+            handler, {"killCursors": "items", "cursors": [cursor_id, 12345]}
+        )
+        assert killed["cursorsKilled"] == [cursor_id]
+        assert killed["cursorsNotFound"] == [12345]
+
+        more = _get_more(handler, cursor_id)
+        assert more["ok"] == 0
+        assert more["code"] == 43
+
+    def test_idle_cursors_time_out(self, handler):
+        _insert(handler, 5)
+        response = _command(
+            handler, {"find": "items", "filter": {}, "batchSize": 1}
+        )
+        handler._cursor_manager.timeout_seconds = 0
+        assert _get_more(handler, response["cursor"]["id"])["code"] == 43
+
+    def test_no_cursor_timeout(self, handler):
+        _insert(handler, 5)
+        response = _command(
+            handler,
+            {
+                "find": "items",
+                "filter": {},
+                "batchSize": 1,
+                "noCursorTimeout": True,
+            },
+        )
+        handler._cursor_manager.timeout_seconds = 0
+        more = _get_more(handler, response["cursor"]["id"])
+        assert len(more["cursor"]["nextBatch"]) == 4
+
+
+class TestWorkerCursorIds:
+    @pytest.fixture(autouse=True)
+    def restore_seed(self):
+        from nx_27017 import changestream
+
+        counter = changestream._cursor_id_counter
+        yield
+        changestream._cursor_id_counter = counter
+        changestream._worker_index = 0
+        changestream._in_worker_pool = False
+
+    def test_worker_ranges_are_disjoint(self):
+        from nx_27017.changestream import (
+            cursor_worker,
+            next_cursor_id,
+            seed_cursor_ids,
+        )
+
+        seed_cursor_ids(3)
+        cursor_id = next_cursor_id()
+        assert cursor_worker(cursor_id) == 3
+        assert cursor_id < 2**63
+
+    def test_cursor_from_other_worker(self, handler):
+        from nx_27017.changestream import next_cursor_id, seed_cursor_ids
+
+        seed_cursor_ids(2)
+        cursor_id = next_cursor_id()
+        seed_cursor_ids(1)
+        more = _get_more(handler, cursor_id)
+        assert more["code"] == 43
+        assert "worker 2" in more["errmsg"]
+
+    def test_worker_returns_whole_result(self, handler):
+        from nx_27017.changestream import seed_cursor_ids
+
+        seed_cursor_ids(1)
+        _insert(handler, 5)
+        response = _command(
+            handler, {"find": "items", "filter": {}, "batchSize": 1}
+        )
+        assert response["cursor"]["id"] == 0
+        assert len(response["cursor"]["firstBatch"]) == 5
+
+    def test_worker_refuses_change_streams(self, handler):
+        from nx_27017.changestream import seed_cursor_ids
+
+        seed_cursor_ids(1)
+        response = _command(
+            handler,
+            {"aggregate": "items", "pipeline": [{"$changeStream": {}}]},
+        )
+        assert response["ok"] == 0
+        assert response["code"] == 40573
@@ -0,0 +1,182 @@
+"""Tests for one-SQLite-file-per-database mode."""
+
+import os
+import threading
+
+import pytest
+
+from nx_27017.databases import validate_database_name
+
+
+@pytest.fixture
+def handler(tmp_path):
+    from nx_27017.nx_27017 import NeoSQLiteHandler
+
+    h = NeoSQLiteHandler(data_dir=str(tmp_path / "data"), read_pool_size=2)
+    yield h
+    h.close()
+
+
+def _command(handler, db_name, body):
+    body = dict(body, **{"$db": db_name})
+    _, response = handler.handle_command(
+        {"request_id": 1, "sections": [("body", body)]}
+    )
+    return response
+
+
+def _insert(handler, db_name, docs):
+    _, response = handler.handle_insert(
+        {
+            "request_id": 1,
+            "sections": [
+                ("body", {"insert": "items", "$db": db_name}),
+                ("payload_docs", docs),
+            ],
+        }
+    )
+    return response
+
+
+def _find(handler, db_name):
+    response = _command(handler, db_name, {"find": "items", "filter": {}})
+    return response["cursor"]["firstBatch"]
+
+
+class TestDatabaseNames:
+    @pytest.mark.parametrize("name", ["tenant1", "my-app", "A_b"])
+    def test_valid(self, name):
+        validate_database_name(name)
+
+    @pytest.mark.parametrize(
+        "name", ["", "a.b", "../etc", "a/b", "a b", "x" * 64]
+    )
+    def test_invalid(self, name):
+        with pytest.raises(ValueError):
+            validate_database_name(name)
+
+
+class TestSeparateFiles:
+    def test_databases_are_isolated(self, handler, tmp_path):
+        _insert(handler, "tenant1", [{"n": 1}])
+        _insert(handler, "tenant2", [{"n": 2}, {"n": 3}])
+
+        assert [d["n"] for d in _find(handler, "tenant1")] == [1]
+        assert len(_find(handler, "tenant2")) == 2
+        data_dir = tmp_path / "data"
+        assert (data_dir / "tenant1.db").exists()
+        assert (data_dir / "tenant2.db").exists()
+
+    def test_each_database_has_its_own_writer(self, handler):
+        _insert(handler, "tenant1", [{"n": 1}])
+        _insert(handler, "tenant2", [{"n": 1}])
+        one = handler._registry.get("tenant1")
+        two = handler._registry.get("tenant2")
+        assert one.writer is not two.writer
+        assert one.conn is not two.conn
+        assert handler.get_database("tenant1") is one.conn
+
+    def test_list_databases(self, handler):
+        _insert(handler, "tenant1", [{"n": 1}])
+        response = _command(handler, "admin", {"listDatabases": 1})
+        names = [d["name"] for d in response["databases"]]
+        assert names == ["admin", "tenant1"]
+        sizes = {d["name"]: d["sizeOnDisk"] for d in response["databases"]}
+        assert sizes["tenant1"] > 0
+        assert response["totalSize"] == sum(sizes.values())
+
+    def test_lists_databases_not_yet_opened(self, tmp_path):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        data_dir = str(tmp_path / "data")
+        first = NeoSQLiteHandler(data_dir=data_dir)
+        _insert(first, "tenant1", [{"n": 1}])
+        first.close()
+
+        second = NeoSQLiteHandler(data_dir=data_dir)
+        try:
+            response = _command(second, "admin", {"listDatabases": 1})
+            assert "tenant1" in [d["name"] for d in response["databases"]]
+            assert len(_find(second, "tenant1")) == 1
+        finally:
+            second.close()
+
+    def test_drop_database(self, handler, tmp_path):
+        _insert(handler, "tenant1", [{"n": 1}])
+        response = _command(handler, "tenant1", {"dropDatabase": 1})
+        assert response["ok"] == 1
+        assert not os.path.exists(tmp_path / "data" / "tenant1.db")
+        assert _find(handler, "tenant1") == []
+
+    def test_drop_database_runs_on_writer(self, handler, monkeypatch):
+        _insert(handler, "tenant1", [{"n": 1}])
+        registry = handler._registry
+        drop = registry.drop
+        threads = []
+
+        def record(name):
+            threads.append(threading.current_thread().name)
+            return drop(name)
+
+        monkeypatch.setattr(registry, "drop", record)
+        response = _command(handler, "tenant1", {"dropDatabase": 1})
+        assert response["ok"] == 1
+        assert threads == ["nx-27017-writer-tenant1"]
+        _insert(handler, "tenant1", [{"n": 2}])
+        assert [d["n"] for d in _find(handler, "tenant1")] == [2]
+
+    def test_drop_admin_refused(self, handler):
+        response = _command(handler, "admin", {"dropDatabase": 1})
+        assert response["ok"] == 0
+
+    def test_invalid_name(self, handler):
+        response = _command(handler, "../escape", {"find": "items"})
+        assert response["code"] == 73
+        assert _insert(handler, "a.b", [{"n": 1}])["code"] == 73
+
+
+class TestSessions:
+    LSID = {"id": {"$oid": "5f0000000000000000000001"}}
+
+    def _begin(self, handler, db_name):
+        _, response = handler.handle_insert(
+            {
+                "request_id": 1,
+                "sections": [
+                    (
+                        "body",
+                        {
+                            "insert": "items",
+                            "$db": db_name,
+                            "lsid": self.LSID,
+                            "startTransaction": True,
+                        },
+                    ),
+                    ("payload_docs", [{"n": 1}]),
+                ],
+            }
+        )
+        assert response["ok"] == 1
+
+    def test_sessions_are_per_database(self, handler):
+        self._begin(handler, "tenant1")
+        self._begin(handler, "tenant2")
+        sid = self.LSID["id"]["$oid"]
+        one = handler._sessions[(sid, "tenant1")]
+        two = handler._sessions[(sid, "tenant2")]
+        assert one is not two
+        for db_name in ("tenant1", "tenant2"):
+            response = _command(
+                handler, db_name, {"commitTransaction": 1, "lsid": self.LSID}
+            )
+            assert response["ok"] == 1
+        assert len(_find(handler, "tenant2")) == 1
+
+        _command(handler, "admin", {"endSessions": [self.LSID["id"]]})
+        assert handler._sessions == {}
+
+    def test_drop_database_ends_its_sessions(self, handler):
+        self._begin(handler, "tenant1")
+        _command(handler, "tenant1", {"abortTransaction": 1, "lsid": self.LSID})
+        _command(handler, "tenant1", {"dropDatabase": 1})
+        assert handler._sessions == {}
@@ -0,0 +1,347 @@
+"""Tests for the reader connection pool and single-writer queue."""
+
+import threading
+
+import pytest
+
+from nx_27017.pool import ReaderPool, WriterQueue
+
+
+@pytest.fixture
+def handler(tmp_path):
+    from nx_27017.nx_27017 import NeoSQLiteHandler
+
+    db_path = str(tmp_path / "test.db")
+    h = NeoSQLiteHandler(db_path, read_pool_size=4)
+    yield h
+    h.close()
+
+
+def _command(handler, body):
+    body = dict(body, **{"$db": "test"})
+    _, response = handler.handle_command(
+        {"request_id": 1, "sections": [("body", body)]}
+    )
+    return response
+
+
+def _insert(handler, docs):
+    return handler.handle_insert(
+        {
+            "request_id": 1,
+            "sections": [
+                ("body", {"insert": "items", "$db": "test"}),
+                ("payload_docs", docs),
+            ],
+        }
+    )
+
+
+class TestWriterQueue:
+    def test_runs_on_writer_thread(self):
+        writer = WriterQueue()
+        try:
+            name = writer.submit(lambda: threading.current_thread().name)
+            assert name == "nx-27017-writer"
+        finally:
+            writer.close()
+
+    def test_propagates_exceptions(self):
+        writer = WriterQueue()
+        try:
+            with pytest.raises(ZeroDivisionError):
+                writer.submit(lambda: 1 / 0)
+            assert writer.submit(lambda: 2) == 2
+        finally:
+            writer.close()
+
+    def test_nested_submit_runs_inline(self):
+        writer = WriterQueue()
+        try:
+            assert writer.submit(lambda: writer.submit(lambda: 3)) == 3
+        finally:
+            writer.close()
+
+    def test_submit_after_close(self):
+        writer = WriterQueue()
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(lambda: None)
+
+    def test_close_from_writer_thread(self):
+        writer = WriterQueue()
+        writer.submit(writer.close)
+        writer._thread.join(1)
+        assert not writer._thread.is_alive()
+        with pytest.raises(RuntimeError):
+            writer.submit(lambda: None)
+
+
+class TestReaderPool:
+    def test_reuses_idle_connections(self):
+        pool = ReaderPool(_FakeConnection, 2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        assert pool.opened == 1
+
+    def test_bounded(self):
+        pool = ReaderPool(_FakeConnection, 2)
+        with pool.connection() as a, pool.connection() as b:
+            assert a is not b
+            assert pool.opened == 2
+            got = []
+            waiter = threading.Thread(
+                target=lambda: got.append(pool._acquire())
+            )
+            waiter.start()
+            waiter.join(0.1)
+            assert waiter.is_alive()
+        waiter.join(1)
+        assert got and pool.opened == 2
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ReaderPool(_FakeConnection, 0)
+
+    def test_close(self):
+        pool = ReaderPool(_FakeConnection, 2)
+        with pool.connection() as borrowed:
+            pool.close()
+            assert not borrowed.closed
+        assert borrowed.closed
+
+
+class _FakeConnection:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestHandlerRouting:
+    def test_writes_and_reads_see_same_data(self, handler):
+        _insert(handler, [{"n": i} for i in range(5)])
+        response = _command(handler, {"find": "items", "filter": {}})
+        assert len(response["cursor"]["firstBatch"]) == 5
+        assert _command(handler, {"count": "items"})["n"] == 5
+
+    def test_reads_use_pooled_connection(self, handler):
+        _insert(handler, [{"n": 1}])
+        _command(handler, {"find": "items", "filter": {}})
+        assert handler._readers.opened == 1
+
+    def test_writes_use_writer_connection(self, handler):
+        seen = []
+        original = handler._execute_command
+
+        def record(msg):
+            seen.append(threading.current_thread().name)
+            return original(msg)
+
+        handler._execute_command = record
+        _command(handler, {"create": "things"})
+        _command(handler, {"find": "things", "filter": {}})
+        assert seen[0] == "nx-27017-writer"
+        assert seen[1] == threading.current_thread().name
+
+    def test_concurrent_reads(self, handler):
+        _insert(handler, [{"n": i} for i in range(50)])
+        results = []
+
+        def read():
+            response = _command(
+                handler, {"find": "items", "filter": {}, "batchSize": 100}
+            )
+            results.append(len(response["cursor"]["firstBatch"]))
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [50] * 8
+        assert 1 <= handler._readers.opened <= 4
+
+    def test_classification(self, handler):
+        assert handler._is_read_command({"find": "items"})
+        assert handler._is_read_command({"aggregate": "items", "pipeline": []})
+        assert not handler._is_read_command(
+            {"aggregate": "items", "pipeline": [{"$out": "copy"}]}
+        )
+        assert not handler._is_read_command(
+            {"find": "items", "txnNumber": 1, "startTransaction": True}
+        )
+        assert not handler._is_read_command({"find": "fs.files"})
+        assert not handler._is_read_command({"update": "items"})
+
+    def test_memory_database_has_no_pool(self):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        h = NeoSQLiteHandler(":memory:")
+        try:
+            assert h._readers is None
+            _insert(h, [{"n": 1}])
+            response = _command(h, {"find": "items", "filter": {}})
+            assert len(response["cursor"]["firstBatch"]) == 1
+        finally:
+            h.close()
+
+    def test_pool_disabled(self, tmp_path):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        h = NeoSQLiteHandler(str(tmp_path / "t.db"), read_pool_size=0)
+        try:
+            assert h._readers is None
+        finally:
+            h.close()
+
+
+class TestGroupCommit:
+    @pytest.fixture
+    def conn(self, tmp_path):
+        from neosqlite import Connection
+
+        conn = Connection(str(tmp_path / "group.db"), check_same_thread=False)
+        conn.db.execute("CREATE TABLE t (n INTEGER UNIQUE)")
+        yield conn
+        conn.close()
+
+    @staticmethod
+    def _submit_all(writer, fns):
+        """Queue every write, in order, before the writer picks any up."""
+        started, release = threading.Event(), threading.Event()
+        blocker = threading.Thread(
+            target=writer.submit,
+            args=(lambda: started.set() or release.wait(),),
+        )
+        blocker.start()
+        started.wait()
+        results = [None] * len(fns)
+
+        def run(i):
+            try:
+                results[i] = writer.submit(fns[i], batchable=True)
+            except Exception as e:
+                results[i] = e
+
+        threads = [
+            threading.Thread(target=run, args=(i,)) for i in range(len(fns))
+        ]
+        for queued, thread in enumerate(threads, 1):
+            thread.start()
+            while writer.pending < queued:
+                threading.Event().wait(0.001)
+        release.set()
+        blocker.join()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_writes_share_one_commit(self, conn):
+        commits = []
+        conn.db.set_trace_callback(
+            lambda sql: commits.append(sql) if sql == "COMMIT" else None
+        )
+        writer = WriterQueue(connection=conn, group_commit_window=0.05)
+        try:
+            results = self._submit_all(
+                writer,
+                [
+                    lambda n=n: conn.db.execute(
+                        "INSERT INTO t VALUES (?)", (n,)
+                    ).rowcount
+                    for n in range(5)
+                ],
+            )
+        finally:
+            writer.close()
+        assert results == [1] * 5
+        assert len(commits) == 1
+        assert conn.db.execute("SELECT count(*) FROM t").fetchone()[0] == 5
+
+    def test_failed_write_rolls_back_alone(self, conn):
+        def fail():
+            conn.db.execute("INSERT INTO t VALUES (100)")
+            raise ValueError("boom")
+
+        writer = WriterQueue(connection=conn, group_commit_window=0.05)
+        try:
+            results = self._submit_all(
+                writer,
+                [
+                    lambda: conn.db.execute("INSERT INTO t VALUES (1)"),
+                    fail,
+                    lambda: conn.db.execute("INSERT INTO t VALUES (1)"),
+                    lambda: conn.db.execute("INSERT INTO t VALUES (2)"),
+                ],
+            )
+        finally:
+            writer.close()
+        assert isinstance(results[1], ValueError)
+        assert "UNIQUE" in str(results[2])
+        rows = conn.db.execute("SELECT n FROM t ORDER BY n").fetchall()
+        assert rows == [(1,), (2,)]
+
+    def test_max_ops(self, conn):
+        commits = []
+        conn.db.set_trace_callback(
+            lambda sql: commits.append(sql) if sql == "COMMIT" else None
+        )
+        writer = WriterQueue(
+            connection=conn, group_commit_window=0.05, group_commit_max_ops=2
+        )
+        try:
+            self._submit_all(
+                writer,
+                [
+                    lambda n=n: conn.db.execute(
+                        "INSERT INTO t VALUES (?)", (n,)
+                    )
+                    for n in range(5)
+                ],
+            )
+        finally:
+            writer.close()
+        # Batches of 2, 2 and a lone write that needs no explicit COMMIT
+        assert len(commits) == 2
+        assert conn.db.execute("SELECT count(*) FROM t").fetchone()[0] == 5
+
+    def test_not_batchable_runs_alone(self, conn):
+        writer = WriterQueue(connection=conn, group_commit_window=0.05)
+        try:
+            assert not writer.submit(lambda: conn.db.in_transaction)
+        finally:
+            writer.close()
+
+    def test_requires_connection(self):
+        with pytest.raises(ValueError):
+            WriterQueue(group_commit_window=0.001)
+
+    def test_handler(self, tmp_path):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        h = NeoSQLiteHandler(str(tmp_path / "t.db"), group_commit_ms=1)
+        try:
+            assert h._writer.group_commit
+            threads = [
+                threading.Thread(target=_insert, args=(h, [{"n": i}]))
+                for i in range(10)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert _command(h, {"count": "items"})["n"] == 10
+            assert h._is_batchable_write({"update": "items"})
+            assert not h._is_batchable_write(
+                {"insert": "items", "startTransaction": True}
+            )
+            assert not h._is_batchable_write(
+                {"update": "items", "autocommit": False}
+            )
+            assert not h._is_batchable_write({"create": "items"})
+        finally:
+            h.close()
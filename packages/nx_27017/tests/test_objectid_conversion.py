@@ -53,3 +53,43 @@ class TestConvertObjectIds:
         }
         result = _convert_objectids(doc)
         assert len(result["items"]) == 2
+
+
+class TestConversionFastPath:
+    """Documents without anything to convert are passed through."""
+
+    def test_neo_to_bson_returns_same_object(self):
+        from nx_27017.utils import convert_neo_to_bson_objectids
+
+        doc = {"name": "test", "nested": {"tags": ["a", "b"]}, "n": 1}
+        assert convert_neo_to_bson_objectids(doc) is doc
+
+    def test_bson_to_neo_returns_same_object(self):
+        from nx_27017.utils import convert_bson_to_neo_objectids
+
+        doc = {"filter": {"n": {"$in": [1, 2]}}}
+        assert convert_bson_to_neo_objectids(doc) is doc
+
+    def test_only_changed_branches_are_copied(self):
+        from neosqlite.objectid import ObjectId as NeoObjectId
+        from nx_27017.utils import convert_bson_to_neo_objectids
+
+        untouched = {"tags": ["a"]}
+        doc = {"ref": ObjectId("507f1f77bcf86cd799439011"), "meta": untouched}
+        result = convert_bson_to_neo_objectids(doc)
+        assert result is not doc
+        assert isinstance(result["ref"], NeoObjectId)
+        assert isinstance(doc["ref"], ObjectId)
+        assert result["meta"] is untouched
+
+    def test_cursor_batches_are_raw_bson(self):
+        from bson.raw_bson import RawBSONDocument
+        from neosqlite.objectid import ObjectId as NeoObjectId
+        from nx_27017.cursors import ServerCursor
+
+        oid = NeoObjectId()
+        cursor = ServerCursor("test.items", [{"_id": oid, "n": 1}])
+        (doc,) = cursor.next_batch()
+        assert isinstance(doc, RawBSONDocument)
+        assert doc["_id"] == ObjectId(oid.binary)
+        assert doc["n"] == 1
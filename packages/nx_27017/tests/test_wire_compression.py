@@ -0,0 +1,159 @@
+"""Tests for OP_COMPRESSED support and compressor negotiation."""
+
+import struct
+import zlib
+
+import pytest
+from bson import encode
+
+from nx_27017 import wire_protocol
+from nx_27017.wire_protocol import (
+    COMPRESSOR_NOOP,
+    COMPRESSOR_SNAPPY,
+    COMPRESSOR_ZLIB,
+    MAX_MESSAGE_SIZE_BYTES,
+    OP_COMPRESSED,
+    OP_MSG,
+    ResponseBuilder,
+    WireProtocol,
+    available_compressors,
+    decompress,
+    negotiate_compressors,
+)
+
+
+def _op_msg(document, request_id=7):
+    body = struct.pack("<I", 0) + b"\x00" + encode(document)
+    header = struct.pack(
+        "<iiii", 16 + len(body), request_id, 0, WireProtocol.OP_MSG
+    )
+    return header + body
+
+
+class TestNegotiation:
+    def test_zlib_always_available(self):
+        assert "zlib" in available_compressors()
+
+    def test_keeps_client_order(self):
+        assert negotiate_compressors(["snappy", "zlib"]) == [
+            name
+            for name in ["snappy", "zlib"]
+            if name in available_compressors()
+        ]
+
+    def test_unknown_and_missing(self):
+        assert negotiate_compressors(["lz4"]) == []
+        assert negotiate_compressors(None) == []
+
+    def test_hello_reply(self, tmp_path):
+        from nx_27017.nx_27017 import NeoSQLiteHandler
+
+        h = NeoSQLiteHandler(str(tmp_path / "test.db"))
+        try:
+            _, reply = h.handle_command(
+                {
+                    "request_id": 1,
+                    "sections": [
+                        ("body", {"hello": 1, "compression": ["zlib"]})
+                    ],
+                }
+            )
+            assert reply["compression"] == ["zlib"]
+            _, reply = h.handle_command(
+                {"request_id": 1, "sections": [("body", {"hello": 1})]}
+            )
+            assert "compression" not in reply
+        finally:
+            h.close()
+
+
+class TestOpCompressed:
+    def test_round_trip(self):
+        message = _op_msg({"find": "items", "filter": {"x": "y" * 500}})
+        wrapped = OP_COMPRESSED.wrap(message, COMPRESSOR_ZLIB)
+        assert len(wrapped) < len(message)
+        assert struct.unpack("<i", wrapped[12:16])[0] == (
+            WireProtocol.OP_COMPRESSED
+        )
+        unwrapped, compressor_id = OP_COMPRESSED.unwrap(wrapped)
+        assert unwrapped == message
+        assert compressor_id == COMPRESSOR_ZLIB
+
+    def test_noop(self):
+        message = _op_msg({"ping": 1})
+        wrapped = OP_COMPRESSED.wrap(message, COMPRESSOR_NOOP)
+        assert OP_COMPRESSED.unwrap(wrapped) == (message, COMPRESSOR_NOOP)
+
+    def test_op_msg_parse_decodes_compressed(self):
+        message = _op_msg({"ping": 1, "$db": "admin"}, request_id=42)
+        msg = OP_MSG.parse(OP_COMPRESSED.wrap(message, COMPRESSOR_ZLIB))
+        assert msg["request_id"] == 42
+        assert msg["opcode"] == WireProtocol.OP_MSG
+        assert msg["sections"] == [("body", {"ping": 1, "$db": "admin"})]
+        assert msg["compressor_id"] == COMPRESSOR_ZLIB
+        assert OP_MSG.parse(message)["compressor_id"] is None
+
+    def test_compressed_reply(self):
+        reply = ResponseBuilder.build_op_msg_reply(
+            1, 42, {"ok": 1}, compressor_id=COMPRESSOR_ZLIB
+        )
+        msg = OP_MSG.parse(reply)
+        assert msg["response_to"] == 42
+        assert msg["sections"] == [("body", {"ok": 1})]
+
+    def test_unsupported_compressor(self):
+        message = _op_msg({"ping": 1})
+        with pytest.raises(ValueError):
+            OP_COMPRESSED.wrap(message, 99)
+        header = struct.pack(
+            "<iiiiiiB", 30, 1, 0, WireProtocol.OP_COMPRESSED, 2013, 5, 99
+        )
+        with pytest.raises(ValueError):
+            OP_COMPRESSED.unwrap(header + b"x")
+
+    def test_size_mismatch(self):
+        body = zlib.compress(b"x" * 100)
+        header = struct.pack(
+            "<iiiiiiB",
+            25 + len(body),
+            1,
+            0,
+            WireProtocol.OP_COMPRESSED,
+            WireProtocol.OP_MSG,
+            10,
+            COMPRESSOR_ZLIB,
+        )
+        with pytest.raises(ValueError):
+            OP_COMPRESSED.unwrap(header + body)
+
+    def test_corrupt_data(self):
+        header = struct.pack(
+            "<iiiiiiB",
+            29,
+            1,
+            0,
+            WireProtocol.OP_COMPRESSED,
+            WireProtocol.OP_MSG,
+            10,
+            COMPRESSOR_ZLIB,
+        )
+        with pytest.raises(ValueError):
+            OP_COMPRESSED.unwrap(header + b"junk")
+
+    def test_snappy_declared_size_checked_first(self, monkeypatch):
+        class Snappy:
+            @staticmethod
+            def uncompress(data):
+                raise AssertionError("decompressed a bogus stream")
+
+        monkeypatch.setattr(wire_protocol, "snappy", Snappy)
+        # The preamble declares 2**31 bytes for a 10 byte message
+        with pytest.raises(ValueError):
+            decompress(b"\x80\x80\x80\x80\x08", COMPRESSOR_SNAPPY, 10)
+        # A truncated preamble
+        with pytest.raises(ValueError):
+            decompress(b"\x80\x80", COMPRESSOR_SNAPPY, 10)
+
+    def test_size_over_max_message(self):
+        with pytest.raises(ValueError):
+            decompress(b"", COMPRESSOR_NOOP, MAX_MESSAGE_SIZE_BYTES + 1)
@@ -562,3 +562,96 @@ def test_changestream_last_id_updated_after_commit(collection):
     # Verify the change is valid
     assert change["operationType"] == "insert"
     stream.close()
+
+
+def test_watch_delta_updates(collection):
+    """Test that delta_updates records only the changed top-level fields."""
+    result = collection.insert_one(
+        {"name": "Grace", "count": 1, "bio": "x" * 1000, "tmp": True}
+    )
+    doc_id = result.inserted_id
+
+    stream = collection.watch(delta_updates=True)
+    collection.update_one(
+        {"_id": doc_id},
+        {"$inc": {"count": 1}, "$set": {"tags": ["a"]}, "$unset": {"tmp": ""}},
+    )
+
+    # No copy of the document is stored for the update event, only the delta
+    rows = collection.db.execute(
+        "SELECT document_data, update_description FROM _neosqlite_changestream "
+        "WHERE operation = 'update'"
+    ).fetchall()
+    assert len(rows) == 1
+    assert rows[0][0] is None and rows[0][1] is not None
+
+    change = next(stream)
+    assert change["operationType"] == "update"
+    assert change["documentKey"]["_id"] == doc_id
+    assert change["updateDescription"] == {
+        "updatedFields": {"count": 2, "tags": ["a"]},
+        "removedFields": ["tmp"],
+    }
+    assert "fullDocument" not in change
+    stream.close()
+
+
+def test_watch_delta_updates_with_update_lookup(collection):
+    """Test that updateLookup fetches the current document for delta events."""
+    doc_id = collection.insert_one({"name": "Heidi", "count": 1}).inserted_id
+
+    stream = collection.watch(full_document="updateLookup", delta_updates=True)
+    collection.update_one({"_id": doc_id}, {"$inc": {"count": 1}})
+    collection.update_one({"_id": doc_id}, {"$inc": {"count": 1}})
+
+    change = next(stream)
+    assert change["updateDescription"]["updatedFields"] == {"count": 2}
+    # The lookup returns the current document, not the historical version
+    assert change["fullDocument"] == {
+        "_id": doc_id,
+        "name": "Heidi",
+        "count": 3,
+    }
+
+    change = next(stream)
+    assert change["updateDescription"]["updatedFields"] == {"count": 3}
+    stream.close()
+
+
+def test_watch_delta_updates_deleted_document_lookup(collection):
+    """Test that updateLookup yields None when the document is gone."""
+    doc_id = collection.insert_one({"count": 1}).inserted_id
+
+    stream = collection.watch(full_document="updateLookup", delta_updates=True)
+    collection.update_one({"_id": doc_id}, {"$set": {"count": 5}})
+    collection.db.execute("DROP TRIGGER _neosqlite_foo_delete_trigger")
+    collection.delete_one({"_id": doc_id})
+
+    change = next(stream)
+    assert change["operationType"] == "update"
+    assert change["fullDocument"] is None
+    stream.close()
+
+
+def test_changestream_adds_update_description_column(connection):
+    """Test that an existing change table gains the update_description column."""
+    connection.db.execute("""
+        CREATE TABLE _neosqlite_changestream (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            collection_name TEXT NOT NULL,
+            operation TEXT NOT NULL,
+            document_id INTEGER,
+            document_data TEXT,
+            document_id_value TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+    collection = connection["foo"]
+    stream = collection.watch(delta_updates=True)
+    doc_id = collection.insert_one({"a": 1}).inserted_id
+    collection.update_one({"_id": doc_id}, {"$set": {"a": 2}})
+
+    assert next(stream)["operationType"] == "insert"
+    change = next(stream)
+    assert change["updateDescription"]["updatedFields"] == {"a": 2}
+    stream.close()
@@ -101,6 +101,19 @@ def test_insert_many(collection):
     assert collection.count_documents({}) == 2
 
 
+def test_insert_leaves_caller_document_intact(collection):
+    """Test that inserting keeps the caller's nested values unchanged."""
+    doc = {"_id": 1, "blob": b"raw", "nested": {"items": [b"a", {"b": 1}]}}
+    collection.insert_one(doc)
+    assert doc == {
+        "_id": 1,
+        "blob": b"raw",
+        "nested": {"items": [b"a", {"b": 1}]},
+    }
+    stored = collection.find_one({"_id": 1})
+    assert stored["nested"]["items"][1] == {"b": 1}
+
+
 def test_insert_non_dict_raise(collection):
     """Test that inserting non-dict documents raises an exception."""
     doc = "{'foo': 'bar'}"
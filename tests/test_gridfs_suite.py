@@ -2643,3 +2643,612 @@ def test_gridin_md5_for_partial_chunk(connection):
     grid_out = bucket.open_download_stream(file_id)
     assert grid_out.md5 == expected_md5
     assert grid_out.length == chunk_size + 512
+
+
+# ================================
+# Streaming Upload Tests
+# ================================
+
+
+class _TrickleReader(io.RawIOBase):
+    """A raw stream that returns at most ``step`` bytes per readinto call."""
+
+    def __init__(self, data, step):
+        self._data = memoryview(data)
+        self._pos = 0
+        self._step = step
+        self.largest_request = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.largest_request = max(self.largest_request, len(buffer))
+        count = min(len(buffer), self._step, len(self._data) - self._pos)
+        buffer[:count] = self._data[self._pos : self._pos + count]
+        self._pos += count
+        return count
+
+
+def test_upload_from_stream_streams_short_reads(connection):
+    """Test that short readinto() results still produce full-size chunks."""
+    chunk_size = 1000
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=chunk_size)
+    data = bytes(range(256)) * 40  # 10240 bytes
+    reader = _TrickleReader(data, step=333)
+
+    file_id = bucket.upload_from_stream("trickle.bin", reader)
+
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.read() == data
+    assert grid_out.length == len(data)
+    assert grid_out.md5 == hashlib.md5(data).hexdigest()
+
+    sizes = connection.db.execute(
+        "SELECT n, length(data) FROM fs_chunks ORDER BY n"
+    ).fetchall()
+    assert [n for n, _ in sizes] == list(range(11))
+    assert all(size == chunk_size for _, size in sizes[:-1])
+    assert sizes[-1][1] == 240
+
+
+def test_upload_from_stream_bounds_read_buffer(connection, monkeypatch):
+    """Test that uploads read through a bounded, batched buffer."""
+    import neosqlite.gridfs.gridfs_bucket as gridfs_bucket
+
+    monkeypatch.setattr(gridfs_bucket, "UPLOAD_BATCH_BYTES", 4096)
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=1024)
+    data = b"abcdefgh" * 4000  # 32000 bytes, several batches
+    reader = _TrickleReader(data, step=len(data))
+
+    file_id = bucket.upload_from_stream("batched.bin", reader)
+
+    # The source is never asked for more than one batch at a time
+    assert reader.largest_request <= 4096
+    assert bucket.open_download_stream(file_id).read() == data
+
+
+def test_upload_from_stream_read_only_source(bucket):
+    """Test uploading from an object that only implements read()."""
+
+    class ReadOnly:
+        def __init__(self, data):
+            self._stream = io.BytesIO(data)
+
+        def read(self, size=-1):
+            return self._stream.read(size)
+
+    data = b"read only source " * 50000
+    file_id = bucket.upload_from_stream("readonly.txt", ReadOnly(data))
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.read() == data
+    assert grid_out.md5 == hashlib.md5(data).hexdigest()
+
+
+def test_upload_from_stream_honours_chunk_size_argument(connection):
+    """Test that a per-upload chunk size is used for chunks and the file row."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=1024)
+    data = b"z" * 5000
+    file_id = bucket.upload_from_stream(
+        "sized.bin", data, chunk_size_bytes=2000
+    )
+
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.chunk_size == 2000
+    assert grid_out.read() == data
+    count = connection.db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()
+    assert count[0] == 3
+
+
+def test_upload_from_stream_rolls_back_on_read_error(connection):
+    """Test that a failing source leaves no partial file behind."""
+
+    class Failing(io.RawIOBase):
+        def __init__(self):
+            self._calls = 0
+
+        def readable(self):
+            return True
+
+        def readinto(self, buffer):
+            self._calls += 1
+            if self._calls > 2:
+                raise OSError("disk went away")
+            buffer[:10] = b"0123456789"
+            return 10
+
+    from neosqlite.objectid import ObjectId
+
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=10)
+    with pytest.raises(OSError):
+        bucket.upload_from_stream("broken.bin", Failing())
+    with pytest.raises(OSError):
+        bucket.upload_from_stream_with_id(ObjectId(), "broken.bin", Failing())
+
+    files = connection.db.execute("SELECT COUNT(*) FROM fs_files").fetchone()
+    chunks = connection.db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()
+    assert files[0] == 0
+    assert chunks[0] == 0
+
+
+def test_upload_from_stream_with_id_streams_file_object(bucket):
+    """Test that upload_from_stream_with_id streams file-like sources."""
+    from neosqlite.objectid import ObjectId
+
+    data = b"custom id payload" * 30000
+    file_id = ObjectId()
+    bucket.upload_from_stream_with_id(
+        file_id, "custom.bin", io.BytesIO(data), chunk_size_bytes=4096
+    )
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.chunk_size == 4096
+    assert grid_out.read() == data
+    assert grid_out.md5 == hashlib.md5(data).hexdigest()
+
+
+# ================================
+# GridOut Random Access Tests
+# ================================
+
+
+def _count_chunk_queries(connection):
+    """Record the chunk SELECTs issued on the connection."""
+    statements = []
+    connection.db.set_trace_callback(
+        lambda sql: statements.append(sql) if "fs_chunks" in sql else None
+    )
+    return statements
+
+
+def test_grid_out_seek_and_tell(connection):
+    """Test random access with seek() and tell()."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=100)
+    data = bytes(range(256)) * 4  # 1024 bytes, 11 chunks
+    file_id = bucket.upload_from_stream("seek.bin", data)
+
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.seekable()
+    assert grid_out.readable()
+    assert grid_out.tell() == 0
+
+    assert grid_out.seek(250) == 250
+    assert grid_out.read(100) == data[250:350]
+    assert grid_out.tell() == 350
+
+    assert grid_out.seek(-50, io.SEEK_CUR) == 300
+    assert grid_out.read(10) == data[300:310]
+
+    assert grid_out.seek(-24, io.SEEK_END) == 1000
+    assert grid_out.read() == data[1000:]
+    assert grid_out.read() == b""
+
+    # Seeking past the end is allowed and reads nothing
+    grid_out.seek(5000)
+    assert grid_out.read(10) == b""
+
+    with pytest.raises(ValueError):
+        grid_out.seek(-1)
+    with pytest.raises(ValueError):
+        grid_out.seek(0, 7)
+
+    grid_out.close()
+    with pytest.raises(ValueError):
+        grid_out.seek(0)
+
+
+def test_grid_out_readinto(connection):
+    """Test readinto() fills caller buffers across chunk boundaries."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=64)
+    data = bytes(range(200))
+    file_id = bucket.upload_from_stream("readinto.bin", data)
+
+    grid_out = bucket.open_download_stream(file_id)
+    buffer = bytearray(150)
+    assert grid_out.readinto(buffer) == 150
+    assert bytes(buffer) == data[:150]
+
+    view = memoryview(bytearray(100))
+    assert grid_out.readinto(view[10:]) == 50
+    assert bytes(view[10:60]) == data[150:]
+    assert grid_out.readinto(view) == 0
+
+    grid_out.close()
+    with pytest.raises(ValueError):
+        grid_out.readinto(bytearray(1))
+
+
+def test_grid_out_range_read_fetches_only_needed_chunks(connection):
+    """Test that a read after a seek queries only the chunks it covers."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=100)
+    data = b"".join(bytes([i]) * 100 for i in range(50))
+    file_id = bucket.upload_from_stream("range.bin", data)
+
+    grid_out = bucket.open_download_stream(file_id)
+    statements = _count_chunk_queries(connection)
+
+    grid_out.seek(2550)
+    assert grid_out.read(100) == data[2550:2650]
+    assert len(statements) == 1
+    assert "BETWEEN" in statements[0]
+    assert set(grid_out._chunk_cache) == {25, 26}
+    connection.db.set_trace_callback(None)
+
+
+def test_grid_out_sequential_reads_use_read_ahead(connection):
+    """Test that sequential reads prefetch chunks in batches."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=100)
+    data = bytes(range(250)) * 4  # 1000 bytes, 10 chunks
+    file_id = bucket.upload_from_stream("sequential.bin", data)
+
+    grid_out = GridOut(connection.db, "fs", file_id, read_ahead=4)
+    statements = _count_chunk_queries(connection)
+
+    result = bytearray()
+    while piece := grid_out.read(50):
+        result.extend(piece)
+    connection.db.set_trace_callback(None)
+
+    assert bytes(result) == data
+    # First read fetches chunk 0 only, then windows of four chunks: 1-4, 5-8, 9
+    assert len(statements) == 4
+
+
+def test_grid_out_read_ahead_validation(connection):
+    """Test that read_ahead must be positive."""
+    bucket = GridFSBucket(connection.db)
+    file_id = bucket.upload_from_stream("tiny.txt", b"tiny")
+    with pytest.raises(ValueError):
+        GridOut(connection.db, "fs", file_id, read_ahead=0)
+
+
+def test_grid_out_missing_chunk_raises(connection):
+    """Test that a missing chunk is reported instead of returning short data."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=10)
+    file_id = bucket.upload_from_stream("holes.bin", b"x" * 35)
+    connection.db.execute("DELETE FROM fs_chunks WHERE n = 2")
+
+    grid_out = bucket.open_download_stream(file_id)
+    assert grid_out.read(20) == b"x" * 20
+    with pytest.raises(NoFile):
+        grid_out.read(10)
+
+
+def test_grid_out_truncated_chunk_raises(connection):
+    """Test that a chunk shorter than chunkSize is reported as corrupt."""
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=10)
+    file_id = bucket.upload_from_stream("short.bin", b"y" * 30)
+    connection.db.execute("UPDATE fs_chunks SET data = X'7979' WHERE n = 1")
+
+    grid_out = bucket.open_download_stream(file_id)
+    with pytest.raises(CorruptGridFile):
+        grid_out.read()
+
+
+# ================================
+# BLOB storage mode
+# ================================
+
+
+@pytest.fixture
+def blob_db():
+    from neosqlite._sqlite import sqlite3
+
+    db = sqlite3.connect(":memory:", isolation_level=None)
+    if not hasattr(db, "blobopen"):
+        db.close()
+        pytest.skip("incremental BLOB I/O requires Python 3.11+")
+    yield db
+    db.close()
+
+
+def test_blob_storage_round_trip(blob_db):
+    """Test that blob mode stores one row per file and reads it back."""
+    bucket = GridFSBucket(blob_db, chunk_size_bytes=16, storage="blob")
+    data = bytes(range(256)) * 3
+    file_id = bucket.upload_from_stream("blob.bin", io.BytesIO(data))
+
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()[0] == 0
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_blobs").fetchone()[0] == 1
+    row = blob_db.execute(
+        "SELECT length, md5, storage FROM fs_files"
+    ).fetchone()
+    assert row == (len(data), hashlib.md5(data).hexdigest(), "blob")
+
+    assert bucket.open_download_stream(file_id).read() == data
+    destination = io.BytesIO()
+    bucket.download_to_stream(file_id, destination)
+    assert destination.getvalue() == data
+
+
+def test_blob_storage_seek_and_partial_read(blob_db):
+    """Test random access into a BLOB-stored file."""
+    bucket = GridFSBucket(blob_db, chunk_size_bytes=10, storage="blob")
+    data = b"".join(bytes([i]) * 10 for i in range(10))
+    file_id = bucket.upload_from_stream("seek.bin", data)
+
+    grid_out = bucket.open_download_stream(file_id)
+    grid_out.seek(45)
+    assert grid_out.read(10) == bytes([4]) * 5 + bytes([5]) * 5
+    buffer = bytearray(7)
+    assert grid_out.readinto(buffer) == 7
+    assert bytes(buffer) == bytes([5]) * 5 + bytes([6]) * 2
+    grid_out.seek(-3, io.SEEK_END)
+    assert grid_out.read() == bytes([9]) * 3
+
+
+def test_blob_storage_grid_in(blob_db):
+    """Test that upload streams spool and store a single BLOB on close."""
+    bucket = GridFSBucket(blob_db, chunk_size_bytes=8, storage="blob")
+    with bucket.open_upload_stream("stream.bin") as grid_in:
+        grid_in.write(b"hello ")
+        grid_in.write(b"blob world")
+
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()[0] == 0
+    grid_out = bucket.open_download_stream_by_name("stream.bin")
+    assert grid_out.read() == b"hello blob world"
+
+
+def test_blob_storage_mixed_bucket(blob_db):
+    """Test that chunked and BLOB files coexist in one bucket."""
+    chunked = GridFSBucket(blob_db, chunk_size_bytes=4)
+    chunked_id = chunked.upload_from_stream("chunked.txt", b"chunked data")
+    blobbed = GridFSBucket(blob_db, chunk_size_bytes=4, storage="blob")
+    blob_id = blobbed.upload_from_stream("blob.txt", b"blob data")
+
+    assert chunked.open_download_stream(blob_id).read() == b"blob data"
+    assert blobbed.open_download_stream(chunked_id).read() == b"chunked data"
+
+
+def test_blob_storage_delete(blob_db):
+    """Test that deleting BLOB-stored files removes their BLOB rows."""
+    bucket = GridFSBucket(blob_db, storage="blob")
+    file_id = bucket.upload_from_stream("a.bin", b"a" * 100)
+    bucket.upload_from_stream("b.bin", b"b" * 100)
+    bucket.upload_from_stream("b.bin", b"c" * 100)
+
+    bucket.delete(file_id)
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_blobs").fetchone()[0] == 2
+    bucket.delete_by_name("b.bin")
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_blobs").fetchone()[0] == 0
+
+    bucket.upload_from_stream("c.bin", b"c")
+    bucket.drop()
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_blobs").fetchone()[0] == 0
+
+
+def test_blob_storage_falls_back_to_chunks_when_too_large(blob_db):
+    """Test that files over SQLITE_LIMIT_LENGTH are stored as chunks."""
+    from neosqlite._sqlite import sqlite3
+
+    bucket = GridFSBucket(blob_db, chunk_size_bytes=64, storage="blob")
+    blob_db.setlimit(sqlite3.SQLITE_LIMIT_LENGTH, 1000)
+    data = b"z" * 1500
+    file_id = bucket.upload_from_stream("big.bin", data)
+
+    assert blob_db.execute("SELECT COUNT(*) FROM fs_blobs").fetchone()[0] == 0
+    assert blob_db.execute("SELECT storage FROM fs_files").fetchone()[0] is None
+    assert bucket.open_download_stream(file_id).read() == data
+
+
+def test_blob_storage_unsupported_connection_uses_chunks(connection):
+    """Test that blob mode degrades to chunks without blobopen()."""
+    if hasattr(connection.db, "blobopen"):
+        pytest.skip("connection supports incremental BLOB I/O")
+    bucket = GridFSBucket(connection.db, chunk_size_bytes=4, storage="blob")
+    file_id = bucket.upload_from_stream("plain.txt", b"plain data")
+    assert (
+        connection.db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()[0]
+        == 3
+    )
+    assert bucket.open_download_stream(file_id).read() == b"plain data"
+
+
+def test_blob_storage_invalid_mode(connection):
+    """Test that an unknown storage mode is rejected."""
+    with pytest.raises(ValueError):
+        GridFSBucket(connection.db, storage="tape")
+
+
+# ================================
+# Deduplicated chunk storage
+# ================================
+
+
+def _dedup_counts(db):
+    store = db.execute(
+        "SELECT COUNT(*), COALESCE(SUM(refcount), 0) FROM fs_chunk_store"
+    ).fetchone()
+    refs = db.execute("SELECT COUNT(*) FROM fs_chunk_refs").fetchone()[0]
+    return store[0], store[1], refs
+
+
+def test_dedup_storage_stores_repeated_chunks_once(connection):
+    """Test that identical chunks across and within files are stored once."""
+    db = connection.db
+    bucket = GridFSBucket(db, chunk_size_bytes=4, storage="dedup")
+    data = b"AAAABBBBAAAACC"
+    first = bucket.upload_from_stream("v1.bin", data)
+    second = bucket.upload_from_stream("v2.bin", io.BytesIO(data))
+
+    assert db.execute("SELECT COUNT(*) FROM fs_chunks").fetchone()[0] == 0
+    # Unique payloads: AAAA, BBBB, CC; 4 mappings per file
+    assert _dedup_counts(db) == (3, 8, 8)
+    assert bucket.open_download_stream(first).read() == data
+    destination = io.BytesIO()
+    bucket.download_to_stream(second, destination)
+    assert destination.getvalue() == data
+    row = db.execute(
+        "SELECT length, md5, storage FROM fs_files WHERE _id = ?",
+        (str(second),),
+    ).fetchone()
+    assert row == (len(data), hashlib.md5(data).hexdigest(), "dedup")
+
+
+def test_dedup_storage_delete_releases_references(connection):
+    """Test that deleting files decrements and frees shared chunks."""
+    db = connection.db
+    bucket = GridFSBucket(db, chunk_size_bytes=4, storage="dedup")
+    first = bucket.upload_from_stream("a.bin", b"AAAABBBB")
+    bucket.upload_from_stream("b.bin", b"AAAACCCC")
+    bucket.upload_from_stream("b.bin", b"CCCCDDDD")
+
+    bucket.delete(first)
+    assert _dedup_counts(db) == (3, 4, 4)
+    assert db.execute(
+        "SELECT refcount FROM fs_chunk_store WHERE data = X'43434343'"
+    ).fetchone() == (2,)
+
+    bucket.delete_by_name("b.bin")
+    assert _dedup_counts(db) == (0, 0, 0)
+
+    bucket.upload_from_stream("c.bin", b"EEEE")
+    bucket.drop()
+    assert _dedup_counts(db) == (0, 0, 0)
+
+
+def test_dedup_storage_grid_in_and_random_access(connection):
+    """Test that upload streams write deduplicated chunks and read back."""
+    db = connection.db
+    bucket = GridFSBucket(db, chunk_size_bytes=4, storage="dedup")
+    with bucket.open_upload_stream("stream.bin") as grid_in:
+        grid_in.write(b"xyzwxyzw")
+        grid_in.write(b"xy")
+
+    assert _dedup_counts(db) == (2, 3, 3)
+    grid_out = bucket.open_download_stream_by_name("stream.bin")
+    grid_out.seek(6)
+    assert grid_out.read() == b"zwxy"
+
+
+def test_dedup_storage_mixed_bucket(connection):
+    """Test that chunked and deduplicated files coexist in one bucket."""
+    chunked = GridFSBucket(connection.db, chunk_size_bytes=4)
+    chunked_id = chunked.upload_from_stream("chunked.txt", b"chunked data")
+    dedup = GridFSBucket(connection.db, chunk_size_bytes=4, storage="dedup")
+    dedup_id = dedup.upload_from_stream("dedup.txt", b"dedup data")
+
+    assert chunked.open_download_stream(dedup_id).read() == b"dedup data"
+    assert dedup.open_download_stream(chunked_id).read() == b"chunked data"
+    chunked.delete(dedup_id)
+    assert _dedup_counts(connection.db) == (0, 0, 0)
+
+
+# ================================
+# Chunk compression
+# ================================
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_compressed_chunks_round_trip(connection, compression):
+    """Test that compressed chunks are smaller and read back unchanged."""
+    db = connection.db
+    bucket = GridFSBucket(db, chunk_size_bytes=1024, compression=compression)
+    data = b'{"level": "info", "message": "request served"}\n' * 200
+    file_id = bucket.upload_from_stream("app.log", data)
+
+    stored = db.execute("SELECT SUM(LENGTH(data)) FROM fs_chunks").fetchone()
+    assert stored[0] < len(data) // 4
+    assert db.execute("SELECT compression FROM fs_files").fetchone() == (
+        compression,
+    )
+    assert bucket.open_download_stream(file_id).read() == data
+    destination = io.BytesIO()
+    bucket.download_to_stream(file_id, destination)
+    assert destination.getvalue() == data
+
+
+def test_compressed_chunks_random_access_decompresses_lazily(
+    connection, monkeypatch
+):
+    """Test that seeking into a compressed file decompresses only needed chunks."""
+    from neosqlite.gridfs import grid_file
+
+    bucket = GridFSBucket(
+        connection.db, chunk_size_bytes=10, compression="zlib"
+    )
+    data = b"".join(bytes([65 + i]) * 10 for i in range(10))
+    file_id = bucket.upload_from_stream("letters.txt", data)
+
+    decompressed = []
+    original = grid_file.decompress_chunk
+
+    def tracking_decompress(chunk, compression):
+        result = original(chunk, compression)
+        decompressed.append(bytes(result[:1]))
+        return result
+
+    monkeypatch.setattr(grid_file, "decompress_chunk", tracking_decompress)
+    grid_out = GridOut(connection.db, "fs", file_id, read_ahead=8)
+    grid_out.seek(35)
+    assert grid_out.read(10) == b"DDDDDEEEEE"
+    assert decompressed == [b"D", b"E"]
+
+
+def test_compression_skips_compressed_content_types(connection):
+    """Test that already-compressed formats are stored uncompressed."""
+    from neosqlite.objectid import ObjectId
+
+    db = connection.db
+    bucket = GridFSBucket(db, compression="zlib")
+    bucket.upload_from_stream("photo.jpg", b"\xff\xd8 jpeg data")
+    bucket.upload_from_stream("backup.tar.gz", b"\x1f\x8b gzip data")
+    bucket.upload_from_stream(
+        "upload.bin", b"zip data", metadata={"contentType": "application/zip"}
+    )
+    bucket.upload_from_stream("notes.txt", b"plain text")
+    with bucket.open_upload_stream_with_id(
+        ObjectId(), "movie", content_type="video/mp4"
+    ) as grid_in:
+        grid_in.write(b"mp4 data")
+
+    rows = dict(db.execute("SELECT filename, compression FROM fs_files"))
+    assert rows == {
+        "photo.jpg": None,
+        "backup.tar.gz": None,
+        "upload.bin": None,
+        "notes.txt": "zlib",
+        "movie": None,
+    }
+
+
+def test_compression_grid_in_and_mixed_bucket(connection):
+    """Test that streamed compressed files and plain files share a bucket."""
+    plain = GridFSBucket(connection.db, chunk_size_bytes=8)
+    plain_id = plain.upload_from_stream("plain.txt", b"plain data here")
+    packed = GridFSBucket(connection.db, chunk_size_bytes=8, compression="lzma")
+    with packed.open_upload_stream("packed.txt") as grid_in:
+        grid_in.write(b"packed ")
+        grid_in.write(b"data here")
+
+    grid_out = plain.open_download_stream_by_name("packed.txt")
+    assert grid_out.read() == b"packed data here"
+    assert packed.open_download_stream(plain_id).read() == b"plain data here"
+
+
+def test_compression_with_dedup_storage(connection):
+    """Test that compressed chunks are deduplicated by their stored bytes."""
+    db = connection.db
+    bucket = GridFSBucket(
+        db, chunk_size_bytes=64, storage="dedup", compression="zlib"
+    )
+    data = b"0123456789abcdef" * 16
+    first = bucket.upload_from_stream("a.txt", data)
+    bucket.upload_from_stream("b.txt", data)
+
+    assert db.execute("SELECT COUNT(*) FROM fs_chunk_store").fetchone() == (1,)
+    assert bucket.open_download_stream(first).read() == data
+
+
+def test_compressed_chunk_corruption_raises(connection):
+    """Test that undecodable compressed chunks raise CorruptGridFile."""
+    bucket = GridFSBucket(connection.db, compression="zlib")
+    file_id = bucket.upload_from_stream("bad.txt", b"some text" * 10)
+    connection.db.execute("UPDATE fs_chunks SET data = X'00010203'")
+    with pytest.raises(CorruptGridFile):
+        bucket.open_download_stream(file_id).read()
+
+
+def test_compression_invalid_method(connection):
+    """Test that an unknown compression method is rejected."""
+    with pytest.raises(ValueError):
+        GridFSBucket(connection.db, compression="brotli")
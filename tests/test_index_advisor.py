@@ -0,0 +1,183 @@
+"""
+Tests for the workload-driven index advisor.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import neosqlite
+from neosqlite.index_advisor import normalize_filter
+
+
+@pytest.fixture
+def conn():
+    # A zero threshold makes every recorded shape slow enough to explain
+    with neosqlite.Connection(":memory:", index_advisor=0.0) as conn:
+        conn.orders.insert_many(
+            [
+                {
+                    "status": "open" if i % 50 == 0 else "done",
+                    "n": i,
+                    "cust": i % 100,
+                    "region": f"r{i % 10}",
+                    "tags": [i % 3, 5],
+                }
+                for i in range(1000)
+            ]
+        )
+        yield conn
+
+
+def _suggested(advisor):
+    return [(s["keys"], s["kind"], s["options"]) for s in advisor.suggest()]
+
+
+def test_disabled_by_default(connection):
+    assert connection.index_advisor is None
+    connection.foo.insert_one({"a": 1})
+    assert connection.foo.count_documents({"a": 1}) == 1
+
+
+def test_normalize_filter():
+    assert normalize_filter(
+        {"a": 1, "b": {"$gt": 2, "$lt": 5}, "c": {"$in": [1]}}
+    ) == {"a": "eq", "b": "range", "c": "eq"}
+    assert normalize_filter({"$and": [{"a": 1}, {"b": {"$regex": "x"}}]}) == {
+        "a": "eq",
+        "b": "$regex",
+    }
+    assert normalize_filter({"$or": [{"a": 1}, {"b": {"$ne": 1}}]}) == {
+        "$or": [{"a": "eq"}, {"b": "$ne"}]
+    }
+
+
+def test_records_shapes(conn):
+    orders = conn.orders
+    for i in range(3):
+        assert len(list(orders.find({"region": f"r{i}"}).sort("n", -1))) == 100
+        orders.count_documents({"n": {"$gte": i}})
+        orders.update_many({"cust": i}, {"$set": {"seen": True}})
+        orders.delete_one({"n": -i})
+        list(orders.aggregate([{"$match": {"cust": i}}, {"$sort": {"n": 1}}]))
+    shapes = {
+        (s["operation"], str(s["filter"]), str(s["sort"])): s
+        for s in conn.index_advisor.shapes("orders")
+    }
+    assert set(shapes) == {
+        ("find", "{'region': 'eq'}", "[('n', -1)]"),
+        ("count", "{'n': 'range'}", "[]"),
+        ("update", "{'cust': 'eq'}", "[]"),
+        ("delete", "{'n': 'eq'}", "[]"),
+        ("aggregate", "{'cust': 'eq'}", "[('n', 1)]"),
+    }
+    find = shapes[("find", "{'region': 'eq'}", "[('n', -1)]")]
+    assert find["count"] == 3
+    assert find["maxMillis"] <= find["totalMillis"]
+    conn.index_advisor.reset()
+    assert conn.index_advisor.shapes() == []
+
+
+def test_cursor_time_excludes_caller(conn, monkeypatch):
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr(
+        "neosqlite.index_advisor.time",
+        SimpleNamespace(perf_counter=lambda: next(clock) / 1000),
+    )
+    # Each clock read is 10ms later; the loop body does not read it
+    for _ in conn.orders.find({"cust": 1}):
+        pass
+    (shape,) = conn.index_advisor.shapes()
+    # Two clock reads per document and two for the end of the cursor
+    assert shape["totalMillis"] == pytest.approx(10 * 11)
+
+
+def test_compound_index_follows_esr(conn):
+    orders = conn.orders
+    for i in range(3):
+        list(orders.find({"n": {"$gt": i}, "region": f"r{i}"}).sort("cust", -1))
+    assert _suggested(conn.index_advisor) == [
+        ([("region", 1), ("cust", -1), ("n", 1)], "compound", {})
+    ]
+
+
+def test_constant_equality_suggests_partial_index(conn):
+    for i in range(3):
+        list(conn.orders.find({"status": "open", "cust": {"$lt": i * 10}}))
+    assert _suggested(conn.index_advisor) == [
+        (
+            [("cust", 1)],
+            "partial",
+            {"partialFilterExpression": {"status": "open"}},
+        )
+    ]
+
+
+def test_array_field_suggests_multikey_index(conn):
+    for i in range(2):
+        conn.orders.count_documents({"tags": i})
+    assert _suggested(conn.index_advisor) == [
+        ([("tags", 1)], "multikey", {"multikey": True})
+    ]
+
+
+def test_indexed_and_fallback_shapes_are_left_alone(conn):
+    orders = conn.orders
+    orders.create_index("region")
+    list(orders.find({"region": "r1"}))
+    list(orders.find({"_id": 3}))
+    list(orders.find({"$jsonSchema": {"required": ["n"]}}))
+    orders.count_documents({"region": {"$regex": "1$"}})
+    assert conn.index_advisor.suggest() == []
+
+
+def test_slow_threshold(conn):
+    list(conn.orders.find({"region": "r1"}))
+    assert conn.index_advisor.suggest(slow_ms=1e9) == []
+    conn.index_advisor.slow_ms = 1e9
+    assert conn.index_advisor.suggest() == []
+    assert conn.index_advisor.suggest(slow_ms=0) != []
+
+
+def test_benefit_uses_statistics(conn):
+    for i in range(3):
+        list(conn.orders.find({"status": "open"}))
+        list(conn.orders.find({"region": f"r{i}"}))
+    suggestions = {s["keys"][0][0]: s for s in conn.index_advisor.suggest()}
+    for field, selectivity in (("status", 0.02), ("region", 0.1)):
+        suggestion = suggestions[field]
+        total = suggestion["shapes"][0]["totalMillis"]
+        assert suggestion["estimatedBenefitMillis"] == pytest.approx(
+            total * (1 - selectivity), abs=0.01
+        )
+        assert any("SCAN orders" in d for d in suggestion["plans"][0])
+
+
+def test_create_suggested_indexes(conn):
+    orders = conn.orders
+    for i in range(3):
+        list(orders.find({"cust": i}).sort("n", 1))
+        orders.count_documents({"tags": i})
+    created = conn.index_advisor.create_suggested_indexes()
+    assert sorted(created["orders"]) == ["idx_orders_cust_n", "idx_orders_tags"]
+    assert "$.tags" in orders.indexes.multikey_index_tables()
+    plan = orders.find({"cust": 1}).sort("n", 1).explain()
+    assert plan["queryPlanner"]["indexUsage"]
+    # Served shapes are no longer suggested
+    assert conn.index_advisor.suggest() == []
+
+
+def test_create_skips_small_benefits(conn):
+    list(conn.orders.find({"region": "r1"}))
+    assert conn.index_advisor.create_suggested_indexes(min_benefit_ms=1e9) == {}
+    assert "idx_orders_region" not in conn.orders.index_information()
+
+
+def test_max_shapes(conn):
+    conn.index_advisor.max_shapes = 2
+    for field in ("a", "b", "c"):
+        conn.orders.count_documents({field: 1})
+    conn.orders.count_documents({"a": 2})
+    counts = sorted(s["count"] for s in conn.index_advisor.shapes())
+    assert counts == [1, 2]
+    assert conn.index_advisor.dropped == 1
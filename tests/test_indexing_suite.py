@@ -3,13 +3,17 @@ Consolidated tests for indexing functionality.
 """
 
 import time
+from datetime import datetime, timedelta, timezone
 from operator import itemgetter
 from typing import Tuple, Type
+from unittest.mock import patch
 
 import pytest
 
 import neosqlite
 from neosqlite.collection import sqlite3
+from neosqlite.collection.index_manager import ttl_collection_names
+from neosqlite.ttl_monitor import TTLMonitor
 
 # Handle both standard sqlite3 and pysqlite3 exceptions
 try:
@@ -1086,5 +1090,888 @@ def test_search_index_functionality(collection):
     assert "title" in search_indexes
 
 
+# ================================
+# Sparse and Partial Index Tests
+# ================================
+
+
+def _plan(collection, query):
+    """Return the SQLite query plan for a find() filter."""
+    where_clause, params, _ = (
+        collection.query_engine.helpers._build_simple_where_clause(query)
+    )
+    cursor = collection.db.execute(
+        f"EXPLAIN QUERY PLAN SELECT id, data FROM {collection.name} "
+        f"{where_clause}",
+        params,
+    )
+    return " ".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def _index_row_count(collection, index_name):
+    return collection.db.execute(
+        f"SELECT count(*) FROM {collection.name} INDEXED BY {index_name} "
+        "WHERE json_type(data, '$.tag') IS NOT NULL"
+    ).fetchone()[0]
+
+
+def test_sparse_index_skips_documents_without_field(collection):
+    collection.insert_many(
+        [
+            {"n": i, "tag": f"t{i}"} if i % 10 == 0 else {"n": i}
+            for i in range(50)
+        ]
+        + [{"n": 50, "tag": None}]
+    )
+    collection.create_index("tag", sparse=True)
+
+    sql = collection.db.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_foo_tag'"
+    ).fetchone()[0]
+    assert "WHERE json_type(data, '$.tag') IS NOT NULL" in sql
+    # Documents with tag set to null are kept, as in MongoDB
+    assert _index_row_count(collection, "idx_foo_tag") == 6
+    assert collection.index_information()["idx_foo_tag"]["sparse"] is True
+
+
+def test_sparse_index_used_for_existence_implying_queries(collection):
+    collection.insert_many([{"tag": i} if i % 2 else {} for i in range(20)])
+    collection.create_index("tag", sparse=True)
+
+    for query in (
+        {"tag": 5},
+        {"tag": {"$gt": 3}},
+        {"tag": {"$gte": 3, "$lt": 9}},
+        {"tag": {"$exists": True}},
+    ):
+        assert "USING INDEX idx_foo_tag" in _plan(collection, query), query
+
+    # A null match must consider documents missing the field
+    assert "idx_foo_tag" not in _plan(collection, {"tag": {"$ne": 5}})
+    assert [d["tag"] for d in collection.find({"tag": {"$gt": 14}})] == [
+        15,
+        17,
+        19,
+    ]
+
+
+def test_sparse_index_paths_track_schema_changes(tmp_path):
+    path = str(tmp_path / "sparse.db")
+    with (
+        neosqlite.Connection(path) as first,
+        neosqlite.Connection(path) as second,
+    ):
+        collection = first["foo"]
+        collection.insert_one({"tag": 1})
+        assert collection.indexes.sparse_index_paths() == frozenset()
+        second["foo"].create_index("tag", sparse=True)
+        assert collection.indexes.sparse_index_paths() == {"$.tag"}
+        second["foo"].drop_index("tag")
+        assert collection.indexes.sparse_index_paths() == frozenset()
+
+
+def test_query_reads_schema_once(collection):
+    collection.insert_many([{"tag": i, "n": i} for i in range(5)])
+    collection.create_index("tag", sparse=True)
+    collection.promote_field("n")
+    statements: list[str] = []
+    collection.db.set_trace_callback(statements.append)
+    found = list(collection.find({"tag": {"$gte": 3}}).sort("n", -1))
+    collection.db.set_trace_callback(None)
+    assert [doc["n"] for doc in found] == [4, 3]
+    # The sparse, promoted and array lookups of WHERE and ORDER BY share it
+    assert sum("pragma_schema_version" in s for s in statements) == 1
+
+
+def test_partial_filter_expression(collection):
+    collection.insert_many(
+        [
+            {"sku": i, "status": "active" if i < 5 else "archived"}
+            for i in range(20)
+        ]
+    )
+    collection.create_index(
+        "sku", partial_filter_expression={"status": "active"}
+    )
+
+    sql = collection.db.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_foo_sku'"
+    ).fetchone()[0]
+    assert sql.endswith("WHERE jsonb_extract(data, '$.status') = 'active'") or (
+        sql.endswith("WHERE json_extract(data, '$.status') = 'active'")
+    )
+    assert "USING INDEX idx_foo_sku" in _plan(
+        collection, {"sku": 3, "status": "active"}
+    )
+    # Without the filter's condition the index may miss matches
+    assert "idx_foo_sku" not in _plan(collection, {"sku": 3})
+    assert len(list(collection.find({"sku": 7}))) == 1
+    assert collection.index_information()["idx_foo_sku"]["key"] == {"sku": 1}
+
+
+def test_index_information_reports_sparse_and_partial_filter(collection):
+    partial = {"status": "a */ b", "n": {"$gt": 2}}
+    collection.create_index("sku", partial_filter_expression=partial)
+    collection.create_index("tag", sparse=True)
+    collection.create_index(
+        [("a", 1), ("b", 1)],
+        sparse=True,
+        partial_filter_expression={"n": {"$lt": 5}},
+    )
+    collection.create_index("plain")
+
+    info = collection.index_information()
+    assert info["idx_foo_sku"]["partialFilterExpression"] == partial
+    assert "sparse" not in info["idx_foo_sku"]
+    assert info["idx_foo_tag"]["sparse"] is True
+    assert "partialFilterExpression" not in info["idx_foo_tag"]
+    assert info["idx_foo_a_b"] == {
+        "v": 2,
+        "unique": False,
+        "sparse": True,
+        "partialFilterExpression": {"n": {"$lt": 5}},
+        "key": {"a": 1, "b": 1},
+    }
+    assert info["idx_foo_plain"] == {
+        "v": 2,
+        "unique": False,
+        "key": {"plain": 1},
+    }
+    # The options survive the index being rebuilt on a promoted column
+    collection.promote_field("sku")
+    info = collection.index_information()["idx_foo_sku"]
+    assert info["partialFilterExpression"] == partial
+    assert info["key"] == {"sku": 1}
+
+
+def test_partial_unique_index(collection):
+    collection.create_indexes(
+        [
+            neosqlite.IndexModel(
+                "email",
+                unique=True,
+                partialFilterExpression={"deleted": False},
+            )
+        ]
+    )
+    collection.insert_one({"email": "a@example.com", "deleted": True})
+    collection.insert_one({"email": "a@example.com", "deleted": True})
+    collection.insert_one({"email": "a@example.com", "deleted": False})
+    with pytest.raises(IntegrityError):
+        collection.insert_one({"email": "a@example.com", "deleted": False})
+
+
+def test_partial_filter_expression_with_quotes(collection):
+    collection.create_index(
+        "sku", partial_filter_expression={"owner": "O'Brien", "n": {"$gt": 2}}
+    )
+    collection.insert_one({"sku": 1, "owner": "O'Brien", "n": 3})
+    assert "USING INDEX idx_foo_sku" in _plan(
+        collection, {"sku": 1, "owner": "O'Brien", "n": {"$gt": 2}}
+    )
+
+
+def test_unsupported_partial_filter_expression(collection):
+    with pytest.raises(ValueError):
+        collection.create_index(
+            "sku", partial_filter_expression={"$or": [{"a": 1}, {"b": 2}]}
+        )
+    with pytest.raises(ValueError):
+        collection.create_index(
+            "sku", partial_filter_expression={"a": object()}
+        )
+    assert "idx_foo_sku" not in collection.list_indexes()
+
+
+# ================================
+# Multikey Index Tests
+# ================================
+
+
+def _side_table(collection):
+    return sorted(
+        collection.db.execute(
+            f"SELECT value, id FROM {collection.name}__mk_tags"
+        ).fetchall(),
+        key=lambda row: (row[1], str(row[0])),
+    )
+
+
+@pytest.fixture
+def tagged(collection):
+    collection.insert_many(
+        [
+            {"n": 1, "tags": ["red", "blue"]},
+            {"n": 2, "tags": "red"},
+            {"n": 3, "tags": ["green", 4, True, {"c": "red"}]},
+            {"n": 4},
+            {"n": 5, "tags": {"c": "red"}},
+        ]
+    )
+    collection.create_index("tags", multikey=True)
+    return collection
+
+
+def _ns(collection, query):
+    return sorted(doc["n"] for doc in collection.find(query))
+
+
+def test_multikey_side_table_contents(tagged):
+    # Scalar elements only; objects, booleans and nested members are skipped
+    assert _side_table(tagged) == [
+        ("blue", 1),
+        ("red", 1),
+        ("red", 2),
+        (4, 3),
+        ("green", 3),
+    ]
+    assert "idx_foo_tags" in tagged.list_indexes()
+
+
+def test_multikey_side_table_follows_writes(tagged):
+    tagged.insert_one({"n": 6, "tags": ["red", "red", "pink"]})
+    tagged.update_one({"n": 1}, {"$push": {"tags": "black"}})
+    tagged.update_one({"n": 2}, {"$set": {"tags": ["yellow"]}})
+    tagged.delete_one({"n": 3})
+    tagged.update_one({"n": 6}, {"$set": {"other": 1}})
+
+    assert _side_table(tagged) == [
+        ("black", 1),
+        ("blue", 1),
+        ("red", 1),
+        ("yellow", 2),
+        ("pink", 6),
+        ("red", 6),
+    ]
+
+
+def test_multikey_queries(tagged):
+    assert _ns(tagged, {"tags": "red"}) == [1, 2]
+    assert _ns(tagged, {"tags": {"$eq": "red"}}) == [1, 2]
+    assert _ns(tagged, {"tags": {"$in": ["blue", "green"]}}) == [1, 3]
+    assert _ns(tagged, {"tags": {"$all": ["red", "blue"]}}) == [1]
+    assert _ns(tagged, {"tags": {"$elemMatch": {"$gt": 3}}}) == [3]
+    assert _ns(tagged, {"tags": {"$elemMatch": {"$gte": "g", "$lt": "h"}}}) == [
+        3
+    ]
+    assert tagged.count_documents({"tags": "red"}) == 2
+    assert len(list(tagged.aggregate([{"$match": {"tags": "blue"}}]))) == 1
+    # Conditions the side table cannot answer use the regular translation
+    assert _ns(tagged, {"tags": True}) == []
+    assert _ns(tagged, {"tags": {"$exists": False}}) == [4]
+
+
+def test_multikey_query_plans(tagged):
+    for query in (
+        {"tags": "red"},
+        {"tags": {"$in": ["red", "blue"]}},
+        {"tags": {"$all": ["red", "blue"]}},
+        {"tags": {"$elemMatch": {"$gte": 3, "$lt": 9}}},
+    ):
+        plan = _plan(tagged, query)
+        assert "SEARCH foo__mk_tags USING PRIMARY KEY" in plan, query
+        assert "SCAN foo" not in plan.replace("SCAN foo__mk", ""), query
+
+    where_clause, params = tagged.query_engine.sql_translator.translate_match(
+        {"tags": "red"}
+    )
+    assert "foo__mk_tags" in where_clause
+
+
+def test_multikey_writes_through_side_table(tagged):
+    assert (
+        tagged.update_many(
+            {"tags": "red"}, {"$set": {"hit": True}}
+        ).matched_count
+        == 2
+    )
+    assert tagged.delete_many({"tags": "blue"}).deleted_count == 1
+    assert _ns(tagged, {"hit": True}) == [2]
+
+
+def test_drop_multikey_index(tagged):
+    tagged.drop_index("tags")
+    assert not tagged.db.execute(
+        "SELECT name FROM sqlite_master WHERE name LIKE 'foo\\_\\_mk%' ESCAPE '\\'"
+    ).fetchall()
+    # The same documents as with the index
+    assert _ns(tagged, {"tags": "red"}) == [1, 2]
+
+
+_MEMBERSHIP_QUERIES = [
+    {"tags": "a"},
+    {"tags": {"$eq": "a"}},
+    {"tags": {"$ne": "a"}},
+    {"tags": {"$in": ["a", 7]}},
+    {"tags": {"$nin": ["a"]}},
+    {"tags": {"$nin": ["c", 7]}},
+    {"tags": 7},
+    {"tags": {"$ne": 7}},
+]
+
+
+def _membership_results(collection):
+    return [
+        (
+            _ns(collection, query),
+            collection.count_documents(query),
+            [
+                doc["n"]
+                for doc in collection.aggregate(
+                    [{"$match": query}, {"$sort": {"n": 1}}]
+                )
+            ],
+        )
+        for query in _MEMBERSHIP_QUERIES
+    ]
+
+
+def test_multikey_index_keeps_results(collection):
+    collection.insert_many(
+        [
+            {"n": 1, "tags": ["a", "b"]},
+            {"n": 2, "tags": "a"},
+            {"n": 3, "tags": ["c"]},
+            {"n": 4},
+            {"n": 5, "tags": [7, "d"]},
+        ]
+    )
+    before = _membership_results(collection)
+    collection.create_index("tags", multikey=True)
+    assert _membership_results(collection) == before
+    collection.drop_index("tags")
+    assert _membership_results(collection) == before
+
+    results = dict(zip(map(str, _MEMBERSHIP_QUERIES), before))
+    assert results[str({"tags": "a"})][0] == [1, 2]
+    # The negations reject arrays containing the value, and keep documents
+    # without the field
+    assert results[str({"tags": {"$ne": "a"}})][0] == [3, 4, 5]
+    assert results[str({"tags": {"$nin": ["a"]}})][0] == [3, 4, 5]
+    assert results[str({"tags": {"$nin": ["c", 7]}})][0] == [1, 2, 4]
+    for query, (found, count, aggregated) in zip(_MEMBERSHIP_QUERIES, before):
+        assert count == len(found) and aggregated == found, query
+        expected = sorted(
+            doc["n"]
+            for doc in collection.find()
+            if collection.query_engine.helpers._apply_query(query, doc)
+        )
+        assert found == expected, query
+
+
+def test_equality_keeps_index_while_no_arrays(collection):
+    collection.insert_many([{"n": i, "tags": f"t{i}"} for i in range(5)])
+    collection.create_index("tags")
+    assert "foo__arrays_tags" not in collection.index_information()
+    plan = _plan(collection, {"tags": "t1"})
+    assert "idx_foo_tags (<expr>=?)" in plan
+    assert "json_each" not in str(
+        collection.query_engine.helpers._build_simple_where_clause(
+            {"tags": "t1"}
+        )
+    )
+
+    collection.insert_one({"n": 9, "tags": ["t1", "t2"]})
+    assert _ns(collection, {"tags": "t1"}) == [1, 9]
+    plan = _plan(collection, {"tags": "t1"})
+    # Both sides of the membership test are index searches
+    assert "MULTI-INDEX OR" in plan and "SCAN foo" not in plan
+
+    collection.drop_index("tags")
+    assert not collection.db.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'foo__arrays_tags'"
+    ).fetchall()
+
+
+def test_array_probe_cached_until_written(tmp_path):
+    path = str(tmp_path / "arrays.db")
+    with (
+        neosqlite.Connection(path) as first,
+        neosqlite.Connection(path) as second,
+    ):
+        collection = first["foo"]
+        collection.insert_many([{"n": i, "tags": f"t{i}"} for i in range(5)])
+        collection.create_index("tags")
+        statements: list[str] = []
+        first.db.set_trace_callback(statements.append)
+        for _ in range(2):
+            assert _ns(collection, {"tags": "t1"}) == [1]
+        first.db.set_trace_callback(None)
+        # One schema read per find, and one array probe for both
+        assert sum("pragma_schema_version" in s for s in statements) == 2
+        assert sum("= 'array' LIMIT 1" in s for s in statements) == 1
+        # Writes through this connection or another one are noticed
+        collection.insert_one({"n": 9, "tags": ["t1"]})
+        assert _ns(collection, {"tags": "t1"}) == [1, 9]
+        collection.delete_one({"n": 9})
+        assert _ns(collection, {"tags": "t1"}) == [1]
+        second["foo"].insert_one({"n": 10, "tags": ["t1"]})
+        assert _ns(collection, {"tags": "t1"}) == [1, 10]
+
+
+def test_drop_collection_drops_side_table(connection):
+    collection = connection["foo"]
+    collection.insert_one({"tags": ["a"]})
+    collection.create_index("tags", multikey=True)
+    connection.drop_collection("foo")
+    tables = [
+        row[0]
+        for row in connection.db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    ]
+    assert "foo__mk_tags" not in tables
+
+    collection = connection["bar"]
+    collection.insert_one({"tags": ["b"]})
+    collection.create_index("tags", multikey=True)
+    collection.drop()
+    assert "bar__mk_tags" not in connection.list_collection_names()
+
+
+def test_invalid_multikey_index(collection):
+    with pytest.raises(ValueError):
+        collection.create_index("tags", multikey=True, unique=True)
+    with pytest.raises(ValueError):
+        collection.create_index([("a", 1), ("b", 1)], multikey=True)
+    with pytest.raises(ValueError):
+        collection.create_index(
+            "tags", multikey=True, partial_filter_expression={"a": 1}
+        )
+
+
+def test_multikey_index_model(collection):
+    collection.insert_one({"tags": ["a", "b"]})
+    collection.create_indexes([neosqlite.IndexModel("tags", multikey=True)])
+    assert collection.indexes.multikey_index_tables() == {
+        "$.tags": "foo__mk_tags"
+    }
+    assert collection.count_documents({"tags": "b"}) == 1
+
+
+# ================================
+# TTL Index Tests
+# ================================
+
+
+def _ago(seconds):
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def sessions(collection):
+    collection.insert_many(
+        [{"n": i, "at": _ago(3600)} for i in range(5)]
+        + [
+            {"n": 5, "at": _ago(0)},
+            {"n": 6, "at": "not a date"},
+            {"n": 7, "at": 42},
+            {"n": 8},
+        ]
+    )
+    collection.create_index("at", expire_after_seconds=60)
+    return collection
+
+
+def test_ttl_index_information(sessions):
+    info = sessions.index_information()
+    assert info["idx_foo_at_utc"]["expireAfterSeconds"] == 60
+    assert sessions.indexes.ttl_policies() == {"at": 60}
+
+
+def test_ttl_expire(sessions):
+    statements = []
+    sessions.db.set_trace_callback(statements.append)
+    assert sessions.expire(batch_size=2) == 5
+    sessions.db.set_trace_callback(None)
+    delete = next(sql for sql in statements if sql.startswith("DELETE"))
+    plan = sessions.db.execute(f"EXPLAIN QUERY PLAN {delete}").fetchall()
+    assert any("idx_foo_at_utc" in row[-1] for row in plan)
+    assert sorted(doc["n"] for doc in sessions.find()) == [5, 6, 7, 8]
+    assert sessions.expire() == 0
+
+
+def test_ttl_expire_max_batches(sessions):
+    assert sessions.expire(batch_size=2, max_batches=1) == 2
+    assert sessions.count_documents({}) == 7
+
+
+def test_ttl_drop_index(sessions):
+    sessions.drop_index("at")
+    assert "idx_foo_at_utc" not in sessions.index_information()
+    assert sessions.indexes.ttl_policies() == {}
+    assert sessions.expire() == 0
+
+
+def test_ttl_policies_follow_collection(connection):
+    collection = connection["foo"]
+    collection.create_index("at", expire_after_seconds=60)
+    collection.rename("bar")
+    assert ttl_collection_names(connection.db) == ["bar"]
+    connection.drop_collection("bar")
+    assert ttl_collection_names(connection.db) == []
+
+
+def test_invalid_ttl_index(collection):
+    with pytest.raises(ValueError):
+        collection.create_index([("a", 1), ("b", 1)], expire_after_seconds=60)
+    with pytest.raises(ValueError):
+        collection.create_index("a", expire_after_seconds=-1)
+    with pytest.raises(ValueError):
+        collection.create_index("a", expire_after_seconds=True)
+    with pytest.raises(ValueError):
+        collection.create_index("a", expire_after_seconds=60, multikey=True)
+
+
+def test_ttl_index_model(collection):
+    collection.insert_one({"at": _ago(3600)})
+    names = collection.create_indexes(
+        [neosqlite.IndexModel("at", expireAfterSeconds=60)]
+    )
+    assert names == ["idx_foo_at_utc"]
+    assert collection.expire() == 1
+
+
+def test_ttl_monitor(tmp_path):
+    with neosqlite.Connection(
+        str(tmp_path / "ttl.db"), ttl_monitor_interval=0.05
+    ) as conn:
+        collection = conn["foo"]
+        collection.insert_many([{"at": _ago(3600)}, {"at": _ago(0)}])
+        collection.create_index("at", expire_after_seconds=60)
+        deadline = time.monotonic() + 5
+        while collection.count_documents({}) > 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+
+
+def test_ttl_monitor_needs_file():
+    with pytest.raises(ValueError):
+        neosqlite.Connection(":memory:", ttl_monitor_interval=1)
+    with pytest.raises(ValueError):
+        TTLMonitor(neosqlite.Connection(":memory:"))
+
+
+# ================================
+# Promoted Field Tests
+# ================================
+
+
+def _table_sql(collection):
+    return collection.db.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (collection.name,),
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def people(collection):
+    collection.insert_many(
+        [{"n": i, "age": i % 10, "a": {"b": i}} for i in range(30)]
+        + [{"n": 30, "age": "7"}, {"n": 31}]
+    )
+    collection.create_index("age")
+    return collection
+
+
+def test_promote_field(people):
+    expected = sorted(d["n"] for d in people.find({"age": {"$gte": 8}}))
+    assert people.promote_field("age") == "f_age"
+    assert "f_age GENERATED ALWAYS AS" in _table_sql(people)
+    assert people.indexes.promoted_columns() == {"$.age": "f_age"}
+    # The existing index is rebuilt on the column
+    assert "idx_foo_age (f_age>?)" in _plan(people, {"age": {"$gte": 8}})
+    assert people.index_information()["idx_foo_age"]["key"] == {"age": 1}
+    assert sorted(d["n"] for d in people.find({"age": {"$gte": 8}})) == expected
+    assert people.count_documents({"age": "7"}) == 1
+    assert people.promote_field("age") == "f_age"
+
+
+def test_promoted_field_sort_and_new_indexes(people):
+    people.promote_field("a.b")
+    people.create_index("a.b")
+    sql = people.db.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_foo_a_b'"
+    ).fetchone()[0]
+    assert sql.endswith("(f_a_b)")
+    docs = list(people.find({"a.b": {"$lt": 3}}).sort("a.b", -1))
+    assert [d["n"] for d in docs] == [2, 1, 0]
+    assert (
+        "ORDER BY foo.f_a_b DESC"
+        in people.query_engine.helpers._build_sort_clause({"a.b": -1})
+    )
+
+
+def test_promoted_field_in_aggregation(people):
+    people.promote_field("age")
+    pipeline = [
+        {"$match": {"age": {"$gte": 8, "$lte": 9}}},
+        {"$sort": {"age": -1, "n": 1}},
+        {"$limit": 3},
+        {"$project": {"n": 1, "_id": 0}},
+    ]
+    sql, _ = people.query_engine.sql_tier_aggregator.build_pipeline_sql(
+        pipeline
+    )
+    assert "WHERE f_age >= ?" in sql
+    assert "ORDER BY f_age DESC" in sql
+    assert list(people.aggregate(pipeline)) == [
+        {"n": 9},
+        {"n": 19},
+        {"n": 29},
+    ]
+
+
+def test_promoted_field_affinity(people):
+    assert people.promote_field("age", affinity="integer") == "f_age"
+    assert "f_age INTEGER GENERATED" in _table_sql(people)
+    # A hidden twin of the index is built on the column
+    assert "foo__typed_age (f_age=?)" in _plan(people, {"age": 7})
+    assert "foo__typed_age (f_age<?)" in _plan(people, {"age": {"$lt": 7}})
+    assert list(people.index_information()) == ["idx_foo_age"]
+    # The column holds no text, so "7" is not converted to match 7
+    assert people.count_documents({"age": 7}) == 3
+    assert people.count_documents({"age": "7"}) == 1
+    # Lower bounds would also match text, so they read the document, using
+    # the index kept on the expression
+    for query in ({"age": {"$gt": 7}}, {"age": {"$gte": 7}}):
+        plan = _plan(people, query)
+        assert "f_age" not in plan
+        assert "USING INDEX idx_foo_age (<expr>>?)" in plan
+    assert people.count_documents({"age": {"$gt": 8}}) == 4
+    assert people.count_documents({"age": {"$gte": 8}}) == 7
+    # So do sorts, which the same index orders
+    cursor = people.find().sort("age", 1)
+    plan = " ".join(
+        step["detail"]
+        for step in cursor.explain()["queryPlanner"]["winningPlan"]
+    )
+    assert "USING INDEX idx_foo_age" in plan
+    assert "TEMP B-TREE" not in plan
+    assert [doc.get("age") for doc in cursor][-4:] == [9, 9, 9, "7"]
+    # Dropping or demoting the index drops its twin
+    people.demote_field("age")
+    assert people.index_information()["idx_foo_age"]["key"] == {"age": 1}
+    people.promote_field("age", affinity="INTEGER")
+    people.drop_index("age")
+    assert not people.db.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'foo__typed_age'"
+    ).fetchall()
+
+
+_MIXED_TYPE_QUERIES = [
+    {"a": 2},
+    {"a": "2"},
+    {"a": {"$eq": 2.5}},
+    {"a": {"$ne": 2}},
+    {"a": {"$ne": "2"}},
+    {"a": {"$in": [2, "x"]}},
+    {"a": {"$in": ["2", "x"]}},
+    {"a": {"$nin": [2, 2.5]}},
+    {"a": {"$gt": 1}},
+    {"a": {"$gte": "2"}},
+    {"a": {"$lt": 3}},
+    {"a": {"$lte": "2"}},
+    {"a": {"$gt": 1, "$lt": 3}},
+    {"a": {"$exists": True}},
+]
+
+
+def _mixed_type_results(collection):
+    return [
+        (
+            sorted(doc["n"] for doc in collection.find(query)),
+            collection.count_documents(query),
+            [
+                doc["n"]
+                for doc in collection.aggregate(
+                    [{"$match": query}, {"$sort": {"a": 1, "n": 1}}]
+                )
+            ],
+        )
+        for query in _MIXED_TYPE_QUERIES
+    ]
+
+
+@pytest.mark.parametrize(
+    "affinity", [None, "INTEGER", "REAL", "NUMERIC", "TEXT", "BLOB"]
+)
+def test_promoted_field_keeps_mixed_type_results(collection, affinity):
+    collection.insert_many(
+        [
+            {"n": 1, "a": 2},
+            {"n": 2, "a": "2"},
+            {"n": 3, "a": 2.5},
+            {"n": 4, "a": "x"},
+            {"n": 5},
+            {"n": 6, "a": True},
+            {"n": 7, "a": "10"},
+            {"n": 8, "a": None},
+        ]
+    )
+    collection.create_index("a")
+    expected = _mixed_type_results(collection)
+    collection.promote_field("a", affinity=affinity)
+    assert _mixed_type_results(collection) == expected
+
+
+def test_demote_field(people):
+    people.promote_field("age")
+    people.demote_field("age")
+    assert "f_age" not in _table_sql(people)
+    assert "idx_foo_age (<expr>>?)" in _plan(people, {"age": {"$gt": 8}})
+    assert people.count_documents({"age": 9}) == 3
+    people.demote_field("age")
+
+
+def test_promoted_field_after_rename(people):
+    people.promote_field("age")
+    people.rename("bar")
+    assert people.indexes.promoted_columns() == {"$.age": "f_age"}
+    assert people.count_documents({"age": 9}) == 3
+    assert people.update_many({"age": 9}, {"$inc": {"n": 1}}).matched_count == 3
+    assert sorted(d["n"] for d in people.find({"age": 9})) == [10, 20, 30]
+
+
+def test_promoted_field_keeps_datetime_index(collection):
+    collection.create_index("at", expire_after_seconds=60)
+    collection.promote_field("at")
+    sql = collection.db.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_foo_at_utc'"
+    ).fetchone()[0]
+    assert "datetime(jsonb_extract(data, '$.at'))" in sql or (
+        "datetime(json_extract(data, '$.at'))" in sql
+    )
+
+
+def test_invalid_promoted_field(collection):
+    with pytest.raises(ValueError):
+        collection.promote_field("_id")
+    with pytest.raises(ValueError):
+        collection.promote_field("age", affinity="DATE")
+    collection.promote_field("a.b")
+    with pytest.raises(ValueError):
+        collection.promote_field("a_b")
+
+
+# ================================
+# Covered Query Tests
+# ================================
+
+
+@pytest.fixture
+def words(collection):
+    collection.insert_many(
+        [{"w": f"w{i:02d}", "n": i + 2, "other": "x"} for i in range(20)]
+        + [
+            {"w": "bool", "n": True},
+            {"w": "null", "n": None},
+            {"w": "missing"},
+            {"w": "object", "n": {"a": 1}},
+            {"w": "date", "n": datetime(2024, 1, 1)},
+        ]
+    )
+    collection.create_index([("w", 1), ("n", 1)])
+    return collection
+
+
+def _winning_plan(cursor):
+    return " ".join(
+        step["detail"]
+        for step in cursor.explain()["queryPlanner"]["winningPlan"]
+    )
+
+
+def test_covered_query_plan(words):
+    cursor = words.find(
+        {"w": {"$gte": "w10"}}, {"w": 1, "n": 1, "_id": 0}
+    ).sort("w", 1)
+    assert "COVERING INDEX idx_foo_w_n" in _winning_plan(cursor)
+    assert list(cursor) == [
+        {"w": f"w{i:02d}", "n": i + 2} for i in range(10, 20)
+    ]
+
+
+def test_covered_query_ambiguous_values(words):
+    projection = {"w": 1, "n": 1, "_id": 0}
+    found = list(words.find({"w": {"$lt": "w"}}, projection).sort("w", 1))
+    assert found == [
+        {"w": "bool", "n": True},
+        {"w": "date", "n": datetime(2024, 1, 1)},
+        {"w": "missing"},
+        {"w": "null", "n": None},
+        {"w": "object", "n": {"a": 1}},
+    ]
+    # 0 and 1 may be booleans, so they are read from the document too
+    words.insert_one({"w": "one", "n": 1})
+    found = list(
+        words.find({"w": {"$in": ["bool", "one"]}}, projection).sort("w", 1)
+    )
+    assert found == [{"w": "bool", "n": True}, {"w": "one", "n": 1}]
+    assert type(found[1]["n"]) is int
+
+
+def test_not_covered_queries(words):
+    for cursor in (
+        words.find({"w": "w05"}, {"w": 1, "n": 1}),
+        words.find({"w": "w05"}, {"w": 1, "other": 1, "_id": 0}),
+        words.find({"w": "w05", "other": "x"}, {"w": 1, "_id": 0}),
+        words.find({"w": "w05"}),
+    ):
+        assert "COVERING" not in _winning_plan(cursor)
+    assert list(words.find({"w": "w05"}, {"w": 1, "n": 1})) == [
+        {"_id": words.find_one({"w": "w05"})["_id"], "w": "w05", "n": 7}
+    ]
+    assert list(words.find({"w": "w05"}, {"w": 1, "other": 1, "_id": 0})) == [
+        {"w": "w05", "other": "x"}
+    ]
+
+
+def test_covered_query_nested_and_promoted(collection):
+    collection.insert_many(
+        [{"a": {"b": f"v{i}"}, "c": i + 2} for i in range(5)]
+    )
+    collection.create_index([("a.b", 1), ("c", 1)])
+    cursor = collection.find({"a.b": "v3"}, {"c": 1, "_id": 0})
+    assert "COVERING INDEX" in _winning_plan(cursor)
+    assert list(cursor) == [{"c": 5}]
+    cursor = collection.find({"a.b": {"$gte": "v3"}}, {"c": 1, "_id": 0})
+    cursor.sort("a.b", -1)
+    assert "COVERING INDEX" in _winning_plan(cursor)
+    assert list(cursor) == [{"c": 6}, {"c": 5}]
+    # SQLite reads virtual columns from the table, even when indexed
+    collection.promote_field("c")
+    cursor = collection.find({"a.b": "v3"}, {"c": 1, "_id": 0})
+    assert "COVERING" not in _winning_plan(cursor)
+    assert list(cursor) == [{"c": 5}]
+
+
+def test_covered_query_without_jsonb():
+    with patch(
+        "neosqlite.collection.jsonb_support.supports_jsonb",
+        return_value=False,
+    ):
+        with neosqlite.Connection(":memory:") as conn:
+            collection = conn["foo"]
+            collection.insert_many(
+                [
+                    {"w": "a", "n": ["x", "y"]},
+                    {"w": "b", "n": {"k": 1}},
+                    {"w": "c", "n": "s"},
+                ]
+            )
+            collection.create_index([("w", 1), ("n", 1)])
+            cursor = collection.find(
+                {"w": {"$gte": "a"}}, {"w": 1, "n": 1, "_id": 0}
+            ).sort("w", 1)
+            # Index values cannot tell JSON text from strings
+            assert "COVERING" not in _winning_plan(cursor)
+            assert list(cursor) == [
+                {"w": "a", "n": ["x", "y"]},
+                {"w": "b", "n": {"k": 1}},
+                {"w": "c", "n": "s"},
+            ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
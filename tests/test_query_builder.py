@@ -72,7 +72,9 @@ class TestBuildOperatorClause:
             "'$.name'", {"$eq": "test"}
         )
         assert "extract(data, '$.name') = ?" in clause
-        assert params == ["test"]
+        # The unindexed field may hold arrays containing the value
+        assert "json_type(data, '$.name') = 'array'" in clause
+        assert params == ["test", "test"]
 
     def test_gt_operator(self, query_helper):
         """Test $gt operator clause generation."""
@@ -111,8 +113,9 @@ class TestBuildOperatorClause:
         clause, params = query_helper._build_operator_clause(
             "'$.name'", {"$ne": "Alice"}
         )
-        assert "extract(data, '$.name') != ?" in clause
-        assert params == ["Alice"]
+        assert clause.startswith("NOT COALESCE(")
+        assert "extract(data, '$.name') = ?" in clause
+        assert params == ["Alice", "Alice"]
 
     def test_in_operator(self, query_helper):
         """Test $in operator uses CTE for array-aware semantics."""
@@ -120,10 +123,10 @@ class TestBuildOperatorClause:
             "'$.name'", {"$in": ["Alice", "Bob"]}
         )
         assert clause is not None
+        assert "extract(data, '$.name') IN (?, ?)" in clause
         assert "EXISTS" in clause
-        assert "json_each" in clause
-        assert "json_each.value" in clause
-        assert params == ["Alice", "Bob"]
+        assert "_each(data, '$.name')" in clause
+        assert params == ["Alice", "Bob", "Alice", "Bob"]
 
     def test_nin_operator(self, query_helper):
         """Test $nin operator uses CTE for array-aware semantics."""
@@ -131,10 +134,9 @@ class TestBuildOperatorClause:
             "'$.name'", {"$nin": ["Alice", "Bob"]}
         )
         assert clause is not None
-        assert "NOT EXISTS" in clause
-        assert "json_each" in clause
-        assert "json_each.value" in clause
-        assert params == ["Alice", "Bob"]
+        assert clause.startswith("NOT COALESCE(")
+        assert "_each(data, '$.name')" in clause
+        assert params == ["Alice", "Bob", "Alice", "Bob"]
 
     def test_exists_true(self, query_helper):
         """Test $exists: true operator clause."""
@@ -246,9 +248,8 @@ class TestBuildOperatorClause:
         )
         assert ">=" in clause
         assert "<=" in clause
-        assert "!=" in clause
-        assert clause.count("AND") == 2
-        assert params == [25, 35, 30]
+        assert "NOT COALESCE(" in clause
+        assert params == [25, 35, 30, 30]
 
     def test_unsupported_operator(self, query_helper):
         """Test unsupported operator returns None."""
@@ -511,7 +512,7 @@ class TestBuildSimpleWhereClause:
         assert result is not None
         clause, params, tables = result
         assert "WHERE" in clause
-        assert params == ["test"]
+        assert params == ["test", "test"]
 
     def test_multiple_fields(self, query_helper):
         """Test multiple field equality."""
@@ -539,9 +540,8 @@ class TestBuildSimpleWhereClause:
         assert result is not None
         clause, params, tables = result
         assert "EXISTS" in clause
-        assert "json_each" in clause
-        assert "json_each.value" in clause
-        assert params == ["Alice", "Bob"]
+        assert "_each(data, '$.name')" in clause
+        assert params == ["Alice", "Bob", "Alice", "Bob"]
 
     def test_with_exists_operator(self, query_helper):
         """Test with $exists operator."""
@@ -653,7 +653,7 @@ class TestBuildFieldClause:
         """Test regular field with equality."""
         clause, params = query_helper._build_field_clause("name", "Alice")
         assert "extract(data," in clause
-        assert params == ["Alice"]
+        assert params == ["Alice", "Alice"]
 
     def test_regular_field_with_operator(self, query_helper):
         """Test regular field with operator."""
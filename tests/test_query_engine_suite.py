@@ -688,7 +688,7 @@ def test_query_helper_aggregation_and_query_building():
         clause, params, _ = helper._build_simple_where_clause({"name": "test"})
         # Check for either json_extract or jsonb_extract depending on support
         assert "json_extract" in clause or "jsonb_extract" in clause
-        assert params == ["test"]
+        assert params == ["test", "test"]
 
         # Test _build_simple_where_clause with _id field
         clause, params, _ = helper._build_simple_where_clause({"_id": 1})
@@ -715,7 +715,7 @@ def test_query_helper_aggregation_and_query_building():
             "json_extract(data, '$.value') = ?" in clause
             or "jsonb_extract(data, '$.value') = ?" in clause
         )
-        assert params == [5]
+        assert params == [5, 5]
 
         # Test _build_operator_clause with multiple operators
         clause, params = helper._build_operator_clause(
@@ -735,10 +735,8 @@ def test_query_helper_aggregation_and_query_building():
         # Check that all conditions are present
         assert ">" in clause
         assert "<" in clause
-        assert "!=" in clause
-        # Check that they're combined with AND
-        assert clause.count("AND") == 2
-        assert params == [5, 15, 10]
+        assert "NOT COALESCE(" in clause
+        assert params == [5, 15, 10, 10]
 
         # Test _build_operator_clause with unsupported operator
         clause, params = helper._build_operator_clause(
@@ -0,0 +1,198 @@
+"""
+Tests for the sampled collection statistics behind the cost model.
+"""
+
+import pytest
+
+import neosqlite
+from neosqlite.collection.statistics import (
+    DEFAULT_DOCUMENT_SIZE,
+    DEFAULT_SAMPLE_SIZE,
+    STATS_TABLE,
+)
+
+
+@pytest.fixture
+def orders(collection):
+    """Skewed orders: 1 in 50 is open, the rest are done."""
+    collection.insert_many(
+        [
+            {
+                "status": "open" if i % 50 == 0 else "done",
+                "n": i,
+                "tags": list(range(i % 5)),
+                "region": f"r{i % 10}",
+                **({"note": "x"} if i % 4 == 0 else {}),
+            }
+            for i in range(500)
+        ]
+    )
+    return collection
+
+
+class TestSelectivity:
+    def test_skewed_equality(self, orders):
+        statistics = orders.statistics
+        assert statistics.selectivity({"status": "open"}) == pytest.approx(0.02)
+        assert statistics.selectivity({"status": "done"}) == pytest.approx(0.98)
+        assert statistics.selectivity({"region": "r3"}) == pytest.approx(0.1)
+
+    def test_ranges(self, orders):
+        statistics = orders.statistics
+        assert statistics.selectivity(
+            {"n": {"$gte": 100, "$lt": 200}}
+        ) == pytest.approx(0.2, abs=0.05)
+        assert statistics.selectivity({"n": {"$gt": 1000}}) == 0.0
+
+    def test_operators(self, orders):
+        statistics = orders.statistics
+        assert statistics.selectivity(
+            {"region": {"$in": ["r1", "r2"]}}
+        ) == pytest.approx(0.2)
+        assert statistics.selectivity(
+            {"status": {"$ne": "open"}}
+        ) == pytest.approx(0.98)
+        assert statistics.selectivity(
+            {"note": {"$exists": False}}
+        ) == pytest.approx(0.75)
+        assert statistics.selectivity(
+            {"$or": [{"status": "open"}, {"region": "r1"}]}
+        ) == pytest.approx(1 - 0.98 * 0.9)
+
+    def test_unknown_conditions(self, orders):
+        statistics = orders.statistics
+        assert statistics.selectivity({"status": {"$regex": "^o"}}) is None
+        assert statistics.selectivity(
+            {"status": "open", "region": {"$regex": "1"}}
+        ) == pytest.approx(0.02 * 0.5)
+
+    def test_empty_collection(self, collection):
+        statistics = collection.statistics
+        assert statistics.selectivity({"a": 1}) is None
+        assert statistics.average_document_size() == DEFAULT_DOCUMENT_SIZE
+
+    def test_arrays_and_distinct_counts(self, orders):
+        statistics = orders.statistics
+        # Lengths 0 to 4; empty arrays are dropped by $unwind
+        assert statistics.unwind_factor("tags") == pytest.approx(2.0)
+        assert statistics.distinct_count("region") == 10
+        assert statistics.distinct_count("_id") == 500
+
+
+class TestFreshness:
+    def test_resampled_after_changes(self, orders):
+        statistics = orders.statistics
+        assert statistics.selectivity({"status": "open"}) == pytest.approx(0.02)
+        orders.insert_many([{"status": "open"} for _ in range(500)])
+        assert statistics.selectivity({"status": "open"}) == pytest.approx(0.51)
+
+    def test_sampled_large_collection(self, collection):
+        collection.insert_many(
+            [{"v": i % 2} for i in range(3 * DEFAULT_SAMPLE_SIZE)]
+        )
+        stats = collection.statistics.path_statistics("$.v")
+        assert stats["sampled"] < 3 * DEFAULT_SAMPLE_SIZE
+        assert collection.statistics.selectivity({"v": 1}) == pytest.approx(
+            0.5, abs=0.1
+        )
+
+
+class TestAnalyze:
+    def test_saves_statistics(self, orders):
+        orders.create_index("region")
+        sampled = orders.analyze()
+        assert {"$", "$.region"} <= set(sampled)
+        assert orders.analyze() == []
+        assert orders.analyze(["status"]) == ["$.status"]
+        saved = orders.db.execute(
+            f"SELECT path FROM {STATS_TABLE} WHERE collection_name = 'foo'"
+        ).fetchall()
+        assert ("$.status",) in saved
+        stat1 = orders.db.execute(
+            "SELECT stat FROM sqlite_stat1 WHERE idx = 'idx_foo_region'"
+        ).fetchone()
+        assert stat1 == ("500 50",)
+
+    def test_loaded_by_new_connection(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "stats.db")
+        with neosqlite.Connection(path) as conn:
+            conn.items.insert_many([{"k": i % 4} for i in range(40)])
+            conn.items.analyze(["k"])
+            conn.db.commit()
+        with neosqlite.Connection(path) as conn:
+            statistics = conn.items.statistics
+            # Saved statistics need no sampling
+            monkeypatch.setattr(statistics, "_sample", None)
+            assert statistics.selectivity({"k": 1}) == pytest.approx(0.25)
+
+    def test_follow_collection(self, connection, orders):
+        orders.analyze(["status"])
+        orders.rename("bar")
+        rows = connection.db.execute(
+            f"SELECT collection_name FROM {STATS_TABLE}"
+        ).fetchall()
+        assert set(rows) == {("bar",)}
+        connection.drop_collection("bar")
+        assert not connection.db.execute(
+            f"SELECT 1 FROM {STATS_TABLE}"
+        ).fetchall()
+
+    def test_command(self, connection, orders):
+        result = connection.command({"analyze": "foo"})
+        assert result["ok"] == 1
+        assert "$" in result["sampled"]
+
+
+class TestCostModel:
+    def test_most_selective_match_first(self, orders):
+        orders.create_index("status")
+        orders.create_index("region")
+        helpers = orders.query_engine.helpers
+        pipeline = [
+            {"$unwind": "$tags"},
+            {"$match": {"region": "r1"}},
+            {"$match": {"status": "open"}},
+        ]
+        assert helpers._reorder_pipeline_for_indexes(pipeline) == [
+            {"$match": {"status": "open"}},
+            {"$match": {"region": "r1"}},
+            {"$unwind": "$tags"},
+        ]
+        assert helpers._optimize_match_pushdown(pipeline)[0] == {
+            "$match": {"status": "open"}
+        }
+
+    def test_result_size(self, orders):
+        helpers = orders.query_engine.helpers
+        size = orders.statistics.average_document_size()
+        assert helpers._estimate_result_size(
+            [{"$match": {"status": "open"}}]
+        ) == 10 * int(size)
+        assert helpers._estimate_result_size(
+            [{"$group": {"_id": "$region"}}]
+        ) == 11 * int(size)
+        assert helpers._estimate_result_size(
+            [{"$unwind": "$tags"}]
+        ) == 1000 * int(size)
+
+    def test_query_cost(self, orders):
+        orders.create_index("status")
+        helpers = orders.query_engine.helpers
+        assert helpers._estimate_query_cost(
+            {"status": "open"}
+        ) < helpers._estimate_query_cost({"status": "done"})
+
+    def test_aggregation_results_unchanged(self, orders):
+        orders.create_index("status")
+        pipeline = [
+            {"$unwind": "$tags"},
+            {"$match": {"status": "done"}},
+            {"$match": {"region": {"$in": ["r1", "r2"]}}},
+            {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ]
+        # r1 documents have one tag, r2 documents two
+        assert list(orders.aggregate(pipeline)) == [
+            {"_id": 0, "count": 100},
+            {"_id": 1, "count": 50},
+        ]
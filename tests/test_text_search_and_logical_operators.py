@@ -5,6 +5,8 @@ Consolidated tests for text search and logical operators functionality.
 import warnings
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 import neosqlite
 from neosqlite import Connection
 from neosqlite.query_operators import _contains
@@ -1937,6 +1939,307 @@ def test_text_search_on_unwound_case_insensitive(collection):
     assert "performance testing" in notes
 
 
+def _text_search(collection, term):
+    return sorted(
+        doc["title"] for doc in collection.find({"$text": {"$search": term}})
+    )
+
+
+def test_multi_field_text_index(collection):
+    """Several text-indexed fields share one multi-column FTS table."""
+    collection.insert_many(
+        [
+            {"title": "Python Guide", "body": "learn snakes"},
+            {"title": "Rust Book", "body": "python bindings"},
+            {"title": "Go", "body": "gophers"},
+        ]
+    )
+    collection.create_index([("title", "text"), ("body", "text")])
+    assert collection.list_search_indexes() == ["title_body"]
+    assert _text_search(collection, "python") == ["Python Guide", "Rust Book"]
+    # Without FTS, $text falls back to Python over the indexed fields
+    query_helpers = collection.query_engine.helpers
+    with patch.object(
+        query_helpers, "_build_simple_where_clause", return_value=None
+    ):
+        assert _text_search(collection, "gophers") == ["Go"]
+    collection.drop_search_index("title_body")
+    assert collection.list_search_indexes() == []
+
+
+@pytest.mark.parametrize("fts_content", [None, "external", "contentless"])
+def test_fts_content_options_stay_in_sync(collection, fts_content):
+    """Triggers keep every kind of FTS table in step with the collection."""
+    collection.insert_many(
+        [
+            {"title": "Python Guide", "body": "learn snakes"},
+            {"title": "Go", "views": 0},
+        ]
+    )
+    collection.create_index(
+        ["title", "body"], fts=True, fts_content=fts_content
+    )
+    fts_table = f"{collection.name}_title_body_fts"
+    stored = collection.db.execute(
+        "SELECT name FROM sqlite_master WHERE name = ?",
+        (f"{fts_table}_content",),
+    ).fetchall()
+    assert bool(stored) == (fts_content is None)
+
+    collection.update_one({"title": "Go"}, {"$set": {"body": "python"}})
+    collection.insert_one({"title": "Snakes", "body": "pythons"})
+    assert _text_search(collection, "python") == ["Go", "Python Guide"]
+    collection.update_one({"title": "Go"}, {"$set": {"body": "gophers"}})
+    collection.delete_one({"title": "Python Guide"})
+    assert _text_search(collection, "python") == []
+    assert _text_search(collection, "gophers") == ["Go"]
+    # Raises if the postings disagree with the indexed text
+    collection.db.execute(
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('integrity-check')"
+    )
+
+
+def test_fts_update_trigger_skips_unchanged_fields(collection):
+    """A counter bump does not rewrite the full-text postings."""
+    collection.insert_one({"title": "Python Guide", "views": 0})
+    collection.create_index("title", fts=True)
+    db = collection.db
+    changes = db.total_changes
+    collection.update_one({"title": "Python Guide"}, {"$inc": {"views": 1}})
+    # Only the document row itself changed
+    assert db.total_changes - changes == 1
+    collection.update_one(
+        {"title": "Python Guide"}, {"$set": {"title": "Rust Guide"}}
+    )
+    assert db.total_changes - changes > 2
+    assert _text_search(collection, "rust") == ["Rust Guide"]
+
+
+def test_contentless_nested_text_index(collection):
+    collection.insert_many(
+        [
+            {
+                "title": "A",
+                "comments": [{"text": "Great read"}, {"text": "ok"}],
+            },
+            {"title": "B", "comments": [{"text": "meh"}]},
+        ]
+    )
+    collection.create_index(
+        "comments.text", fts=True, fts_content="contentless"
+    )
+    assert _text_search(collection, "great") == ["A"]
+    collection.update_one(
+        {"title": "B"}, {"$push": {"comments": {"text": "great too"}}}
+    )
+    assert _text_search(collection, "great") == ["A", "B"]
+
+
+def test_fts_content_option_errors(collection):
+    with pytest.raises(ValueError, match="nested fields"):
+        collection.create_index(
+            "comments.text", fts=True, fts_content="external"
+        )
+    with pytest.raises(ValueError, match="content must be"):
+        collection.create_index("title", fts=True, fts_content="copy")
+    with pytest.raises(ValueError, match="other keys"):
+        collection.create_index([("title", "text"), ("views", 1)])
+
+
+def test_create_indexes_fts_content(collection):
+    collection.insert_one({"title": "Python Guide", "body": "snakes"})
+    collection.create_indexes(
+        [
+            neosqlite.IndexModel(
+                [("title", "text"), ("body", "text")],
+                fts_content="external",
+            )
+        ]
+    )
+    sql = collection.db.execute(
+        "SELECT sql FROM sqlite_master WHERE name = ?",
+        (f"{collection.name}_title_body_fts",),
+    ).fetchone()[0]
+    assert "content_rowid='id'" in sql
+    assert _text_search(collection, "snakes") == ["Python Guide"]
+
+
+TEXT_SCORE = {"$meta": "textScore"}
+
+
+@pytest.fixture
+def articles(collection):
+    collection.insert_many(
+        [
+            {"title": "python", "body": "a snake", "n": 1},
+            {"title": "guide", "body": "python python python", "n": 2},
+            {"title": "java", "body": "a coffee", "n": 2},
+            {"title": "python tips", "body": "python", "n": 3},
+        ]
+    )
+    return collection
+
+
+def _scored(cursor):
+    return [(doc["title"], doc["score"]) for doc in cursor]
+
+
+def test_text_score_projection_and_sort(articles):
+    articles.create_index([("title", "text"), ("body", "text")])
+    query = {"$text": {"$search": "python"}}
+    results = _scored(
+        articles.find(query, {"score": TEXT_SCORE}).sort("score", TEXT_SCORE)
+    )
+    scores = [score for _, score in results]
+    assert len(results) == 3
+    assert scores == sorted(scores, reverse=True)
+    assert all(score > 0 for score in scores)
+    # A $meta projection adds the score to the whole document
+    (doc,) = articles.find({"$text": {"$search": "snake"}}, {"s": TEXT_SCORE})
+    assert set(doc) == {"_id", "title", "body", "n", "s"}
+    (doc,) = articles.find(
+        {"$text": {"$search": "snake"}}, {"title": 1, "s": TEXT_SCORE}
+    )
+    assert set(doc) == {"_id", "title", "s"}
+
+
+def test_text_index_weights(articles):
+    articles.create_index(
+        [("title", "text"), ("body", "text")], weights={"title": 10}
+    )
+    results = _scored(
+        articles.find(
+            {"$text": {"$search": "python"}}, {"score": TEXT_SCORE}
+        ).sort("score", TEXT_SCORE)
+    )
+    assert [title for title, _ in results][0] != "guide"
+    articles.drop_search_index("title_body")
+    articles.create_index(
+        [("title", "text"), ("body", "text")], weights={"body": 10}
+    )
+    results = _scored(
+        articles.find(
+            {"$text": {"$search": "python"}}, {"score": TEXT_SCORE}
+        ).sort("score", TEXT_SCORE)
+    )
+    assert results[0][0] == "guide"
+    with pytest.raises(ValueError):
+        articles.create_index([("title", "text")], weights={"title": 0})
+    with pytest.raises(ValueError):
+        articles.create_search_index("title", weights={"body": 2})
+
+
+def test_text_score_top_k_pushdown(articles, monkeypatch):
+    articles.create_index([("title", "text"), ("body", "text")])
+    query = {"$text": {"$search": "python"}}
+    everything = _scored(
+        articles.find(query, {"score": TEXT_SCORE}).sort("score", TEXT_SCORE)
+    )
+    helpers = articles.query_engine.helpers
+    build_ranking = helpers._build_text_ranking
+    limits = []
+
+    def spy(text_query, limit=None):
+        limits.append(limit)
+        return build_ranking(text_query, limit)
+
+    monkeypatch.setattr(helpers, "_build_text_ranking", spy)
+    cursor = (
+        articles.find(query, {"score": TEXT_SCORE})
+        .sort("score", TEXT_SCORE)
+        .skip(1)
+        .limit(1)
+    )
+    assert _scored(cursor) == everything[1:2]
+    assert limits == [2]
+    plan = [
+        step["detail"]
+        for step in cursor.explain()["queryPlanner"]["winningPlan"]
+    ]
+    assert any("VIRTUAL TABLE" in detail for detail in plan)
+    # Other sort keys rank every match
+    limits.clear()
+    results = _scored(
+        articles.find(query, {"score": TEXT_SCORE})
+        .sort([("n", -1), ("score", TEXT_SCORE)])
+        .limit(2)
+    )
+    assert [title for title, _ in results] == ["python tips", "guide"]
+    assert limits == [None]
+
+
+def test_text_search_with_other_conditions(articles):
+    articles.create_index([("title", "text"), ("body", "text")])
+    query = {"$text": {"$search": "python"}, "n": {"$gte": 2}}
+    assert sorted(doc["title"] for doc in articles.find(query)) == [
+        "guide",
+        "python tips",
+    ]
+    results = _scored(
+        articles.find(query, {"score": TEXT_SCORE}).sort("score", TEXT_SCORE)
+    )
+    assert sorted(title for title, _ in results) == ["guide", "python tips"]
+
+
+def test_text_score_hidden_from_python_filters(articles):
+    articles.create_index([("title", "text"), ("body", "text")])
+    schema = {
+        "properties": {
+            "_id": {},
+            "title": {"type": "string"},
+            "body": {"type": "string"},
+            "n": {"type": "integer"},
+        },
+        "additionalProperties": False,
+    }
+    query = {"$text": {"$search": "python"}, "$jsonSchema": schema}
+    results = _scored(
+        articles.find(query, {"score": TEXT_SCORE}).sort("score", TEXT_SCORE)
+    )
+    assert len(results) == 3
+    seen = []
+    cursor = (
+        articles.find({"$text": {"$search": "python"}}, {"score": TEXT_SCORE})
+        .sort("score", TEXT_SCORE)
+        .where(lambda doc: bool(seen.append(set(doc))) or doc["n"] > 1)
+        .skip(1)
+    )
+    ranked = [result for result in results if result[0] != "python"]
+    assert _scored(cursor) == ranked[1:]
+    assert seen and all("_textScore" not in keys for keys in seen)
+
+
+def test_text_score_sums_text_indexes(articles):
+    articles.create_index("title", fts=True)
+    articles.create_index("body", fts=True)
+    results = dict(
+        _scored(
+            articles.find(
+                {"$text": {"$search": "python"}}, {"score": TEXT_SCORE}
+            ).sort("score", TEXT_SCORE)
+        )
+    )
+    assert set(results) == {"python", "guide", "python tips"}
+    title_only = dict(
+        _scored(
+            articles.find(
+                {"$text": {"$search": "snake"}}, {"score": TEXT_SCORE}
+            )
+        )
+    )
+    assert title_only["python"] > 0
+
+
+def test_text_score_without_text_index(articles):
+    articles.insert_one({"title": "python", "body": "", "score": 99})
+    results = list(
+        articles.find({"$text": {"$search": "python"}}, {"s": TEXT_SCORE})
+        .sort("score", TEXT_SCORE)
+        .limit(5)
+    )
+    assert {doc["s"] for doc in results} == {0.0}
+
+
 # ================================
 # Logical Operators Tests
 # ================================